@@ -0,0 +1 @@
+"""Performance benchmarks for the space package, run against a local stub API."""
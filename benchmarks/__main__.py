@@ -0,0 +1,162 @@
+"""
+Command line for the benchmark suite.
+
+    python -m benchmarks run --output results.json
+    python -m benchmarks compare baseline.json results.json --threshold 0.15
+    python -m benchmarks serve --size 1000 --port 8000
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from benchmarks.stub_server import StubServer
+from benchmarks.suite import DEFAULT_SIZES, compare, run_suite
+
+BENCHMARKS = ("cold_start", "fetch", "parse", "render")
+
+
+def _sizes(value: str) -> List[int]:
+    try:
+        sizes = [int(size) for size in value.split(",") if size.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid sizes: {value!r}") from None
+    if not sizes or min(sizes) < 0:
+        raise argparse.ArgumentTypeError(f"Invalid sizes: {value!r}")
+    return sizes
+
+
+def _stub_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Stub response delay, in seconds"
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of stub responses that are 503 (default: 0)",
+    )
+    parser.add_argument(
+        "--no-compress", action="store_true", help="Never gzip stub responses"
+    )
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="space performance benchmarks"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the suite and write JSON results")
+    run.add_argument(
+        "--sizes",
+        type=_sizes,
+        default=list(DEFAULT_SIZES),
+        metavar="N[,N...]",
+        help="Roster sizes (default: 3,100,1000,10000,100000)",
+    )
+    run.add_argument(
+        "--only",
+        choices=BENCHMARKS,
+        action="append",
+        help="Run only this benchmark (repeatable)",
+    )
+    run.add_argument("--repeat", type=int, default=5, help="Timed runs (default: 5)")
+    run.add_argument(
+        "--budget",
+        type=float,
+        default=30.0,
+        help="Seconds after which a benchmark stops repeating (default: 30)",
+    )
+    _stub_options(run)
+    run.add_argument("-o", "--output", help="Results file (default: stdout)")
+
+    check = commands.add_parser(
+        "compare", help="Compare two results files; fail on regressions"
+    )
+    check.add_argument("baseline", help="Reference results file")
+    check.add_argument("current", help="Results file to check")
+    check.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Largest allowed slowdown of a median, as a fraction (default: 0.10)",
+    )
+
+    serve = commands.add_parser("serve", help="Run the stub server in the foreground")
+    serve.add_argument("--size", type=int, default=3, help="People on the roster")
+    serve.add_argument("--port", type=int, default=8000, help="Port (default: 8000)")
+    _stub_options(serve)
+
+    return parser.parse_args(args)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    options = parse_args(args)
+
+    if options.command == "serve":
+        server = StubServer(
+            size=options.size,
+            latency=options.latency,
+            error_rate=options.error_rate,
+            compress=not options.no_compress,
+            port=options.port,
+        )
+        print(f"Serving {options.size} people on {server.base_url}/astros.json")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if options.command == "compare":
+        with open(options.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        with open(options.current, encoding="utf-8") as f:
+            current = json.load(f)
+        try:
+            comparisons = compare(baseline, current)
+        except ValueError as e:
+            print(f"benchmarks: {e}", file=sys.stderr)
+            return 2
+        regressions = 0
+        for c in comparisons:
+            regressed = c.change > options.threshold
+            regressions += regressed
+            print(
+                f"{c.name:<20} {c.size:>7} {c.baseline * 1000:>10.2f} ms "
+                f"{c.current * 1000:>10.2f} ms {c.change:>+8.1%}"
+                + ("  REGRESSION" if regressed else "")
+            )
+        if regressions:
+            print(
+                f"{regressions} benchmark(s) slower than the baseline by more "
+                f"than {options.threshold:.0%}",
+                file=sys.stderr,
+            )
+            return 1
+        return 0
+
+    results = run_suite(
+        sizes=options.sizes,
+        repeat=options.repeat,
+        budget=options.budget,
+        latency=options.latency,
+        error_rate=options.error_rate,
+        compress=not options.no_compress,
+        benchmarks=options.only,
+        progress=lambda message: print(f"benchmarks: {message}", file=sys.stderr),
+    )
+    text = json.dumps(results, indent=2) + "\n"
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
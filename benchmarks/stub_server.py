@@ -0,0 +1,192 @@
+"""
+Local stub of the Open Notify ``/astros.json`` endpoint.
+
+The roster size, response latency, error rate and gzip compression are
+configurable, and can be changed between benchmark runs without restarting
+the server. Rosters are generated deterministically, so the same size
+always produces the same body.
+"""
+
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import TracebackType
+from typing import Any, Optional, Type
+
+ASTROS_PATH = "/astros.json"
+
+_FIRST = ("Oleg", "Jasmin", "Sunita", "Li", "Matthias", "Koichi", "Anne", "Sergey")
+_LAST = ("Kononenko", "Moghbeli", "Williams", "Guangsu", "Maurer", "Wakata", "Çelik")
+_CRAFTS = ("ISS", "Tiangong", "Crew Dragon", "Soyuz MS-25")
+
+
+class _Server(ThreadingHTTPServer):
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients that stop reading mid-body (e.g. `space --pager` quitting
+        # after one screen) reset the connection; that is not an error
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+@lru_cache(maxsize=16)
+def roster_body(size: int) -> bytes:
+    """
+    Build an ``/astros.json`` body with ``size`` people.
+
+    Args:
+        size: Number of people on the roster.
+
+    Returns:
+        The UTF-8 encoded JSON body.
+    """
+    people = [
+        {
+            "name": f"{_FIRST[i % len(_FIRST)]} {_LAST[i % len(_LAST)]} {i}",
+            "craft": _CRAFTS[i % len(_CRAFTS)],
+        }
+        for i in range(size)
+    ]
+    data = {"message": "success", "number": size, "people": people}
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+@lru_cache(maxsize=16)
+def _gzipped(size: int) -> bytes:
+    return gzip.compress(roster_body(size))
+
+
+class StubServer:
+    """
+    Threaded HTTP server answering ``GET /astros.json`` on the loopback
+    interface.
+
+    Args:
+        size: People on the served roster.
+        latency: Seconds to wait before answering each request.
+        error_rate: Fraction of requests answered with ``503``.
+        compress: Gzip the body for clients that accept it.
+        port: Port to bind (0 picks a free port).
+        seed: Seed for the error draws, for repeatable runs.
+    """
+
+    def __init__(
+        self,
+        size: int = 3,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        compress: bool = True,
+        port: int = 0,
+        seed: int = 0,
+    ) -> None:
+        self.size = size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.compress = compress
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = _Server(("127.0.0.1", port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """URL to use as ``SPACE_API_BASE_URL``."""
+        return f"http://127.0.0.1:{self._httpd.server_port}"
+
+    def configure(self, **settings: Any) -> None:
+        """Change ``size``, ``latency``, ``error_rate`` or ``compress``."""
+        for name, value in settings.items():
+            if name not in ("size", "latency", "error_rate", "compress"):
+                raise TypeError(f"Unknown stub server setting: {name}")
+            setattr(self, name, value)
+
+    def start(self) -> "StubServer":
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve requests in the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+    def _fail(self) -> bool:
+        """Count a request and decide whether it gets an error."""
+        with self._lock:
+            self.requests += 1
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            self.errors += failed
+            return failed
+
+    def _handler(self) -> Type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed
+            # ACKs add ~40 ms to every response
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path.split("?", 1)[0] != ASTROS_PATH:
+                    self._send(404, b"")
+                    return
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if stub._fail():
+                    self._send(503, b"", {"Retry-After": "1"})
+                    return
+                headers = {"Content-Type": "application/json"}
+                if stub.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    headers["Content-Encoding"] = "gzip"
+                    self._send(200, _gzipped(stub.size), headers)
+                else:
+                    self._send(200, roster_body(stub.size), headers)
+
+            def _send(
+                self, status: int, body: bytes, headers: Optional[dict] = None
+            ) -> None:
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
@@ -0,0 +1,386 @@
+"""
+The benchmarks, and the JSON results file they produce.
+
+Every benchmark runs against a ``StubServer`` on the loopback interface, so
+real sockets, HTTP parsing and (optionally) gzip are exercised while the
+network itself stays out of the numbers. Results are plain JSON keyed by
+benchmark name and roster size, so runs can be compared with
+``python -m benchmarks compare``.
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from benchmarks.stub_server import ASTROS_PATH, StubServer, roster_body
+
+# Bump when the results format changes incompatibly
+SCHEMA_VERSION = 1
+
+DEFAULT_SIZES = (3, 100, 1_000, 10_000, 100_000)
+
+# Chunk size used to feed the streaming parser, as SpaceClient.iter_people does
+STREAM_CHUNK = 64 * 1024
+
+
+@dataclass
+class Result:
+    """Timings of one benchmark at one roster size."""
+
+    name: str
+    size: int
+    samples: List[float]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the summary written to the results file."""
+        ordered = sorted(self.samples)
+        return {
+            "name": self.name,
+            "size": self.size,
+            "unit": "s",
+            "n": len(ordered),
+            "min": ordered[0],
+            "median": statistics.median(ordered),
+            "p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+            "mean": statistics.fmean(ordered),
+            **self.extra,
+        }
+
+
+def measure(
+    fn: Callable[[], Any], repeat: int, budget: float, warmup: int = 1
+) -> List[float]:
+    """
+    Time ``fn`` several times.
+
+    Args:
+        fn: The operation to time.
+        repeat: Maximum number of timed runs.
+        budget: Stop repeating once this many seconds have been spent
+            (after at least one timed run).
+        warmup: Untimed runs first, to fill caches and pools.
+
+    Returns:
+        The duration of every timed run, in seconds.
+    """
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    spent = 0.0
+    while len(samples) < repeat and (not samples or spent < budget):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+        spent += samples[-1]
+    return samples
+
+
+def _chunks(body: bytes) -> Iterator[bytes]:
+    for offset in range(0, len(body), STREAM_CHUNK):
+        yield body[offset : offset + STREAM_CHUNK]
+
+
+def bench_cold_start(server: StubServer, repeat: int, budget: float) -> List[Result]:
+    """Time fresh ``space`` processes: --version, and a 3-person roster."""
+    server.configure(size=3)
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    results = []
+    for name, argv in (
+        ("cold_start.version", ["--version"]),
+        ("cold_start.json", ["--format", "json"]),
+        ("cold_start.table", []),
+    ):
+        command = [sys.executable, "-m", "space", *argv]
+
+        def run() -> None:
+            subprocess.run(command, env=env, check=True, capture_output=True)
+
+        results.append(Result(name, 3, measure(run, repeat, budget)))
+    return results
+
+
+def bench_fetch(
+    server: StubServer, size: int, repeat: int, budget: float
+) -> List[Result]:
+    """Time a full GET of the roster (headers and body) over a warm pool."""
+    from space.client import SpaceClient
+
+    server.configure(size=size)
+    url = f"{server.base_url}{ASTROS_PATH}"
+    errors = 0
+    with SpaceClient(base_url=server.base_url, mirrors=[]) as client:
+
+        def fetch() -> None:
+            nonlocal errors
+            try:
+                client.get(url)
+            except Exception:
+                errors += 1
+
+        samples = measure(fetch, repeat, budget)
+        stats = client.stats()
+    return [
+        Result(
+            "fetch",
+            size,
+            samples,
+            (
+                {
+                    "bytes_received": stats.bytes_received // stats.requests,
+                    "errors": errors,
+                }
+                if stats.requests
+                else {"errors": errors}
+            ),
+        )
+    ]
+
+
+def bench_parse(size: int, repeat: int, budget: float) -> List[Result]:
+    """
+    Time decoding a roster body with each of the package's parsers.
+
+    ``parse.json`` and ``parse.orjson`` decode and validate the whole body;
+    ``decode.*`` and ``validate`` time the two steps on their own.
+    """
+    from space.core import parse_people
+    from space.decode import DECODERS, validate_astros
+    from space.models import Roster
+    from space.stream import iter_array_items
+
+    body = roster_body(size)
+    document = json.loads(body)
+    parsers: Dict[str, Callable[[], Any]] = {}
+    for backend, decode in sorted(DECODERS.items()):
+        parsers[f"decode.{backend}"] = partial(decode, body)
+        parsers[f"parse.{backend}"] = lambda decode=decode: parse_people(decode(body))
+    parsers.update(
+        {
+            "validate": partial(validate_astros, document),
+            "parse.stream": lambda: list(iter_array_items(_chunks(body), "people")),
+            "parse.roster": lambda: Roster(iter_array_items(_chunks(body), "people")),
+        }
+    )
+    results = []
+    for name, parser in parsers.items():
+        samples = measure(parser, repeat, budget)
+        median = statistics.median(samples)
+        extra = {
+            "people_per_s": round(size / median) if median else None,
+            "mb_per_s": round(len(body) / median / 1e6, 2) if median else None,
+        }
+        results.append(Result(name, size, samples, extra))
+    return results
+
+
+def bench_render(
+    server: StubServer, size: int, repeat: int, budget: float
+) -> List[Result]:
+    """
+    Time ``main()`` on the table path, its render phase, and the time to the
+    first screen of ``--pager``.
+    """
+    from space.__main__ import main
+    from space.instrument import get_recorder
+
+    server.configure(size=size)
+    recorder = get_recorder()
+    renders: List[float] = []
+    errors = 0
+
+    def run() -> None:
+        nonlocal errors
+        recorder.reset()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with _argv(["space", "--no-cache"]):
+                try:
+                    main()
+                except Exception:
+                    errors += 1
+        renders.extend(s.duration for s in recorder.spans() if s.name == "render")
+
+    # Rich needs tens of seconds for the largest tables; skip their warm-up
+    totals = measure(run, repeat, budget, warmup=int(size <= 10_000))
+    # Drop the warm-up run's render, if it had one
+    renders = renders[-len(totals) :]
+    results = [Result("main.table", size, totals, {"errors": errors})]
+    if renders:
+        results.append(Result("render.table", size, renders))
+    results.append(
+        Result("pager.first_screen", size, measure(_first_screen, repeat, budget))
+    )
+    return results
+
+
+def _first_screen() -> None:
+    """Stream the roster into ``space --pager`` and draw its first screen."""
+    from rich.console import Console
+
+    from space.__main__ import TABLE_COLUMNS
+    from space.pager import page_table
+    from space.space import iter_people_in_space
+
+    console = Console(file=io.StringIO(), width=120, height=50, force_terminal=True)
+    people = iter_people_in_space(cache_ttl=0)
+    try:
+        page_table(
+            console,
+            people,
+            ["name", "craft"],
+            TABLE_COLUMNS,
+            "People",
+            None,
+            lambda: "q",
+        )
+    finally:
+        people.close()
+
+
+@contextlib.contextmanager
+def _argv(argv: List[str]) -> Iterator[None]:
+    saved = sys.argv
+    sys.argv = argv
+    try:
+        yield
+    finally:
+        sys.argv = saved
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and versions the results were measured on."""
+    from space import __version__
+
+    return {
+        "space": __version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    repeat: int = 5,
+    budget: float = 30.0,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    compress: bool = True,
+    benchmarks: Optional[Sequence[str]] = None,
+    progress: Callable[[str], None] = lambda message: None,
+) -> Dict[str, Any]:
+    """
+    Run the benchmark suite against a fresh stub server.
+
+    Args:
+        sizes: Roster sizes to measure.
+        repeat: Maximum timed runs per benchmark and size.
+        budget: Seconds after which a benchmark stops repeating.
+        latency: Stub server response delay, in seconds.
+        error_rate: Fraction of stub responses that are ``503``.
+        compress: Let the stub server gzip its responses.
+        benchmarks: Subset of ``cold_start``, ``fetch``, ``parse`` and
+            ``render`` to run (default: all).
+        progress: Called with a short message before each benchmark.
+
+    Returns:
+        The results document, ready to be written as JSON.
+    """
+    selected = set(benchmarks or ("cold_start", "fetch", "parse", "render"))
+    with StubServer(
+        latency=latency, error_rate=error_rate, compress=compress
+    ) as server:
+        # Point the package (in this process and in the subprocesses) at the
+        # stub before anything reads the configuration
+        os.environ.update(
+            SPACE_API_BASE_URL=server.base_url,
+            SPACE_ASTROS_ENDPOINT=ASTROS_PATH,
+            SPACE_API_MIRRORS="",
+            SPACE_CACHE_TTL="0",
+            SPACE_RECORD_HISTORY="false",
+            # A running `space daemon` would answer the cold starts instead
+            SPACE_DAEMON_SOCKET="",
+        )
+        results: List[Result] = []
+        if "cold_start" in selected:
+            progress("cold start")
+            results += bench_cold_start(server, repeat, budget)
+        for size in sizes:
+            if "fetch" in selected:
+                progress(f"fetch, {size} people")
+                results += bench_fetch(server, size, repeat, budget)
+            if "parse" in selected:
+                progress(f"parse, {size} people")
+                results += bench_parse(size, repeat, budget)
+            if "render" in selected:
+                progress(f"render, {size} people")
+                results += bench_render(server, size, repeat, budget)
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "environment": environment(),
+        "settings": {
+            "sizes": list(sizes),
+            "repeat": repeat,
+            "budget": budget,
+            "latency": latency,
+            "error_rate": error_rate,
+            "compress": compress,
+        },
+        "results": [result.to_dict() for result in results],
+    }
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Change in one benchmark's median between two runs."""
+
+    name: str
+    size: int
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median (0.1 is 10% slower)."""
+        return self.current / self.baseline - 1 if self.baseline else 0.0
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Comparison]:
+    """
+    Match the results of two runs by benchmark and roster size.
+
+    Args:
+        baseline: Results document of the reference run.
+        current: Results document of the run being checked.
+
+    Returns:
+        One comparison per benchmark present in both runs.
+
+    Raises:
+        ValueError: If either document has an unsupported schema version.
+    """
+    for document in (baseline, current):
+        if document.get("schema_version") != SCHEMA_VERSION:
+            raise ValueError(
+                f"Unsupported results schema: {document.get('schema_version')!r}"
+            )
+    reference = {(r["name"], r["size"]): r["median"] for r in baseline["results"]}
+    return [
+        Comparison(r["name"], r["size"], reference[r["name"], r["size"]], r["median"])
+        for r in current["results"]
+        if (r["name"], r["size"]) in reference
+    ]
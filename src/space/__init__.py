@@ -2,6 +2,8 @@
 Space module - A Python package for space-related functionality.
 """
 
+from typing import Any
+
 __version__ = "0.1.0"
 __author__ = "Victor Velasquez"
 __email__ = "victorcop90@gmail.com"
@@ -12,3 +14,13 @@ __email__ = "victorcop90@gmail.com"
 # from .celestial import Planet, Star
 
 __all__ = ["fetch_people_in_space"]
+
+
+def __getattr__(name: str) -> Any:
+    # Resolve the public API on first use so importing the package (and
+    # running ``space --version``) stays cheap
+    if name == "fetch_people_in_space":
+        from space.space import fetch_people_in_space
+
+        return fetch_people_in_space
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,37 +1,142 @@
-import argparse
-import logging
-from typing import Optional
-
-from rich.console import Console
-from rich.table import Table
+import os
+import sys
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 
 from space import __version__
-from space.space import fetch_people_in_space
+
+# Nothing else is imported up front: a running `space daemon` answers before
+# argparse, logging or the output module would even be needed
+if TYPE_CHECKING:
+    import argparse
+
+    from rich.console import Console
+
+    from space.models import Roster
+
+# Column title and style of each known field in the table output
+TABLE_COLUMNS = {
+    "name": ("Name", "cyan"),
+    "craft": ("Spacecraft", "green"),
+    "count": ("People", "yellow"),
+    "time": ("Time", "dim"),
+    "event": ("Event", "bold"),
+    "observer": ("Observer", "cyan"),
+    "max_elevation": ("Max Elevation (°)", "green"),
+    "status": ("Status", "bold"),
+}
+
+# Heading of the roster table
+HEADING = "People currently in space"
+
+# Fields of the per-craft summary rows produced by --group-by craft
+GROUP_FIELDS = ["craft", "count"]
+
+# Fields of the roster change events listed by `space history`
+EVENT_FIELDS = ["time", "event", "name", "craft"]
+
+# Fields of the ISS position samples streamed by `space track`
+TRACK_FIELDS = ["time", "latitude", "longitude", "speed_kmh"]
+
+# Fields of the visibility windows listed by `space passes`
+PASS_FIELDS = ["observer", "start", "end", "duration", "max_elevation"]
+
+# Exit status of `space compare`, as for diff(1)
+COMPARE_SAME = 0
+COMPARE_DIFFERS = 1
+COMPARE_ERROR = 2
+
+
+def parse_time_arg(value: str) -> float:
+    """Parse a --at/--since/--until value for argparse."""
+    import argparse
+
+    from space.history import parse_time
+
+    try:
+        return parse_time(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
 
 
-def setup_logging(verbose: bool, debug: bool) -> None:
+def positive_float(value: str) -> float:
+    """Parse a number of seconds that must be positive, for argparse."""
+    import argparse
+
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}") from None
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be positive: {value}")
+    return number
+
+
+def int_at_least(minimum: int) -> Callable[[str], int]:
+    """Build an argparse type for integers no smaller than ``minimum``."""
+    import argparse
+
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer: {value!r}") from None
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}: {value}")
+        return number
+
+    return parse
+
+
+def port_number(value: str) -> int:
+    """Parse a TCP port (0 picks a free one), for argparse."""
+    import argparse
+
+    port = int_at_least(0)(value)
+    if port > 65535:
+        raise argparse.ArgumentTypeError(f"must be at most 65535: {value}")
+    return port
+
+
+def setup_logging(verbose: bool, debug: bool, json_format: bool = False) -> None:
     """
     Configure logging based on verbosity level.
 
+    Records are written by a background thread (see ``space.logs``), so
+    logging never blocks the command on a slow terminal or pipe.
+
     Args:
         verbose: Enable INFO level logging.
         debug: Enable DEBUG level logging.
+        json_format: Write one JSON object per record, with timing span
+            fields as structured keys.
     """
+    import logging
+
+    from space import logs
+
     if debug:
-        level = logging.DEBUG
-    elif verbose:
-        level = logging.INFO
-    else:
-        level = logging.WARNING
+        from space import config
 
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+        logs.setup_logging(
+            logging.DEBUG,
+            json_format,
+            payload_sample_rate=config.LOG_PAYLOAD_SAMPLE_RATE,
+        )
+    else:
+        logs.setup_logging(logging.INFO if verbose else logging.WARNING, json_format)
 
 
-def parse_args(args: Optional[list] = None) -> argparse.Namespace:
+def parse_args(args: Optional[list] = None) -> "argparse.Namespace":
     """
     Parse command-line arguments.
 
@@ -41,6 +146,11 @@ def parse_args(args: Optional[list] = None) -> argparse.Namespace:
     Returns:
         Parsed arguments namespace.
     """
+    import argparse
+    from pathlib import Path
+
+    from space.output import FORMATS, parse_fields
+
     parser = argparse.ArgumentParser(description="Space Module CLI")
     parser.add_argument(
         "-v", "--verbose", action="store_true", help="Enable verbose output"
@@ -48,38 +158,834 @@ def parse_args(args: Optional[list] = None) -> argparse.Namespace:
     parser.add_argument(
         "-d", "--debug", action="store_true", help="Enable debug output"
     )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int_at_least(0),
+        metavar="SECONDS",
+        help="Serve the roster from the on-disk cache for this many seconds "
+        "(overrides SPACE_CACHE_TTL)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the on-disk response cache"
+    )
+    parser.add_argument(
+        "--env",
+        metavar="NAME",
+        help="Use the API of this environment from SPACE_ENVIRONMENTS "
+        "(overrides SPACE_ENV)",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="table",
+        help="Output format; json, ndjson and csv stream rows without Rich "
+        "(default: table)",
+    )
+    parser.add_argument(
+        "--pager",
+        action="store_true",
+        help="Show the table one screen at a time, rendering only the rows in "
+        "view (table format only)",
+    )
+    parser.add_argument(
+        "--fields",
+        type=parse_fields,
+        metavar="FIELD[,FIELD...]",
+        help="Comma-separated fields to output (default: name,craft)",
+    )
+
+    parser.add_argument(
+        "--craft", metavar="CRAFT", help="Only show people on this spacecraft"
+    )
+    parser.add_argument(
+        "--name",
+        metavar="NAME",
+        help="Only show people with this name (case and accents are ignored)",
+    )
+    parser.add_argument(
+        "--group-by",
+        choices=["craft"],
+        help="Summarize the roster as a count of people per spacecraft",
+    )
+
+    parser.add_argument(
+        "--log-format",
+        choices=["text", "json"],
+        default="text",
+        help="Log record format; json includes timing spans as fields "
+        "(default: text)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print how long each phase of the run took to stderr",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write phase timings in the Prometheus text format on exit "
+        "(e.g. for the node_exporter textfile collector)",
+    )
+
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        type=Path,
+        metavar="CASSETTE",
+        help="Append every API response to a cassette file "
+        "(overrides SPACE_RECORD_CASSETTE)",
+    )
+    cassette.add_argument(
+        "--replay",
+        type=Path,
+        metavar="CASSETTE",
+        help="Answer API requests from a recorded cassette instead of the "
+        "network (overrides SPACE_REPLAY_CASSETTE)",
+    )
 
     parser.add_argument(
         "--version", action="version", version=f"%(prog)s {__version__}"
     )
-    return parser.parse_args(args)
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    watch_parser = subparsers.add_parser(
+        "watch", help="Keep the roster on screen and refresh it as it changes"
+    )
+    watch_parser.add_argument(
+        "--interval",
+        type=positive_float,
+        default=15.0,
+        metavar="SECONDS",
+        help="Polling interval right after a change (default: 15)",
+    )
+    watch_parser.add_argument(
+        "--max-interval",
+        type=positive_float,
+        metavar="SECONDS",
+        help="Longest polling interval while nothing changes "
+        "(default: 300, or --interval if longer)",
+    )
+
+    serve_parser = subparsers.add_parser(
+        "serve", help="Serve a cached roster over HTTP to local clients"
+    )
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)"
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=port_number,
+        default=8080,
+        help="Port to listen on (default: 8080)",
+    )
+    serve_parser.add_argument(
+        "--refresh",
+        type=positive_float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Seconds between upstream refreshes (default: 60)",
+    )
+
+    daemon_parser = subparsers.add_parser(
+        "daemon",
+        help="Keep a refreshed roster in memory and answer `space` from it "
+        "over a Unix socket",
+    )
+    daemon_parser.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Socket to listen on; clients find it through SPACE_DAEMON_SOCKET "
+        "(default: $XDG_RUNTIME_DIR/space.sock)",
+    )
+    daemon_parser.add_argument(
+        "--refresh",
+        type=positive_float,
+        default=60.0,
+        metavar="SECONDS",
+        help="Seconds between upstream refreshes (default: 60)",
+    )
+
+    history_parser = subparsers.add_parser(
+        "history", help="Show recorded roster changes (see SPACE_RECORD_HISTORY)"
+    )
+    history_parser.add_argument(
+        "--at",
+        type=parse_time_arg,
+        metavar="TIME",
+        help="Show who was in space at TIME (ISO 8601 or epoch seconds)",
+    )
+    history_parser.add_argument(
+        "--since", type=parse_time_arg, metavar="TIME", help="Only changes after TIME"
+    )
+    history_parser.add_argument(
+        "--until", type=parse_time_arg, metavar="TIME", help="Only changes before TIME"
+    )
+    history_parser.add_argument(
+        "--name",
+        dest="history_name",
+        metavar="NAME",
+        help="Only arrivals and departures of this person",
+    )
+    history_parser.add_argument(
+        "--db", type=Path, help="History database (default: SPACE_HISTORY_DB)"
+    )
+
+    track_parser = subparsers.add_parser(
+        "track", help="Poll the ISS position at a fixed rate (needs numpy)"
+    )
+    track_parser.add_argument(
+        "--interval",
+        type=positive_float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Seconds between position polls (default: 5)",
+    )
+    track_parser.add_argument(
+        "--count",
+        type=int_at_least(1),
+        metavar="N",
+        help="Stop after N samples (default: run until interrupted)",
+    )
+    track_parser.add_argument(
+        "--capacity",
+        type=int_at_least(2),
+        default=4096,
+        metavar="N",
+        help="Samples kept in memory for derived statistics (default: 4096)",
+    )
+
+    passes_parser = subparsers.add_parser(
+        "passes", help="Find ISS visibility windows for observers (needs numpy)"
+    )
+    passes_parser.add_argument(
+        "observers",
+        type=argparse.FileType("r"),
+        help="CSV of observers with latitude and longitude columns ('-' for stdin)",
+    )
+    passes_parser.add_argument(
+        "--track",
+        type=argparse.FileType("r"),
+        metavar="FILE",
+        help="ISS samples from `space --format csv track` (default: poll live)",
+    )
+    passes_parser.add_argument(
+        "--min-elevation",
+        type=float,
+        default=10.0,
+        metavar="DEGREES",
+        help="Lowest elevation that counts as visible (default: 10)",
+    )
+    passes_parser.add_argument(
+        "--count",
+        type=int_at_least(2),
+        default=60,
+        metavar="N",
+        help="Samples to poll without --track (default: 60)",
+    )
+    passes_parser.add_argument(
+        "--interval",
+        type=positive_float,
+        default=5.0,
+        metavar="SECONDS",
+        help="Seconds between polls without --track (default: 5)",
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare",
+        help="Fetch the roster from several environments at once and show "
+        "where they disagree",
+    )
+    compare_parser.add_argument(
+        "environments",
+        nargs="*",
+        metavar="ENV",
+        help="Environments to compare (default: all of SPACE_ENVIRONMENTS)",
+    )
+    compare_parser.add_argument(
+        "--all",
+        dest="show_all",
+        action="store_true",
+        help="List everyone, not just the people the environments disagree on",
+    )
+    compare_parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        metavar="N",
+        help="Environments fetched at the same time, at most (default: 8)",
+    )
+    parsed = parser.parse_args(args)
+    if parsed.command == "watch":
+        if parsed.max_interval is None:
+            parsed.max_interval = max(300.0, parsed.interval)
+        elif parsed.max_interval < parsed.interval:
+            watch_parser.error("--max-interval must not be shorter than --interval")
+    return parsed
+
+
+def run_track(args: "argparse.Namespace") -> int:
+    """
+    Run ``space track``: stream ISS positions, then summarize the buffer.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        print("space track: needs numpy (pip install 'space[track]')", file=sys.stderr)
+        return 1
+
+    from space.iss import PositionBuffer, TrackingError, track
+    from space.output import write_people
+
+    buffer = PositionBuffer(args.capacity)
+    samples = track(buffer, args.interval, max_samples=args.count)
+    fields = args.fields or TRACK_FIELDS
+
+    if args.format != "table":
+        try:
+            write_people(samples, args.format, sys.stdout, fields)
+        except KeyboardInterrupt:
+            pass
+        except TrackingError as e:
+            print(f"space track: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    from rich.console import Console
+
+    console = Console()
+    try:
+        for sample in samples:
+            speed = sample["speed_kmh"]
+            console.print(
+                f"{time.strftime('%H:%M:%S', time.gmtime(sample['time']))}  "
+                f"lat [cyan]{sample['latitude']:8.4f}[/cyan]  "
+                f"lon [cyan]{sample['longitude']:9.4f}[/cyan]  "
+                f"[green]{'' if speed is None else f'{speed:,.0f} km/h'}[/green]"
+            )
+    except KeyboardInterrupt:
+        pass
+    except TrackingError as e:
+        print(f"space track: {e}", file=sys.stderr)
+        return 1
+
+    if len(buffer) > 1:
+        distance = float(buffer.distances_km().sum())
+        speed = float(np.nanmean(buffer.speeds_kmh()))
+        console.print(
+            f"\n[bold cyan]🛰  {len(buffer)} samples, {distance:,.1f} km, "
+            f"mean ground speed {speed:,.0f} km/h[/bold cyan]"
+        )
+    return 0
+
+
+def run_passes(args: "argparse.Namespace") -> int:
+    """
+    Run ``space passes``: visibility windows for a CSV of observers.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        Process exit code.
+    """
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("space passes: needs numpy (pip install 'space[track]')", file=sys.stderr)
+        return 1
+
+    from space.iss import PositionBuffer, TrackingError, track
+    from space.output import write_people
+    from space.passes import find_passes, load_observers, load_track
+
+    try:
+        with args.observers:
+            labels, observers = load_observers(args.observers)
+        if args.track is not None:
+            with args.track:
+                samples = load_track(args.track)
+    except ValueError as e:
+        print(f"space passes: {e}", file=sys.stderr)
+        return 1
+    if args.track is None:
+        buffer = PositionBuffer(args.count)
+        try:
+            for _ in track(buffer, args.interval, max_samples=args.count):
+                pass
+        except TrackingError as e:
+            print(f"space passes: {e}", file=sys.stderr)
+            return 1
+        samples = buffer.samples()
+
+    rows = []
+    for window in find_passes(observers, samples, args.min_elevation):
+        row = window.to_dict()
+        row["observer"] = labels[window.observer]
+        row["latitude"], row["longitude"] = observers[window.observer].tolist()
+        rows.append(row)
+
+    fields = args.fields or PASS_FIELDS
+    if args.format != "table":
+        write_people(rows, args.format, sys.stdout, fields)
+        return 0
+
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    console.print(
+        f"\n[bold cyan]🛰  {len(rows)} passes for {len(labels)} observers"
+        f"[/bold cyan]\n"
+    )
+    table = Table(show_header=True, header_style="bold magenta")
+    for field in fields:
+        title, style = TABLE_COLUMNS.get(field, (field.replace("_", " ").title(), None))
+        table.add_column(title, style=style)
+    for row in rows:
+        table.add_row(*(_format_cell(field, row.get(field)) for field in fields))
+    console.print(table)
+    console.print()
+    return 0
+
+
+def run_compare(args: "argparse.Namespace") -> int:
+    """
+    Run ``space compare``: diff the rosters of several environments.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Returns:
+        0 if the environments agree, 1 if they differ, 2 if one could not
+        be fetched or the command line is wrong.
+    """
+    from space import config
+    from space.compare import SAME, diff_rosters, fetch_environments
+    from space.instrument import span
+    from space.output import count_people, write_people
+
+    if args.record is not None or args.replay is not None:
+        print(
+            "space compare: use SPACE_RECORD_CASSETTE or SPACE_REPLAY_CASSETTE "
+            "instead of --record and --replay",
+            file=sys.stderr,
+        )
+        return COMPARE_ERROR
+    if args.max_workers < 1:
+        print("space compare: --max-workers must be at least 1", file=sys.stderr)
+        return COMPARE_ERROR
+    configured = config.ENVIRONMENTS
+    names = args.environments or list(configured)
+    unknown = [name for name in names if name not in configured]
+    if unknown or len(names) < 2:
+        problem = (
+            f"unknown environment {unknown[0]!r}"
+            if unknown
+            else "at least two environments are needed"
+        )
+        print(
+            f"space compare: {problem} (configured in SPACE_ENVIRONMENTS: "
+            f"{', '.join(configured) or 'none'})",
+            file=sys.stderr,
+        )
+        return COMPARE_ERROR
+
+    results = fetch_environments(
+        {name: configured[name] for name in dict.fromkeys(names)}, args.max_workers
+    )
+    rows = diff_rosters(results, differences_only=not args.show_all)
+    fetched = [result.name for result in results if result.ok]
+    status = COMPARE_SAME
+    if any(row["status"] != SAME for row in rows):
+        status = COMPARE_DIFFERS
+    if len(fetched) < len(results):
+        status = COMPARE_ERROR
+
+    fields = args.fields or ["name", *fetched] + (["status"] if args.show_all else [])
+    if args.format != "table":
+        for result in results:
+            if not result.ok:
+                print(f"space compare: {result.name}: {result.error}", file=sys.stderr)
+        with span("render", format=args.format):
+            write_people(rows, args.format, sys.stdout, fields)
+        return status
+
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    console.print()
+    for result in results:
+        if result.ok:
+            console.print(
+                f"[bold cyan]{result.name}[/bold cyan]: "
+                f"{count_people(len(result.people or ()))} "
+                f"in {result.seconds:.2f}s "
+                f"[dim]({result.url})[/dim]"
+            )
+        else:
+            console.print(
+                f"[bold red]{result.name}[/bold red]: {result.error} "
+                f"[dim]({result.url})[/dim]"
+            )
+    if status == COMPARE_SAME:
+        console.print("\n[bold green]✔ All environments agree[/bold green]\n")
+    if not rows:
+        return status
+
+    with span("render", format="table"):
+        table = Table(show_header=True, header_style="bold magenta")
+        for field in fields:
+            title, style = TABLE_COLUMNS.get(field, (field, None))
+            table.add_column(title, style=style, no_wrap=field == "name")
+        for row in rows:
+            table.add_row(
+                *(
+                    "[red]—[/red]" if row.get(field) is None else str(row[field])
+                    for field in fields
+                )
+            )
+        console.print()
+        console.print(table)
+        console.print()
+    return status
+
+
+def _format_cell(field: str, value: Any) -> str:
+    """Format a pass window value for the table view."""
+    if field in ("start", "end") and value is not None:
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(value))
+    return "" if value is None else str(value)
+
+
+def use_cassette(args: "argparse.Namespace") -> None:
+    """
+    Route the process-wide API client through ``--record`` or ``--replay``.
+
+    Args:
+        args: Parsed command-line arguments.
+
+    Raises:
+        OSError: If the cassette cannot be opened.
+        ValueError: If the replayed file is not a cassette.
+    """
+    from space import config
+    from space.cassette import (
+        Cassette,
+        CassetteWriter,
+        RecordingAdapter,
+        ReplayAdapter,
+    )
+    from space.client import configure_default_client
+
+    if args.replay is not None:
+        cassette = Cassette(args.replay)
+        configure_default_client(
+            transport=ReplayAdapter(cassette, config.REPLAY_LATENCY)
+        )
+    else:
+        writer = CassetteWriter(args.record)
+        configure_default_client(
+            transport=RecordingAdapter(writer, pool_maxsize=config.HTTP_POOL_SIZE)
+        )
+
+
+def write_metrics_file(path: str, lines: List[str]) -> None:
+    """Atomically replace ``path`` with Prometheus text-format ``lines``."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp, path)
+
+
+def limiter_metrics() -> List[str]:
+    """Render the host-wide rate limiter's counters, if a request used it."""
+    from space.ratelimit import render_limiter_metrics
+    from space.resilience import get_policy
+
+    # Don't load the configuration just for this
+    if not get_policy.cache_info().currsize:
+        return []
+    limiter = get_policy().limiter
+    return render_limiter_metrics(limiter.stats() if limiter else None)
 
 
 def main() -> int:
+    # A running `space daemon` answers from memory before anything else loads
+    from space.fastpath import run_fast_path
+
+    status = run_fast_path(sys.argv[1:])
+    if status is not None:
+        return status
+
     args = parse_args()
-    setup_logging(verbose=args.verbose, debug=args.debug)
+    if args.env is not None:
+        # Read when the configuration is first loaded
+        os.environ["SPACE_ENV"] = args.env
+    setup_logging(
+        verbose=args.verbose, debug=args.debug, json_format=args.log_format == "json"
+    )
+
+    # Imported here so --help and --version never pay for the instrumentation
+    from space.instrument import format_profile, get_recorder, span
+
+    try:
+        with span("run", command=args.command or "roster"):
+            return run(args)
+    finally:
+        recorder = get_recorder()
+        if args.profile:
+            print(format_profile(recorder.spans()), file=sys.stderr)
+        if args.metrics_file:
+            try:
+                write_metrics_file(
+                    args.metrics_file, recorder.render_metrics() + limiter_metrics()
+                )
+            except OSError as e:
+                print(f"space: cannot write {args.metrics_file}: {e}", file=sys.stderr)
+
+
+def run(args: "argparse.Namespace") -> int:
+    """
+    Run the command selected on the command line.
+
+    Args:
+        args: Parsed arguments.
+
+    Returns:
+        The process exit status.
+    """
+    # Imported here so --help and --version never pay for requests, tenacity
+    # or the configuration lookup
+    import logging
+
+    from space.instrument import span
+    from space.output import DEFAULT_FIELDS, write_people
+    from space.space import fetch_people_in_space, fetch_roster
+
     logger = logging.getLogger(__name__)
 
     logger.info("Space module CLI started.")
 
-    people = fetch_people_in_space()
-    logger.info(f"Number of people in space: {len(people)}")
+    cache_ttl = 0 if args.no_cache else args.cache_ttl
 
-    console = Console()
+    if args.command == "compare":
+        return run_compare(args)
 
-    console.print(
-        f"\n[bold cyan]🚀 People currently in space: {len(people)}[/bold cyan]\n"
-    )
+    if args.record is not None or args.replay is not None:
+        try:
+            use_cassette(args)
+        except (OSError, ValueError) as e:
+            print(f"space: cannot open cassette: {e}", file=sys.stderr)
+            return 1
+
+    if args.command == "watch":
+        from space.watch import AdaptiveInterval, watch
+
+        try:
+            watch(
+                lambda: fetch_people_in_space(cache_ttl=cache_ttl),
+                AdaptiveInterval(args.interval, args.max_interval),
+            )
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "serve":
+        from space import config
+        from space.client import get_default_client
+        from space.resilience import get_policy
+        from space.serve import serve
+
+        limiter = get_policy().limiter
+        try:
+            serve(
+                lambda: fetch_people_in_space(cache_ttl=cache_ttl),
+                host=args.host,
+                port=args.port,
+                refresh_interval=args.refresh,
+                paths={"/astros.json", config.ASTROS_ENDPOINT or "/astros.json"},
+                mirror_stats=get_default_client().mirror_stats,
+                limiter_stats=limiter.stats if limiter else None,
+            )
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "daemon":
+        from space.daemon import serve_daemon
+        from space.fastpath import SUPPORTED, socket_path
+
+        if not SUPPORTED:
+            print(
+                "space daemon: needs Unix domain sockets, "
+                "which this platform does not have",
+                file=sys.stderr,
+            )
+            return 1
+        path = args.socket or socket_path()
+        if not path:
+            print("space daemon: SPACE_DAEMON_SOCKET is empty", file=sys.stderr)
+            return 1
+        try:
+            serve_daemon(
+                lambda: fetch_roster(cache_ttl=cache_ttl),
+                path,
+                refresh_interval=args.refresh,
+            )
+        except RuntimeError as e:
+            print(f"space daemon: {e}", file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    if args.command == "track":
+        return run_track(args)
+
+    if args.command == "passes":
+        return run_passes(args)
+
+    people: Optional[Iterable[Mapping[str, Any]]] = None
+    fields = args.fields or DEFAULT_FIELDS
+    total: Optional[int] = None
+    heading = HEADING
+    if args.command == "history":
+        from space import config
+        from space.history import HistoryStore, format_time
+
+        with HistoryStore(args.db or config.HISTORY_DB) as store:
+            if args.at is not None:
+                people = store.roster_at(args.at) or []
+                heading = f"People in space at {format_time(args.at)}"
+            else:
+                events = store.events(args.since, args.until, args.history_name)
+                people = [event.to_dict() for event in events]
+                fields = args.fields or EVENT_FIELDS
+                heading = "Roster changes"
+        total = len(people)
+    elif args.craft is not None or args.name is not None or args.group_by:
+        # Queries need the whole roster; it is indexed once and filtered
+        people, total, fields = query_roster(args, fetch_roster(cache_ttl=cache_ttl))
+
+    if args.format != "table":
+        from space.space import iter_people_in_space
+
+        if people is None:
+            # Without a query, rows are written as they are parsed off the wire
+            people = iter_people_in_space(cache_ttl=cache_ttl)
+        try:
+            with span("render", format=args.format):
+                count = write_people(people, args.format, sys.stdout, fields)
+                sys.stdout.flush()
+        except BrokenPipeError:
+            # The reader went away (e.g. `space --format ndjson | head`)
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 0
+        logger.info(f"Number of people in space: {count}")
+        return 0
+
+    if args.pager:
+        from rich.console import Console
+
+        from space import config
+        from space.pager import page_table
+        from space.space import iter_people_in_space
+
+        stream = None
+        if people is None:
+            # Rows are paged in as they are parsed off the wire
+            people = stream = iter_people_in_space(cache_ttl=cache_ttl)
+        with span("render", format="pager"):
+            count = page_table(Console(), people, fields, TABLE_COLUMNS, heading, total)
+        if stream is not None and config.RECORD_HISTORY:
+            # Only a roster read to the end is recorded, whatever was paged
+            for _ in stream:
+                pass
+        logger.info(f"Number of people shown: {count}")
+        return 0
+
+    if people is None:
+        people = fetch_people_in_space(cache_ttl=cache_ttl)
+        total = len(people)
+    logger.info(f"Number of people in space: {total}")
+
+    # rich is only needed for the table, so machine-readable formats skip it
+    from rich.console import Console
+
+    with span("render", format="table"):
+        print_table(Console(), people, fields, total, heading)
+
+    return 0
+
+
+def query_roster(
+    args: "argparse.Namespace", roster: "Roster"
+) -> Tuple[Iterable[Mapping[str, Any]], int, List[str]]:
+    """
+    Apply ``--craft``, ``--name`` and ``--group-by`` to a roster.
+
+    Args:
+        args: Parsed command-line arguments.
+        roster: The whole roster.
+
+    Returns:
+        The rows to output, the number of matching people, and the fields
+        to show.
+    """
+    from space.output import DEFAULT_FIELDS
+
+    roster = roster.filter(craft=args.craft, name=args.name)
+    if args.group_by == "craft":
+        groups = [
+            {"craft": craft, "count": count}
+            for craft, count in roster.craft_counts().items()
+        ]
+        return groups, len(roster), args.fields or GROUP_FIELDS
+    return roster, len(roster), args.fields or DEFAULT_FIELDS
+
+
+def print_table(
+    console: "Console",
+    people: Iterable[Mapping[str, Any]],
+    fields: List[str],
+    total: Optional[int],
+    heading: str,
+) -> None:
+    """
+    Print rows as a Rich table under a heading.
+
+    Args:
+        console: Where to print.
+        people: Rows to show.
+        fields: Columns to show, in order.
+        total: Count shown in the heading.
+        heading: Title printed above the table.
+    """
+    from rich.table import Table
+
+    console.print(f"\n[bold cyan]🚀 {heading}: {total}[/bold cyan]\n")
 
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("#", style="dim", width=6)
-    table.add_column("Name", style="cyan", no_wrap=True)
-    table.add_column("Spacecraft", style="green")
+    for field in fields:
+        title, style = TABLE_COLUMNS.get(field, (field.replace("_", " ").title(), None))
+        table.add_column(title, style=style, no_wrap=field == "name")
 
     for i, person in enumerate(people, 1):
-        table.add_row(str(i), person["name"], person["craft"])
+        table.add_row(str(i), *(str(person.get(field, "")) for field in fields))
 
     console.print(table)
     console.print()
 
-    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
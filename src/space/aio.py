@@ -0,0 +1,173 @@
+"""
+Asyncio client for the Open Notify API.
+
+Requires the optional ``aiohttp`` dependency (``pip install space[async]``).
+"""
+
+import asyncio
+import logging
+import time
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Type
+
+import aiohttp
+
+from space.config import API_BASE_URL, ASTROS_ENDPOINT, HTTP_POOL_SIZE
+from space.core import (
+    REQUEST_TIMEOUT,
+    attempt_timeout,
+    parse_people,
+    retry_transient,
+)
+from space.decode import loads
+from space.instrument import record_span, span
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSpaceClient:
+    """
+    Async context-managed client backed by a pooled ``aiohttp`` session.
+
+    All requests made through one client share its connection pool, so
+    concurrent calls reuse keep-alive connections instead of opening new
+    ones.
+
+    Args:
+        base_url: API base URL. Defaults to ``SPACE_API_BASE_URL``.
+        timeout: Total per-request timeout in seconds.
+        pool_size: Maximum number of simultaneous connections. Defaults to
+            ``SPACE_HTTP_POOL_SIZE``.
+
+    Example:
+        async with AsyncSpaceClient() as client:
+            people = await client.fetch_people()
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = REQUEST_TIMEOUT,
+        pool_size: Optional[int] = None,
+    ) -> None:
+        self.base_url = API_BASE_URL if base_url is None else base_url
+        self.timeout = timeout
+        self.pool_size = HTTP_POOL_SIZE if pool_size is None else pool_size
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncSpaceClient":
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying session and its connection pool."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @retry_transient((aiohttp.ClientConnectionError, asyncio.TimeoutError), logger)
+    async def get_json(self, endpoint: str) -> Dict[str, Any]:
+        """
+        GET an API endpoint and decode its JSON body.
+
+        Args:
+            endpoint: Path relative to the base URL, e.g. ``/astros.json``.
+
+        Returns:
+            The decoded JSON response body.
+        """
+        if self._session is None:
+            raise RuntimeError("AsyncSpaceClient must be used as a context manager")
+        try:
+            timeout = aiohttp.ClientTimeout(total=attempt_timeout(self.timeout))
+            url = f"{self.base_url}{endpoint}"
+            start = time.perf_counter()
+            async with self._session.get(url, timeout=timeout) as response:
+                headers = time.perf_counter() - start
+                record_span("http.headers", start, headers, status=response.status)
+                response.raise_for_status()
+                body = await response.read()
+                record_span(
+                    "http.body", start + headers, time.perf_counter() - start - headers
+                )
+            with span("decode", bytes=len(body)):
+                data: Dict[str, Any] = loads(body)
+            return data
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching data from API: {e}")
+            raise
+        except ValueError as e:
+            logger.error(f"Error parsing API response: {e}")
+            raise
+
+    async def fetch_people(self) -> List[Dict[str, Any]]:
+        """Fetch the list of people currently in space."""
+        data = await self.get_json(ASTROS_ENDPOINT or "")
+        try:
+            return parse_people(data)
+        except ValueError as e:
+            logger.error(f"Error parsing API response: {e}")
+            raise
+
+    async def gather(self, *endpoints: str) -> List[Dict[str, Any]]:
+        """
+        Fetch several endpoints concurrently over the shared pool.
+
+        Args:
+            endpoints: Paths relative to the base URL.
+
+        Returns:
+            Decoded JSON bodies, in the same order as ``endpoints``.
+        """
+        return list(await asyncio.gather(*(self.get_json(e) for e in endpoints)))
+
+
+async def fetch_people_in_space_async(
+    client: Optional[AsyncSpaceClient] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of ``space.space.fetch_people_in_space``.
+
+    Args:
+        client: An open client to reuse. A short-lived one is created if
+            omitted.
+
+    Returns:
+        List of people, each a dict with ``name`` and ``craft`` keys.
+    """
+    if client is not None:
+        return await client.fetch_people()
+    async with AsyncSpaceClient() as own_client:
+        return await own_client.fetch_people()
+
+
+async def gather_endpoints(
+    *endpoints: str, client: Optional[AsyncSpaceClient] = None
+) -> List[Dict[str, Any]]:
+    """
+    Fetch several Open Notify endpoints at once.
+
+    Args:
+        endpoints: Paths relative to the base URL, e.g. ``/astros.json`` and
+            ``/iss-now.json``.
+        client: An open client to reuse. A short-lived one is created if
+            omitted.
+
+    Returns:
+        Decoded JSON bodies, in the same order as ``endpoints``.
+    """
+    if client is not None:
+        return await client.gather(*endpoints)
+    async with AsyncSpaceClient() as own_client:
+        return await own_client.gather(*endpoints)
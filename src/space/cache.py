@@ -0,0 +1,109 @@
+"""On-disk response cache for the Open Notify API."""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """A cached roster together with the validators needed to revalidate it."""
+
+    people: List[Dict[str, Any]]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        """Return the number of seconds since the entry was fetched."""
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, ttl: int) -> bool:
+        """
+        Check whether the entry can be served without contacting the API.
+
+        Args:
+            ttl: Time-to-live in seconds.
+
+        Returns:
+            True if the entry is younger than ``ttl`` seconds.
+        """
+        return self.age() < ttl
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for revalidation."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    A directory of JSON cache files keyed by request URL.
+
+    Writes go to a temporary file in the cache directory and are moved into
+    place with ``os.replace``, so concurrent processes sharing the directory
+    only ever see complete entries.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+
+    def path_for(self, url: str) -> Path:
+        """Return the cache file path used for ``url``."""
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def load(self, url: str) -> Optional[CacheEntry]:
+        """
+        Load the cached entry for ``url``.
+
+        Args:
+            url: The request URL the entry was stored under.
+
+        Returns:
+            The cached entry, or None if it is missing or unreadable.
+        """
+        path = self.path_for(url)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return CacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache file {path}: {e}")
+            return None
+
+    def store(self, url: str, entry: CacheEntry) -> None:
+        """
+        Atomically write ``entry`` as the cached response for ``url``.
+
+        Args:
+            url: The request URL to store the entry under.
+            entry: The entry to persist.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(asdict(entry), f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path_for(url))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -0,0 +1,301 @@
+"""
+Record and replay HTTP responses.
+
+A cassette is a file of recorded responses: status, headers, timings and
+the body exactly as it came off the wire (still gzip-compressed when the
+server compressed it), so replaying exercises the same decoding as a live
+fetch and cassettes stay small. The layout is append-only::
+
+    MAGIC
+    (<meta length: u32> <body length: u32> <meta JSON> <body>)*
+
+``RecordingAdapter`` is a ``requests`` transport that appends every
+response it receives to a cassette. ``ReplayAdapter`` answers requests from
+a memory-mapped cassette instead of the network: responses are matched by
+method and path (the host is ignored, so cassettes recorded against one
+mirror replay under any base URL), served in recorded order and cycled
+when exhausted, optionally after a simulated latency.
+"""
+
+import io
+import json
+import mmap
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+MAGIC = b"SPACECS1"
+
+_LENGTHS = struct.Struct("<II")
+
+# Response headers that describe the original connection, not the body
+_HOP_HEADERS = frozenset(("connection", "keep-alive", "transfer-encoding"))
+
+
+class CassetteMiss(requests.exceptions.RequestException):
+    """No recorded response matches a request."""
+
+
+@dataclass(frozen=True)
+class Interaction:
+    """One recorded response."""
+
+    method: str
+    url: str
+    status: int
+    reason: str
+    headers: Tuple[Tuple[str, str], ...]
+    elapsed: float
+    duration: float
+    recorded_at: float
+    offset: int = 0
+    length: int = 0
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Method and path (with query) the interaction answers."""
+        return _key(self.method, self.url)
+
+
+def _key(method: str, url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    return method.upper(), f"{path}?{parts.query}" if parts.query else path
+
+
+class CassetteWriter:
+    """
+    Append recorded responses to a cassette file.
+
+    Each response is written with a single ``write`` to a file opened for
+    appending, so several processes can record into the same cassette.
+
+    Args:
+        path: Cassette file; created if missing.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file: BinaryIO = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+            self._file.flush()
+
+    def append(self, interaction: Interaction, body: bytes) -> None:
+        """
+        Record one response.
+
+        Args:
+            interaction: The response metadata; offsets are ignored.
+            body: The body as received, before content decoding.
+        """
+        meta = json.dumps(
+            {
+                "method": interaction.method,
+                "url": interaction.url,
+                "status": interaction.status,
+                "reason": interaction.reason,
+                "headers": interaction.headers,
+                "elapsed": round(interaction.elapsed, 6),
+                "duration": round(interaction.duration, 6),
+                "recorded_at": round(interaction.recorded_at, 3),
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        record = _LENGTHS.pack(len(meta), len(body)) + meta + body
+        with self._lock:
+            self._file.write(record)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Close the cassette file."""
+        with self._lock:
+            self._file.close()
+
+
+class Cassette:
+    """
+    Read-only, memory-mapped view of a cassette file.
+
+    Only the record headers are read when the cassette is opened; bodies
+    stay in the page cache until a response is replayed.
+
+    Args:
+        path: Cassette file written by ``CassetteWriter``.
+
+    Raises:
+        ValueError: If the file is not a cassette.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a space cassette")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.interactions = self._load()
+        self._by_key: Dict[Tuple[str, str], List[Interaction]] = {}
+        for interaction in self.interactions:
+            self._by_key.setdefault(interaction.key, []).append(interaction)
+        self._served: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> List[Interaction]:
+        interactions = []
+        offset, size = len(MAGIC), len(self._map)
+        while offset + _LENGTHS.size <= size:
+            meta_length, body_length = _LENGTHS.unpack_from(self._map, offset)
+            body_offset = offset + _LENGTHS.size + meta_length
+            if body_offset + body_length > size:
+                # Cut short by a recorder that died mid-write
+                break
+            meta = json.loads(self._map[offset + _LENGTHS.size : body_offset])
+            interactions.append(
+                Interaction(
+                    meta["method"],
+                    meta["url"],
+                    meta["status"],
+                    meta["reason"],
+                    tuple((name, value) for name, value in meta["headers"]),
+                    meta["elapsed"],
+                    meta["duration"],
+                    meta["recorded_at"],
+                    body_offset,
+                    body_length,
+                )
+            )
+            offset = body_offset + body_length
+        return interactions
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def body(self, interaction: Interaction) -> bytes:
+        """Return the recorded body of ``interaction``, as received."""
+        return self._map[interaction.offset : interaction.offset + interaction.length]
+
+    def match(self, method: str, url: str) -> Interaction:
+        """
+        Pick the response to replay for a request.
+
+        Responses recorded for the same method and path are served in
+        order, starting over after the last one.
+
+        Args:
+            method: Request method.
+            url: Request URL; only its path and query are matched.
+
+        Returns:
+            The interaction to replay.
+
+        Raises:
+            CassetteMiss: If nothing was recorded for the request.
+        """
+        key = _key(method, url)
+        candidates = self._by_key.get(key)
+        if not candidates:
+            raise CassetteMiss(f"No recorded response for {key[0]} {key[1]}")
+        with self._lock:
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        return candidates[served % len(candidates)]
+
+    def close(self) -> None:
+        """Unmap the cassette file."""
+        self._map.close()
+
+
+def _raw_response(interaction: Interaction, body: bytes) -> HTTPResponse:
+    """Wrap a recorded body in a urllib3 response, as if read off a socket."""
+    return HTTPResponse(
+        body=io.BytesIO(body),
+        headers=dict(interaction.headers),
+        status=interaction.status,
+        reason=interaction.reason,
+        preload_content=False,
+        decode_content=True,
+    )
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport that sends requests over the network and records the
+    responses.
+
+    Args:
+        writer: Cassette to append responses to.
+        **kwargs: ``HTTPAdapter`` options (e.g. ``pool_maxsize``).
+    """
+
+    def __init__(self, writer: CassetteWriter, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.writer = writer
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, stream: bool = False, **kwargs: Any
+    ) -> requests.Response:
+        start = time.perf_counter()
+        response = super().send(request, stream=True, **kwargs)
+        elapsed = time.perf_counter() - start
+        try:
+            body = response.raw.read(decode_content=False)
+        finally:
+            response.close()
+        headers = [
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in _HOP_HEADERS and name.lower() != "content-length"
+        ]
+        headers.append(("Content-Length", str(len(body))))
+        interaction = Interaction(
+            request.method or "GET",
+            response.url,
+            response.status_code,
+            response.reason or "",
+            tuple(headers),
+            elapsed,
+            time.perf_counter() - start,
+            time.time(),
+        )
+        self.writer.append(interaction, body)
+        return self.build_response(request, _raw_response(interaction, body))
+
+    def close(self) -> None:
+        super().close()
+        self.writer.close()
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Transport that answers every request from a cassette.
+
+    Args:
+        cassette: Recorded responses.
+        latency: Seconds to wait before each response. None replays the
+            recorded duration of each response; 0 replays at full speed.
+    """
+
+    def __init__(self, cassette: Cassette, latency: Optional[float] = 0.0) -> None:
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, stream: bool = False, **kwargs: Any
+    ) -> requests.Response:
+        interaction = self.cassette.match(request.method or "GET", request.url or "")
+        delay = interaction.duration if self.latency is None else self.latency
+        if delay > 0:
+            time.sleep(delay)
+        raw = _raw_response(interaction, self.cassette.body(interaction))
+        return self.build_response(request, raw)
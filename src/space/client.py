@@ -0,0 +1,346 @@
+"""Synchronous API client backed by a pooled ``requests.Session``."""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from types import TracebackType
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from space.config import (
+    API_BASE_URL,
+    API_MIRRORS,
+    ASTROS_ENDPOINT,
+    HEDGE_DELAY,
+    HTTP_KEEP_ALIVE,
+    HTTP_POOL_SIZE,
+    RECORD_CASSETTE,
+    REPLAY_CASSETTE,
+    REPLAY_LATENCY,
+)
+from space.core import (
+    REQUEST_TIMEOUT,
+    attempt_timeout,
+    parse_people,
+    retry_transient,
+)
+from space.decode import loads, validate_astros_member, validate_person
+from space.instrument import ERROR, OK, record_span, span
+from space.mirrors import MirrorPool, MirrorStats
+from space.stream import iter_array_items
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ClientStats:
+    """Per-client request accounting."""
+
+    requests: int = 0
+    bytes_received: int = 0
+    bytes_decoded: int = 0
+    total_latency: float = 0.0
+    last_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Average seconds per request, or 0.0 before the first request."""
+        return self.total_latency / self.requests if self.requests else 0.0
+
+
+class SpaceClient:
+    """
+    HTTP client that reuses connections across requests.
+
+    The client owns a ``requests.Session`` whose adapters keep up to
+    ``pool_size`` connections per host alive, asks for gzip-compressed
+    responses, and records the bytes and latency of every request.
+
+    Args:
+        base_url: API base URL. Defaults to ``SPACE_API_BASE_URL``.
+        pool_size: Connections kept per host. Defaults to
+            ``SPACE_HTTP_POOL_SIZE``.
+        keep_alive: Reuse connections between requests. Defaults to
+            ``SPACE_HTTP_KEEP_ALIVE``.
+        timeout: Per-request timeout in seconds.
+        mirrors: Mirror base URLs, most preferred first. Requests for URLs
+            under ``base_url`` are sent to the mirrors instead, with
+            failover and hedging (see ``MirrorPool``); ``base_url`` is
+            tried last if it is not listed. Defaults to
+            ``SPACE_API_MIRRORS``.
+        transport: ``requests`` adapter used for every request instead of a
+            pooled ``HTTPAdapter``, e.g. a ``space.cassette`` recorder or
+            replayer. Defaults to replaying ``SPACE_REPLAY_CASSETTE`` or
+            recording to ``SPACE_RECORD_CASSETTE`` when set.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        keep_alive: Optional[bool] = None,
+        timeout: float = REQUEST_TIMEOUT,
+        mirrors: Optional[Sequence[str]] = None,
+        transport: Optional[HTTPAdapter] = None,
+    ) -> None:
+        self.base_url = API_BASE_URL if base_url is None else base_url
+        self.pool_size = HTTP_POOL_SIZE if pool_size is None else pool_size
+        self.keep_alive = HTTP_KEEP_ALIVE if keep_alive is None else keep_alive
+        self.timeout = timeout
+        self._stats = ClientStats()
+        self._stats_lock = threading.Lock()
+
+        urls = list(API_MIRRORS if mirrors is None else mirrors)
+        if urls and self.base_url and self.base_url not in urls:
+            urls.append(self.base_url)
+        self.mirrors = MirrorPool(urls, HEDGE_DELAY) if urls else None
+
+        self.session = requests.Session()
+        adapter = transport or _default_transport(self.pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.session.headers["Connection"] = (
+            "keep-alive" if self.keep_alive else "close"
+        )
+
+    def __enter__(self) -> "SpaceClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self.mirrors is not None:
+            self.mirrors.close()
+        self.session.close()
+
+    def stats(self) -> ClientStats:
+        """Return a snapshot of the client's request accounting."""
+        with self._stats_lock:
+            return replace(self._stats)
+
+    def mirror_stats(self) -> List[MirrorStats]:
+        """Return per-mirror health and latency (empty without mirrors)."""
+        return self.mirrors.stats() if self.mirrors is not None else []
+
+    @retry_transient(
+        (requests.exceptions.ConnectionError, requests.exceptions.Timeout), logger
+    )
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        GET a URL over the pooled session, retrying transient failures.
+
+        Args:
+            url: Absolute URL to request.
+            headers: Optional extra request headers.
+            stream: Return as soon as the headers arrive and leave the body
+                unread. Latency then covers the time to the headers only.
+
+        Returns:
+            The HTTP response, already checked for error status codes.
+
+        Raises:
+            CircuitOpenError: If upstream is failing and the circuit is open.
+        """
+
+        def send(target: str) -> requests.Response:
+            start = time.perf_counter()
+            response = self.session.get(
+                target,
+                headers=headers,
+                timeout=attempt_timeout(self.timeout),
+                stream=stream,
+            )
+            latency = time.perf_counter() - start
+            self._record(response, latency, read_body=not stream)
+            self._record_phases(response, start, latency, stream)
+            response.raise_for_status()
+            return response
+
+        try:
+            if (
+                self.mirrors is not None
+                and self.base_url
+                and url.startswith(self.base_url)
+            ):
+                return self.mirrors.request(url[len(self.base_url) :], send)
+            return send(url)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Error fetching data from API: {e}")
+            raise
+
+    def get_json(self, endpoint: str) -> Dict[str, Any]:
+        """
+        GET an API endpoint and decode its JSON body.
+
+        Args:
+            endpoint: Path relative to the base URL, e.g. ``/astros.json``.
+
+        Returns:
+            The decoded JSON response body.
+        """
+        response = self.get(f"{self.base_url}{endpoint}")
+        try:
+            with span("decode", bytes=len(response.content)):
+                data: Dict[str, Any] = loads(response.content)
+            return data
+        except ValueError as e:
+            logger.error(f"Error parsing API response: {e}")
+            raise
+
+    def fetch_people(self) -> List[Dict[str, Any]]:
+        """Fetch the list of people currently in space."""
+        data = self.get_json(ASTROS_ENDPOINT or "")
+        try:
+            return parse_people(data)
+        except ValueError as e:
+            logger.error(f"Error parsing API response: {e}")
+            raise
+
+    def iter_people(self, chunk_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the roster, yielding each person as soon as it is parsed.
+
+        The response body is read ``chunk_size`` bytes at a time and never
+        held in memory as a whole. Each person, and the ``number`` and
+        ``message`` members, are validated as soon as they are decoded.
+
+        Args:
+            chunk_size: Number of bytes read from the socket at a time.
+
+        Yields:
+            Person records, each a dict with ``name`` and ``craft`` keys.
+        """
+        response = self.get(f"{self.base_url}{ASTROS_ENDPOINT or ''}", stream=True)
+        decoded = 0
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal decoded
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                decoded += len(chunk)
+                yield chunk
+
+        count = 0
+        start = time.perf_counter()
+        outcome = ERROR
+        try:
+            people = iter_array_items(chunks(), "people", validate_astros_member)
+            for person in people:
+                validate_person(person, f"people[{count}]")
+                count += 1
+                yield person
+            outcome = OK
+        except (KeyError, ValueError) as e:
+            logger.error(f"Error parsing API response: {e}")
+            raise
+        finally:
+            response.close()
+            # Includes reading the body off the socket and, as this is a
+            # generator, whatever the consumer does between items
+            record_span(
+                "decode.stream",
+                start,
+                time.perf_counter() - start,
+                outcome,
+                bytes=decoded,
+                items=count,
+            )
+            with self._stats_lock:
+                self._stats.bytes_decoded += decoded
+                if "Content-Length" not in response.headers:
+                    self._stats.bytes_received += decoded
+        logger.info(f"Streamed {count} people ({decoded} bytes)")
+
+    @staticmethod
+    def _record_phases(
+        response: requests.Response, start: float, latency: float, stream: bool
+    ) -> None:
+        """Split a request's latency into time to headers and body transfer."""
+        # requests only exposes the time until the headers were parsed, which
+        # includes DNS, connect and server time
+        headers = min(latency, response.elapsed.total_seconds())
+        record_span("http.headers", start, headers, status=response.status_code)
+        if not stream:
+            record_span("http.body", start + headers, latency - headers)
+
+    def _record(
+        self, response: requests.Response, latency: float, read_body: bool = True
+    ) -> None:
+        """Add one response to the byte and latency accounting."""
+        # Streamed bodies are counted by the caller as they are consumed
+        decoded = len(response.content) if read_body else 0
+        # Content-Length is the on-the-wire size when the body was compressed
+        try:
+            wire = int(response.headers.get("Content-Length", decoded))
+        except ValueError:
+            wire = decoded
+        with self._stats_lock:
+            self._stats.requests += 1
+            self._stats.bytes_received += wire
+            self._stats.bytes_decoded += decoded
+            self._stats.total_latency += latency
+            self._stats.last_latency = latency
+        # Called on every request: only format the line if it is emitted
+        logger.debug(
+            "GET %s -> %s (%d bytes, %.1f ms)",
+            response.url,
+            response.status_code,
+            wire,
+            latency * 1000,
+        )
+
+
+def _default_transport(pool_size: int) -> HTTPAdapter:
+    """Build the adapter selected by the record/replay settings."""
+    if REPLAY_CASSETTE is not None:
+        from space.cassette import Cassette, ReplayAdapter
+
+        return ReplayAdapter(Cassette(REPLAY_CASSETTE), REPLAY_LATENCY)
+    if RECORD_CASSETTE is not None:
+        from space.cassette import CassetteWriter, RecordingAdapter
+
+        return RecordingAdapter(CassetteWriter(RECORD_CASSETTE), pool_maxsize=pool_size)
+    return HTTPAdapter(pool_maxsize=pool_size)
+
+
+# Options for the process-wide client, set by configure_default_client
+_default_options: Dict[str, Any] = {}
+
+
+def configure_default_client(**options: Any) -> None:
+    """
+    Replace the ``SpaceClient`` options of the process-wide client.
+
+    A client already created with the previous options is closed, and a
+    new one is created on next use.
+
+    Args:
+        **options: Keyword arguments for ``SpaceClient``.
+    """
+    if get_default_client.cache_info().currsize:
+        get_default_client().close()
+        get_default_client.cache_clear()
+    _default_options.clear()
+    _default_options.update(options)
+
+
+@lru_cache(maxsize=1)
+def get_default_client() -> SpaceClient:
+    """Return the process-wide client used by ``fetch_people_in_space``."""
+    return SpaceClient(**_default_options)
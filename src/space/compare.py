@@ -0,0 +1,173 @@
+"""
+Compare the rosters reported by several API environments.
+
+``fetch_environments`` fetches the roster of every selected environment
+(see ``SPACE_ENVIRONMENTS``) at once on a bounded thread pool, so a
+comparison takes about as long as the slowest environment rather than the
+sum of all of them. Each environment gets its own client and circuit
+breaker, so one that is down does not fail fast for the others; the retry
+budget and the host-wide rate limiter are shared as for any request.
+
+``diff_rosters`` lines the rosters up person by person. Names and crafts
+are compared normalized (see ``normalize_name``), so differences in case,
+accents or spacing are not reported as disagreements.
+"""
+
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import requests
+
+from space.client import SpaceClient
+from space.core import parse_people, use_policy
+from space.instrument import span
+from space.models import normalize_name
+from space.resilience import CircuitBreaker, get_policy
+
+logger = logging.getLogger(__name__)
+
+# Environments fetched at the same time, at most
+DEFAULT_MAX_WORKERS = 8
+
+# Row status of a person every environment reports on the same craft
+SAME = "same"
+DIFFERS = "differs"
+
+
+@dataclass(frozen=True)
+class EnvironmentResult:
+    """
+    Outcome of fetching one environment's roster.
+
+    Attributes:
+        name: The environment's name.
+        url: The roster URL that was fetched.
+        people: The roster, or None if the fetch failed.
+        error: Why the fetch failed, or None.
+        seconds: How long the fetch took, retries included.
+    """
+
+    name: str
+    url: str
+    people: Optional[List[Dict[str, Any]]]
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the roster was fetched."""
+        return self.people is not None
+
+
+def fetch_environment(name: str, url: str) -> EnvironmentResult:
+    """
+    Fetch one environment's roster, capturing any failure.
+
+    Mirrors and the response cache are not used: the point is to see what
+    the environment itself reports.
+
+    Args:
+        name: The environment's name.
+        url: Its full roster URL.
+
+    Returns:
+        The roster, or the error that prevented fetching it.
+    """
+    from space import config
+
+    policy = replace(
+        get_policy(),
+        breaker=CircuitBreaker(config.BREAKER_THRESHOLD, config.BREAKER_RESET_TIMEOUT),
+    )
+    start = time.perf_counter()
+    try:
+        with span("compare.fetch", environment=name), use_policy(policy):
+            with SpaceClient(base_url=url, mirrors=[]) as client:
+                people = parse_people(client.get_json(""))
+    except (requests.exceptions.RequestException, ConnectionError, ValueError) as e:
+        logger.warning(f"Could not fetch the {name} roster: {e}")
+        return EnvironmentResult(name, url, None, str(e), time.perf_counter() - start)
+    return EnvironmentResult(name, url, people, None, time.perf_counter() - start)
+
+
+def fetch_environments(
+    environments: Mapping[str, str], max_workers: int = DEFAULT_MAX_WORKERS
+) -> List[EnvironmentResult]:
+    """
+    Fetch several environments' rosters concurrently.
+
+    Args:
+        environments: Environment names and their roster URLs.
+        max_workers: Most environments fetched at the same time.
+
+    Returns:
+        One result per environment, in the order given.
+
+    Raises:
+        ValueError: If ``max_workers`` is less than 1.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if not environments:
+        return []
+    workers = min(max_workers, len(environments))
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="space-compare"
+    ) as executor:
+        # Each fetch runs in a copy of the caller's context so its policy
+        # and deadline stay its own while span nesting carries over
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run, fetch_environment, name, url
+            )
+            for name, url in environments.items()
+        ]
+        return [future.result() for future in futures]
+
+
+def diff_rosters(
+    results: Sequence[EnvironmentResult], differences_only: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Line up environments' rosters person by person.
+
+    Environments whose fetch failed are left out.
+
+    Args:
+        results: Rosters from ``fetch_environments``.
+        differences_only: Leave out people every environment agrees on.
+
+    Returns:
+        One row per person, ordered by normalized name, holding ``name`` (as
+        first reported), ``status`` (``same`` or ``differs``) and, under
+        each environment's name, the craft it reports for the person or
+        None if it does not list them.
+    """
+    fetched = [result for result in results if result.people is not None]
+    # Normalized name -> environment -> (name as reported, craft)
+    people: Dict[str, Dict[str, Tuple[str, str]]] = {}
+    for result in fetched:
+        for person in result.people or ():
+            entry = people.setdefault(normalize_name(person["name"]), {})
+            entry.setdefault(result.name, (person["name"], person["craft"]))
+
+    rows = []
+    for key in sorted(people):
+        entry = people[key]
+        crafts = {
+            normalize_name(entry[result.name][1]) if result.name in entry else None
+            for result in fetched
+        }
+        status = SAME if len(crafts) == 1 and None not in crafts else DIFFERS
+        if differences_only and status == SAME:
+            continue
+        row: Dict[str, Any] = {"name": next(iter(entry.values()))[0]}
+        for result in fetched:
+            row[result.name] = entry[result.name][1] if result.name in entry else None
+        row["status"] = status
+        rows.append(row)
+    return rows
@@ -1,30 +1,295 @@
-"""Configuration settings for the space application."""
+"""
+Configuration settings for the space application.
+
+Settings are resolved lazily: the ``.env`` file is loaded and the
+environment validated the first time a setting is read, not when this
+module is imported. That keeps ``space --help`` and ``space --version`` fast
+and lets them answer even when the configuration is incomplete.
+"""
 
 import os
+import re
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
 # Look for .env in the project root (two levels up from this file)
 env_path = Path(__file__).parent.parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
 
-# API Configuration
-# Must be set via .env file or environment variables
-API_BASE_URL = os.getenv("SPACE_API_BASE_URL")
-ASTROS_ENDPOINT = os.getenv("SPACE_ASTROS_ENDPOINT")
+# Settings resolved by _load_settings() on first attribute access
+API_BASE_URL: Optional[str]
+API_MIRRORS: List[str]
+HEDGE_DELAY: float
+ASTROS_ENDPOINT: Optional[str]
+ASTROS_API_URL: str
+ISS_ENDPOINT: str
+CACHE_DIR: Path
+CACHE_TTL: int
+ROSTER_MAX_AGE: float
+STALE_WHILE_REVALIDATE: bool
+HTTP_POOL_SIZE: int
+HTTP_KEEP_ALIVE: bool
+HISTORY_DB: Path
+RECORD_HISTORY: bool
+RETRY_ATTEMPTS: int
+RETRY_BACKOFF: float
+RETRY_BACKOFF_MAX: float
+RETRY_BUDGET_RATIO: float
+RETRY_BUDGET_RESERVE: float
+REQUEST_DEADLINE: float
+BREAKER_THRESHOLD: int
+BREAKER_RESET_TIMEOUT: float
+LOG_PAYLOAD_SAMPLE_RATE: float
+RECORD_CASSETTE: Optional[Path]
+REPLAY_CASSETTE: Optional[Path]
+REPLAY_LATENCY: Optional[float]
+JSON_DECODER: str
+RATE_LIMIT: float
+RATE_LIMIT_BURST: float
+RATE_LIMIT_POLICY: str
+RATE_LIMIT_FILE: Path
+ENVIRONMENTS: Dict[str, str]
+ENVIRONMENT: Optional[str]
 
-# Validate required configuration (skip during pytest runs)
-if not os.getenv("PYTEST_CURRENT_TEST"):
-    if not API_BASE_URL:
-        raise ValueError(
-            "SPACE_API_BASE_URL must be set in .env file or environment variables"
+_settings: Optional[Dict[str, Any]] = None
+
+
+def _get_int(name: str, default: int, minimum: int = 0) -> int:
+    """Read an integer environment variable, validating its lower bound."""
+    try:
+        value = int(os.getenv(name, str(default)))
+    except ValueError:
+        raise ValueError(f"{name} must be an integer") from None
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}")
+    return value
+
+
+def _get_float(name: str, default: float, minimum: float = 0.0) -> float:
+    """Read a numeric environment variable, validating its lower bound."""
+    try:
+        value = float(os.getenv(name, str(default)))
+    except ValueError:
+        raise ValueError(f"{name} must be a number") from None
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum:g}")
+    return value
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable (1/0, true/false, yes/no, on/off)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    if value.lower() in ("1", "true", "yes", "on"):
+        return True
+    if value.lower() in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"{name} must be a boolean (true/false)")
+
+
+def _get_path(name: str) -> Optional[Path]:
+    """Read an optional path environment variable (empty means unset)."""
+    value = os.getenv(name)
+    return Path(value).expanduser() if value else None
+
+
+def _get_replay_latency() -> Optional[float]:
+    """Read SPACE_REPLAY_LATENCY: seconds, or ``recorded`` (None)."""
+    if os.getenv("SPACE_REPLAY_LATENCY", "").strip().lower() == "recorded":
+        return None
+    return _get_float("SPACE_REPLAY_LATENCY", 0.0)
+
+
+def _get_json_decoder() -> str:
+    """Read SPACE_JSON_DECODER: ``auto``, ``orjson`` or ``json``."""
+    value = os.getenv("SPACE_JSON_DECODER", "auto").strip().lower() or "auto"
+    if value not in ("auto", "orjson", "json"):
+        raise ValueError("SPACE_JSON_DECODER must be auto, orjson or json")
+    return value
+
+
+def _get_rate_limit_policy() -> str:
+    """Read SPACE_RATE_LIMIT_POLICY: ``wait``, ``cache`` or ``fail``."""
+    value = os.getenv("SPACE_RATE_LIMIT_POLICY", "wait").strip().lower() or "wait"
+    if value not in ("wait", "cache", "fail"):
+        raise ValueError("SPACE_RATE_LIMIT_POLICY must be wait, cache or fail")
+    return value
+
+
+def _get_environments() -> Dict[str, str]:
+    """
+    Read the named API environments listed in SPACE_ENVIRONMENTS.
+
+    Each name needs a ``SPACE_ENV_<NAME>_URL`` variable holding the full
+    roster URL, e.g. ``SPACE_ENV_DEV_URL=http://localhost:8000/api/v1/astros``.
+    """
+    environments: Dict[str, str] = {}
+    for name in os.getenv("SPACE_ENVIRONMENTS", "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if not re.fullmatch(r"[A-Za-z0-9_]+", name):
+            raise ValueError(
+                f"SPACE_ENVIRONMENTS: {name!r} may only use letters, digits and _"
+            )
+        if name in ("name", "status"):
+            # `space compare` has columns of these names
+            raise ValueError(f"SPACE_ENVIRONMENTS: {name!r} is a reserved name")
+        variable = f"SPACE_ENV_{name.upper()}_URL"
+        url = os.getenv(variable, "").strip()
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"{variable} must be set to an http(s) URL")
+        environments[name] = url
+    return environments
+
+
+def _split_url(url: str) -> Tuple[str, str]:
+    """Split a roster URL into an API base URL and an endpoint path."""
+    parts = urlsplit(url)
+    endpoint = parts.path + (f"?{parts.query}" if parts.query else "")
+    return f"{parts.scheme}://{parts.netloc}", endpoint
+
+
+def _load_settings() -> Dict[str, Any]:
+    """Load the .env file and resolve every setting from the environment."""
+    from dotenv import load_dotenv
+
+    # Load environment variables from .env file
+    load_dotenv(dotenv_path=env_path)
+
+    # API Configuration
+    # Must be set via .env file or environment variables
+    api_base_url = os.getenv("SPACE_API_BASE_URL")
+    astros_endpoint = os.getenv("SPACE_ASTROS_ENDPOINT")
+
+    # A selected environment replaces the API base URL and endpoint
+    environments = _get_environments()
+    environment = os.getenv("SPACE_ENV", "").strip() or None
+    if environment is not None:
+        if environment not in environments:
+            raise ValueError(
+                f"SPACE_ENV: unknown environment {environment!r} "
+                "(not listed in SPACE_ENVIRONMENTS)"
+            )
+        api_base_url, astros_endpoint = _split_url(environments[environment])
+
+    # Validate required configuration (skip during pytest runs)
+    if not os.getenv("PYTEST_CURRENT_TEST"):
+        if not api_base_url:
+            raise ValueError(
+                "SPACE_API_BASE_URL must be set in .env file or environment variables"
+            )
+        if not astros_endpoint:
+            raise ValueError(
+                "SPACE_ASTROS_ENDPOINT must be set in .env file or environment "
+                "variables"
+            )
+
+    cache_dir = Path(
+        os.getenv(
+            "SPACE_CACHE_DIR",
+            Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "space",
         )
-    if not ASTROS_ENDPOINT:
+    ).expanduser()
+
+    record_cassette = _get_path("SPACE_RECORD_CASSETTE")
+    replay_cassette = _get_path("SPACE_REPLAY_CASSETTE")
+    if record_cassette and replay_cassette:
         raise ValueError(
-            "SPACE_ASTROS_ENDPOINT must be set in .env file or environment variables"
+            "SPACE_RECORD_CASSETTE and SPACE_REPLAY_CASSETTE cannot both be set"
         )
 
-# Full API URL
-ASTROS_API_URL = f"{API_BASE_URL}{ASTROS_ENDPOINT}"
+    return {
+        "API_BASE_URL": api_base_url,
+        "ASTROS_ENDPOINT": astros_endpoint,
+        # Mirror base URLs tried in order (comma-separated; empty disables
+        # failover), and seconds to wait for a mirror before hedging to the
+        # next one until its own p95 latency is known
+        "API_MIRRORS": [
+            url.strip()
+            for url in os.getenv("SPACE_API_MIRRORS", "").split(",")
+            if url.strip()
+        ],
+        "HEDGE_DELAY": _get_float("SPACE_HEDGE_DELAY", 1.0),
+        # Full API URL
+        "ASTROS_API_URL": f"{api_base_url}{astros_endpoint}",
+        # ISS position endpoint, on the same API as the roster
+        "ISS_ENDPOINT": os.getenv("SPACE_ISS_ENDPOINT", "/iss-now.json"),
+        # Response cache configuration
+        # The cache is opt-in: a TTL of 0 (the default) disables it
+        "CACHE_DIR": cache_dir,
+        "CACHE_TTL": _get_int("SPACE_CACHE_TTL", 0),
+        # In-process roster reuse: seconds a fetched roster is served from
+        # memory, and whether an older one is served while it is refreshed
+        "ROSTER_MAX_AGE": _get_float("SPACE_ROSTER_MAX_AGE", 0.0),
+        "STALE_WHILE_REVALIDATE": _get_bool("SPACE_STALE_WHILE_REVALIDATE", False),
+        # HTTP connection pool configuration
+        # Maximum number of pooled connections kept per host
+        "HTTP_POOL_SIZE": _get_int("SPACE_HTTP_POOL_SIZE", 10, minimum=1),
+        # Reuse connections between requests (disable to send "Connection: close")
+        "HTTP_KEEP_ALIVE": _get_bool("SPACE_HTTP_KEEP_ALIVE", True),
+        # Roster history configuration
+        # Recording is opt-in; `space history` reads the same database
+        "HISTORY_DB": Path(
+            os.getenv("SPACE_HISTORY_DB", cache_dir / "history.sqlite3")
+        ).expanduser(),
+        "RECORD_HISTORY": _get_bool("SPACE_RECORD_HISTORY", False),
+        # Resilience policy for API requests
+        # Attempts per call (1 disables retries), and the full-jitter backoff
+        # ceiling for the first retry and for any retry
+        "RETRY_ATTEMPTS": _get_int("SPACE_RETRY_ATTEMPTS", 3, minimum=1),
+        "RETRY_BACKOFF": _get_float("SPACE_RETRY_BACKOFF", 1.0),
+        "RETRY_BACKOFF_MAX": _get_float("SPACE_RETRY_BACKOFF_MAX", 10.0),
+        # Process-wide retries allowed per first attempt, plus a burst reserve
+        "RETRY_BUDGET_RATIO": _get_float("SPACE_RETRY_BUDGET_RATIO", 0.2),
+        "RETRY_BUDGET_RESERVE": _get_float("SPACE_RETRY_BUDGET_RESERVE", 10.0),
+        # Seconds a call may spend retrying, backoff included
+        "REQUEST_DEADLINE": _get_float("SPACE_REQUEST_DEADLINE", 15.0),
+        # Consecutive failures that open the circuit (0 disables it), and
+        # seconds to fail fast before probing upstream again
+        "BREAKER_THRESHOLD": _get_int("SPACE_BREAKER_THRESHOLD", 5),
+        "BREAKER_RESET_TIMEOUT": _get_float("SPACE_BREAKER_RESET_TIMEOUT", 30.0),
+        # Logging configuration
+        # Fraction of debug-level payload excerpts that are logged
+        "LOG_PAYLOAD_SAMPLE_RATE": _get_float("SPACE_LOG_PAYLOAD_SAMPLE_RATE", 1.0),
+        # Host-wide rate limit shared by every space process (0 disables):
+        # requests per second, bucket size, what to do when it is reached
+        # (wait for a token, serve the last known roster, or fail), and the
+        # file holding the shared bucket
+        "RATE_LIMIT": _get_float("SPACE_RATE_LIMIT", 0.0),
+        "RATE_LIMIT_BURST": _get_float("SPACE_RATE_LIMIT_BURST", 5.0, minimum=1.0),
+        "RATE_LIMIT_POLICY": _get_rate_limit_policy(),
+        "RATE_LIMIT_FILE": _get_path("SPACE_RATE_LIMIT_FILE")
+        or cache_dir / "ratelimit",
+        # Named environments (name -> roster URL) compared by `space compare`,
+        # and the one selected with SPACE_ENV, if any
+        "ENVIRONMENTS": environments,
+        "ENVIRONMENT": environment,
+        # JSON decoder backend for API responses ("auto" prefers orjson)
+        "JSON_DECODER": _get_json_decoder(),
+        # Record/replay configuration
+        # Append every API response to a cassette, or answer every request
+        # from one instead of the network (at most one of the two)
+        "RECORD_CASSETTE": record_cassette,
+        "REPLAY_CASSETTE": replay_cassette,
+        # Seconds to wait before each replayed response, or "recorded" to
+        # replay the recorded timings (default: 0, full speed)
+        "REPLAY_LATENCY": _get_replay_latency(),
+    }
+
+
+def __getattr__(name: str) -> Any:
+    global _settings
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _settings is None:
+        from space.instrument import span
+
+        with span("config.load"):
+            _settings = _load_settings()
+    try:
+        return _settings[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
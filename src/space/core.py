@@ -0,0 +1,289 @@
+"""Transport-independent pieces shared by the sync and async API clients."""
+
+import functools
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from tenacity import RetryCallState, before_sleep_log, retry, retry_if_exception_type
+
+from space.decode import validate_astros
+from space.instrument import span
+from space.logs import PAYLOAD, PayloadPreview, PayloadSummary
+from space.ratelimit import WAIT
+from space.resilience import (
+    CircuitBreaker,
+    ResiliencePolicy,
+    full_jitter_backoff,
+    get_policy,
+)
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Seconds to wait for a response before giving up on an attempt
+REQUEST_TIMEOUT = 10
+
+# Shortest timeout given to an attempt when the call deadline is near
+MIN_ATTEMPT_TIMEOUT = 0.1
+
+# Monotonic time by which the API call in progress must finish
+_deadline: ContextVar[Optional[float]] = ContextVar("space_deadline", default=None)
+
+# Number of the attempt in progress (1 for the first try)
+_attempt: ContextVar[int] = ContextVar("space_attempt", default=1)
+
+# Policy for API calls made in this context, instead of the process-wide one
+_policy: ContextVar[Optional[ResiliencePolicy]] = ContextVar(
+    "space_policy", default=None
+)
+
+
+def _current_policy() -> ResiliencePolicy:
+    """Return the policy set by ``use_policy``, else the process-wide one."""
+    return _policy.get() or get_policy()
+
+
+@contextmanager
+def use_policy(policy: ResiliencePolicy) -> Iterator[None]:
+    """
+    Apply ``policy`` to the API calls made inside the block.
+
+    Used to give an upstream its own circuit breaker, so that one failing
+    API does not open the circuit for the others. Only calls made in the
+    current context (thread or task) are affected.
+
+    Args:
+        policy: The policy to use instead of the process-wide one.
+    """
+    token = _policy.set(policy)
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+def attempt_timeout(timeout: float) -> float:
+    """
+    Cap a request timeout to what is left of the current call's deadline.
+
+    Args:
+        timeout: The transport's own per-request timeout.
+
+    Returns:
+        The timeout to use for this attempt.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return timeout
+    return max(MIN_ATTEMPT_TIMEOUT, min(timeout, deadline - time.monotonic()))
+
+
+def _rate_limit_delay(policy: ResiliencePolicy) -> float:
+    """
+    Take a token from the host-wide rate limiter for the next attempt.
+
+    Returns:
+        Seconds to wait before sending; 0 without a limiter.
+
+    Raises:
+        RateLimitedError: If no token is free and the limiter's policy is
+            not to wait, or the wait would overrun the call deadline.
+    """
+    limiter = policy.limiter
+    if limiter is None:
+        return 0.0
+    max_wait = 0.0
+    if limiter.policy == WAIT:
+        deadline = _deadline.get()
+        max_wait = policy.deadline if deadline is None else deadline - time.monotonic()
+    return limiter.acquire(max_wait)
+
+
+def _is_server_error(error: BaseException) -> bool:
+    """Whether ``error`` reports a 5xx response, from requests or aiohttp."""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None) or getattr(error, "status", None)
+    return isinstance(status, int) and status >= 500
+
+
+def _settle(
+    breaker: CircuitBreaker,
+    error: BaseException,
+    exceptions: Tuple[Type[BaseException], ...],
+) -> None:
+    """
+    Report a failed attempt to the breaker.
+
+    Transient errors and 5xx responses count as failures. Anything else (a
+    4xx, a bad body, an interrupt) says nothing about upstream's health,
+    but still ends a half-open probe so the circuit cannot get stuck.
+    """
+    if isinstance(error, exceptions) or _is_server_error(error):
+        breaker.record_failure()
+    else:
+        breaker.release()
+
+
+def _guard(fn: F, exceptions: Tuple[Type[BaseException], ...]) -> F:
+    """
+    Run each attempt of ``fn`` through the shared rate limiter and breaker,
+    timing it.
+
+    The token is taken before the breaker is asked, so an attempt the
+    limiter refuses never holds the half-open probe.
+    """
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def guarded_async(*args: Any, **kwargs: Any) -> Any:
+            policy = _current_policy()
+            breaker = policy.breaker
+            with span("fetch.attempt", attempt=_attempt.get()):
+                delay = _rate_limit_delay(policy)
+                if delay:
+                    import asyncio
+
+                    with span("ratelimit.wait", seconds=round(delay, 3)):
+                        await asyncio.sleep(delay)
+                breaker.allow()
+                try:
+                    result = await fn(*args, **kwargs)
+                except BaseException as e:
+                    _settle(breaker, e, exceptions)
+                    raise
+            breaker.record_success()
+            return result
+
+        return cast(F, guarded_async)
+
+    @functools.wraps(fn)
+    def guarded(*args: Any, **kwargs: Any) -> Any:
+        policy = _current_policy()
+        breaker = policy.breaker
+        with span("fetch.attempt", attempt=_attempt.get()):
+            delay = _rate_limit_delay(policy)
+            if delay:
+                with span("ratelimit.wait", seconds=round(delay, 3)):
+                    time.sleep(delay)
+            breaker.allow()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                _settle(breaker, e, exceptions)
+                raise
+        breaker.record_success()
+        return result
+
+    return cast(F, guarded)
+
+
+def _before_attempt(retry_state: RetryCallState) -> None:
+    """Start the call deadline and credit the retry budget on first attempts."""
+    _attempt.set(retry_state.attempt_number)
+    if retry_state.attempt_number == 1:
+        policy = _current_policy()
+        _deadline.set(time.monotonic() + policy.deadline)
+        policy.budget.deposit()
+
+
+def _stop(retry_state: RetryCallState) -> bool:
+    """Stop on the attempt limit, the call deadline or an empty retry budget."""
+    policy = _current_policy()
+    if retry_state.attempt_number >= policy.attempts:
+        return True
+    if (retry_state.seconds_since_start or 0.0) >= policy.deadline:
+        logger.warning(f"Request deadline of {policy.deadline:.0f}s exceeded")
+        return True
+    if not policy.budget.withdraw():
+        logger.warning("Retry budget exhausted, not retrying")
+        return True
+    return False
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    """Full-jitter backoff, cut short so the call deadline is never overrun."""
+    policy = _current_policy()
+    delay = full_jitter_backoff(
+        retry_state.attempt_number, policy.backoff, policy.backoff_max
+    )
+    remaining = policy.deadline - (retry_state.seconds_since_start or 0.0)
+    return max(0.0, min(delay, remaining))
+
+
+def retry_transient(
+    exceptions: Tuple[Type[BaseException], ...], log: logging.Logger
+) -> Callable[[F], F]:
+    """
+    Build the retry decorator used for every API request.
+
+    Each attempt first takes a token from the host-wide rate limiter, if
+    one is configured, waiting for it or failing with ``RateLimitedError``
+    depending on its policy, then checks the process-wide circuit breaker,
+    which fails fast with ``CircuitOpenError`` while upstream is down.
+    Transient errors and 5xx responses count as breaker failures; transient
+    failures are retried with full-jitter backoff until the attempt limit,
+    the per-call deadline or the process-wide retry budget runs out. All
+    limits come from ``space.config`` (see ``space.resilience``).
+
+    Works on both regular functions and coroutines.
+
+    Args:
+        exceptions: Exception types that count as transient failures.
+        log: Logger used to report each retry.
+
+    Returns:
+        A tenacity retry decorator.
+    """
+    retrying = retry(
+        stop=_stop,
+        wait=_wait,
+        retry=retry_if_exception_type(exceptions),
+        before=_before_attempt,
+        before_sleep=before_sleep_log(log, logging.WARNING),
+        reraise=True,
+    )
+
+    def decorator(fn: F) -> F:
+        return cast(F, retrying(_guard(fn, exceptions)))
+
+    return decorator
+
+
+def parse_people(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Validate a decoded ``/astros.json`` payload and extract its people.
+
+    Args:
+        data: The decoded JSON response body.
+
+    Returns:
+        List of people, each a dict with ``name`` and ``craft`` keys.
+
+    Raises:
+        SchemaError: If the payload is malformed; the message names the
+            offending field.
+    """
+    # The payload can be large: log a bounded excerpt only when debugging,
+    # and a summary once it is known to be a roster; neither is formatted
+    # unless the record is emitted
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Payload: %s", PayloadPreview(data), extra=PAYLOAD)
+    validate_astros(data)
+    logger.info("Fetched data: %s", PayloadSummary(data))
+    return cast(List[Dict[str, Any]], data["people"])
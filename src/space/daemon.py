@@ -0,0 +1,315 @@
+"""
+Background process that answers ``space`` from a roster kept in memory.
+
+``space daemon`` refreshes the roster on a schedule with a warm client and
+listens on a Unix domain socket (see ``space.fastpath`` for the protocol).
+Each request carries the caller's command line; the daemon parses it with
+the CLI's own parser, filters and renders the in-memory roster exactly as
+``space`` would, and sends back the output bytes. Commands it can't answer
+faithfully from memory -- subcommands, paging, logging, profiling,
+cache, environment or cassette options -- are declined, and the caller
+runs them itself. So are requests from callers whose ``SPACE_*``
+configuration differs from the daemon's: their roster may not be the one
+in memory.
+
+Answers are as fresh as the last refresh, i.e. up to ``refresh_interval``
+seconds old.
+"""
+
+import asyncio
+import io
+import logging
+import os
+import socket
+import stat
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Callable, Dict, List, Mapping, Optional
+
+from space.fastpath import MAX_REQUEST, config_environment, decode_request
+from space.models import Roster
+
+logger = logging.getLogger(__name__)
+
+# Distinct requests whose replies are kept until the next refresh
+MAX_REPLIES = 64
+
+# Parsing swaps the process-wide stdout and stderr; one request at a time
+_parse_lock = threading.Lock()
+
+
+class RosterDaemon:
+    """
+    Roster cache plus request handling for ``space daemon``.
+
+    Args:
+        fetch: Callable returning the current roster. It runs in a worker
+            thread, so the blocking ``fetch_roster`` can be used.
+        refresh_interval: Seconds between background refreshes.
+        environ: Environment the roster is fetched under. Defaults to
+            ``os.environ``.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Roster],
+        refresh_interval: float = 60.0,
+        environ: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        from dotenv import dotenv_values
+
+        from space.config import env_path
+
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        # Like space.config, the .env file fills in what the environment
+        # does not set, for the daemon and its callers alike
+        self._dotenv = {
+            name: value
+            for name, value in dotenv_values(env_path).items()
+            if value is not None
+        }
+        self.config = self.effective_config(os.environ if environ is None else environ)
+        self.roster: Optional[Roster] = None
+        # Replies by request, for the current roster: a shell prompt asks the
+        # same question over and over
+        self._replies: Dict[bytes, bytes] = {}
+
+    def effective_config(self, environ: Mapping[str, str]) -> Dict[str, str]:
+        """
+        Return the configuration ``space`` runs with under ``environ``.
+
+        Args:
+            environ: Environment variables of a ``space`` process.
+
+        Returns:
+            Its ``SPACE_*`` variables, .env file included.
+        """
+        return config_environment({**self._dotenv, **environ})
+
+    async def refresh(self) -> bool:
+        """
+        Fetch the roster once and keep it for the next answers.
+
+        Returns:
+            True if the refresh succeeded. On failure the previous roster
+            keeps being used.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            roster = await loop.run_in_executor(None, self.fetch)
+        except Exception as e:
+            logger.warning(f"Roster refresh failed: {e}")
+            return False
+        self.roster = roster
+        self._replies = {}
+        return True
+
+    async def refresh_forever(self) -> None:
+        """Refresh the roster every ``refresh_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def answer(self, argv: List[str], width: int, color: bool) -> Optional[bytes]:
+        """
+        Render the output of ``space`` for a command line.
+
+        Args:
+            argv: Command-line arguments, without the program name.
+            width: Columns available for the table.
+            color: Whether the output goes to a terminal that takes colors.
+
+        Returns:
+            The output bytes, or None if the caller must run the command
+            itself.
+        """
+        from space.__main__ import (
+            HEADING,
+            parse_args,
+            print_table,
+            query_roster,
+        )
+        from space.output import write_people
+
+        roster = self.roster
+        if roster is None:
+            return None
+        try:
+            # Usage errors and --help are printed by the caller instead
+            with _parse_lock, redirect_stdout(io.StringIO()), redirect_stderr(
+                io.StringIO()
+            ):
+                args = parse_args(argv)
+        except SystemExit:
+            return None
+        if (
+            args.command is not None
+            or args.verbose
+            or args.debug
+            or args.profile
+            or args.metrics_file
+            or args.no_cache
+            or args.cache_ttl is not None
+            or args.env is not None
+            or args.pager
+            or args.record is not None
+            or args.replay is not None
+        ):
+            return None
+
+        people, total, fields = query_roster(args, roster)
+        output = io.StringIO()
+        if args.format != "table":
+            write_people(people, args.format, output, fields)
+        else:
+            from rich.console import Console
+
+            console = Console(
+                file=output,
+                width=width,
+                force_terminal=color,
+                color_system="standard" if color else None,
+            )
+            print_table(console, people, fields, total, HEADING)
+        return output.getvalue().encode("utf-8")
+
+    def handle(self, request: bytes) -> bytes:
+        """
+        Build the reply to one request.
+
+        Args:
+            request: The request bytes sent by ``space.fastpath``.
+
+        Returns:
+            ``OK 0`` and the output, or an empty reply to decline.
+        """
+        replies = self._replies
+        reply = replies.get(request)
+        if reply is not None or not request:
+            # An empty request is another daemon checking the socket is live
+            return reply or b""
+        try:
+            argv, width, color, environ = decode_request(request)
+            if self.effective_config(environ) != self.config:
+                logger.debug("Declining a caller configured differently")
+                output = None
+            else:
+                output = self.answer(argv, width, color)
+        except Exception as e:
+            logger.warning(f"Cannot answer request: {e}")
+            return b""
+        reply = b"" if output is None else b"OK 0\n" + output
+        if self.roster is not None and len(replies) < MAX_REPLIES:
+            replies[request] = reply
+        return reply
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = b""
+            while len(request) <= MAX_REQUEST:
+                chunk = await reader.read(MAX_REQUEST)
+                if not chunk:
+                    break
+                request += chunk
+            else:
+                return
+            reply = self._replies.get(request)
+            if reply is None:
+                # Rendering a large table takes a while; keep accepting
+                # connections meanwhile
+                loop = asyncio.get_running_loop()
+                reply = await loop.run_in_executor(None, self.handle, request)
+            writer.write(reply)
+            await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+
+def _claim_socket(path: str) -> None:
+    """
+    Make ``path`` available for a new daemon.
+
+    Raises:
+        RuntimeError: If another daemon is already listening there.
+    """
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise RuntimeError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"A daemon is already listening on {path}")
+    finally:
+        probe.close()
+
+
+async def run_daemon(daemon: RosterDaemon, path: str) -> asyncio.AbstractServer:
+    """
+    Load the first roster and start listening.
+
+    Args:
+        daemon: The daemon to expose.
+        path: Unix socket path. Only the current user may connect.
+
+    Returns:
+        The listening asyncio server.
+
+    Raises:
+        RuntimeError: If another daemon is already listening on ``path``.
+    """
+    _claim_socket(path)
+    await daemon.refresh()
+    # Create the socket owner-only, rather than chmod it once it is bound and
+    # already open to anyone the umask lets in
+    umask = os.umask(0o177)
+    try:
+        listener = await asyncio.start_unix_server(daemon._serve_client, path)
+    finally:
+        os.umask(umask)
+    return listener
+
+
+def serve_daemon(
+    fetch: Callable[[], Roster], path: str, refresh_interval: float = 60.0
+) -> None:
+    """
+    Run ``space daemon`` until interrupted.
+
+    Args:
+        fetch: Callable returning the current roster.
+        path: Unix socket path to listen on.
+        refresh_interval: Seconds between background refreshes.
+
+    Raises:
+        RuntimeError: If another daemon is already listening on ``path``.
+    """
+
+    async def main() -> None:
+        daemon = RosterDaemon(fetch, refresh_interval)
+        listener = await run_daemon(daemon, path)
+        refresher = asyncio.create_task(daemon.refresh_forever())
+        logger.info(f"Answering on {path}")
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            refresher.cancel()
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    asyncio.run(main())
@@ -0,0 +1,221 @@
+"""
+Decode and validate JSON API payloads.
+
+``loads`` decodes a response body with ``orjson`` when it is installed
+(``pip install space[fast]``) and with the standard library otherwise;
+``SPACE_JSON_DECODER`` picks a backend explicitly.
+
+``validate_astros`` checks a decoded ``/astros.json`` payload in one pass
+and reports exactly which field is wrong, e.g.
+``people[12].craft: expected a string, got null``. ``validate_person``
+and ``validate_astros_member`` check the payload piece by piece, for
+streaming parsers that validate each value as soon as it is decoded.
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without the extra
+    orjson = None  # type: ignore[assignment]
+
+Decoder = Callable[[Union[bytes, str]], Any]
+
+DECODERS: Dict[str, Decoder] = {"json": json.loads}
+if orjson is not None:
+    DECODERS["orjson"] = orjson.loads
+
+# Backend used by loads(), resolved from the configuration on first use
+_decoder: Optional[Decoder] = None
+
+# Stands for an absent object member
+_MISSING = object()
+
+
+def get_decoder(name: str = "auto") -> Decoder:
+    """
+    Look up a JSON decoder backend.
+
+    Args:
+        name: ``orjson``, ``json``, or ``auto`` for the fastest installed.
+
+    Returns:
+        A function decoding a JSON document from bytes or str.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    if name == "auto":
+        return DECODERS.get("orjson", json.loads)
+    try:
+        return DECODERS[name]
+    except KeyError:
+        raise ValueError(f"JSON decoder {name!r} is not available") from None
+
+
+def use_decoder(name: str) -> None:
+    """Make ``loads`` use the named backend (see ``get_decoder``)."""
+    global _decoder
+    _decoder = get_decoder(name)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode a JSON document with the configured backend.
+
+    Args:
+        data: The document, as bytes (preferred, skips a copy) or str.
+
+    Returns:
+        The decoded value.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    global _decoder
+    if _decoder is None:
+        from space.config import JSON_DECODER
+
+        _decoder = get_decoder(JSON_DECODER)
+    return _decoder(data)
+
+
+class SchemaError(ValueError):
+    """
+    A decoded document does not match its schema.
+
+    Attributes:
+        path: Location of the offending value, e.g. ``people[3].name``
+            (empty for the document itself).
+        reason: What is wrong with it.
+    """
+
+    def __init__(self, path: str, reason: str) -> None:
+        super().__init__(f"{path or 'document'}: {reason}")
+        self.path = path
+        self.reason = reason
+
+
+class MissingFieldError(SchemaError, KeyError):
+    """
+    A required object member is absent.
+
+    Also a ``KeyError``, which is what indexing the payload used to raise.
+    """
+
+    def __str__(self) -> str:
+        # KeyError would repr() the message
+        return ValueError.__str__(self)
+
+
+def _kind(value: Any) -> str:
+    """Name the JSON type of a decoded value, for error messages."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "a boolean"
+    if isinstance(value, (int, float)):
+        return "a number"
+    if isinstance(value, str):
+        return "a string"
+    if isinstance(value, list):
+        return "an array"
+    return "an object"
+
+
+def _field(path: str, key: str) -> str:
+    """Location of the ``key`` member of the object at ``path``."""
+    return f"{path}.{key}" if path else key
+
+
+def _reject(value: Any, path: str, expected: str) -> SchemaError:
+    """Build the error for a member that is missing or of the wrong type."""
+    if value is _MISSING:
+        return MissingFieldError(path, "missing")
+    return SchemaError(path, f"expected {expected}, got {_kind(value)}")
+
+
+def validate_person(person: Any, path: str = "") -> None:
+    """
+    Check one roster entry: an object with string ``name`` and ``craft``.
+
+    Args:
+        person: The decoded entry.
+        path: Its location, prepended to reported fields, e.g. ``people[3]``.
+
+    Raises:
+        SchemaError: If the entry is malformed; ``MissingFieldError`` if a
+            member is absent.
+    """
+    if type(person) is not dict:
+        raise SchemaError(path, f"expected an object, got {_kind(person)}")
+    name = person.get("name", _MISSING)
+    if type(name) is not str:
+        raise _reject(name, _field(path, "name"), "a string")
+    craft = person.get("craft", _MISSING)
+    if type(craft) is not str:
+        raise _reject(craft, _field(path, "craft"), "a string")
+
+
+def validate_astros_member(name: str, value: Any, path: str = "") -> None:
+    """
+    Check one top-level member of an ``/astros.json`` payload.
+
+    ``message`` must be a string, ``number`` an integer and ``people`` an
+    array of roster entries; other members are accepted as they are.
+
+    Args:
+        name: The member's name.
+        value: Its decoded value.
+        path: Location of the payload, prepended to reported fields.
+
+    Raises:
+        SchemaError: If the member is malformed.
+    """
+    where = _field(path, name)
+    if name == "people":
+        if type(value) is not list:
+            raise SchemaError(where, f"expected an array, got {_kind(value)}")
+        for index, person in enumerate(value):
+            # Checked inline: a call per person would cost more than the
+            # checks; validate_person only runs to report a bad entry
+            if (
+                type(person) is not dict
+                or type(person.get("name")) is not str
+                or type(person.get("craft")) is not str
+            ):
+                validate_person(person, f"{where}[{index}]")
+    elif name == "number":
+        if type(value) is not int:
+            raise SchemaError(where, f"expected an integer, got {_kind(value)}")
+    elif name == "message":
+        if type(value) is not str:
+            raise SchemaError(where, f"expected a string, got {_kind(value)}")
+
+
+def validate_astros(data: Any, path: str = "") -> None:
+    """
+    Check a decoded ``/astros.json`` payload in a single pass.
+
+    ``number`` and ``message`` are only checked when present: mirrors and
+    caches may serve just the roster.
+
+    Args:
+        data: The decoded payload.
+        path: Its location, for payloads nested in a larger document.
+
+    Raises:
+        SchemaError: If the payload is malformed; the message names the
+            first offending field, e.g. ``people[12].craft: expected a
+            string, got null``. ``MissingFieldError`` if ``people`` or a
+            person's member is absent.
+    """
+    if type(data) is not dict:
+        raise SchemaError(path, f"expected an object, got {_kind(data)}")
+    for name in ("message", "number", "people"):
+        value = data.get(name, _MISSING)
+        if value is not _MISSING:
+            validate_astros_member(name, value, path)
+        elif name == "people":
+            raise MissingFieldError(_field(path, name), "missing")
@@ -0,0 +1,223 @@
+"""
+Thin client for ``space daemon``.
+
+``space`` calls ``run_fast_path`` before importing anything else. If a
+daemon is listening on ``socket_path()``, the command line is sent to it
+and its answer is written to stdout as is: no configuration load, no HTTP
+connection, no parsing and no rendering happen in the calling process. If
+no daemon is running, or it declines the command, ``space`` carries on
+with a direct fetch.
+
+This module is on the startup path of every invocation, so it only
+imports ``os``, ``sys`` and the built-in ``_socket``.
+
+Protocol (one request per connection): the client sends NUL-separated
+fields -- ``PROTOCOL``, the output width, ``1`` or ``0`` for a color
+terminal, the number of configuration variables followed by each as
+``NAME=value`` (see ``config_environment``), then the arguments -- and
+shuts down its sending side. The daemon replies ``OK <exit status>\\n``
+followed by the output bytes, or closes the connection without an ``OK``
+to decline, e.g. when the caller is configured differently from it.
+"""
+
+import _socket
+import os
+import sys
+from typing import Dict, List, Mapping, Optional, Tuple
+
+PROTOCOL = "space/2"
+
+# Seconds to wait for the daemon before falling back to a direct fetch
+TIMEOUT = 5.0
+
+# Largest request the daemon reads, in bytes
+MAX_REQUEST = 64 * 1024
+
+# Arguments answered locally, without asking the daemon
+_LOCAL = frozenset(("-h", "--help", "--version"))
+
+# The daemon listens on a Unix domain socket, which Windows lacks
+SUPPORTED = hasattr(_socket, "AF_UNIX")
+
+
+def socket_path() -> str:
+    """
+    Return where ``space daemon`` listens.
+
+    Only the environment is consulted (not ``.env``), so the lookup costs
+    nothing: ``SPACE_DAEMON_SOCKET`` if set (an empty value disables the
+    daemon), else ``$XDG_RUNTIME_DIR/space.sock``, else ``daemon.sock`` in
+    the cache directory.
+
+    Returns:
+        The socket path, or an empty string when the daemon is disabled.
+    """
+    path = os.environ.get("SPACE_DAEMON_SOCKET")
+    if path is not None:
+        return os.path.expanduser(path)
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "space.sock")
+    cache_dir = os.environ.get("SPACE_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache"), "space"
+    )
+    return os.path.join(os.path.expanduser(cache_dir), "daemon.sock")
+
+
+def config_environment(environ: Mapping[str, str]) -> Dict[str, str]:
+    """
+    Pick the variables that configure ``space`` out of an environment.
+
+    These are the ``SPACE_*`` variables, bar ``SPACE_DAEMON_SOCKET``: the
+    daemon only answers callers configured as it is.
+
+    Args:
+        environ: Environment variables, e.g. ``os.environ``.
+
+    Returns:
+        The configuration variables and their values.
+    """
+    return {
+        name: value
+        for name, value in environ.items()
+        if name.startswith("SPACE_") and name != "SPACE_DAEMON_SOCKET"
+    }
+
+
+def encode_request(
+    argv: List[str],
+    width: int,
+    color: bool,
+    environ: Optional[Mapping[str, str]] = None,
+) -> bytes:
+    """Build a request for the daemon, with this process's configuration."""
+    config = config_environment(os.environ if environ is None else environ)
+    fields = [PROTOCOL, str(width), "1" if color else "0", str(len(config))]
+    fields += [f"{name}={value}" for name, value in sorted(config.items())]
+    return "\0".join(fields + argv).encode("utf-8", "surrogateescape")
+
+
+def decode_request(data: bytes) -> Tuple[List[str], int, bool, Dict[str, str]]:
+    """
+    Parse a request built by ``encode_request``.
+
+    Args:
+        data: The request bytes.
+
+    Returns:
+        The arguments, the output width, whether output goes to a color
+        terminal, and the caller's configuration variables.
+
+    Raises:
+        ValueError: If the request is malformed or speaks another protocol.
+    """
+    fields = data.decode("utf-8", "surrogateescape").split("\0")
+    if fields[0] != PROTOCOL:
+        raise ValueError(f"Unsupported protocol: {fields[0]!r}")
+    if len(fields) < 4 or not fields[1].isdigit() or not fields[3].isdigit():
+        raise ValueError("Malformed request")
+    end = 4 + int(fields[3])
+    if len(fields) < end or not all("=" in field for field in fields[4:end]):
+        raise ValueError("Malformed request")
+    config = dict(field.split("=", 1) for field in fields[4:end])
+    return fields[end:], int(fields[1]), fields[2] == "1", config
+
+
+def ask_daemon(
+    argv: List[str],
+    width: int,
+    color: bool,
+    path: Optional[str] = None,
+    timeout: float = TIMEOUT,
+) -> Optional[Tuple[int, bytes]]:
+    """
+    Ask a running daemon to answer a command line.
+
+    Args:
+        argv: Command-line arguments, without the program name.
+        width: Columns available for the table.
+        color: Whether the output goes to a terminal that takes colors.
+        path: Socket path. Defaults to ``socket_path()``.
+        timeout: Seconds to wait for the answer.
+
+    Returns:
+        The exit status and output, or None if there is no daemon (or no
+        Unix domain sockets on this platform) or it declined the command.
+    """
+    if not SUPPORTED:
+        return None
+    path = socket_path() if path is None else path
+    if not path:
+        return None
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(encode_request(argv, width, color))
+        sock.shutdown(_socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(1 << 16)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+    header, _, output = b"".join(chunks).partition(b"\n")
+    if not header.startswith(b"OK "):
+        return None
+    try:
+        return int(header[3:]), output
+    except ValueError:
+        return None
+
+
+def _terminal() -> Tuple[int, bool]:
+    """Describe stdout the way Rich would: its width and color support."""
+    try:
+        fd = sys.stdout.fileno()
+        tty = os.isatty(fd)
+    except (AttributeError, OSError, ValueError):
+        fd, tty = -1, False
+    columns = os.environ.get("COLUMNS", "")
+    if columns.isdigit():
+        width = int(columns)
+    else:
+        try:
+            width = os.get_terminal_size(fd)[0] if tty else 80
+        except OSError:
+            width = 80
+    color = tty and "NO_COLOR" not in os.environ and os.environ.get("TERM") != "dumb"
+    return width, color
+
+
+def run_fast_path(argv: List[str]) -> Optional[int]:
+    """
+    Answer a command line through the daemon, if one is running.
+
+    Args:
+        argv: Command-line arguments, without the program name.
+
+    Returns:
+        The exit status once the daemon's output has been written, or None
+        if the command must run in this process.
+    """
+    if not SUPPORTED or _LOCAL.intersection(argv):
+        return None
+    width, color = _terminal()
+    answer = ask_daemon(argv, width, color)
+    if answer is None:
+        return None
+    status, output = answer
+    try:
+        sys.stdout.flush()
+        sys.stdout.buffer.write(output)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `space --format ndjson | head`)
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    return status
@@ -0,0 +1,133 @@
+"""In-process roster fetcher with request coalescing and stale-while-revalidate."""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+People = List[Dict[str, Any]]
+
+
+@dataclass
+class FetcherStats:
+    """Counters describing how ``RosterFetcher.get`` calls were answered."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    stale: int = 0
+    refreshes: int = 0
+    errors: int = 0
+
+
+class RosterFetcher:
+    """
+    Share one in-flight roster request between concurrent callers.
+
+    Calls that arrive while a request is already running wait for that
+    request instead of issuing their own (single-flight). A value younger
+    than ``max_age`` seconds is returned without calling the loader. When
+    ``stale_while_revalidate`` is enabled, an older value is returned right
+    away while a background thread refreshes it.
+
+    Args:
+        loader: Zero-argument callable that fetches the roster.
+        max_age: Seconds a loaded roster is served without refreshing.
+        stale_while_revalidate: Serve the last good roster while refreshing.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], People],
+        max_age: float = 0.0,
+        stale_while_revalidate: bool = False,
+    ) -> None:
+        self.loader = loader
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self._lock = threading.Lock()
+        self._value: People = []
+        self._loaded_at: Optional[float] = None
+        self._flight: Optional["Future[People]"] = None
+        self._stats = FetcherStats()
+
+    def get(self) -> People:
+        """
+        Return the roster, loading it at most once for concurrent callers.
+
+        Returns:
+            List of people currently in space.
+
+        Raises:
+            Exception: Whatever the loader raised, re-raised in every caller
+                that was waiting on the failed request.
+        """
+        with self._lock:
+            if self._loaded_at is not None:
+                if time.monotonic() - self._loaded_at < self.max_age:
+                    self._stats.hits += 1
+                    return self._value
+                if self.stale_while_revalidate:
+                    self._stats.stale += 1
+                    if self._flight is None:
+                        self._start_background_refresh()
+                    return self._value
+
+            if self._flight is not None:
+                self._stats.coalesced += 1
+                flight = self._flight
+                leader = False
+            else:
+                self._stats.misses += 1
+                flight = self._flight = Future()
+                leader = True
+
+        if leader:
+            self._load(flight)
+        return flight.result()
+
+    def stats(self) -> FetcherStats:
+        """Return a snapshot of the fetcher's counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def invalidate(self) -> None:
+        """Forget the stored roster so the next call loads it again."""
+        with self._lock:
+            self._loaded_at = None
+            self._value = []
+
+    def _start_background_refresh(self) -> None:
+        """Start a refresh thread; must be called with the lock held."""
+        flight: "Future[People]" = Future()
+        self._flight = flight
+        self._stats.refreshes += 1
+        threading.Thread(
+            target=self._load, args=(flight,), name="space-refresh", daemon=True
+        ).start()
+
+    def _load(self, flight: "Future[People]") -> None:
+        """Run the loader and publish its outcome to everyone on ``flight``."""
+        try:
+            value = self.loader()
+        except BaseException as e:
+            # KeyboardInterrupt and SystemExit too: waiters must not block
+            # on a flight that never lands
+            if isinstance(e, Exception):
+                logger.warning(f"Roster refresh failed: {e}")
+            with self._lock:
+                self._stats.errors += 1
+                self._flight = None
+            flight.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            with self._lock:
+                self._value = value
+                self._loaded_at = time.monotonic()
+                self._flight = None
+            flight.set_result(value)
@@ -0,0 +1,243 @@
+"""
+Append-only history of the roster.
+
+Every recorded roster is compared with the last one stored; unchanged
+rosters are dropped, so the store only grows when someone arrives or
+departs. Each change is kept twice: as a full roster snapshot (for
+"who was in space at time T") and as one event per person (for "when did
+X launch or return"). Both tables are indexed on time, so point-in-time
+and range queries are index seeks however many years of polling the store
+has seen.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+from space.models import normalize_name
+
+logger = logging.getLogger(__name__)
+
+ARRIVED = "arrived"
+DEPARTED = "departed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rosters (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    digest TEXT NOT NULL,
+    people TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS rosters_recorded_at ON rosters (recorded_at);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    event TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    craft TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_recorded_at ON events (recorded_at);
+CREATE INDEX IF NOT EXISTS events_name_key ON events (name_key, recorded_at);
+"""
+
+
+@dataclass(frozen=True)
+class HistoryEvent:
+    """One person arriving in or departing from space."""
+
+    recorded_at: float
+    event: str
+    name: str
+    craft: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the event as a row, with the time in ISO 8601 (UTC)."""
+        row = asdict(self)
+        row["time"] = format_time(row.pop("recorded_at"))
+        return row
+
+
+def parse_time(value: str) -> float:
+    """
+    Parse a point in time given on the command line.
+
+    Args:
+        value: Seconds since the epoch, or an ISO 8601 date or timestamp.
+            Timestamps without a timezone are taken as UTC.
+
+    Returns:
+        Seconds since the epoch.
+
+    Raises:
+        ValueError: If ``value`` is neither.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid time: {value!r} (use ISO 8601 or epoch)") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def format_time(timestamp: float) -> str:
+    """Format seconds since the epoch as an ISO 8601 UTC timestamp."""
+    moment = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _digest(people: List[Dict[str, str]]) -> str:
+    """Fingerprint a roster independently of the order people are listed in."""
+    keys = sorted((person["name"], person["craft"]) for person in people)
+    canonical = json.dumps(keys, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
+
+
+class HistoryStore:
+    """
+    SQLite-backed store of roster changes.
+
+    Several processes (e.g. ``space serve`` and ``space watch``) may record
+    into the same file; appends are serialized by SQLite.
+
+    Args:
+        path: Database file. Parent directories are created as needed.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def record(
+        self, people: Iterable[Mapping[str, Any]], at: Optional[float] = None
+    ) -> bool:
+        """
+        Append a roster if it differs from the last one recorded.
+
+        The first roster recorded is a baseline: it produces no events, as
+        the arrival times of the people on it are unknown.
+
+        Args:
+            people: The roster, as returned by ``fetch_people_in_space``.
+            at: When the roster was observed. Defaults to now.
+
+        Returns:
+            True if the roster changed and was stored.
+        """
+        roster = [{"name": p["name"], "craft": p["craft"]} for p in people]
+        recorded_at = time.time() if at is None else at
+        digest = _digest(roster)
+
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            last = conn.execute(
+                "SELECT digest, people FROM rosters ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            if last is not None and last[0] == digest:
+                conn.execute("COMMIT")
+                return False
+
+            conn.execute(
+                "INSERT INTO rosters (recorded_at, digest, people) VALUES (?, ?, ?)",
+                (recorded_at, digest, json.dumps(roster, separators=(",", ":"))),
+            )
+            if last is not None:
+                old = {(p["name"], p["craft"]) for p in json.loads(last[1])}
+                new = {(p["name"], p["craft"]) for p in roster}
+                changes = [(DEPARTED, key) for key in sorted(old - new)]
+                changes += [(ARRIVED, key) for key in sorted(new - old)]
+                conn.executemany(
+                    "INSERT INTO events (recorded_at, event, name, name_key, craft) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (recorded_at, event, name, normalize_name(name), craft)
+                        for event, (name, craft) in changes
+                    ],
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        logger.debug(f"Recorded roster change ({len(roster)} people)")
+        return True
+
+    def roster_at(self, when: float) -> Optional[List[Dict[str, str]]]:
+        """
+        Return the roster as it was at a point in time.
+
+        Args:
+            when: Seconds since the epoch.
+
+        Returns:
+            The last roster recorded at or before ``when``, or None if the
+            history starts later.
+        """
+        row = self._conn.execute(
+            "SELECT people FROM rosters WHERE recorded_at <= ? "
+            "ORDER BY recorded_at DESC, id DESC LIMIT 1",
+            (when,),
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def events(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        name: Optional[str] = None,
+    ) -> List[HistoryEvent]:
+        """
+        Return arrivals and departures, oldest first.
+
+        Args:
+            since: Only events at or after this time.
+            until: Only events at or before this time.
+            name: Only events for this person, matched after
+                ``normalize_name``.
+
+        Returns:
+            The matching events.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if name is not None:
+            clauses.append("name_key = ?")
+            params.append(normalize_name(name))
+        if since is not None:
+            clauses.append("recorded_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("recorded_at <= ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = self._conn.execute(
+            "SELECT recorded_at, event, name, craft FROM events "
+            f"{where}ORDER BY recorded_at, id",
+            params,
+        )
+        return [HistoryEvent(*row) for row in rows]
@@ -0,0 +1,258 @@
+"""
+Timing spans for the phases of a ``space`` run.
+
+``span("decode")`` times a block and records it in the process-wide
+``Recorder``. Every finished span is:
+
+- kept (the most recent ``MAX_SPANS``) for ``space --profile``, which prints
+  them as an indented tree;
+- logged at INFO on this module's logger, with its fields attached to the
+  record as ``span`` so ``--log-format json`` emits them as structured
+  fields;
+- added to a per-phase counter and latency histogram, rendered in the
+  Prometheus text format by ``Recorder.render_metrics`` (served on
+  ``space serve``'s ``/metrics`` and written by ``--metrics-file``).
+
+Phases recorded by the package: ``config.load``, ``fetch`` (one roster
+load), ``fetch.attempt`` (each try, retries included), ``http.headers`` and
+``http.body`` (time to the response headers, which covers DNS, connect and
+server time, then the body transfer), ``decode``, ``decode.stream`` and
+``render``.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds, in seconds, of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Finished spans kept for --profile; older ones are dropped
+MAX_SPANS = 1000
+
+OK = "ok"
+ERROR = "error"
+
+# Nesting depth of the span being run in the current context
+_depth: ContextVar[int] = ContextVar("space_span_depth", default=0)
+
+
+@dataclass(frozen=True)
+class Span:
+    """One timed phase."""
+
+    name: str
+    start: float
+    duration: float
+    depth: int = 0
+    outcome: str = OK
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the span as structured log fields."""
+        return {
+            "span": self.name,
+            "duration_ms": round(self.duration * 1000, 3),
+            "outcome": self.outcome,
+            **self.attributes,
+        }
+
+
+class Recorder:
+    """
+    Thread-safe store of finished spans and their aggregates.
+
+    Args:
+        buckets: Histogram bucket upper bounds, in seconds, ascending.
+        max_spans: Recent spans kept for ``spans()``.
+    """
+
+    def __init__(
+        self, buckets: Sequence[float] = BUCKETS, max_spans: int = MAX_SPANS
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._totals: "Counter[Tuple[str, str]]" = Counter()
+        self._histograms: Dict[str, List[int]] = {}
+        self._sums: Dict[str, float] = {}
+
+    def record(self, span: Span) -> None:
+        """Add a finished span."""
+        with self._lock:
+            self._spans.append(span)
+            self._totals[span.name, span.outcome] += 1
+            counts = self._histograms.get(span.name)
+            if counts is None:
+                counts = self._histograms[span.name] = [0] * len(self.buckets)
+                self._sums[span.name] = 0.0
+            for i, bound in enumerate(self.buckets):
+                if span.duration <= bound:
+                    counts[i] += 1
+                    break
+            self._sums[span.name] += span.duration
+
+    def spans(self) -> List[Span]:
+        """Return the recent spans in the order they started."""
+        with self._lock:
+            spans = list(self._spans)
+        return sorted(spans, key=lambda s: s.start)
+
+    def reset(self) -> None:
+        """Forget every span and aggregate."""
+        with self._lock:
+            self._spans.clear()
+            self._totals.clear()
+            self._histograms.clear()
+            self._sums.clear()
+
+    def render_metrics(self) -> List[str]:
+        """
+        Render the aggregates as Prometheus text-format lines.
+
+        Returns:
+            ``space_span_total`` counters by phase and outcome, and the
+            ``space_span_seconds`` histogram by phase; empty before the
+            first span.
+        """
+        with self._lock:
+            totals = sorted(self._totals.items())
+            histograms = {name: list(c) for name, c in self._histograms.items()}
+            sums = dict(self._sums)
+        if not totals:
+            return []
+        lines = [
+            "# HELP space_span_total Timed phases, by phase and outcome.",
+            "# TYPE space_span_total counter",
+        ]
+        for (name, outcome), count in totals:
+            lines.append(
+                f'space_span_total{{phase="{name}",outcome="{outcome}"}} {count}'
+            )
+        lines += [
+            "# HELP space_span_seconds Duration of timed phases.",
+            "# TYPE space_span_seconds histogram",
+        ]
+        for name in sorted(histograms):
+            cumulative = 0
+            for bound, count in zip(self.buckets, histograms[name]):
+                cumulative += count
+                lines.append(
+                    f'space_span_seconds_bucket{{phase="{name}",le="{bound}"}} '
+                    f"{cumulative}"
+                )
+            total = sum(c for (n, _), c in totals if n == name)
+            lines += [
+                f'space_span_seconds_bucket{{phase="{name}",le="+Inf"}} {total}',
+                f'space_span_seconds_sum{{phase="{name}"}} {sums[name]:.6f}',
+                f'space_span_seconds_count{{phase="{name}"}} {total}',
+            ]
+        return lines
+
+
+_recorder = Recorder()
+
+
+def get_recorder() -> Recorder:
+    """Return the process-wide recorder."""
+    return _recorder
+
+
+def record_span(
+    name: str,
+    start: float,
+    duration: float,
+    outcome: str = OK,
+    depth: Optional[int] = None,
+    **attributes: Any,
+) -> Span:
+    """
+    Record a phase timed by the caller.
+
+    Args:
+        name: Phase name.
+        start: ``time.perf_counter()`` when the phase started.
+        duration: Seconds the phase took.
+        outcome: ``ok`` or ``error``.
+        depth: Nesting depth. Defaults to a child of the current span.
+        **attributes: Extra fields for the profile and the logs.
+
+    Returns:
+        The recorded span.
+    """
+    finished = Span(
+        name,
+        start,
+        duration,
+        _depth.get() if depth is None else depth,
+        outcome,
+        attributes,
+    )
+    _recorder.record(finished)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(
+            f"{name} took {duration * 1000:.1f} ms",
+            extra={"span": finished.to_dict()},
+        )
+    return finished
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Time a block as one phase.
+
+    Spans opened inside the block are recorded as its children. An
+    exception leaving the block marks the span as an error and is
+    re-raised.
+
+    Args:
+        name: Phase name.
+        **attributes: Extra fields for the profile and the logs.
+
+    Yields:
+        The attribute dict, to which the block may add fields.
+    """
+    depth = _depth.get()
+    token = _depth.set(depth + 1)
+    start = time.perf_counter()
+    outcome = OK
+    try:
+        yield attributes
+    except BaseException as e:
+        outcome = ERROR
+        attributes.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        _depth.reset(token)
+        record_span(
+            name, start, time.perf_counter() - start, outcome, depth, **attributes
+        )
+
+
+def format_profile(spans: Sequence[Span]) -> str:
+    """
+    Format spans as an indented tree for ``--profile``.
+
+    Args:
+        spans: Spans in start order (``Recorder.spans()``).
+
+    Returns:
+        One line per span with its duration, name and attributes.
+    """
+    lines = []
+    for s in spans:
+        details = " ".join(f"{k}={v}" for k, v in s.attributes.items())
+        flag = "" if s.outcome == OK else " [error]"
+        lines.append(
+            f"{s.duration * 1000:10.1f} ms  {'  ' * s.depth}{s.name}{flag}"
+            + (f"  {details}" if details else "")
+        )
+    return "\n".join(lines)
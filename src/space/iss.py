@@ -0,0 +1,256 @@
+"""
+ISS position tracking for ``space track``.
+
+Positions from the Open Notify ``/iss-now.json`` endpoint are stored in a
+preallocated NumPy ring buffer of (timestamp, latitude, longitude) rows, and
+derived quantities are computed over the whole buffer with array operations.
+
+Requires the optional ``numpy`` dependency (``pip install space[track]``).
+"""
+
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from space import config
+
+logger = logging.getLogger(__name__)
+
+# Mean Earth radius (IUGG), in kilometres
+EARTH_RADIUS_KM = 6371.0088
+
+# Consecutive failed polls after which tracking gives up
+MAX_CONSECUTIVE_FAILURES = 10
+
+
+class TrackingError(ConnectionError):
+    """Raised when too many ISS position polls fail in a row."""
+
+
+class IssPosition(NamedTuple):
+    """One ISS position sample."""
+
+    timestamp: float
+    latitude: float
+    longitude: float
+
+
+def parse_position(data: Dict[str, Any]) -> IssPosition:
+    """
+    Extract the position from an ``/iss-now.json`` response body.
+
+    Args:
+        data: Decoded JSON response.
+
+    Returns:
+        The sampled position.
+
+    Raises:
+        KeyError: If the response has no position.
+        ValueError: If the coordinates are not numbers.
+    """
+    position = data["iss_position"]
+    return IssPosition(
+        float(data["timestamp"]),
+        float(position["latitude"]),
+        float(position["longitude"]),
+    )
+
+
+def fetch_iss_position() -> IssPosition:
+    """
+    Fetch the current ISS position.
+
+    The request goes through the shared pooled client, so it uses the same
+    configuration, session and retry policy as the roster requests.
+
+    Returns:
+        The current position.
+    """
+    from space.client import get_default_client
+
+    try:
+        return parse_position(get_default_client().get_json(config.ISS_ENDPOINT))
+    except (KeyError, ValueError) as e:
+        logger.error(f"Error parsing ISS position: {e}")
+        raise
+
+
+def haversine_km(
+    lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike
+) -> np.ndarray:
+    """
+    Great-circle distance between coordinate arrays, element-wise.
+
+    Args:
+        lat1: Latitudes of the start points, in degrees.
+        lon1: Longitudes of the start points, in degrees.
+        lat2: Latitudes of the end points, in degrees.
+        lon2: Longitudes of the end points, in degrees.
+
+    Returns:
+        Distances in kilometres.
+    """
+    phi1, lam1, phi2, lam2 = (np.radians(a) for a in (lat1, lon1, lat2, lon2))
+    h = (
+        np.sin((phi2 - phi1) / 2) ** 2
+        + np.cos(phi1) * np.cos(phi2) * np.sin((lam2 - lam1) / 2) ** 2
+    )
+    distance: np.ndarray = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0, 1)))
+    return distance
+
+
+class PositionBuffer:
+    """
+    Fixed-capacity ring buffer of position samples.
+
+    Memory is allocated once; when the buffer is full each new sample
+    overwrites the oldest one.
+
+    Args:
+        capacity: Maximum number of samples kept.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity < 2:
+            raise ValueError("Position buffer capacity must be at least 2")
+        self.capacity = capacity
+        self._data = np.empty((capacity, 3), dtype=np.float64)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, position: IssPosition) -> None:
+        """Store a sample, evicting the oldest one if the buffer is full."""
+        self._data[self._next] = position
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def samples(self) -> np.ndarray:
+        """
+        Return the stored samples, oldest first.
+
+        Returns:
+            An array of shape ``(len(self), 3)`` with columns timestamp,
+            latitude and longitude. It is a copy once the buffer has
+            wrapped around, and a read-only view before.
+        """
+        if self._size < self.capacity:
+            view = self._data[: self._size]
+            view.flags.writeable = False
+            return view
+        return np.roll(self._data, -self._next, axis=0)
+
+    def last(self) -> Optional[IssPosition]:
+        """Return the most recent sample, if any."""
+        if not self._size:
+            return None
+        return IssPosition(*self._data[self._next - 1].tolist())
+
+    def distances_km(self) -> np.ndarray:
+        """Great-circle distance between consecutive samples, in kilometres."""
+        samples = self.samples()
+        return haversine_km(
+            samples[:-1, 1], samples[:-1, 2], samples[1:, 1], samples[1:, 2]
+        )
+
+    def speeds_kmh(self) -> np.ndarray:
+        """
+        Ground speed between consecutive samples, in kilometres per hour.
+
+        Intervals with no elapsed time (repeated timestamps) yield NaN.
+        """
+        samples = self.samples()
+        elapsed = np.diff(samples[:, 0])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speeds = self.distances_km() / elapsed * 3600.0
+        speeds[elapsed <= 0] = np.nan
+        return speeds
+
+
+def track(
+    buffer: PositionBuffer,
+    interval: float,
+    fetch: Optional[Callable[[], IssPosition]] = None,
+    max_samples: Optional[int] = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+    max_failures: int = MAX_CONSECUTIVE_FAILURES,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Poll the ISS position at a fixed rate and yield each sample.
+
+    Polls are scheduled against a fixed timetable, so slow requests do not
+    make the rate drift; a poll that overruns its slot is followed
+    immediately by the next one rather than by a burst of catch-up polls.
+    Failed polls are logged and skipped, until ``max_failures`` of them
+    fail in a row.
+
+    Args:
+        buffer: Ring buffer that receives every sample.
+        interval: Seconds between polls.
+        fetch: Callable returning the current position. Defaults to
+            ``fetch_iss_position``.
+        max_samples: Stop after this many samples (None polls forever).
+        clock: Monotonic clock, replaceable in tests.
+        sleep: Sleep function, replaceable in tests.
+        max_failures: Consecutive failed polls after which to give up.
+
+    Yields:
+        A row per sample with ``time``, ``latitude``, ``longitude`` and the
+        ``speed_kmh`` since the previous sample (None for the first).
+
+    Raises:
+        TrackingError: If ``max_failures`` polls in a row failed.
+    """
+    if interval <= 0:
+        raise ValueError("Tracking interval must be positive")
+    fetch = fetch or fetch_iss_position
+    count = 0
+    failures = 0
+    deadline = clock()
+    while max_samples is None or count < max_samples:
+        try:
+            position = fetch()
+        except Exception as e:
+            logger.warning(f"ISS position poll failed: {e}")
+            failures += 1
+            if failures >= max_failures:
+                raise TrackingError(
+                    f"{failures} ISS position polls failed in a row: {e}"
+                ) from e
+        else:
+            failures = 0
+            previous = buffer.last()
+            buffer.append(position)
+            count += 1
+            speed = None
+            if previous is not None and position.timestamp > previous.timestamp:
+                distance = haversine_km(
+                    previous.latitude,
+                    previous.longitude,
+                    position.latitude,
+                    position.longitude,
+                )
+                elapsed = position.timestamp - previous.timestamp
+                speed = round(float(distance) / elapsed * 3600.0, 1)
+            yield {
+                "time": position.timestamp,
+                "latitude": position.latitude,
+                "longitude": position.longitude,
+                "speed_kmh": speed,
+            }
+            if max_samples is not None and count >= max_samples:
+                return
+
+        deadline += interval
+        now = clock()
+        if deadline > now:
+            sleep(deadline - now)
+        else:
+            deadline = now
@@ -0,0 +1,232 @@
+"""
+Logging for the space package.
+
+``setup_logging`` routes every record through a ``QueueHandler``: the
+calling thread only puts the record on a bounded in-memory queue, and a
+``QueueListener`` thread formats and writes it. A slow or blocked stderr
+therefore never stalls a fetch; if the queue fills up, records are dropped
+and counted instead.
+
+API payloads are never formatted into log messages whole. ``PayloadSummary``
+describes a roster by its size and a content hash, and ``PayloadPreview``
+renders a size-bounded excerpt; both are passed as lazy %-style arguments,
+so they cost nothing unless the record is actually emitted. Records logged
+with ``extra=PAYLOAD`` are additionally sampled at ``payload_sample_rate``.
+"""
+
+import atexit
+import copy
+import hashlib
+import json
+import logging
+import queue
+import random
+import reprlib
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Mapping, Optional, TextIO
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Records waiting for the listener thread before new ones are dropped
+QUEUE_SIZE = 10_000
+
+# Marks a record as a payload log, subject to sampling:
+# logger.debug("Payload: %s", PayloadPreview(data), extra=PAYLOAD)
+PAYLOAD = {"payload": True}
+
+_listener: Optional[QueueListener] = None
+
+# Renders tracebacks before records are queued
+_EXCEPTIONS = logging.Formatter()
+
+
+class PayloadSummary:
+    """
+    Lazy one-line description of an ``/astros.json`` payload.
+
+    Formats as e.g. ``7 people on 2 craft (digest 3f2a9c1e)``; the work
+    happens only if a log record is actually emitted. Malformed payloads
+    are described too, never raised on.
+
+    Args:
+        data: Decoded response body.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+
+    def __str__(self) -> str:
+        if not isinstance(self.data, Mapping):
+            return f"{type(self.data).__name__} payload"
+        people = self.data.get("people")
+        if not isinstance(people, list):
+            return f"payload with keys {sorted(map(str, self.data))}"
+        digest = hashlib.blake2b(digest_size=4)
+        crafts = set()
+        for person in people:
+            if isinstance(person, Mapping):
+                name, craft = str(person.get("name")), str(person.get("craft"))
+                crafts.add(craft)
+            else:
+                name, craft = repr(person), ""
+            digest.update(f"{name}\0{craft}\n".encode("utf-8"))
+        return (
+            f"{len(people)} people on {len(crafts)} craft "
+            f"(digest {digest.hexdigest()})"
+        )
+
+
+class PayloadPreview:
+    """
+    Lazy, size-bounded ``repr`` of a payload.
+
+    Long lists, dicts and strings are cut short with ``...``, so the output
+    stays small however large the payload is.
+
+    Args:
+        data: Any decoded JSON value.
+    """
+
+    __slots__ = ("data",)
+
+    _repr = reprlib.Repr()
+    _repr.maxlevel = 3
+    _repr.maxlist = 5
+    _repr.maxdict = 5
+    _repr.maxstring = 60
+    _repr.maxother = 60
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+
+    def __str__(self) -> str:
+        return self._repr.repr(self.data)
+
+
+class PayloadSampler(logging.Filter):
+    """
+    Let through only a fraction of payload records.
+
+    Args:
+        rate: Fraction (0-1) of records marked with ``PAYLOAD`` to keep.
+            Other records always pass.
+    """
+
+    def __init__(self, rate: float = 1.0) -> None:
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "payload", False) or self.rate >= 1:
+            return True
+        return random.random() < self.rate
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that counts and drops records when the queue is full."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The base class folds the traceback into the message; render it
+        # into exc_text instead, so the formatter (JSON included) places it
+        record = copy.copy(record)
+        record.message = record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or _EXCEPTIONS.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as one JSON object per line, span fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        moment = datetime.fromtimestamp(record.created, tz=timezone.utc)
+        entry: Dict[str, Any] = {
+            "time": moment.isoformat(timespec="milliseconds").replace("+00:00", "Z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "span", None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(
+    level: int = logging.WARNING,
+    json_format: bool = False,
+    payload_sample_rate: float = 1.0,
+    stream: Optional[TextIO] = None,
+) -> None:
+    """
+    Send log records through a background thread.
+
+    Like ``logging.basicConfig``, this does nothing if the root logger
+    already has handlers (for instance under pytest), apart from setting
+    the level.
+
+    Args:
+        level: Root logger level.
+        json_format: Write one JSON object per record instead of text.
+        payload_sample_rate: Fraction of payload records to keep.
+        stream: Where records are written. Defaults to ``sys.stderr``.
+    """
+    global _listener
+    root = logging.getLogger()
+    root.setLevel(level)
+    if root.handlers:
+        return
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(
+        JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT, DATE_FORMAT)
+    )
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(QUEUE_SIZE)
+    handler = _DroppingQueueHandler(log_queue)
+    handler.addFilter(PayloadSampler(payload_sample_rate))
+    root.addHandler(handler)
+
+    stop_logging()
+    _listener = QueueListener(log_queue, output)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread, if running."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def dropped_records() -> int:
+    """Return how many records were dropped because the queue was full."""
+    return sum(
+        handler.dropped
+        for handler in logging.getLogger().handlers
+        if isinstance(handler, _DroppingQueueHandler)
+    )
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,295 @@
+"""
+Failover and hedged requests across several API mirrors.
+
+``MirrorPool`` sends each request to the first healthy mirror in the
+configured order. If that mirror has not answered within its recent p95
+latency, a hedged copy of the request goes to the next mirror and the
+first successful response wins; a mirror that fails is skipped straight
+away. Latency percentiles, failures, hedges and wins are tracked per
+mirror and exposed through ``MirrorPool.stats()``.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per mirror for the percentile estimates
+LATENCY_WINDOW = 128
+
+# Samples needed before a mirror's own p95 replaces the initial hedge delay
+MIN_LATENCY_SAMPLES = 8
+
+# Consecutive failures after which a mirror is tried last, and for how long
+UNHEALTHY_AFTER = 3
+UNHEALTHY_COOLDOWN = 30.0
+
+
+@dataclass(frozen=True)
+class MirrorStats:
+    """Health and latency of one mirror, for monitoring."""
+
+    url: str
+    healthy: bool
+    requests: int
+    failures: int
+    hedges: int
+    wins: int
+    p50: Optional[float]
+    p95: Optional[float]
+
+
+class Mirror:
+    """
+    Running health and latency estimates for one base URL.
+
+    Args:
+        url: The mirror's base URL.
+        clock: Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(self, url: str, clock: Callable[[], float] = time.monotonic) -> None:
+        self.url = url.rstrip("/")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._failures = 0
+        self._consecutive_failures = 0
+        self._failed_at = 0.0
+        self._hedges = 0
+        self._wins = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Return the ``q`` quantile (0-1) of recent latencies, if any."""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def hedge_delay(self, default: float) -> float:
+        """Seconds to wait for this mirror before hedging to the next one."""
+        with self._lock:
+            enough = len(self._latencies) >= MIN_LATENCY_SAMPLES
+        p95 = self.percentile(0.95) if enough else None
+        return default if p95 is None else p95
+
+    @property
+    def healthy(self) -> bool:
+        """False while the mirror is cooling down after repeated failures."""
+        with self._lock:
+            return (
+                self._consecutive_failures < UNHEALTHY_AFTER
+                or self._clock() - self._failed_at >= UNHEALTHY_COOLDOWN
+            )
+
+    def record_success(self, latency: float) -> None:
+        """Account a response received after ``latency`` seconds."""
+        with self._lock:
+            self._requests += 1
+            self._latencies.append(latency)
+            self._consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        """Account a failed request."""
+        with self._lock:
+            self._requests += 1
+            self._failures += 1
+            self._consecutive_failures += 1
+            self._failed_at = self._clock()
+
+    def record_win(self) -> None:
+        """Account a response that was used (the first to arrive)."""
+        with self._lock:
+            self._wins += 1
+
+    def record_hedge(self) -> None:
+        """Account a hedged request sent to this mirror."""
+        with self._lock:
+            self._hedges += 1
+
+    def stats(self) -> MirrorStats:
+        """Return a snapshot of the mirror's counters and estimates."""
+        with self._lock:
+            counters = (self._requests, self._failures, self._hedges, self._wins)
+        return MirrorStats(
+            self.url,
+            self.healthy,
+            *counters,
+            p50=self.percentile(0.5),
+            p95=self.percentile(0.95),
+        )
+
+
+class MirrorPool:
+    """
+    Ordered mirrors with failover and p95-based request hedging.
+
+    Args:
+        urls: Mirror base URLs, most preferred first.
+        hedge_delay: Seconds to wait before hedging while a mirror has too
+            few latency samples for its own p95.
+        clock: Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        hedge_delay: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not urls:
+            raise ValueError("MirrorPool needs at least one mirror URL")
+        self.mirrors = [Mirror(url, clock) for url in urls]
+        self.hedge_delay = hedge_delay
+        self._executor = ThreadPoolExecutor(
+            max_workers=2 * len(self.mirrors), thread_name_prefix="space-mirror"
+        )
+
+    def close(self) -> None:
+        """Stop the worker threads once in-flight requests finish."""
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> List[MirrorStats]:
+        """Return a snapshot of every mirror's stats, in configured order."""
+        return [mirror.stats() for mirror in self.mirrors]
+
+    def ordered(self) -> List[Mirror]:
+        """Return healthy mirrors in configured order, then unhealthy ones."""
+        healthy = [mirror for mirror in self.mirrors if mirror.healthy]
+        return healthy + [mirror for mirror in self.mirrors if mirror not in healthy]
+
+    def request(
+        self, path: str, send: Callable[[str], requests.Response]
+    ) -> requests.Response:
+        """
+        Request ``path`` from the mirrors, hedging slow ones.
+
+        Args:
+            path: Path (and query) appended to each mirror's base URL.
+            send: Performs one request to an absolute URL and returns the
+                response, raising on transport or HTTP errors.
+
+        Returns:
+            The first successful response.
+
+        Raises:
+            requests.exceptions.RequestException: The last error, if every
+                mirror failed.
+        """
+        order = self.ordered()
+        pending: Dict["Future[requests.Response]", Mirror] = {}
+        next_index = 0
+        last_error: Optional[BaseException] = None
+
+        def launch(hedged: bool) -> Mirror:
+            nonlocal next_index
+            mirror = order[next_index]
+            next_index += 1
+            if hedged:
+                mirror.record_hedge()
+                logger.debug(f"Hedging request for {path} to {mirror.url}")
+            # Run in a copy of the caller's context so the call deadline and
+            # span nesting carry over to the worker thread
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, _attempt, mirror, path, send)
+            pending[future] = mirror
+            return mirror
+
+        current = launch(hedged=False)
+        while pending:
+            can_hedge = next_index < len(order)
+            timeout = current.hedge_delay(self.hedge_delay) if can_hedge else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                current = launch(hedged=True)
+                continue
+            for future in done:
+                mirror = pending.pop(future)
+                error = future.exception()
+                if error is not None:
+                    logger.warning(f"Mirror {mirror.url} failed: {error}")
+                    last_error = error
+                    continue
+                mirror.record_win()
+                for loser in pending:
+                    # Requests can't be interrupted mid-flight; release the
+                    # loser's connection as soon as its response arrives
+                    if not loser.cancel():
+                        loser.add_done_callback(_close_response)
+                return future.result()
+            if not pending and next_index < len(order):
+                current = launch(hedged=False)
+        assert last_error is not None
+        raise last_error
+
+
+def _attempt(
+    mirror: Mirror, path: str, send: Callable[[str], requests.Response]
+) -> requests.Response:
+    """Send one request to ``mirror``, recording its outcome and latency."""
+    start = time.perf_counter()
+    try:
+        response = send(mirror.url + path)
+    except Exception:
+        mirror.record_failure()
+        raise
+    mirror.record_success(time.perf_counter() - start)
+    return response
+
+
+def _close_response(future: "Future[requests.Response]") -> None:
+    """Release the connection of a response nobody is waiting for."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def render_mirror_metrics(stats: Iterable[MirrorStats]) -> List[str]:
+    """
+    Render mirror stats as Prometheus text-format lines.
+
+    Args:
+        stats: Snapshots from ``MirrorPool.stats()``.
+
+    Returns:
+        The metric lines, without a trailing newline; empty without stats.
+    """
+    stats = list(stats)
+    if not stats:
+        return []
+    families = [
+        ("up", "gauge", "Whether the mirror is considered healthy.", "healthy"),
+        ("requests_total", "counter", "Requests sent to the mirror.", "requests"),
+        ("failures_total", "counter", "Failed requests to the mirror.", "failures"),
+        ("hedges_total", "counter", "Hedged requests sent to the mirror.", "hedges"),
+        ("wins_total", "counter", "Responses from the mirror that were used.", "wins"),
+    ]
+    lines: List[str] = []
+    for suffix, kind, help_text, attribute in families:
+        name = f"space_mirror_{suffix}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for mirror in stats:
+            count = int(getattr(mirror, attribute))
+            lines.append(f'{name}{{mirror="{mirror.url}"}} {count}')
+    name = "space_mirror_latency_seconds"
+    lines += [
+        f"# HELP {name} Recent response latency quantiles.",
+        f"# TYPE {name} gauge",
+    ]
+    for mirror in stats:
+        for quantile, latency in (("0.5", mirror.p50), ("0.95", mirror.p95)):
+            if latency is not None:
+                lines.append(
+                    f'{name}{{mirror="{mirror.url}",quantile="{quantile}"}} '
+                    f"{latency:.6f}"
+                )
+    return lines
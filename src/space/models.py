@@ -0,0 +1,330 @@
+"""
+Compact record types for astronaut rosters.
+
+``Astronaut`` is an immutable, slotted record that still reads like the
+API's ``{"name": ..., "craft": ...}`` dicts. ``Roster`` stores a whole
+snapshot column-wise: a tuple of interned names and an array of small
+integer craft codes into a table of interned craft names. Keeping many
+snapshots of the same people therefore costs a few bytes per person per
+snapshot instead of a dict each.
+
+Rosters also answer repeated queries (people on a craft, "is X in space",
+per-craft counts) from hash indexes built on the first query and reused
+for the life of the roster.
+"""
+
+import sys
+import unicodedata
+from array import array
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+_FIELDS = ("name", "craft")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a name for lookups.
+
+    Accents are stripped, case is folded and runs of whitespace collapse to
+    one space, so ``"  jérôme  LE bRIS"`` matches ``"Jerome Le Bris"``.
+
+    Args:
+        name: A person's name, or a craft name.
+
+    Returns:
+        The lookup key for ``name``.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+class Astronaut(Mapping[str, str]):
+    """
+    An immutable person record with dict-style read access.
+
+    ``astronaut.name`` and ``astronaut["name"]`` are equivalent, and an
+    ``Astronaut`` compares equal to the matching API dict, so code written
+    against the dicts returned by ``fetch_people_in_space`` keeps working.
+
+    Args:
+        name: The person's name.
+        craft: The spacecraft the person is on.
+    """
+
+    __slots__ = _FIELDS
+
+    name: str
+    craft: str
+
+    def __init__(self, name: str, craft: str) -> None:
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "craft", craft)
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        raise AttributeError("Astronaut records are immutable")
+
+    def __delattr__(self, key: str) -> None:
+        raise AttributeError("Astronaut records are immutable")
+
+    def __getitem__(self, key: str) -> str:
+        if key not in _FIELDS:
+            raise KeyError(key)
+        value: str = getattr(self, key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_FIELDS)
+
+    def __len__(self) -> int:
+        return len(_FIELDS)
+
+    def __hash__(self) -> int:
+        return hash((self.name, self.craft))
+
+    def __repr__(self) -> str:
+        return f"Astronaut(name={self.name!r}, craft={self.craft!r})"
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, str]]:
+        return (Astronaut, (self.name, self.craft))
+
+    def to_dict(self) -> Dict[str, str]:
+        """Return the record as a plain API-style dict."""
+        return {"name": self.name, "craft": self.craft}
+
+    @classmethod
+    def from_dict(cls, person: Mapping[str, Any]) -> "Astronaut":
+        """Build a record from an API dict, interning its strings."""
+        return cls(sys.intern(person["name"]), sys.intern(person["craft"]))
+
+
+class Roster(Sequence[Astronaut]):
+    """
+    A column-oriented, immutable snapshot of the people in space.
+
+    Indexing and iteration produce ``Astronaut`` records on demand. The
+    ``names``, ``craft_codes`` and ``crafts`` attributes expose the columnar
+    storage directly for bulk processing.
+
+    ``on_craft``, ``find``, ``has_name``, ``filter`` and ``craft_counts``
+    use indexes on craft and on normalized name that are built by the first
+    query; later queries are dictionary lookups.
+
+    Args:
+        people: Person records (API dicts or ``Astronaut`` objects). Any
+            iterable works, including the ``iter_people_in_space`` stream.
+    """
+
+    __slots__ = ("names", "craft_codes", "crafts", "_index")
+
+    names: Tuple[str, ...]
+    craft_codes: "array[int]"
+    crafts: Tuple[str, ...]
+    _index: Optional["_RosterIndex"]
+
+    def __init__(self, people: Iterable[Mapping[str, Any]] = ()) -> None:
+        names: List[str] = []
+        codes = array("H")
+        craft_ids: Dict[str, int] = {}
+        for person in people:
+            craft = person["craft"]
+            code = craft_ids.get(craft)
+            if code is None:
+                code = craft_ids[craft] = len(craft_ids)
+            names.append(sys.intern(person["name"]))
+            codes.append(code)
+        self.names = tuple(names)
+        self.craft_codes = codes
+        self.crafts = tuple(sys.intern(craft) for craft in craft_ids)
+        self._index = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @overload
+    def __getitem__(self, index: int) -> Astronaut: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "Roster": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Astronaut, "Roster"]:
+        if isinstance(index, slice):
+            return self._take(range(*index.indices(len(self))))
+        return Astronaut(self.names[index], self.crafts[self.craft_codes[index]])
+
+    def __iter__(self) -> Iterator[Astronaut]:
+        crafts = self.crafts
+        for name, code in zip(self.names, self.craft_codes):
+            yield Astronaut(name, crafts[code])
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, Mapping):
+            return False
+        name, craft = item.get("name"), item.get("craft")
+        if not isinstance(name, str):
+            return False
+        index = self._get_index()
+        for i in index.names.get(normalize_name(name), ()):
+            if self.names[i] == name and self.crafts[self.craft_codes[i]] == craft:
+                return True
+        return False
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Roster):
+            return self.columns() == other.columns()
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.names, tuple(self.crafts_column())))
+
+    def __repr__(self) -> str:
+        return f"Roster({len(self)} people on {len(self.crafts)} craft)"
+
+    def __reduce__(self) -> Tuple[Any, Tuple[List[Astronaut]]]:
+        return (Roster, (list(self),))
+
+    def crafts_column(self) -> Iterator[str]:
+        """Yield the craft of every person, in roster order."""
+        crafts = self.crafts
+        return (crafts[code] for code in self.craft_codes)
+
+    def columns(self) -> Dict[str, List[str]]:
+        """
+        Return the roster as parallel columns.
+
+        Returns:
+            ``{"name": [...], "craft": [...]}`` with one entry per person.
+        """
+        return {"name": list(self.names), "craft": list(self.crafts_column())}
+
+    def to_dicts(self) -> List[Dict[str, str]]:
+        """Return the roster as the list of dicts the API returns."""
+        return [
+            {"name": name, "craft": craft}
+            for name, craft in zip(self.names, self.crafts_column())
+        ]
+
+    def _get_index(self) -> "_RosterIndex":
+        index = self._index
+        if index is None:
+            # Building twice under a race is harmless: both results are equal
+            index = self._index = _RosterIndex(self)
+        return index
+
+    def _take(self, positions: Sequence[int]) -> "Roster":
+        """Build a sub-roster from positions, reusing the interned strings."""
+        roster = Roster()
+        codes: Dict[int, int] = {}
+        crafts: List[str] = []
+        for i in positions:
+            code = self.craft_codes[i]
+            if code not in codes:
+                codes[code] = len(crafts)
+                crafts.append(self.crafts[code])
+            roster.craft_codes.append(codes[code])
+        roster.names = tuple(self.names[i] for i in positions)
+        roster.crafts = tuple(crafts)
+        return roster
+
+    def on_craft(self, craft: str) -> "Roster":
+        """
+        Return the people on one craft.
+
+        Args:
+            craft: Craft name, matched like ``normalize_name`` (so ``"iss"``
+                finds ``"ISS"``).
+
+        Returns:
+            The matching people, in roster order; empty for an unknown craft.
+        """
+        index = self._get_index()
+        return index.by_craft.get(normalize_name(craft), _EMPTY)
+
+    def find(self, name: str) -> "Roster":
+        """
+        Return the people with a given name.
+
+        Args:
+            name: Name to look up, compared after ``normalize_name``.
+
+        Returns:
+            The matching people, in roster order.
+        """
+        positions = self._get_index().names.get(normalize_name(name))
+        return self._take(positions) if positions else _EMPTY
+
+    def has_name(self, name: str) -> bool:
+        """Return whether anyone on the roster has ``name`` (normalized)."""
+        return normalize_name(name) in self._get_index().names
+
+    def filter(
+        self, craft: Optional[str] = None, name: Optional[str] = None
+    ) -> "Roster":
+        """
+        Return the people matching every given criterion.
+
+        Args:
+            craft: Keep only people on this craft.
+            name: Keep only people with this name.
+
+        Returns:
+            The matching people, in roster order. With no criteria the
+            roster itself is returned.
+        """
+        if name is None:
+            return self if craft is None else self.on_craft(craft)
+        index = self._get_index()
+        positions = index.names.get(normalize_name(name), ())
+        if craft is not None:
+            key = normalize_name(craft)
+            positions = tuple(
+                i for i in positions if index.craft_keys[self.craft_codes[i]] == key
+            )
+        return self._take(positions) if positions else _EMPTY
+
+    def craft_counts(self) -> Dict[str, int]:
+        """
+        Count the people on each craft.
+
+        Returns:
+            ``{craft: count}`` in order of first appearance on the roster.
+        """
+        return dict(self._get_index().counts)
+
+
+class _RosterIndex:
+    """Hash indexes over one roster, built once and never mutated."""
+
+    __slots__ = ("craft_keys", "by_craft", "names", "counts")
+
+    def __init__(self, roster: Roster) -> None:
+        self.craft_keys = tuple(normalize_name(craft) for craft in roster.crafts)
+        craft_positions: Dict[str, List[int]] = {}
+        names: Dict[str, List[int]] = {}
+        counts = [0] * len(roster.crafts)
+        for i, (name, code) in enumerate(zip(roster.names, roster.craft_codes)):
+            craft_positions.setdefault(self.craft_keys[code], []).append(i)
+            names.setdefault(normalize_name(name), []).append(i)
+            counts[code] += 1
+        self.by_craft = {
+            key: roster._take(positions) for key, positions in craft_positions.items()
+        }
+        self.names = {key: tuple(positions) for key, positions in names.items()}
+        self.counts = tuple(zip(roster.crafts, counts))
+
+
+_EMPTY = Roster()
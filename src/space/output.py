@@ -0,0 +1,111 @@
+"""
+Machine-readable roster output (JSON, NDJSON and CSV).
+
+Rows are written to the stream one at a time as they are produced, and
+nothing here imports ``rich``, so piping ``space`` into other tools stays
+cheap.
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TextIO
+
+FORMATS = ("table", "json", "ndjson", "csv")
+DEFAULT_FIELDS = ["name", "craft"]
+
+_SEPARATORS = (",", ":")
+
+
+def project(person: Mapping[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """
+    Keep only ``fields`` of a person record, in the requested order.
+
+    Args:
+        person: A person record from the API.
+        fields: Field names to keep. Missing fields become None.
+
+    Returns:
+        The projected record.
+    """
+    return {field: person.get(field) for field in fields}
+
+
+def write_people(
+    people: Iterable[Mapping[str, Any]],
+    fmt: str,
+    stream: TextIO,
+    fields: Optional[List[str]] = None,
+) -> int:
+    """
+    Stream person records to ``stream`` in a machine-readable format.
+
+    Args:
+        people: Person records; consumed lazily.
+        fmt: One of ``json``, ``ndjson`` or ``csv``.
+        stream: Text stream to write to.
+        fields: Fields to output. Defaults to ``name`` and ``craft``.
+
+    Returns:
+        Number of records written.
+
+    Raises:
+        ValueError: If ``fmt`` is not a streaming format.
+    """
+    fields = fields or DEFAULT_FIELDS
+    count = 0
+
+    if fmt == "ndjson":
+        for person in people:
+            stream.write(json.dumps(project(person, fields), separators=_SEPARATORS))
+            stream.write("\n")
+            count += 1
+    elif fmt == "json":
+        stream.write("[")
+        for person in people:
+            if count:
+                stream.write(",")
+            stream.write(json.dumps(project(person, fields), separators=_SEPARATORS))
+            count += 1
+        stream.write("]\n")
+    elif fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        for person in people:
+            writer.writerow(person)
+            count += 1
+    else:
+        raise ValueError(f"Unsupported output format: {fmt}")
+
+    return count
+
+
+def count_people(count: int) -> str:
+    """
+    Describe a number of people, e.g. ``1 person`` or ``3 people``.
+
+    Args:
+        count: How many people there are.
+
+    Returns:
+        The count followed by the matching noun.
+    """
+    return f"{count} {'person' if count == 1 else 'people'}"
+
+
+def parse_fields(value: str) -> List[str]:
+    """
+    Parse a comma-separated ``--fields`` value.
+
+    Args:
+        value: Raw option value, e.g. ``"name,craft"``.
+
+    Returns:
+        The field names, with surrounding whitespace removed.
+
+    Raises:
+        ValueError: If no field names are given.
+    """
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    if not fields:
+        raise ValueError("--fields needs at least one field name")
+    return fields
@@ -0,0 +1,490 @@
+"""
+Virtualized, paginated table output for large rosters.
+
+The default table view builds one Rich table of every row before printing
+anything, which for a very large roster takes seconds and holds every
+cell in memory. ``page_table`` only ever renders the rows that fit on the
+screen:
+
+- Rows are pulled from the roster's iterator as they are needed and kept
+  in a ``LazyRows`` buffer, so the first screen shows as soon as its rows
+  are parsed, however large the roster is.
+- Column widths come from the first ``SAMPLE_ROWS`` rows instead of a scan
+  of all of them; longer cells are cut short with an ellipsis.
+- On a terminal, a built-in pager shows one screen at a time: space/b
+  page, j/k (or the arrow keys) scroll, g/G jump to the top or the end,
+  ``/`` searches forward (case and accents are ignored), n repeats the
+  search and q quits. Otherwise the rows are written a page at a time.
+"""
+
+import os
+import sys
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+from rich import box
+from rich.cells import cell_len
+from rich.console import Group
+from rich.table import Table
+from rich.text import Text
+
+from space.models import normalize_name
+from space.output import count_people
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+try:
+    import termios
+    import tty
+except ImportError:  # pragma: no cover - Windows
+    termios = None  # type: ignore[assignment]
+
+# Rows measured to size the columns
+SAMPLE_ROWS = 200
+
+# Rows written at a time when not paging interactively
+PAGE_ROWS = 500
+
+# Narrowest a column is squeezed to when the screen is too narrow
+MIN_COLUMN_WIDTH = 4
+
+# Screen lines that are not rows: heading, column titles, rule, status line
+CHROME_LINES = 4
+
+STATUS_KEYS = "space/b page · j/k line · g/G top/end · / search · n next · q quit"
+
+Row = Mapping[str, Any]
+
+
+class LazyRows:
+    """
+    Rows read from an iterator only as far as they are asked for.
+
+    Rows already read are kept, so paging back costs nothing.
+
+    Args:
+        rows: The rows, consumed lazily.
+    """
+
+    def __init__(self, rows: Iterable[Row]) -> None:
+        self._iterator: Iterator[Row] = iter(rows)
+        self._rows: List[Row] = []
+        self.exhausted = False
+
+    def __len__(self) -> int:
+        """Number of rows read so far."""
+        return len(self._rows)
+
+    def fetch(self, count: int) -> int:
+        """
+        Read rows until ``count`` are buffered or the iterator runs out.
+
+        Returns:
+            The number of rows buffered.
+        """
+        while len(self._rows) < count and not self.exhausted:
+            try:
+                self._rows.append(next(self._iterator))
+            except StopIteration:
+                self.exhausted = True
+        return len(self._rows)
+
+    def fetch_all(self) -> int:
+        """Read every remaining row; return the total."""
+        return self.fetch(sys.maxsize)
+
+    def window(self, start: int, stop: int) -> List[Row]:
+        """Return rows ``start`` to ``stop`` (fewer at the end)."""
+        self.fetch(stop)
+        return self._rows[start:stop]
+
+    def drain(self) -> Iterator[Row]:
+        """Yield every row once, without keeping them, for one-pass output."""
+        buffered, self._rows = self._rows, []
+        yield from buffered
+        yield from self._iterator
+        self.exhausted = True
+
+    def find(self, text: str, fields: Sequence[str], start: int) -> Optional[int]:
+        """
+        Find the first row from ``start`` with ``text`` in one of ``fields``.
+
+        Rows are read as far as needed, and no further.
+
+        Args:
+            text: What to look for; case, accents and spacing are ignored.
+            fields: Fields searched.
+            start: Index of the first row searched.
+
+        Returns:
+            The row's index, or None if no later row matches.
+        """
+        needle = normalize_name(text)
+        index = start
+        while self.fetch(index + 1) > index:
+            row = self._rows[index]
+            for field in fields:
+                if needle in normalize_name(str(row.get(field, ""))):
+                    return index
+            index += 1
+        return None
+
+
+def _cell(row: Row, field: str) -> str:
+    return str(row.get(field, ""))
+
+
+def measure_columns(
+    sample: Sequence[Row], fields: Sequence[str], titles: Sequence[str], width: int
+) -> List[int]:
+    """
+    Size the columns from a sample of rows, to fit ``width`` if possible.
+
+    Args:
+        sample: Rows measured; later rows are cut to fit.
+        fields: Fields shown, in order.
+        titles: Column titles, measured too.
+        width: Screen width available to the table.
+
+    Returns:
+        The width of each column, in terminal cells.
+    """
+    widths = [
+        max([cell_len(title)] + [cell_len(_cell(row, field)) for row in sample])
+        for field, title in zip(fields, titles)
+    ]
+    # Two cells of padding per column and one between columns
+    available = width - (3 * len(widths) - 1)
+    while sum(widths) > available:
+        widest = max(range(len(widths)), key=widths.__getitem__)
+        if widths[widest] <= MIN_COLUMN_WIDTH:
+            break
+        widths[widest] -= 1
+    return widths
+
+
+class TableLayout:
+    """
+    Fixed column layout shared by every page of one table.
+
+    Args:
+        fields: Fields shown, in order.
+        columns: Title and style of each known field.
+        sample: Rows used to size the columns.
+        width: Screen width.
+        index_width: Cells kept for the row numbers.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        columns: Mapping[str, Any],
+        sample: Sequence[Row],
+        width: int,
+        index_width: int = 6,
+    ) -> None:
+        self.fields = list(fields)
+        self.titles = ["#"]
+        self.styles: List[Optional[str]] = ["dim"]
+        for field in self.fields:
+            title, style = columns.get(field, (field.replace("_", " ").title(), None))
+            self.titles.append(title)
+            self.styles.append(style)
+        self.widths = measure_columns(
+            [{"#": "9" * index_width}, *sample],
+            ["#", *self.fields],
+            self.titles,
+            width,
+        )
+
+    def render(self, rows: Sequence[Row], first: int, header: bool = True) -> Table:
+        """
+        Render one page of rows.
+
+        Args:
+            rows: The page's rows.
+            first: Number of the first row, counting from 1.
+            header: Show the column titles.
+
+        Returns:
+            A table one line per row, plus two for the titles.
+        """
+        table = Table(
+            box=box.SIMPLE_HEAD,
+            show_edge=False,
+            show_header=header,
+            header_style="bold magenta",
+        )
+        for title, style, width in zip(self.titles, self.styles, self.widths):
+            table.add_column(
+                title, style=style, width=width, no_wrap=True, overflow="ellipsis"
+            )
+        for number, row in enumerate(rows, first):
+            table.add_row(str(number), *(_cell(row, field) for field in self.fields))
+        return table
+
+
+class Pager:
+    """
+    Interactive pager over a lazily read table.
+
+    Args:
+        console: Console drawn on; its height sets the page size.
+        rows: The rows.
+        layout: Column layout.
+        heading: Title shown above the table.
+        total: Number of rows, if known up front.
+    """
+
+    def __init__(
+        self,
+        console: "Console",
+        rows: LazyRows,
+        layout: TableLayout,
+        heading: str,
+        total: Optional[int] = None,
+    ) -> None:
+        self.console = console
+        self.rows = rows
+        self.layout = layout
+        self.heading = heading
+        self.total = total
+        self.top = 0
+        self.message = ""
+        self.query = ""
+        # Search text being typed after "/", or None
+        self.prompt: Optional[str] = None
+
+    @property
+    def page_size(self) -> int:
+        """Rows shown per screen."""
+        return max(1, self.console.size.height - CHROME_LINES)
+
+    def _count(self) -> str:
+        if self.total is not None:
+            return f"{self.total:,}"
+        if self.rows.exhausted:
+            return f"{len(self.rows):,}"
+        return f"{len(self.rows):,}+"
+
+    def render(self) -> Group:
+        """Render the current screen."""
+        rows = self.rows.window(self.top, self.top + self.page_size)
+        heading = Text(
+            f"🚀 {self.heading}: {self._count()}", style="bold cyan", justify="left"
+        )
+        table = self.layout.render(rows, self.top + 1)
+        if self.prompt is not None:
+            status = Text(f"/{self.prompt}", style="bold")
+        else:
+            last = self.top + len(rows)
+            status = Text(
+                f"rows {self.top + 1 if rows else 0:,}–{last:,} of {self._count()}"
+                f"  {self.message or STATUS_KEYS}",
+                style="reverse",
+                no_wrap=True,
+                overflow="ellipsis",
+            )
+        parts: List[Any] = [heading, table]
+        # Short pages are padded so the status line stays at the bottom
+        blank = self.page_size - len(rows)
+        if blank > 0:
+            parts.append(Text("\n" * (blank - 1)))
+        return Group(*parts, status)
+
+    def _scroll(self, offset: int) -> None:
+        available = self.rows.fetch(self.top + offset + self.page_size)
+        self.top = max(0, min(self.top + offset, available - self.page_size))
+
+    def _search(self, start: int) -> None:
+        if not self.query:
+            return
+        found = self.rows.find(self.query, self.layout.fields, start)
+        if found is None:
+            self.message = f"Not found: {self.query}"
+        else:
+            self.top = found
+            self._scroll(0)
+
+    def handle(self, key: str) -> bool:
+        """
+        Act on one key press.
+
+        Args:
+            key: A character, or ``up``, ``down``, ``pgup``, ``pgdn``,
+                ``home``, ``end``, ``enter``, ``backspace`` or ``esc``.
+
+        Returns:
+            False once the pager should close.
+        """
+        self.message = ""
+        if self.prompt is not None:
+            if key == "enter":
+                self.query, self.prompt = self.prompt, None
+                self._search(self.top + 1)
+            elif key == "esc":
+                self.prompt = None
+            elif key == "backspace":
+                self.prompt = self.prompt[:-1]
+            elif len(key) == 1 and key.isprintable():
+                self.prompt += key
+            return True
+        if key in ("q", "Q", "esc"):
+            return False
+        if key in (" ", "f", "pgdn"):
+            self._scroll(self.page_size)
+        elif key in ("b", "pgup"):
+            self._scroll(-self.page_size)
+        elif key in ("j", "down", "enter"):
+            self._scroll(1)
+        elif key in ("k", "up"):
+            self._scroll(-1)
+        elif key in ("g", "<", "home"):
+            self.top = 0
+        elif key in ("G", ">", "end"):
+            self.top = max(0, self.rows.fetch_all() - self.page_size)
+        elif key == "/":
+            self.prompt = ""
+        elif key == "n":
+            self._search(self.top + 1)
+        return True
+
+    def run(self, read_key: Callable[[], str]) -> None:
+        """Show screens until the user quits or ``read_key`` runs dry."""
+        with self.console.screen(hide_cursor=True) as screen:
+            while True:
+                screen.update(self.render())
+                try:
+                    key = read_key()
+                except EOFError:
+                    return
+                if not self.handle(key):
+                    return
+
+
+# Escape sequences of the keys the pager knows
+_ESCAPES = {
+    "[A": "up",
+    "[B": "down",
+    "[H": "home",
+    "[F": "end",
+    "[5~": "pgup",
+    "[6~": "pgdn",
+    "OA": "up",
+    "OB": "down",
+    "OH": "home",
+    "OF": "end",
+}
+
+
+def _read_key(fd: int) -> str:
+    """Read one key press from a terminal in cbreak mode."""
+    import select
+
+    data = os.read(fd, 1)
+    if not data:
+        raise EOFError
+    if data == b"\x1b":
+        # A lone Esc, or the start of an escape sequence
+        sequence = b""
+        while select.select([fd], [], [], 0.05)[0]:
+            sequence += os.read(fd, 1)
+            if sequence[-1:].isalpha() or sequence[-1:] == b"~":
+                break
+        return _ESCAPES.get(sequence.decode("ascii", "replace"), "esc")
+    if data in (b"\r", b"\n"):
+        return "enter"
+    if data in (b"\x7f", b"\x08"):
+        return "backspace"
+    # Complete a UTF-8 character
+    extra = 3 if data[0] >= 0xF0 else 2 if data[0] >= 0xE0 else int(data[0] >= 0xC0)
+    if extra:
+        data += os.read(fd, extra)
+    return data.decode("utf-8", "replace")
+
+
+def _interactive(console: "Console") -> bool:
+    """Whether keys can be read and screens drawn."""
+    return (
+        termios is not None
+        and console.is_terminal
+        and not console.is_dumb_terminal
+        and sys.stdin.isatty()
+    )
+
+
+def page_table(
+    console: "Console",
+    people: Iterable[Row],
+    fields: Sequence[str],
+    columns: Mapping[str, Any],
+    heading: str,
+    total: Optional[int] = None,
+    read_key: Optional[Callable[[], str]] = None,
+) -> int:
+    """
+    Show rows as a table, rendering only what fits on the screen.
+
+    With ``read_key``, or on a terminal, rows are paged interactively;
+    otherwise they are written ``PAGE_ROWS`` at a time.
+
+    Args:
+        console: Where to draw.
+        people: Rows to show; read lazily.
+        fields: Columns to show, in order.
+        columns: Title and style of each known field.
+        heading: Title printed above the table.
+        total: Number of rows, if known up front.
+        read_key: Source of key presses, instead of the terminal.
+
+    Returns:
+        Number of rows read.
+    """
+    rows = LazyRows(people)
+    rows.fetch(SAMPLE_ROWS)
+    # Room for seven-digit row numbers unless the total is known
+    index_width = max(6, len(str(total)) if total is not None else 7)
+    layout = TableLayout(
+        fields, columns, rows.window(0, SAMPLE_ROWS), console.width, index_width
+    )
+
+    if read_key is not None:
+        Pager(console, rows, layout, heading, total).run(read_key)
+        return len(rows)
+    if _interactive(console):
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            Pager(console, rows, layout, heading, total).run(lambda: _read_key(fd))
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+        return len(rows)
+
+    if total is not None:
+        console.print(f"\n[bold cyan]🚀 {heading}: {total}[/bold cyan]\n")
+    else:
+        console.print(f"\n[bold cyan]🚀 {heading}[/bold cyan]\n")
+    start = 0
+    stream = rows.drain()
+    while True:
+        page = list(islice(stream, PAGE_ROWS))
+        if not page:
+            break
+        console.print(layout.render(page, start + 1, header=start == 0))
+        start += len(page)
+    if total is None:
+        console.print(f"\n[bold cyan]{count_people(start)}[/bold cyan]")
+    console.print()
+    return start
@@ -0,0 +1,230 @@
+"""
+Batch ISS visibility windows for many observers.
+
+Given a ground track of ISS position samples (from ``space track`` or a
+``PositionBuffer``) and an ``(N, 2)`` array of observer latitudes and
+longitudes, ``find_passes`` computes the ISS elevation above every
+observer's horizon at every sample with array operations, and reports each
+run of samples above the minimum elevation as a visibility window.
+
+Observers are processed in chunks so memory stays bounded however many
+there are. Requires the optional ``numpy`` dependency
+(``pip install space[track]``).
+"""
+
+import csv
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from space.iss import EARTH_RADIUS_KM, haversine_km
+
+# Nominal ISS orbital altitude, in kilometres
+ISS_ALTITUDE_KM = 420.0
+
+# Observers per chunk are chosen so one chunk's (observers x samples)
+# arrays hold about this many elements
+CHUNK_ELEMENTS = 1 << 20
+
+_LATITUDE_COLUMNS = ("latitude", "lat")
+_LONGITUDE_COLUMNS = ("longitude", "lon", "lng")
+
+
+@dataclass(frozen=True)
+class PassWindow:
+    """A period during which the ISS is above one observer's horizon mask."""
+
+    observer: int
+    start: float
+    end: float
+    max_elevation: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the window as an output row."""
+        row = asdict(self)
+        row["duration"] = self.end - self.start
+        row["max_elevation"] = round(self.max_elevation, 2)
+        return row
+
+
+def elevation_deg(
+    observers: ArrayLike, track: ArrayLike, altitude_km: float = ISS_ALTITUDE_KM
+) -> np.ndarray:
+    """
+    Elevation of the satellite above each observer's horizon.
+
+    Args:
+        observers: ``(N, 2)`` observer latitudes and longitudes, in degrees.
+        track: ``(M, 2)`` sub-satellite latitudes and longitudes, in degrees.
+        altitude_km: Satellite altitude above the mean Earth radius.
+
+    Returns:
+        An ``(N, M)`` array of elevations in degrees (negative below the
+        horizon).
+    """
+    obs = np.asarray(observers, dtype=np.float64)
+    sat = np.asarray(track, dtype=np.float64)
+    central = (
+        haversine_km(obs[:, None, 0], obs[:, None, 1], sat[None, :, 0], sat[None, :, 1])
+        / EARTH_RADIUS_KM
+    )
+    ratio = EARTH_RADIUS_KM / (EARTH_RADIUS_KM + altitude_km)
+    elevation: np.ndarray = np.degrees(
+        np.arctan2(np.cos(central) - ratio, np.sin(central))
+    )
+    return elevation
+
+
+def find_passes(
+    observers: ArrayLike,
+    samples: ArrayLike,
+    min_elevation: float = 10.0,
+    altitude_km: float = ISS_ALTITUDE_KM,
+    chunk_size: Optional[int] = None,
+) -> Iterator[PassWindow]:
+    """
+    Find the visibility windows of every observer over a sampled track.
+
+    A window spans consecutive samples with the ISS at or above
+    ``min_elevation``; its start and end are the first and last such
+    sample times, so the sampling interval bounds their precision.
+
+    Args:
+        observers: ``(N, 2)`` observer latitudes and longitudes, in degrees.
+        samples: ``(M, 3)`` timestamps, latitudes and longitudes, oldest
+            first (``PositionBuffer.samples()``).
+        min_elevation: Lowest elevation, in degrees, that counts as visible.
+        altitude_km: Satellite altitude above the mean Earth radius.
+        chunk_size: Observers processed at once. Defaults to a size that
+            keeps each chunk around ``CHUNK_ELEMENTS`` array elements.
+
+    Yields:
+        Windows ordered by observer index, then start time.
+
+    Raises:
+        ValueError: If the arrays have the wrong shape.
+    """
+    obs = np.asarray(observers, dtype=np.float64)
+    track = np.asarray(samples, dtype=np.float64)
+    if obs.ndim != 2 or obs.shape[1] != 2:
+        raise ValueError("observers must be an (N, 2) array of latitude, longitude")
+    if track.ndim != 2 or track.shape[1] != 3:
+        raise ValueError("samples must be an (M, 3) array of time, latitude, longitude")
+    if not len(obs) or not len(track):
+        return
+
+    times = track[:, 0]
+    width = len(track)
+    rows = chunk_size or max(1, CHUNK_ELEMENTS // width)
+    for offset in range(0, len(obs), rows):
+        elevation = elevation_deg(
+            obs[offset : offset + rows], track[:, 1:], altitude_km
+        )
+        visible = elevation >= min_elevation
+
+        # Window edges are where visibility flips; pad so runs touching
+        # either end of the track are closed
+        padded = np.zeros((len(visible), width + 2), dtype=np.int8)
+        padded[:, 1:-1] = visible
+        edges = np.diff(padded, axis=1)
+        starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+        if not len(ends):
+            continue
+
+        # Peak elevation of every window in one reduction over the
+        # flattened chunk: each window is the slice [start, end)
+        flat = np.append(elevation.ravel(), -np.inf)
+        base = starts[0] * width
+        bounds = np.empty(2 * len(ends), dtype=np.intp)
+        bounds[0::2] = base + starts[1]
+        bounds[1::2] = base + ends
+        peaks = np.maximum.reduceat(flat, bounds)[0::2]
+
+        for row, first, last, peak in zip(
+            (starts[0] + offset).tolist(),
+            times[starts[1]].tolist(),
+            times[ends - 1].tolist(),
+            peaks.tolist(),
+        ):
+            yield PassWindow(row, first, last, peak)
+
+
+def _column(header: List[str], names: Tuple[str, ...]) -> int:
+    """Find the first of ``names`` in a CSV header (case-insensitive)."""
+    lowered = [name.strip().lower() for name in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    raise ValueError(f"CSV needs one of the columns: {', '.join(names)}")
+
+
+def load_observers(stream: TextIO) -> Tuple[List[str], np.ndarray]:
+    """
+    Read observer locations from CSV.
+
+    The header must name a latitude (``latitude``/``lat``) and a longitude
+    (``longitude``/``lon``/``lng``) column. An ``id`` or ``name`` column,
+    if present, labels each observer; otherwise the row number is used.
+
+    Args:
+        stream: Text stream of CSV data.
+
+    Returns:
+        The observer labels and an ``(N, 2)`` array of their coordinates.
+
+    Raises:
+        ValueError: If a column is missing or a coordinate is not a number.
+    """
+    reader = csv.reader(stream)
+    header = next(reader, [])
+    lat, lon = _column(header, _LATITUDE_COLUMNS), _column(header, _LONGITUDE_COLUMNS)
+    try:
+        label: Optional[int] = _column(header, ("id", "name"))
+    except ValueError:
+        label = None
+
+    labels: List[str] = []
+    coordinates: List[Tuple[float, float]] = []
+    for line, row in enumerate(reader, start=2):
+        if not row:
+            continue
+        try:
+            coordinates.append((float(row[lat]), float(row[lon])))
+        except (IndexError, ValueError):
+            raise ValueError(f"Invalid observer on line {line}: {row}") from None
+        labels.append(row[label] if label is not None else str(len(labels)))
+    return labels, np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+
+
+def load_track(stream: TextIO) -> np.ndarray:
+    """
+    Read ISS samples written by ``space --format csv track``.
+
+    Args:
+        stream: Text stream of CSV data with ``time``, ``latitude`` and
+            ``longitude`` columns.
+
+    Returns:
+        An ``(M, 3)`` array of samples, sorted by time.
+
+    Raises:
+        ValueError: If a column is missing or a value is not a number.
+    """
+    reader = csv.reader(stream)
+    header = next(reader, [])
+    columns = (
+        _column(header, ("time", "timestamp")),
+        _column(header, _LATITUDE_COLUMNS),
+        _column(header, _LONGITUDE_COLUMNS),
+    )
+    try:
+        samples = np.array(
+            [[float(row[i]) for i in columns] for row in reader if row],
+            dtype=np.float64,
+        ).reshape(-1, 3)
+    except (IndexError, ValueError):
+        raise ValueError("Invalid ISS track CSV") from None
+    return samples[np.argsort(samples[:, 0], kind="stable")]
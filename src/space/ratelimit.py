@@ -0,0 +1,282 @@
+"""
+Host-wide rate limiting of API requests.
+
+Every ``space`` process on a host (cron jobs, sidecars, shells) takes a
+token from one shared token bucket before each request attempt, retries
+included, so together they stay under the upstream's rate limit. The
+bucket lives in a small file (``SPACE_RATE_LIMIT_FILE``) that is locked
+with ``flock`` for the few microseconds each update takes; its counters of
+throttled and delayed requests are host-wide too and are exported as
+Prometheus metrics.
+
+When no token is free a caller either waits its turn (tokens are reserved
+in order, so waiters are served first come, first served), or fails fast
+with ``RateLimitedError``; ``fetch_people_in_space`` can then serve the
+last known roster instead.
+
+Without ``fcntl`` (Windows) the bucket is only shared by the threads of
+one process.
+"""
+
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# What to do when no token is free
+WAIT = "wait"
+CACHE = "cache"
+FAIL = "fail"
+POLICIES = (WAIT, CACHE, FAIL)
+
+# Shared state: magic, tokens, last refill (epoch seconds), then counters
+# of granted, delayed and throttled requests and of seconds spent waiting
+_STATE = struct.Struct("<8sddQQQd")
+_MAGIC = b"SPACERL1"
+
+
+class RateLimitedError(ConnectionError):
+    """Raised instead of sending a request when the rate limit is reached."""
+
+    def __init__(self, message: str, retry_in: float) -> None:
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+@dataclass(frozen=True)
+class LimiterStats:
+    """Host-wide state and counters of the rate limiter, for monitoring."""
+
+    rate: float
+    burst: float
+    tokens: float
+    granted: int
+    delayed: int
+    throttled: int
+    wait_seconds: float
+
+
+class RateLimiter:
+    """
+    Token bucket shared through a file by every process on the host.
+
+    Tokens accrue at ``rate`` per second up to ``burst``; each request
+    attempt takes one.
+
+    Args:
+        path: State file; created if missing. A missing, foreign or
+            truncated file starts a full bucket.
+        rate: Requests per second allowed across the host.
+        burst: Bucket size: requests that may go out back to back.
+        policy: ``wait``, ``cache`` or ``fail`` (see ``space.config``).
+        clock: Wall clock, shared by all processes; replaceable in tests.
+
+    Raises:
+        ValueError: If ``rate`` is not positive, ``burst`` is below 1 or
+            ``policy`` is unknown.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        rate: float,
+        burst: float = 1.0,
+        policy: str = WAIT,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive")
+        if burst < 1:
+            raise ValueError("Rate limit burst must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown rate limit policy: {policy!r}")
+        self.path = Path(path)
+        self.rate = rate
+        self.burst = burst
+        self.policy = policy
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # O_BINARY (Windows only) keeps the packed state from being
+            # newline-translated
+            flags = os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0)
+            self._fd = os.open(self.path, flags, 0o600)
+        return self._fd
+
+    def _update(self, change: Callable[[List[float]], None]) -> List[float]:
+        """Apply ``change`` to the refilled shared state under the file lock."""
+        with self._lock:
+            fd = self._open()
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                # Seek, then read and write: os.pread and os.pwrite are
+                # POSIX-only
+                os.lseek(fd, 0, os.SEEK_SET)
+                data = os.read(fd, _STATE.size)
+                now = self._clock()
+                if len(data) == _STATE.size and data[:8] == _MAGIC:
+                    state = list(_STATE.unpack(data)[1:])
+                else:
+                    state = [self.burst, now, 0, 0, 0, 0.0]
+                # A clock stepped backwards refills nothing
+                elapsed = max(0.0, now - state[1])
+                state[0] = min(self.burst, state[0] + elapsed * self.rate)
+                state[1] = now
+                change(state)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(
+                    fd,
+                    _STATE.pack(
+                        _MAGIC,
+                        state[0],
+                        state[1],
+                        int(state[2]),
+                        int(state[3]),
+                        int(state[4]),
+                        state[5],
+                    ),
+                )
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+        return state
+
+    def acquire(self, max_wait: float = 0.0) -> float:
+        """
+        Take a token for one request attempt.
+
+        When none is free and the wait for one fits in ``max_wait``, a
+        token is reserved ahead of time and the caller must sleep for the
+        returned delay before sending.
+
+        Args:
+            max_wait: Longest acceptable wait, in seconds.
+
+        Returns:
+            Seconds to wait before sending; 0 if a token was free.
+
+        Raises:
+            RateLimitedError: If no token is free within ``max_wait``.
+        """
+        delay = 0.0
+
+        def take(state: List[float]) -> None:
+            nonlocal delay
+            tokens = state[0]
+            if tokens >= 1:
+                state[0] -= 1
+                state[2] += 1
+                return
+            delay = (1 - tokens) / self.rate
+            if delay > max_wait:
+                state[4] += 1
+                return
+            # Go into debt: later callers wait behind this one
+            state[0] -= 1
+            state[2] += 1
+            state[3] += 1
+            state[5] += delay
+
+        try:
+            self._update(take)
+        except OSError as e:
+            # An unusable state file must not stop every request
+            logger.warning(f"Rate limiter unavailable, not limiting: {e}")
+            return 0.0
+        if delay > max_wait:
+            raise RateLimitedError(
+                f"Rate limit of {self.rate:g} requests/s reached "
+                f"(next token in {delay:.1f}s)",
+                delay,
+            )
+        if delay:
+            logger.info(f"Rate limited, waiting {delay:.2f}s")
+        return delay
+
+    def stats(self) -> LimiterStats:
+        """Return the host-wide tokens and counters."""
+        state = self._update(lambda state: None)
+        return LimiterStats(
+            rate=self.rate,
+            burst=self.burst,
+            tokens=state[0],
+            granted=int(state[2]),
+            delayed=int(state[3]),
+            throttled=int(state[4]),
+            wait_seconds=state[5],
+        )
+
+    def close(self) -> None:
+        """Close the state file."""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def render_limiter_metrics(stats: Optional[LimiterStats]) -> List[str]:
+    """
+    Render rate limiter stats as Prometheus text-format lines.
+
+    Args:
+        stats: Snapshot from ``RateLimiter.stats()``, or None without a
+            limiter.
+
+    Returns:
+        The metric lines, without a trailing newline; empty without stats.
+    """
+    if stats is None:
+        return []
+    families = [
+        ("tokens", "gauge", "Tokens left in the host-wide bucket.", stats.tokens),
+        ("rate", "gauge", "Requests per second allowed per host.", stats.rate),
+        (
+            "granted_total",
+            "counter",
+            "Request attempts let through, after waiting or not.",
+            stats.granted,
+        ),
+        (
+            "delayed_total",
+            "counter",
+            "Request attempts that waited for a token.",
+            stats.delayed,
+        ),
+        (
+            "throttled_total",
+            "counter",
+            "Request attempts refused for lack of a token.",
+            stats.throttled,
+        ),
+        (
+            "wait_seconds_total",
+            "counter",
+            "Seconds request attempts spent waiting for a token.",
+            stats.wait_seconds,
+        ),
+    ]
+    lines: List[str] = []
+    for suffix, kind, help_text, value in families:
+        name = f"space_ratelimit_{suffix}"
+        lines += [
+            f"# HELP {name} {help_text}",
+            f"# TYPE {name} {kind}",
+            f"{name} {value:.6f}" if isinstance(value, float) else f"{name} {value}",
+        ]
+    return lines
@@ -0,0 +1,239 @@
+"""
+Failure handling shared by every API request.
+
+Four pieces keep a fleet of clients from making an upstream outage worse:
+
+- ``CircuitBreaker`` stops sending requests after repeated failures and
+  lets a single probe through once the reset timeout has passed.
+- ``RetryBudget`` caps retries at a fraction of first attempts across the
+  whole process, so retries cannot multiply the load during an outage.
+- ``full_jitter_backoff`` spreads retries randomly over the backoff window
+  so clients that failed together do not retry in lockstep.
+- ``RateLimiter`` (in ``space.ratelimit``) caps the request rate of every
+  ``space`` process on the host together.
+
+The process-wide instances are built from ``space.config`` on first use by
+``get_policy``.
+"""
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    from space.ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker.
+
+    The circuit opens after ``failure_threshold`` consecutive failures.
+    While open every call fails fast; after ``reset_timeout`` seconds one
+    probe is let through (half-open), and its outcome closes or re-opens
+    the circuit.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit.
+            0 disables the breaker.
+        reset_timeout: Seconds to stay open before probing again.
+        clock: Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """Current state: ``closed``, ``open`` or ``half-open``."""
+        with self._lock:
+            if (
+                self._state == OPEN
+                and self._clock() - self._opened_at >= self.reset_timeout
+            ):
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> None:
+        """
+        Check that a request may be sent now.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a
+                probe already in flight.
+        """
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            elapsed = self._clock() - self._opened_at
+            if elapsed >= self.reset_timeout and not self._probing:
+                self._probing = True
+                logger.info("Circuit half-open, probing upstream")
+                return
+            retry_in = max(0.0, self.reset_timeout - elapsed)
+        raise CircuitOpenError(
+            f"Circuit open, upstream unavailable (retry in {retry_in:.0f}s)"
+        )
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("Circuit closed, upstream recovered")
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """End a probe that told nothing about upstream, so another may go."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._state != OPEN or self._probing:
+                    logger.warning(
+                        f"Circuit open after {self._failures} failures; "
+                        f"failing fast for {self.reset_timeout:.0f}s"
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probing = False
+
+
+class RetryBudget:
+    """
+    Process-wide allowance of retries, as a fraction of first attempts.
+
+    Every first attempt deposits ``ratio`` tokens and every retry withdraws
+    one, with the balance capped at ``reserve``. Over time retries are
+    limited to about ``ratio`` of requests, plus a ``reserve`` for bursts.
+
+    Args:
+        ratio: Retries allowed per first attempt.
+        reserve: Initial and maximum balance.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: float = 10.0) -> None:
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = reserve
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        """Retries currently available."""
+        with self._lock:
+            return self._balance
+
+    def deposit(self) -> None:
+        """Credit the budget for a first attempt."""
+        with self._lock:
+            self._balance = min(self.reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take one retry from the budget.
+
+        Returns:
+            True if the retry may proceed.
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+def full_jitter_backoff(attempt: int, base: float, maximum: float) -> float:
+    """
+    Delay before retry number ``attempt`` using "full jitter".
+
+    Args:
+        attempt: 1 for the first retry, 2 for the second, and so on.
+        base: Backoff ceiling for the first retry, in seconds.
+        maximum: Largest possible delay, in seconds.
+
+    Returns:
+        A delay drawn uniformly from ``[0, min(maximum, base * 2**(attempt-1))]``.
+    """
+    return random.uniform(0, min(maximum, base * 2 ** (attempt - 1)))
+
+
+@dataclass(frozen=True)
+class ResiliencePolicy:
+    """Retry, backoff, deadline, circuit and rate settings for API requests."""
+
+    attempts: int
+    backoff: float
+    backoff_max: float
+    deadline: float
+    breaker: CircuitBreaker
+    budget: RetryBudget
+    limiter: Optional["RateLimiter"] = None
+
+
+@lru_cache(maxsize=1)
+def get_policy() -> ResiliencePolicy:
+    """
+    Return the process-wide policy, built from ``space.config``.
+
+    Returns:
+        The shared policy; its breaker and budget are shared by every
+        request in the process, its rate limiter by every process on the
+        host.
+    """
+    from space import config
+
+    limiter = None
+    if config.RATE_LIMIT > 0:
+        from space.ratelimit import RateLimiter
+
+        limiter = RateLimiter(
+            config.RATE_LIMIT_FILE,
+            config.RATE_LIMIT,
+            config.RATE_LIMIT_BURST,
+            config.RATE_LIMIT_POLICY,
+        )
+    return ResiliencePolicy(
+        attempts=config.RETRY_ATTEMPTS,
+        backoff=config.RETRY_BACKOFF,
+        backoff_max=config.RETRY_BACKOFF_MAX,
+        deadline=config.REQUEST_DEADLINE,
+        breaker=CircuitBreaker(config.BREAKER_THRESHOLD, config.BREAKER_RESET_TIMEOUT),
+        budget=RetryBudget(config.RETRY_BUDGET_RATIO, config.RETRY_BUDGET_RESERVE),
+        limiter=limiter,
+    )
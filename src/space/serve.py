@@ -0,0 +1,364 @@
+"""
+Local HTTP server that shares one cached roster with many clients.
+
+``space serve`` refreshes the roster in the background on a schedule and
+answers every request from memory. The response body, its ETag and the
+response headers are serialized once per refresh, so serving a request is
+a header lookup and a write. The server speaks just enough HTTP/1.1
+(GET/HEAD, keep-alive, pipelining) for API clients and monitoring.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from space.instrument import get_recorder
+from space.mirrors import MirrorStats, render_mirror_metrics
+from space.ratelimit import LimiterStats, render_limiter_metrics
+
+logger = logging.getLogger(__name__)
+
+# Largest request head (request line plus headers) accepted, in bytes
+MAX_REQUEST_HEAD = 8192
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+    503: "Service Unavailable",
+}
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A roster serialized once and served to every client."""
+
+    body: bytes
+    etag: str
+    people: int
+    created_at: float
+    head_200: bytes
+    head_304: bytes
+
+
+def build_snapshot(people: List[Dict[str, Any]], max_age: int) -> Snapshot:
+    """
+    Serialize a roster into ready-to-send response bytes.
+
+    Args:
+        people: The roster, as returned by ``fetch_people_in_space``.
+        max_age: Seconds clients may cache the response.
+
+    Returns:
+        The snapshot holding the body, its ETag and prebuilt headers.
+    """
+    body = json.dumps(
+        {"message": "success", "number": len(people), "people": people},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    common = f"ETag: {etag}\r\nCache-Control: max-age={max_age}\r\n"
+    head_200 = (
+        "HTTP/1.1 200 OK\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n" + common
+    ).encode("ascii")
+    head_304 = ("HTTP/1.1 304 Not Modified\r\n" + common).encode("ascii")
+    return Snapshot(body, etag, len(people), time.time(), head_200, head_304)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against ``etag``."""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class RosterServer:
+    """
+    Roster cache plus request handling for ``space serve``.
+
+    Args:
+        fetch: Callable returning the current roster. It runs in a worker
+            thread, so the blocking ``fetch_people_in_space`` can be used.
+        refresh_interval: Seconds between background refreshes.
+        paths: Request paths that return the roster.
+        mirror_stats: Callable returning upstream mirror stats, exported
+            on ``/metrics`` when given.
+        limiter_stats: Callable returning the host-wide rate limiter's
+            counters, exported on ``/metrics`` when given.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], List[Dict[str, Any]]],
+        refresh_interval: float = 60.0,
+        paths: Iterable[str] = ("/astros.json",),
+        mirror_stats: Optional[Callable[[], List[MirrorStats]]] = None,
+        limiter_stats: Optional[Callable[[], LimiterStats]] = None,
+    ) -> None:
+        self.fetch = fetch
+        self.mirror_stats = mirror_stats
+        self.limiter_stats = limiter_stats
+        self.refresh_interval = refresh_interval
+        self.paths = frozenset(paths)
+        self.snapshot: Optional[Snapshot] = None
+        self.requests: "Counter[Tuple[str, int]]" = Counter()
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    async def refresh(self) -> bool:
+        """
+        Fetch the roster once and publish a new snapshot.
+
+        Returns:
+            True if the refresh succeeded. On failure the previous snapshot
+            keeps being served.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            people = await loop.run_in_executor(None, self.fetch)
+            snapshot = build_snapshot(people, int(self.refresh_interval))
+        except Exception as e:
+            self.refresh_errors += 1
+            logger.warning(f"Roster refresh failed: {e}")
+            return False
+        self.refreshes += 1
+        if self.snapshot is None or snapshot.etag != self.snapshot.etag:
+            logger.info(f"Serving new roster ({snapshot.people} people)")
+        self.snapshot = snapshot
+        return True
+
+    async def refresh_forever(self) -> None:
+        """Refresh the roster every ``refresh_interval`` seconds."""
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def respond(
+        self, method: str, path: str, headers: Dict[str, str]
+    ) -> Tuple[int, List[bytes]]:
+        """
+        Build the response to one request.
+
+        Args:
+            method: Request method.
+            path: Request path, without the query string.
+            headers: Request headers with lower-cased names.
+
+        Returns:
+            The status code and the response parts, excluding the blank line
+            that ends the headers and any ``Connection`` header.
+        """
+        label = path if path in self.paths or path == "/metrics" else "other"
+        status, parts = self._route(method, path, headers)
+        self.requests[(label, status)] += 1
+        if method == "HEAD":
+            parts = parts[:1]
+        return status, parts
+
+    def _route(
+        self, method: str, path: str, headers: Dict[str, str]
+    ) -> Tuple[int, List[bytes]]:
+        if method not in ("GET", "HEAD"):
+            return 405, _simple_response(405, "Allow: GET, HEAD\r\n")
+        if path == "/metrics":
+            body = self.render_metrics().encode("utf-8")
+            head = (
+                "HTTP/1.1 200 OK\r\n"
+                "Content-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\n"
+            ).encode("ascii")
+            return 200, [head, body]
+        if path not in self.paths:
+            return 404, _simple_response(404)
+
+        snapshot = self.snapshot
+        if snapshot is None:
+            return 503, _simple_response(503, "Retry-After: 1\r\n")
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+            return 304, [snapshot.head_304]
+        return 200, [snapshot.head_200, snapshot.body]
+
+    def render_metrics(self) -> str:
+        """Render the server's counters in the Prometheus text format."""
+        lines = [
+            "# HELP space_serve_requests_total Requests answered, by path and status.",
+            "# TYPE space_serve_requests_total counter",
+        ]
+        for (path, status), count in sorted(self.requests.items()):
+            lines.append(
+                f'space_serve_requests_total{{path="{path}",status="{status}"}} '
+                f"{count}"
+            )
+        snapshot = self.snapshot
+        lines += [
+            "# HELP space_serve_refreshes_total Successful roster refreshes.",
+            "# TYPE space_serve_refreshes_total counter",
+            f"space_serve_refreshes_total {self.refreshes}",
+            "# HELP space_serve_refresh_errors_total Failed roster refreshes.",
+            "# TYPE space_serve_refresh_errors_total counter",
+            f"space_serve_refresh_errors_total {self.refresh_errors}",
+            "# HELP space_serve_roster_people People in the served roster.",
+            "# TYPE space_serve_roster_people gauge",
+            f"space_serve_roster_people {snapshot.people if snapshot else 0}",
+            "# HELP space_serve_roster_age_seconds Age of the served roster.",
+            "# TYPE space_serve_roster_age_seconds gauge",
+            "space_serve_roster_age_seconds "
+            f"{time.time() - snapshot.created_at if snapshot else 0:.3f}",
+        ]
+        if self.mirror_stats is not None:
+            lines += render_mirror_metrics(self.mirror_stats())
+        if self.limiter_stats is not None:
+            try:
+                lines += render_limiter_metrics(self.limiter_stats())
+            except OSError as e:
+                logger.warning(f"Cannot read rate limiter state: {e}")
+        # Timings of the upstream fetches behind the refreshes
+        lines += get_recorder().render_metrics()
+        return "\n".join(lines) + "\n"
+
+
+def _simple_response(status: int, extra_headers: str = "") -> List[bytes]:
+    """Build a response with an empty body."""
+    head = (
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+        f"Content-Length: 0\r\n{extra_headers}"
+    ).encode("ascii")
+    return [head]
+
+
+class _HTTPProtocol(asyncio.Protocol):
+    """Minimal HTTP/1.1 connection handler with keep-alive and pipelining."""
+
+    def __init__(self, server: RosterServer) -> None:
+        self.server = server
+        self.buffer = b""
+        self.transport: Optional[asyncio.Transport] = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+
+    def data_received(self, data: bytes) -> None:
+        self.buffer += data
+        while self.transport is not None:
+            end = self.buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(self.buffer) > MAX_REQUEST_HEAD:
+                    self._write(_simple_response(431), close=True)
+                return
+            head, rest = self.buffer[:end], end + len(b"\r\n\r\n")
+            self.buffer = self.buffer[rest:]
+            self._handle(head)
+
+    def _handle(self, head: bytes) -> None:
+        try:
+            request_line, *header_lines = head.decode("latin-1").split("\r\n")
+            method, target, version = request_line.split(" ")
+        except ValueError:
+            self._write(_simple_response(400), close=True)
+            return
+
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("content-length", "0") != "0" or "transfer-encoding" in headers:
+            # Request bodies are not supported; the stream can't be resynced
+            self._write(_simple_response(400), close=True)
+            return
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            close = connection == "close"
+        else:
+            close = connection != "keep-alive"
+
+        _, parts = self.server.respond(method, target.split("?", 1)[0], headers)
+        self._write(parts, close)
+
+    def _write(self, parts: List[bytes], close: bool) -> None:
+        assert self.transport is not None
+        head, body = parts[0], parts[1:]
+        connection = b"Connection: close\r\n\r\n" if close else b"\r\n"
+        self.transport.writelines([head, connection, *body])
+        if close:
+            self.transport.close()
+            self.transport = None
+
+
+async def run_server(
+    server: RosterServer, host: str, port: int
+) -> asyncio.AbstractServer:
+    """
+    Load the first roster and start listening.
+
+    The first refresh happens before the socket opens, so clients never
+    see a 503 unless the upstream is down at startup.
+
+    Args:
+        server: The roster server to expose.
+        host: Interface to bind.
+        port: TCP port to bind (0 picks a free port).
+
+    Returns:
+        The listening asyncio server.
+    """
+    await server.refresh()
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: _HTTPProtocol(server), host, port)
+
+
+def serve(
+    fetch: Callable[[], List[Dict[str, Any]]],
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    refresh_interval: float = 60.0,
+    paths: Iterable[str] = ("/astros.json",),
+    mirror_stats: Optional[Callable[[], List[MirrorStats]]] = None,
+    limiter_stats: Optional[Callable[[], LimiterStats]] = None,
+) -> None:
+    """
+    Run ``space serve`` until interrupted.
+
+    Args:
+        fetch: Callable returning the current roster.
+        host: Interface to bind.
+        port: TCP port to bind.
+        refresh_interval: Seconds between background refreshes.
+        paths: Request paths that return the roster.
+        mirror_stats: Callable returning upstream mirror stats for
+            ``/metrics``.
+        limiter_stats: Callable returning the rate limiter's counters for
+            ``/metrics``.
+    """
+
+    async def main() -> None:
+        server = RosterServer(
+            fetch, refresh_interval, paths, mirror_stats, limiter_stats
+        )
+        listener = await run_server(server, host, port)
+        refresher = asyncio.create_task(server.refresh_forever())
+        logger.info(f"Serving roster on http://{host}:{port}")
+        try:
+            async with listener:
+                await listener.serve_forever()
+        finally:
+            refresher.cancel()
+
+    asyncio.run(main())
@@ -1,39 +1,265 @@
 import logging
-from typing import Any, Dict, List, cast
+from functools import lru_cache, partial
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
-from tenacity import (
-    before_sleep_log,
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
 
-from space.config import ASTROS_API_URL
+from space.cache import CacheEntry, ResponseCache
+from space.client import get_default_client
+from space.config import (
+    ASTROS_API_URL,
+    CACHE_DIR,
+    CACHE_TTL,
+    HISTORY_DB,
+    RATE_LIMIT_POLICY,
+    RECORD_HISTORY,
+    ROSTER_MAX_AGE,
+    STALE_WHILE_REVALIDATE,
+)
+from space.core import parse_people
+from space.decode import loads
+from space.fetcher import RosterFetcher
+from space.instrument import span
+from space.models import Roster
+from space.ratelimit import CACHE, RateLimitedError
+from space.resilience import CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
+# Last roster loaded in this process, served while the circuit is open
+_last_people: Optional[List[Dict[str, Any]]] = None
 
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type(
-        (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
-    ),
-    before_sleep=before_sleep_log(logger, logging.WARNING),
-    reraise=True,
-)
-def fetch_people_in_space() -> List[Dict[str, Any]]:
+
+def _get_astros(headers: Optional[Dict[str, str]] = None) -> requests.Response:
+    """Request the astronaut roster through the shared pooled client."""
+    return get_default_client().get(ASTROS_API_URL, headers=headers)
+
+
+def _parse_people(response: requests.Response) -> List[Dict[str, Any]]:
+    """Extract the list of people from an API response."""
     try:
-        response = requests.get(ASTROS_API_URL, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        logger.info(f"Fetched data: {data}")
-        return cast(List[Dict[str, Any]], data["people"])
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching data from API: {e}")
-        raise
-    except (KeyError, ValueError) as e:
+        with span("decode", bytes=len(response.content)):
+            return parse_people(loads(response.content))
+    except ValueError as e:
         logger.error(f"Error parsing API response: {e}")
         raise
+
+
+def _fetch_with_cache(ttl: int) -> List[Dict[str, Any]]:
+    """
+    Fetch the roster through the on-disk response cache.
+
+    Fresh entries are served without touching the network. Stale entries
+    are revalidated with a conditional GET, and a 304 response extends
+    their lifetime without re-downloading the roster.
+
+    Args:
+        ttl: Number of seconds a cached roster is considered fresh.
+
+    Returns:
+        List of people currently in space.
+    """
+    cache = ResponseCache(CACHE_DIR)
+    entry = cache.load(ASTROS_API_URL)
+    if entry is not None and entry.is_fresh(ttl):
+        logger.debug(f"Serving roster from cache (age {entry.age():.0f}s)")
+        return entry.people
+
+    response = _get_astros(entry.conditional_headers() if entry else None)
+    if entry is not None and response.status_code == 304:
+        logger.debug("Cached roster revalidated (304 Not Modified)")
+        entry = CacheEntry(entry.people, entry.etag, entry.last_modified)
+    else:
+        entry = CacheEntry(
+            _parse_people(response),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    try:
+        cache.store(ASTROS_API_URL, entry)
+    except OSError as e:
+        logger.warning(f"Could not write response cache: {e}")
+    return entry.people
+
+
+def _record_history(people: List[Dict[str, Any]]) -> None:
+    """Append the roster to the history store; failures are only logged."""
+    import sqlite3
+
+    from space.history import HistoryStore
+
+    try:
+        with HistoryStore(HISTORY_DB) as store:
+            store.record(people)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Could not record roster history: {e}")
+
+
+def _last_known_people() -> Optional[List[Dict[str, Any]]]:
+    """Return the last roster seen, from memory or the on-disk cache."""
+    if _last_people is not None:
+        return _last_people
+    entry = ResponseCache(CACHE_DIR).load(ASTROS_API_URL)
+    return entry.people if entry is not None else None
+
+
+def _fallback_people(error: Exception) -> List[Dict[str, Any]]:
+    """
+    Return the last known roster in place of a fetch that was refused.
+
+    Args:
+        error: Why the fetch was refused.
+
+    Returns:
+        The last roster seen.
+
+    Raises:
+        Exception: ``error`` itself, if it does not allow a fallback (a
+            ``RateLimitedError`` without the ``cache`` policy) or no roster
+            has been seen.
+    """
+    if isinstance(error, RateLimitedError) and RATE_LIMIT_POLICY != CACHE:
+        raise error
+    fallback = _last_known_people()
+    if fallback is None:
+        raise error
+    logger.warning(f"{error}; serving the last known roster")
+    return fallback
+
+
+def _load_people(ttl: int) -> List[Dict[str, Any]]:
+    """
+    Fetch the roster, going through the on-disk cache when ``ttl`` > 0.
+
+    While the circuit breaker is open, or the host-wide rate limit is
+    reached with the ``cache`` policy, the last known roster is returned
+    instead, if there is one.
+    """
+    global _last_people
+    try:
+        with span("fetch", cache_ttl=ttl):
+            people = _fetch_with_cache(ttl) if ttl > 0 else _parse_people(_get_astros())
+    except (CircuitOpenError, RateLimitedError) as e:
+        return _fallback_people(e)
+    _last_people = people
+    if RECORD_HISTORY:
+        _record_history(people)
+    return people
+
+
+@lru_cache(maxsize=None)
+def get_fetcher(cache_ttl: int) -> RosterFetcher:
+    """
+    Return the shared in-process fetcher for a given cache TTL.
+
+    The fetcher keeps a roster in memory for ``SPACE_ROSTER_MAX_AGE``
+    seconds and, with ``SPACE_STALE_WHILE_REVALIDATE``, serves an older one
+    while it is refreshed in the background.
+
+    Args:
+        cache_ttl: On-disk cache TTL the fetcher's loader should use.
+
+    Returns:
+        The process-wide ``RosterFetcher`` for that TTL.
+    """
+    return RosterFetcher(
+        partial(_load_people, cache_ttl),
+        max_age=ROSTER_MAX_AGE,
+        stale_while_revalidate=STALE_WHILE_REVALIDATE,
+    )
+
+
+def fetch_people_in_space(cache_ttl: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch the list of people currently in space.
+
+    Concurrent calls from several threads share a single upstream request,
+    and a roster fetched less than ``SPACE_ROSTER_MAX_AGE`` seconds ago is
+    reused; with ``SPACE_STALE_WHILE_REVALIDATE`` an older one is returned
+    at once while it is refreshed in the background. While upstream is down and the circuit breaker is open, the last known
+    roster is returned without waiting on the network.
+
+    Args:
+        cache_ttl: Seconds to serve the roster from the on-disk cache before
+            revalidating it. Defaults to ``SPACE_CACHE_TTL``; 0 disables the
+            cache.
+
+    Returns:
+        List of people, each a dict with ``name`` and ``craft`` keys.
+    """
+    ttl = CACHE_TTL if cache_ttl is None else cache_ttl
+    return get_fetcher(ttl).get()
+
+
+def _stream_people() -> Iterator[Dict[str, Any]]:
+    """
+    Stream the roster from the API.
+
+    While the circuit breaker is open, or the host-wide rate limit is
+    reached with the ``cache`` policy, the last known roster is yielded
+    instead, if there is one, as ``fetch_people_in_space`` would return.
+    """
+    people = get_default_client().iter_people()
+    try:
+        # The request is sent, and refused, on the first item
+        first = next(people)
+    except StopIteration:
+        return
+    except (CircuitOpenError, RateLimitedError) as e:
+        yield from _fallback_people(e)
+        return
+    yield first
+    yield from people
+
+
+def iter_people_in_space(cache_ttl: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the people currently in space while the response streams in.
+
+    The body is parsed incrementally, so memory stays bounded however large
+    the roster is (unless ``SPACE_RECORD_HISTORY`` is set: the roster is
+    then recorded once it has been read to the end). When the on-disk cache
+    is enabled the cached roster is used instead, through
+    ``fetch_people_in_space``. While the circuit breaker is open, or the
+    rate limit is reached with the ``cache`` policy, the last known roster
+    is yielded, as ``fetch_people_in_space`` would return.
+
+    Args:
+        cache_ttl: Seconds to serve the roster from the on-disk cache.
+            Defaults to ``SPACE_CACHE_TTL``; 0 streams from the API.
+
+    Yields:
+        Person records, each a dict with ``name`` and ``craft`` keys.
+    """
+    ttl = CACHE_TTL if cache_ttl is None else cache_ttl
+    if ttl > 0:
+        yield from fetch_people_in_space(cache_ttl=ttl)
+        return
+    if not RECORD_HISTORY:
+        yield from _stream_people()
+        return
+    # Only a complete roster is recorded: a partial one would show everyone
+    # not yet read as having departed
+    people = []
+    for person in _stream_people():
+        people.append(person)
+        yield person
+    _record_history(people)
+
+
+def fetch_roster(cache_ttl: Optional[int] = None) -> Roster:
+    """
+    Fetch the people currently in space as a compact ``Roster``.
+
+    The roster is built straight from the response stream (or the cache),
+    so the per-person dicts are never materialized as a list.
+
+    Args:
+        cache_ttl: Seconds to serve the roster from the on-disk cache.
+            Defaults to ``SPACE_CACHE_TTL``; 0 streams from the API.
+
+    Returns:
+        The roster, with interned names and craft.
+    """
+    return Roster(iter_people_in_space(cache_ttl=cache_ttl))
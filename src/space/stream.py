@@ -0,0 +1,141 @@
+"""
+Incremental JSON parsing for large API responses.
+
+``iter_array_items`` walks the top-level object of a JSON document as the
+bytes arrive and yields the elements of one array member one at a time.
+Only the element being decoded is held in memory, so rosters of any size
+can be processed in bounded memory.
+"""
+
+import codecs
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+_WHITESPACE = " \t\n\r"
+
+# Drop consumed text from the buffer once this many characters are behind us
+_COMPACT_AT = 64 * 1024
+
+
+class _Reader:
+    """Buffered character reader over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """Read one more chunk into the buffer; False once input is exhausted."""
+        if self.eof:
+            return False
+        if self.pos >= _COMPACT_AT:
+            self.buffer = self.buffer[self.pos :]
+            self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.buffer += self._decoder.decode(chunk)
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` (after whitespace) or raise ValueError."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, got {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Most likely a value split across chunks; retry with more data
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # A number may continue in the next chunk ("12" + "3")
+                if self._fill():
+                    continue
+            self.pos = end
+            return value
+
+
+def iter_array_items(
+    chunks: Iterable[bytes],
+    key: str,
+    on_member: Optional[Callable[[str, Any], None]] = None,
+) -> Iterator[Any]:
+    """
+    Yield the elements of ``document[key]`` while the document streams in.
+
+    Other members of the top-level object are decoded and handed to
+    ``on_member``, if given, then discarded, so they may appear before or
+    after ``key``.
+
+    Args:
+        chunks: The raw JSON document, as an iterable of byte chunks.
+        key: Name of the top-level member holding the array.
+        on_member: Called with the name and value of every other member as
+            soon as it is decoded, e.g. to validate it; whatever it raises
+            is propagated.
+
+    Yields:
+        Each decoded array element, in order.
+
+    Raises:
+        KeyError: If the document has no ``key`` member.
+        ValueError: If the document is not valid JSON, or ``key`` is not an
+            array.
+    """
+    reader = _Reader(chunks)
+    reader.expect("{")
+    found = False
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            name = reader.value()
+            if not isinstance(name, str):
+                raise ValueError(f"Expected an object key at offset {reader.pos}")
+            reader.expect(":")
+            if name == key and not found:
+                found = True
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.value()
+                        if reader.peek() == "]":
+                            reader.pos += 1
+                            break
+                        reader.expect(",")
+            else:
+                value = reader.value()
+                if on_member is not None:
+                    on_member(name, value)
+            if reader.peek() == "}":
+                reader.pos += 1
+                break
+            reader.expect(",")
+    if not found:
+        raise KeyError(key)
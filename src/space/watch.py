@@ -0,0 +1,199 @@
+"""Live-updating roster display for ``space watch``."""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.live import Live
+from rich.table import Table
+
+logger = logging.getLogger(__name__)
+
+# Rosters are compared on (name, craft): a move between craft is a
+# departure from one and an arrival on the other
+PersonKey = Tuple[str, str]
+
+ARRIVED_STYLE = "bold green"
+DEPARTED_STYLE = "strike red"
+
+
+@dataclass
+class RosterDiff:
+    """People who arrived and departed between two roster snapshots."""
+
+    arrived: List[PersonKey] = field(default_factory=list)
+    departed: List[PersonKey] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.arrived or self.departed)
+
+
+def roster_keys(people: List[Dict[str, Any]]) -> List[PersonKey]:
+    """Return the (name, craft) key of every person, in roster order."""
+    return [(person["name"], person["craft"]) for person in people]
+
+
+def diff_rosters(old: List[PersonKey], new: List[PersonKey]) -> RosterDiff:
+    """
+    Compare two rosters by name and craft.
+
+    Args:
+        old: Keys from the previous snapshot.
+        new: Keys from the current snapshot.
+
+    Returns:
+        The arrivals and departures, each in roster order.
+    """
+    old_set, new_set = set(old), set(new)
+    return RosterDiff(
+        arrived=[key for key in new if key not in old_set],
+        departed=[key for key in old if key not in new_set],
+    )
+
+
+class AdaptiveInterval:
+    """
+    Polling interval that backs off while nothing changes.
+
+    Each unchanged poll multiplies the interval by ``backoff`` up to
+    ``maximum``; a change resets it to ``minimum``.
+
+    Args:
+        minimum: Interval in seconds right after a change.
+        maximum: Upper bound for the interval in seconds.
+        backoff: Growth factor applied after each unchanged poll.
+    """
+
+    def __init__(self, minimum: float, maximum: float, backoff: float = 2.0) -> None:
+        if minimum <= 0 or maximum < minimum:
+            raise ValueError("Polling interval bounds must satisfy 0 < min <= max")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.backoff = backoff
+        self.current = minimum
+
+    def update(self, changed: bool) -> float:
+        """
+        Compute the delay before the next poll.
+
+        Args:
+            changed: Whether the last poll saw a roster change.
+
+        Returns:
+            Seconds to wait before polling again.
+        """
+        if changed:
+            self.current = self.minimum
+        else:
+            self.current = min(self.current * self.backoff, self.maximum)
+        return self.current
+
+
+class WatchView:
+    """
+    Row model behind the live table.
+
+    Rows are kept between polls and only the rows named in a diff are
+    touched: arrivals are added highlighted, departures stay on screen
+    struck through until the next change, and every other row is reused
+    as-is.
+    """
+
+    def __init__(self) -> None:
+        self.rows: Dict[PersonKey, str] = {}
+        self.status = ""
+
+    def load(self, keys: List[PersonKey]) -> None:
+        """Replace all rows with ``keys``, without highlighting."""
+        self.rows = dict.fromkeys(keys, "")
+
+    def apply(self, diff: RosterDiff) -> None:
+        """Update the rows affected by ``diff``."""
+        if not diff:
+            return
+        # Settle the highlights from the previous change
+        for key, style in list(self.rows.items()):
+            if style == DEPARTED_STYLE:
+                del self.rows[key]
+            elif style:
+                self.rows[key] = ""
+        for key in diff.departed:
+            self.rows[key] = DEPARTED_STYLE
+        for key in diff.arrived:
+            self.rows[key] = ARRIVED_STYLE
+
+    @property
+    def count(self) -> int:
+        """Number of people currently in space."""
+        return sum(1 for style in self.rows.values() if style != DEPARTED_STYLE)
+
+    def render(self) -> Table:
+        """Build the table for the current rows."""
+        table = Table(
+            title=f"🚀 People currently in space: {self.count}",
+            title_style="bold cyan",
+            caption=self.status,
+            show_header=True,
+            header_style="bold magenta",
+        )
+        table.add_column("#", style="dim", width=6)
+        table.add_column("Name", style="cyan", no_wrap=True)
+        table.add_column("Spacecraft", style="green")
+        for i, ((name, craft), style) in enumerate(self.rows.items(), 1):
+            table.add_row(str(i), name, craft, style=style or None)
+        return table
+
+
+def watch(
+    fetch: Callable[[], List[Dict[str, Any]]],
+    interval: AdaptiveInterval,
+    console: Optional[Console] = None,
+    sleep: Callable[[float], None] = time.sleep,
+    max_polls: Optional[int] = None,
+) -> None:
+    """
+    Poll the roster and keep a live table up to date.
+
+    Args:
+        fetch: Callable returning the current roster.
+        interval: Adaptive polling interval.
+        console: Console to render on. Defaults to a new one.
+        sleep: Function used to wait between polls.
+        max_polls: Stop after this many polls (runs forever if None).
+    """
+    view = WatchView()
+    keys: Optional[List[PersonKey]] = None
+    polls = 0
+
+    with Live(view.render(), console=console, auto_refresh=False) as live:
+        while max_polls is None or polls < max_polls:
+            polls += 1
+            try:
+                new_keys = roster_keys(fetch())
+            except Exception as e:
+                logger.warning(f"Roster poll failed: {e}")
+                delay = interval.update(changed=False)
+                view.status = f"Poll failed at {datetime.now():%H:%M:%S}: {e}"
+            else:
+                if keys is None:
+                    view.load(new_keys)
+                    diff = RosterDiff(arrived=new_keys)
+                else:
+                    diff = diff_rosters(keys, new_keys)
+                    view.apply(diff)
+                if diff:
+                    logger.info(
+                        f"Roster changed: {len(diff.arrived)} arrived, "
+                        f"{len(diff.departed)} departed"
+                    )
+                keys = new_keys
+                delay = interval.update(changed=bool(diff))
+                view.status = (
+                    f"Updated {datetime.now():%H:%M:%S} · next check in {delay:.0f}s"
+                )
+            live.update(view.render(), refresh=True)
+            if max_polls is None or polls < max_polls:
+                sleep(delay)
@@ -1,8 +1,13 @@
 """Pytest configuration and fixtures."""
 
+import gzip
+import json
 import logging
 import os
-from typing import Any, Dict, Generator
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Generator, List
 
 import pytest
 
@@ -17,6 +22,16 @@ def pytest_configure(config):
     os.environ.setdefault("SPACE_ASTROS_ENDPOINT", "/astros.json")
 
 
+@pytest.fixture(autouse=True)
+def reset_resilience() -> Generator[None, None, None]:
+    """Give every test a fresh circuit breaker and retry budget."""
+    from space.resilience import get_policy
+
+    get_policy.cache_clear()
+    yield
+    get_policy.cache_clear()
+
+
 @pytest.fixture
 def reset_logging() -> Generator[None, None, None]:
     """Reset logging configuration before test."""
@@ -54,3 +69,65 @@ def mock_api_response() -> Dict[str, Any]:
 def mock_empty_api_response() -> Dict[str, Any]:
     """Fixture providing an empty mock API response."""
     return {"number": 0, "people": [], "message": "success"}
+
+
+@pytest.fixture
+def astros_server(
+    mock_api_response: Dict[str, Any],
+) -> Generator[Dict[str, Any], None, None]:
+    """Serve the mock roster over real HTTP/1.1, gzip-encoded on request."""
+    body = json.dumps(mock_api_response).encode("utf-8")
+    seen: List[Dict[str, str]] = []
+    ports: List[int] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            seen.append(dict(self.headers))
+            ports.append(self.client_address[1])
+            payload = body
+            self.send_response(200)
+            if "gzip" in self.headers.get("Accept-Encoding", ""):
+                payload = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    try:
+        yield {
+            "base_url": f"http://127.0.0.1:{server.server_port}",
+            "body": body,
+            "headers": seen,
+            "ports": ports,
+        }
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def astros_cassette(
+    astros_server: Dict[str, Any], tmp_path: Path
+) -> Generator[Path, None, None]:
+    """Record the mock roster into a cassette, for offline replay."""
+    from space.cassette import CassetteWriter, RecordingAdapter
+    from space.client import SpaceClient
+
+    path = tmp_path / "astros.cassette"
+    recorder = RecordingAdapter(CassetteWriter(path))
+    with SpaceClient(
+        base_url=astros_server["base_url"], mirrors=[], transport=recorder
+    ) as client:
+        client.fetch_people()
+    yield path
@@ -0,0 +1,147 @@
+"""Unit tests for the aio module."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+from tenacity import wait_none  # noqa: E402
+
+from space.aio import (  # noqa: E402
+    AsyncSpaceClient,
+    fetch_people_in_space_async,
+    gather_endpoints,
+)
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def _serve(routes: Dict[str, Handler], test: Callable[[str], Awaitable[Any]]) -> Any:
+    """Run ``test`` against a local aiohttp server exposing ``routes``."""
+
+    async def run() -> Any:
+        app = web.Application()
+        for path, handler in routes.items():
+            app.router.add_get(path, handler)
+        async with TestServer(app) as server:
+            return await test(str(server.make_url("")).rstrip("/"))
+
+    return asyncio.run(run())
+
+
+def _json(payload: Any, status: int = 200) -> Handler:
+    async def handler(request: web.Request) -> web.StreamResponse:
+        return web.json_response(payload, status=status)
+
+    return handler
+
+
+class TestAsyncSpaceClient:
+    """Tests for AsyncSpaceClient."""
+
+    def test_fetch_people(self, mock_api_response: Dict[str, Any]) -> None:
+        """Test the roster is fetched and parsed."""
+
+        async def test(base_url: str) -> List[Dict[str, Any]]:
+            async with AsyncSpaceClient(base_url=base_url) as client:
+                return await client.fetch_people()
+
+        people = _serve({"/astros.json": _json(mock_api_response)}, test)
+        assert people == mock_api_response["people"]
+
+    def test_gather_preserves_order(self, mock_api_response: Dict[str, Any]) -> None:
+        """Test several endpoints are fetched concurrently, in order."""
+        iss_now = {"iss_position": {"latitude": "1.0", "longitude": "2.0"}}
+
+        async def run_gather(base_url: str) -> List[Dict[str, Any]]:
+            async with AsyncSpaceClient(base_url=base_url) as client:
+                return await gather_endpoints(
+                    "/iss-now.json", "/astros.json", client=client
+                )
+
+        routes = {
+            "/astros.json": _json(mock_api_response),
+            "/iss-now.json": _json(iss_now),
+        }
+        assert _serve(routes, run_gather) == [iss_now, mock_api_response]
+
+    def test_http_error_is_raised(self) -> None:
+        """Test HTTP error statuses raise without retrying."""
+        calls = []
+
+        async def failing(request: web.Request) -> web.StreamResponse:
+            calls.append(request)
+            return web.Response(status=404)
+
+        async def test(base_url: str) -> None:
+            async with AsyncSpaceClient(base_url=base_url) as client:
+                await client.fetch_people()
+
+        with pytest.raises(aiohttp.ClientResponseError):
+            _serve({"/astros.json": failing}, test)
+        assert len(calls) == 1
+
+    def test_invalid_json_raises_value_error(self) -> None:
+        """Test a non-JSON body raises ValueError."""
+
+        async def garbage(request: web.Request) -> web.StreamResponse:
+            return web.Response(text="not json")
+
+        async def test(base_url: str) -> None:
+            async with AsyncSpaceClient(base_url=base_url) as client:
+                await client.fetch_people()
+
+        with pytest.raises(ValueError):
+            _serve({"/astros.json": garbage}, test)
+
+    def test_missing_people_key_raises_key_error(self) -> None:
+        """Test a payload without 'people' raises KeyError."""
+
+        async def test(base_url: str) -> None:
+            async with AsyncSpaceClient(base_url=base_url) as client:
+                await client.fetch_people()
+
+        with pytest.raises(KeyError):
+            _serve({"/astros.json": _json({"number": 0})}, test)
+
+    def test_connection_errors_are_retried(self) -> None:
+        """Test connection failures are retried with the shared policy."""
+
+        async def test() -> None:
+            async with AsyncSpaceClient(base_url="http://127.0.0.1:9") as client:
+                await client.fetch_people()
+
+        retrying = AsyncSpaceClient.get_json.retry  # type: ignore[attr-defined]
+        with patch.object(retrying, "wait", wait_none()):
+            with patch.object(
+                aiohttp.ClientSession,
+                "get",
+                side_effect=aiohttp.ClientConnectionError("refused"),
+            ) as mock_get:
+                with pytest.raises(aiohttp.ClientConnectionError):
+                    asyncio.run(test())
+
+        assert mock_get.call_count == 3
+
+    def test_requires_context_manager(self) -> None:
+        """Test using the client outside ``async with`` fails clearly."""
+        with pytest.raises(RuntimeError, match="context manager"):
+            asyncio.run(AsyncSpaceClient().get_json("/astros.json"))
+
+
+class TestFetchPeopleInSpaceAsync:
+    """Tests for fetch_people_in_space_async."""
+
+    def test_with_default_client(self, mock_api_response: Dict[str, Any]) -> None:
+        """Test a short-lived client is created when none is given."""
+
+        async def test(base_url: str) -> List[Dict[str, Any]]:
+            with patch("space.aio.API_BASE_URL", base_url):
+                return await fetch_people_in_space_async()
+
+        people = _serve({"/astros.json": _json(mock_api_response)}, test)
+        assert len(people) == 3
@@ -0,0 +1,127 @@
+"""Tests for the benchmark suite and its stub server."""
+
+import gzip
+import json
+import os
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from benchmarks.__main__ import main as benchmarks_main
+from benchmarks.stub_server import StubServer, roster_body
+from benchmarks.suite import SCHEMA_VERSION, compare, measure, run_suite
+
+
+class TestStubServer:
+    """Tests for the stub Open Notify server."""
+
+    def test_serves_roster_schema(self) -> None:
+        """Test the roster has the requested size and the API's schema."""
+        with StubServer(size=5) as server:
+            data = requests.get(f"{server.base_url}/astros.json", timeout=5).json()
+
+        assert data["message"] == "success"
+        assert data["number"] == 5
+        assert len(data["people"]) == 5
+        assert set(data["people"][0]) == {"name", "craft"}
+
+    def test_compression(self) -> None:
+        """Test gzip is used only when enabled and accepted."""
+        with StubServer(size=100) as server:
+            url = f"{server.base_url}/astros.json"
+            headers = {"Accept-Encoding": "gzip"}
+            compressed = requests.get(url, headers=headers, stream=True, timeout=5)
+            server.configure(compress=False)
+            plain = requests.get(url, headers=headers, stream=True, timeout=5)
+
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert int(compressed.headers["Content-Length"]) == len(
+            gzip.compress(roster_body(100))
+        )
+        assert "Content-Encoding" not in plain.headers
+
+    def test_error_rate(self) -> None:
+        """Test the configured fraction of requests fails with 503."""
+        with StubServer(error_rate=1.0) as server:
+            response = requests.get(f"{server.base_url}/astros.json", timeout=5)
+            assert (server.requests, server.errors) == (1, 1)
+
+        assert response.status_code == 503
+
+    def test_unknown_path_is_404(self) -> None:
+        """Test only the roster endpoint is served."""
+        with StubServer() as server:
+            response = requests.get(f"{server.base_url}/iss-now.json", timeout=5)
+
+        assert response.status_code == 404
+
+    def test_unknown_setting(self) -> None:
+        """Test configure rejects settings the stub does not have."""
+        server = StubServer()
+        try:
+            with pytest.raises(TypeError):
+                server.configure(colour="blue")
+        finally:
+            server.stop()
+
+
+def test_measure_respects_budget() -> None:
+    """Test repetition stops once the time budget is spent."""
+    calls = []
+
+    assert len(measure(lambda: calls.append(1), repeat=3, budget=10)) == 3
+    assert len(measure(lambda: calls.append(1), repeat=3, budget=0)) == 1
+    assert len(calls) == 6
+
+
+def test_run_suite() -> None:
+    """Test a small run produces summaries for every size and parser."""
+    with patch.dict(os.environ):
+        results = run_suite(sizes=[3, 50], repeat=2, benchmarks=["fetch", "parse"])
+
+    assert results["schema_version"] == SCHEMA_VERSION
+    assert results["settings"]["sizes"] == [3, 50]
+    names = {(r["name"], r["size"]) for r in results["results"]}
+    assert ("fetch", 50) in names
+    assert ("parse.roster", 3) in names
+    assert {("decode.json", 50), ("parse.json", 50), ("validate", 50)} <= names
+    for result in results["results"]:
+        assert result["n"] == 2
+        assert result["min"] <= result["median"] <= result["p95"]
+
+
+def _results(median: float) -> Dict[str, Any]:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "results": [{"name": "fetch", "size": 3, "median": median}],
+    }
+
+
+class TestCompare:
+    """Tests for comparing results files."""
+
+    def test_compare(self) -> None:
+        """Test medians are matched by benchmark and size."""
+        (comparison,) = compare(_results(0.010), _results(0.012))
+
+        assert comparison.change == pytest.approx(0.2)
+
+    def test_schema_mismatch(self) -> None:
+        """Test results from another schema version are refused."""
+        with pytest.raises(ValueError, match="schema"):
+            compare({"schema_version": 0, "results": []}, _results(0.01))
+
+    @pytest.mark.parametrize("current, status", [(0.0105, 0), (0.02, 1)])
+    def test_cli_gates_on_threshold(
+        self, tmp_path: Any, capsys: Any, current: float, status: int
+    ) -> None:
+        """Test `compare` fails when a median regresses past the threshold."""
+        baseline, result = tmp_path / "base.json", tmp_path / "new.json"
+        baseline.write_text(json.dumps(_results(0.01)))
+        result.write_text(json.dumps(_results(current)))
+
+        argv = ["compare", str(baseline), str(result), "--threshold", "0.1"]
+        assert benchmarks_main(argv) == status
+        assert ("REGRESSION" in capsys.readouterr().out) == bool(status)
@@ -0,0 +1,90 @@
+"""Unit tests for the cache module."""
+
+import json
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from space.cache import CacheEntry, ResponseCache
+
+URL = "http://api.open-notify.org/astros.json"
+
+
+class TestCacheEntry:
+    """Tests for CacheEntry."""
+
+    def test_is_fresh_within_ttl(self) -> None:
+        """Test an entry younger than the TTL is fresh."""
+        entry = CacheEntry(people=[], fetched_at=time.time() - 5)
+        assert entry.is_fresh(60) is True
+
+    def test_is_fresh_after_ttl(self) -> None:
+        """Test an entry older than the TTL is stale."""
+        entry = CacheEntry(people=[], fetched_at=time.time() - 120)
+        assert entry.is_fresh(60) is False
+
+    def test_conditional_headers(self) -> None:
+        """Test validators are turned into conditional request headers."""
+        entry = CacheEntry(
+            people=[], etag='"abc"', last_modified="Wed, 21 Oct 2015 07:28:00 GMT"
+        )
+        assert entry.conditional_headers() == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+        }
+
+    def test_conditional_headers_without_validators(self) -> None:
+        """Test no headers are sent when the entry has no validators."""
+        assert CacheEntry(people=[]).conditional_headers() == {}
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    def test_load_missing_returns_none(self, tmp_path: Path) -> None:
+        """Test loading an uncached URL returns None."""
+        assert ResponseCache(tmp_path).load(URL) is None
+
+    def test_store_and_load_roundtrip(
+        self, tmp_path: Path, mock_api_response: dict
+    ) -> None:
+        """Test a stored entry is loaded back unchanged."""
+        cache = ResponseCache(tmp_path / "nested")
+        entry = CacheEntry(people=mock_api_response["people"], etag='"v1"')
+
+        cache.store(URL, entry)
+
+        assert cache.load(URL) == entry
+
+    def test_store_leaves_no_temporary_files(self, tmp_path: Path) -> None:
+        """Test atomic writes clean up after themselves."""
+        cache = ResponseCache(tmp_path)
+        cache.store(URL, CacheEntry(people=[]))
+        assert [p.name for p in tmp_path.iterdir()] == [cache.path_for(URL).name]
+
+    def test_store_failure_keeps_previous_entry(self, tmp_path: Path) -> None:
+        """Test a failed write does not clobber the existing entry."""
+        cache = ResponseCache(tmp_path)
+        original = CacheEntry(people=[{"name": "A", "craft": "ISS"}])
+        cache.store(URL, original)
+
+        with patch("space.cache.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                cache.store(URL, CacheEntry(people=[]))
+
+        assert cache.load(URL) == original
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_load_corrupt_file_returns_none(self, tmp_path: Path) -> None:
+        """Test a corrupt cache file is treated as a miss."""
+        cache = ResponseCache(tmp_path)
+        cache.path_for(URL).write_text("{not json", encoding="utf-8")
+        assert cache.load(URL) is None
+
+    def test_load_unexpected_schema_returns_none(self, tmp_path: Path) -> None:
+        """Test a cache file with unknown fields is treated as a miss."""
+        cache = ResponseCache(tmp_path)
+        cache.path_for(URL).write_text(json.dumps({"bogus": 1}), encoding="utf-8")
+        assert cache.load(URL) is None
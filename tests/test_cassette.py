@@ -0,0 +1,209 @@
+"""Unit tests for the cassette module."""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, Generator
+
+import pytest
+import requests
+
+from space.cassette import (
+    MAGIC,
+    Cassette,
+    CassetteMiss,
+    CassetteWriter,
+    Interaction,
+    RecordingAdapter,
+    ReplayAdapter,
+)
+from space.client import SpaceClient, configure_default_client
+
+
+def make_interaction(url: str = "http://a/astros.json", **fields: Any) -> Interaction:
+    values: Dict[str, Any] = {
+        "method": "GET",
+        "url": url,
+        "status": 200,
+        "reason": "OK",
+        "headers": (("Content-Type", "application/json"),),
+        "elapsed": 0.01,
+        "duration": 0.02,
+        "recorded_at": 1700000000.0,
+    }
+    values.update(fields)
+    return Interaction(**values)
+
+
+@pytest.fixture
+def default_client() -> Generator[None, None, None]:
+    """Restore the process-wide client's default options after the test."""
+    yield
+    configure_default_client()
+
+
+class TestCassetteFile:
+    """Tests for writing and reading cassette files."""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """Test interactions and bodies read back as written."""
+        path = tmp_path / "c.cassette"
+        writer = CassetteWriter(path)
+        writer.append(make_interaction(), b'{"people": []}')
+        writer.append(make_interaction("http://a/iss-now.json", status=503), b"")
+        writer.close()
+
+        cassette = Cassette(path)
+
+        assert len(cassette) == 2
+        first, second = cassette.interactions
+        assert (first.key, first.status) == (("GET", "/astros.json"), 200)
+        assert first.headers == (("Content-Type", "application/json"),)
+        assert cassette.body(first) == b'{"people": []}'
+        assert (second.status, cassette.body(second)) == (503, b"")
+
+    def test_appends_to_existing_cassette(self, tmp_path: Path) -> None:
+        """Test a second recorder adds to the file instead of replacing it."""
+        path = tmp_path / "c.cassette"
+        for body in (b"1", b"2"):
+            writer = CassetteWriter(path)
+            writer.append(make_interaction(), body)
+            writer.close()
+
+        assert path.read_bytes().count(MAGIC) == 1
+        assert len(Cassette(path)) == 2
+
+    def test_truncated_record_is_ignored(self, tmp_path: Path) -> None:
+        """Test a record cut short by a crash does not break the cassette."""
+        path = tmp_path / "c.cassette"
+        writer = CassetteWriter(path)
+        writer.append(make_interaction(), b"complete")
+        writer.append(make_interaction(), b"cut short")
+        writer.close()
+        path.write_bytes(path.read_bytes()[:-3])
+
+        assert len(Cassette(path)) == 1
+
+    def test_rejects_other_files(self, tmp_path: Path) -> None:
+        """Test a file without the cassette header is refused."""
+        path = tmp_path / "roster.json"
+        path.write_text("{}")
+
+        with pytest.raises(ValueError, match="not a space cassette"):
+            Cassette(path)
+
+
+class TestMatch:
+    """Tests for picking the response to replay."""
+
+    def test_cycles_in_recorded_order(self, tmp_path: Path) -> None:
+        """Test responses for a path are served in order, then start over."""
+        path = tmp_path / "c.cassette"
+        writer = CassetteWriter(path)
+        for body in (b"1", b"2"):
+            writer.append(make_interaction(), body)
+        writer.close()
+        cassette = Cassette(path)
+
+        bodies = [
+            cassette.body(cassette.match("GET", "http://b/astros.json"))
+            for _ in range(3)
+        ]
+
+        assert bodies == [b"1", b"2", b"1"]
+
+    def test_query_is_matched(self, tmp_path: Path) -> None:
+        """Test the host is ignored but the query string is not."""
+        path = tmp_path / "c.cassette"
+        writer = CassetteWriter(path)
+        writer.append(make_interaction("http://a/x?page=2"), b"")
+        writer.close()
+        cassette = Cassette(path)
+
+        assert cassette.match("get", "https://other/x?page=2").status == 200
+        with pytest.raises(CassetteMiss, match="GET /x"):
+            cassette.match("GET", "http://a/x")
+
+
+class TestAdapters:
+    """Tests for recording and replaying through SpaceClient."""
+
+    def test_records_wire_bytes(
+        self, astros_cassette: Path, astros_server: Dict[str, Any]
+    ) -> None:
+        """Test the compressed body and its headers are recorded."""
+        cassette = Cassette(astros_cassette)
+        (interaction,) = cassette.interactions
+
+        headers = dict(interaction.headers)
+        assert headers["Content-Encoding"] == "gzip"
+        assert headers["Content-Length"] == str(interaction.length)
+        assert cassette.body(interaction) != astros_server["body"]
+        assert interaction.duration >= interaction.elapsed > 0
+
+    def test_recording_client_still_answers(
+        self, astros_server: Dict[str, Any], tmp_path: Path
+    ) -> None:
+        """Test a recorded response is passed on to the caller, streamed too."""
+        recorder = RecordingAdapter(CassetteWriter(tmp_path / "c.cassette"))
+        with SpaceClient(
+            base_url=astros_server["base_url"], mirrors=[], transport=recorder
+        ) as client:
+            streamed = list(client.iter_people())
+
+        assert [p["name"] for p in streamed][:1] == ["John Doe"]
+
+    def test_replays_offline(
+        self, astros_cassette: Path, mock_api_response: Dict[str, Any]
+    ) -> None:
+        """Test a replaying client never touches the network."""
+        replayer = ReplayAdapter(Cassette(astros_cassette))
+        with SpaceClient(
+            base_url="http://unreachable.invalid", mirrors=[], transport=replayer
+        ) as client:
+            people = client.fetch_people()
+            streamed = list(client.iter_people())
+
+        assert people == mock_api_response["people"]
+        assert streamed == mock_api_response["people"]
+
+    def test_miss_is_not_retried(self, astros_cassette: Path) -> None:
+        """Test an unrecorded request fails at once."""
+        replayer = ReplayAdapter(Cassette(astros_cassette))
+        with SpaceClient(base_url="http://a", mirrors=[], transport=replayer) as client:
+            with pytest.raises(CassetteMiss):
+                client.get("http://a/iss-now.json")
+            assert client.stats().requests == 0
+
+    @pytest.mark.parametrize("latency", [0.05, None])
+    def test_simulated_latency(self, astros_cassette: Path, latency: Any) -> None:
+        """Test replies wait a fixed delay, or the recorded duration."""
+        cassette = Cassette(astros_cassette)
+        expected = latency or cassette.interactions[0].duration
+        with SpaceClient(
+            base_url="http://a", mirrors=[], transport=ReplayAdapter(cassette, latency)
+        ) as client:
+            start = time.perf_counter()
+            response = client.get("http://a/astros.json")
+
+        assert time.perf_counter() - start >= expected
+        assert response.elapsed.total_seconds() >= expected
+
+    def test_default_client(
+        self,
+        astros_cassette: Path,
+        mock_api_response: Dict[str, Any],
+        default_client: None,
+    ) -> None:
+        """Test fetch_people_in_space can be pointed at a cassette."""
+        from space.space import fetch_people_in_space
+
+        configure_default_client(
+            transport=ReplayAdapter(Cassette(astros_cassette)), mirrors=[]
+        )
+
+        assert fetch_people_in_space(cache_ttl=0) == mock_api_response["people"]
+
+
+def test_miss_is_a_request_exception() -> None:
+    """Test callers handling requests errors also handle misses."""
+    assert issubclass(CassetteMiss, requests.exceptions.RequestException)
@@ -0,0 +1,144 @@
+"""Unit tests for the client module."""
+
+import gzip
+from datetime import timedelta
+from typing import Any, Dict
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from space.client import ClientStats, SpaceClient, get_default_client
+from space.decode import SchemaError
+
+
+class TestSpaceClient:
+    """Tests for SpaceClient."""
+
+    def test_fetch_people(self, astros_server: Dict[str, Any]) -> None:
+        """Test the roster is fetched over the pooled session."""
+        with SpaceClient(base_url=astros_server["base_url"]) as client:
+            people = client.fetch_people()
+
+        assert [p["name"] for p in people] == ["John Doe", "Jane Smith", "Bob Johnson"]
+
+    def test_requests_gzip(self, astros_server: Dict[str, Any]) -> None:
+        """Test the client asks for compressed responses."""
+        with SpaceClient(base_url=astros_server["base_url"]) as client:
+            client.fetch_people()
+
+        assert "gzip" in astros_server["headers"][0]["Accept-Encoding"]
+
+    def test_keep_alive_reuses_connection(self, astros_server: Dict[str, Any]) -> None:
+        """Test consecutive requests share one TCP connection."""
+        with SpaceClient(base_url=astros_server["base_url"]) as client:
+            client.fetch_people()
+            client.fetch_people()
+
+        assert len(set(astros_server["ports"])) == 1
+
+    def test_keep_alive_disabled(self, astros_server: Dict[str, Any]) -> None:
+        """Test keep_alive=False asks the server to close the connection."""
+        with SpaceClient(base_url=astros_server["base_url"], keep_alive=False) as c:
+            c.fetch_people()
+
+        assert astros_server["headers"][0]["Connection"] == "close"
+
+    def test_stats_account_bytes_and_latency(
+        self, astros_server: Dict[str, Any]
+    ) -> None:
+        """Test wire bytes, decoded bytes and latency are recorded."""
+        with SpaceClient(base_url=astros_server["base_url"]) as client:
+            client.fetch_people()
+            client.fetch_people()
+            stats = client.stats()
+
+        body = astros_server["body"]
+        assert stats.requests == 2
+        assert stats.bytes_decoded == 2 * len(body)
+        assert stats.bytes_received == 2 * len(gzip.compress(body))
+        assert stats.total_latency > 0
+        assert stats.mean_latency == pytest.approx(stats.total_latency / 2)
+
+    def test_iter_people_streams_roster(self, astros_server: Dict[str, Any]) -> None:
+        """Test the roster can be streamed person by person."""
+        with SpaceClient(base_url=astros_server["base_url"]) as client:
+            people = client.iter_people(chunk_size=8)
+            first = next(people)
+            rest = list(people)
+            stats = client.stats()
+
+        assert first == {"name": "John Doe", "craft": "ISS"}
+        assert len(rest) == 2
+        assert stats.requests == 1
+        assert stats.bytes_decoded == len(astros_server["body"])
+
+    @pytest.mark.parametrize(
+        "mock_api_response",
+        [{"people": [{"name": "John Doe", "craft": "ISS"}, {"name": "Jane Smith"}]}],
+    )
+    def test_malformed_roster_is_rejected(self, astros_server: Dict[str, Any]) -> None:
+        """Test fetched and streamed rosters are validated, naming the field."""
+        with SpaceClient(base_url=astros_server["base_url"]) as client:
+            with pytest.raises(SchemaError, match=r"^people\[1\]\.craft: missing$"):
+                client.fetch_people()
+            with pytest.raises(SchemaError, match=r"^people\[1\]\.craft: missing$"):
+                list(client.iter_people())
+
+    @pytest.mark.parametrize(
+        "mock_api_response",
+        [{"message": "success", "number": "3", "people": []}],
+    )
+    def test_malformed_count_is_rejected(self, astros_server: Dict[str, Any]) -> None:
+        """Test members besides the roster are validated when streaming too."""
+        with SpaceClient(base_url=astros_server["base_url"]) as client:
+            with pytest.raises(SchemaError, match=r"^number: expected an integer"):
+                list(client.iter_people())
+
+    def test_pool_size_configures_adapters(self) -> None:
+        """Test the pool size is applied to both HTTP and HTTPS adapters."""
+        client = SpaceClient(pool_size=3)
+        for prefix in ("http://", "https://"):
+            assert client.session.get_adapter(prefix)._pool_maxsize == 3
+
+    def test_defaults_come_from_config(self) -> None:
+        """Test pool settings default to the configured values."""
+        with patch("space.client.HTTP_POOL_SIZE", 7):
+            with patch("space.client.HTTP_KEEP_ALIVE", False):
+                client = SpaceClient()
+        assert client.pool_size == 7
+        assert client.keep_alive is False
+
+    @patch("space.client.requests.Session.get")
+    def test_http_error_is_recorded_and_raised(self, mock_get: Any) -> None:
+        """Test HTTP errors raise but still count towards the stats."""
+        mock_response = Mock(content=b"", headers={}, elapsed=timedelta(0))
+        mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            "500 Server Error"
+        )
+        mock_get.return_value = mock_response
+        client = SpaceClient(base_url="http://example.invalid")
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get_json("/astros.json")
+        assert client.stats().requests == 1
+
+    @patch("space.client.requests.Session.get")
+    def test_invalid_json_raises_value_error(self, mock_get: Any) -> None:
+        """Test an undecodable body raises ValueError."""
+        mock_response = Mock(content=b"nope", headers={}, elapsed=timedelta(0))
+        mock_get.return_value = mock_response
+
+        with pytest.raises(ValueError):
+            SpaceClient(base_url="http://example.invalid").get_json("/astros.json")
+
+    def test_stats_snapshot_is_a_copy(self) -> None:
+        """Test callers cannot mutate the client's counters."""
+        client = SpaceClient()
+        client.stats().requests = 99
+        assert client.stats() == ClientStats()
+
+
+def test_get_default_client_is_shared() -> None:
+    """Test fetch_people_in_space reuses one client per process."""
+    assert get_default_client() is get_default_client()
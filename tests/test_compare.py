@@ -0,0 +1,160 @@
+"""Unit tests for the compare module."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Generator
+from unittest.mock import patch
+
+import pytest
+
+from space.compare import (
+    EnvironmentResult,
+    diff_rosters,
+    fetch_environment,
+    fetch_environments,
+)
+from space.resilience import get_policy
+
+# Roster served under each path, and seconds to wait before answering
+ROSTERS = {
+    "/dev": [{"name": "Jane Smith", "craft": "ISS"}, {"name": "Bob", "craft": "ISS"}],
+    "/staging": [
+        {"name": "jane  SMITH", "craft": "iss"},
+        {"name": "Bob", "craft": "Tiangong"},
+    ],
+    "/prod": [{"name": "Jane Smith", "craft": "ISS"}],
+}
+DELAY = 0.3
+
+
+@pytest.fixture
+def environments() -> Generator[Dict[str, str], None, None]:
+    """Serve ROSTERS slowly, and a 500 error on any other path."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802
+            time.sleep(DELAY)
+            people = ROSTERS.get(self.path)
+            body = json.dumps({"people": people}).encode() if people else b""
+            self.send_response(200 if people else 500)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        yield {name[1:]: base_url + name for name in [*ROSTERS, "/broken"]}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class TestFetchEnvironments:
+    """Tests for fetching several environments."""
+
+    def test_fetched_concurrently(self, environments: Dict[str, str]) -> None:
+        """Test the run takes as long as the slowest environment."""
+        start = time.perf_counter()
+        results = fetch_environments(environments)
+        elapsed = time.perf_counter() - start
+
+        assert [result.name for result in results] == list(environments)
+        assert elapsed < 2 * DELAY
+        assert [len(result.people or ()) for result in results[:3]] == [2, 2, 1]
+        assert all(result.seconds >= DELAY for result in results)
+
+    def test_bounded_pool(self, environments: Dict[str, str]) -> None:
+        """Test no more than max_workers environments are fetched at once."""
+        start = time.perf_counter()
+        fetch_environments(environments, max_workers=2)
+
+        assert time.perf_counter() - start >= 2 * DELAY
+
+    def test_failure_is_captured(self, environments: Dict[str, str]) -> None:
+        """Test a failing environment is reported, not raised."""
+        results = fetch_environments(environments)
+
+        assert not results[-1].ok
+        assert "500" in (results[-1].error or "")
+
+    def test_own_circuit_breaker(self, environments: Dict[str, str]) -> None:
+        """Test an open process-wide circuit does not stop a comparison."""
+        breaker = get_policy().breaker
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        assert fetch_environment("dev", environments["dev"]).ok
+
+    def test_invalid_max_workers(self) -> None:
+        """Test a pool without workers is refused."""
+        with pytest.raises(ValueError):
+            fetch_environments({}, max_workers=0)
+
+
+class TestDiffRosters:
+    """Tests for lining rosters up."""
+
+    @pytest.fixture
+    def results(self) -> list:
+        return [
+            EnvironmentResult(name, f"http://example.invalid{path}", people)
+            for name, path, people in (
+                ("dev", "/dev", ROSTERS["/dev"]),
+                ("staging", "/staging", ROSTERS["/staging"]),
+                ("prod", "/prod", ROSTERS["/prod"]),
+            )
+        ]
+
+    def test_rows(self, results: list) -> None:
+        """Test each person gets the craft reported by each environment."""
+        assert diff_rosters(results) == [
+            {
+                "name": "Bob",
+                "dev": "ISS",
+                "staging": "Tiangong",
+                "prod": None,
+                "status": "differs",
+            },
+            {
+                "name": "Jane Smith",
+                "dev": "ISS",
+                "staging": "iss",
+                "prod": "ISS",
+                "status": "same",
+            },
+        ]
+
+    def test_differences_only(self, results: list) -> None:
+        """Test people all environments agree on can be left out."""
+        assert [row["name"] for row in diff_rosters(results, True)] == ["Bob"]
+
+    def test_failed_environments_left_out(self, results: list) -> None:
+        """Test an environment without a roster does not count as disagreeing."""
+        results[1] = EnvironmentResult("staging", "", None, "timed out")
+
+        rows = diff_rosters(results, differences_only=True)
+
+        assert rows == [
+            {"name": "Bob", "dev": "ISS", "prod": None, "status": "differs"}
+        ]
+
+
+def test_fetch_environment_uses_no_mirrors(environments: Dict[str, str]) -> None:
+    """Test configured mirrors do not stand in for a compared environment."""
+    with patch("space.client.API_MIRRORS", ["http://127.0.0.1:9"]):
+        result = fetch_environment("prod", environments["prod"])
+
+    assert result.people == ROSTERS["/prod"]
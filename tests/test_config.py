@@ -2,6 +2,7 @@
 
 import os
 import sys
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -15,8 +16,10 @@ def test_config_missing_base_url() -> None:
 
     with patch("dotenv.load_dotenv"):
         with patch.dict(os.environ, {}, clear=True):
+            import space.config
+
             with pytest.raises(ValueError, match="SPACE_API_BASE_URL must be set"):
-                import space.config  # noqa: F401
+                space.config.ASTROS_API_URL
 
 
 def test_config_missing_endpoint() -> None:
@@ -29,8 +32,33 @@ def test_config_missing_endpoint() -> None:
         with patch.dict(
             os.environ, {"SPACE_API_BASE_URL": "http://api.example.com"}, clear=True
         ):
+            import space.config
+
             with pytest.raises(ValueError, match="SPACE_ASTROS_ENDPOINT must be set"):
-                import space.config  # noqa: F401
+                space.config.ASTROS_API_URL
+
+
+def test_config_import_is_lazy() -> None:
+    """Test that importing config neither loads .env nor validates."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv") as mock_load_dotenv:
+        with patch.dict(os.environ, {}, clear=True):
+            import space.config
+
+            mock_load_dotenv.assert_not_called()
+            with pytest.raises(ValueError, match="SPACE_API_BASE_URL must be set"):
+                space.config.ASTROS_API_URL
+            mock_load_dotenv.assert_called_once()
+
+
+def test_config_unknown_setting() -> None:
+    """Test that unknown settings raise AttributeError."""
+    import space.config
+
+    with pytest.raises(AttributeError):
+        space.config.NOT_A_SETTING
 
 
 def test_config_valid_values() -> None:
@@ -53,3 +81,385 @@ def test_config_valid_values() -> None:
             assert space.config.API_BASE_URL == "http://api.example.com"
             assert space.config.ASTROS_ENDPOINT == "/test.json"
             assert space.config.ASTROS_API_URL == "http://api.example.com/test.json"
+
+
+def test_config_invalid_cache_ttl() -> None:
+    """Test that ValueError is raised when SPACE_CACHE_TTL is not an integer."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_CACHE_TTL": "soon",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            with pytest.raises(ValueError, match="SPACE_CACHE_TTL must be an integer"):
+                space.config.ASTROS_API_URL
+
+
+def test_config_invalid_keep_alive() -> None:
+    """Test that ValueError is raised when SPACE_HTTP_KEEP_ALIVE is not boolean."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_HTTP_KEEP_ALIVE": "maybe",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            with pytest.raises(ValueError, match="SPACE_HTTP_KEEP_ALIVE must be"):
+                space.config.ASTROS_API_URL
+
+
+def test_config_pool_size_minimum() -> None:
+    """Test that ValueError is raised when SPACE_HTTP_POOL_SIZE is below 1."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_HTTP_POOL_SIZE": "0",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            with pytest.raises(ValueError, match="SPACE_HTTP_POOL_SIZE must be at"):
+                space.config.ASTROS_API_URL
+
+
+def test_config_history_defaults() -> None:
+    """Test history recording is off and the database lives in the cache dir."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_CACHE_DIR": "/tmp/space-cache",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            assert space.config.RECORD_HISTORY is False
+            assert space.config.HISTORY_DB == Path("/tmp/space-cache/history.sqlite3")
+
+
+def test_config_roster_reuse() -> None:
+    """Test in-process roster reuse is off by default and configurable."""
+    environ = {
+        "SPACE_API_BASE_URL": "http://api.example.com",
+        "SPACE_ASTROS_ENDPOINT": "/test.json",
+    }
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, environ, clear=True):
+            import space.config
+
+            assert space.config.ROSTER_MAX_AGE == 0.0
+            assert space.config.STALE_WHILE_REVALIDATE is False
+
+    del sys.modules["space.config"]
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                **environ,
+                "SPACE_ROSTER_MAX_AGE": "30",
+                "SPACE_STALE_WHILE_REVALIDATE": "yes",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            assert space.config.ROSTER_MAX_AGE == 30.0
+            assert space.config.STALE_WHILE_REVALIDATE is True
+
+
+def test_config_resilience_defaults() -> None:
+    """Test the default retry, deadline and circuit breaker settings."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            assert space.config.RETRY_ATTEMPTS == 3
+            assert space.config.RETRY_BACKOFF == 1.0
+            assert space.config.RETRY_BACKOFF_MAX == 10.0
+            assert space.config.RETRY_BUDGET_RATIO == 0.2
+            assert space.config.REQUEST_DEADLINE == 15.0
+            assert space.config.BREAKER_THRESHOLD == 5
+            assert space.config.BREAKER_RESET_TIMEOUT == 30.0
+
+
+def test_config_invalid_deadline() -> None:
+    """Test that ValueError is raised when SPACE_REQUEST_DEADLINE is not a number."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_REQUEST_DEADLINE": "forever",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            with pytest.raises(
+                ValueError, match="SPACE_REQUEST_DEADLINE must be a number"
+            ):
+                space.config.ASTROS_API_URL
+
+
+def test_config_mirrors() -> None:
+    """Test SPACE_API_MIRRORS is split into an ordered list of base URLs."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_API_MIRRORS": " http://cache.local, ,http://staging ",
+                "SPACE_HEDGE_DELAY": "0.25",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            assert space.config.API_MIRRORS == ["http://cache.local", "http://staging"]
+            assert space.config.HEDGE_DELAY == 0.25
+
+
+def test_config_log_payload_sample_rate() -> None:
+    """Test SPACE_LOG_PAYLOAD_SAMPLE_RATE is read and validated."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_LOG_PAYLOAD_SAMPLE_RATE": "0.1",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            assert space.config.LOG_PAYLOAD_SAMPLE_RATE == 0.1
+
+    del sys.modules["space.config"]
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(
+            os.environ,
+            {
+                "SPACE_API_BASE_URL": "http://api.example.com",
+                "SPACE_ASTROS_ENDPOINT": "/test.json",
+                "SPACE_LOG_PAYLOAD_SAMPLE_RATE": "-1",
+            },
+            clear=True,
+        ):
+            import space.config
+
+            with pytest.raises(ValueError, match="at least 0"):
+                space.config.LOG_PAYLOAD_SAMPLE_RATE
+
+
+def test_config_cassettes() -> None:
+    """Test the record/replay settings are read and checked."""
+    base = {
+        "SPACE_API_BASE_URL": "http://api.example.com",
+        "SPACE_ASTROS_ENDPOINT": "/test.json",
+    }
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, base, clear=True):
+            import space.config
+
+            assert space.config.RECORD_CASSETTE is None
+            assert space.config.REPLAY_CASSETTE is None
+            assert space.config.REPLAY_LATENCY == 0.0
+
+    del sys.modules["space.config"]
+    env = {
+        **base,
+        "SPACE_REPLAY_CASSETTE": "/tmp/astros.cassette",
+        "SPACE_REPLAY_LATENCY": "recorded",
+    }
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, env, clear=True):
+            import space.config
+
+            assert space.config.REPLAY_CASSETTE == Path("/tmp/astros.cassette")
+            assert space.config.REPLAY_LATENCY is None
+
+    del sys.modules["space.config"]
+    env = {
+        **base,
+        "SPACE_RECORD_CASSETTE": "/tmp/a.cassette",
+        "SPACE_REPLAY_CASSETTE": "/tmp/b.cassette",
+    }
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, env, clear=True):
+            import space.config
+
+            with pytest.raises(ValueError, match="cannot both be set"):
+                space.config.REPLAY_CASSETTE
+
+
+@pytest.mark.parametrize("value, expected", [("", "auto"), ("ORJSON", "orjson")])
+def test_config_json_decoder(value: str, expected: str) -> None:
+    """Test SPACE_JSON_DECODER is read case-insensitively."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    env = {
+        "SPACE_API_BASE_URL": "http://api.example.com",
+        "SPACE_ASTROS_ENDPOINT": "/test.json",
+        "SPACE_JSON_DECODER": value,
+    }
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, env, clear=True):
+            import space.config
+
+            assert space.config.JSON_DECODER == expected
+
+
+def test_config_json_decoder_invalid() -> None:
+    """Test an unknown SPACE_JSON_DECODER is rejected."""
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    env = {
+        "SPACE_API_BASE_URL": "http://api.example.com",
+        "SPACE_ASTROS_ENDPOINT": "/test.json",
+        "SPACE_JSON_DECODER": "simdjson",
+    }
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, env, clear=True):
+            import space.config
+
+            with pytest.raises(ValueError, match="auto, orjson or json"):
+                space.config.JSON_DECODER
+
+
+def test_config_rate_limit() -> None:
+    """Test the host-wide rate limit settings and their defaults."""
+    base = {
+        "SPACE_API_BASE_URL": "http://api.example.com",
+        "SPACE_ASTROS_ENDPOINT": "/test.json",
+        "SPACE_CACHE_DIR": "/tmp/space-cache",
+    }
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, base, clear=True):
+            import space.config
+
+            assert space.config.RATE_LIMIT == 0.0
+            assert space.config.RATE_LIMIT_BURST == 5.0
+            assert space.config.RATE_LIMIT_POLICY == "wait"
+            assert space.config.RATE_LIMIT_FILE == Path("/tmp/space-cache/ratelimit")
+
+    del sys.modules["space.config"]
+    env = {**base, "SPACE_RATE_LIMIT_POLICY": "retry"}
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, env, clear=True):
+            import space.config
+
+            with pytest.raises(ValueError, match="wait, cache or fail"):
+                space.config.RATE_LIMIT_POLICY
+
+
+def test_config_environments() -> None:
+    """Test named environments are read, and one can be selected."""
+    base = {
+        "SPACE_API_BASE_URL": "http://api.example.com",
+        "SPACE_ASTROS_ENDPOINT": "/test.json",
+        "SPACE_ENVIRONMENTS": "dev, staging",
+        "SPACE_ENV_DEV_URL": "http://localhost:8000/api/v1/astros",
+        "SPACE_ENV_STAGING_URL": "https://staging-api.example.com/astros?v=2",
+    }
+    if "space.config" in sys.modules:
+        del sys.modules["space.config"]
+
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, base, clear=True):
+            import space.config
+
+            assert space.config.ENVIRONMENTS == {
+                "dev": "http://localhost:8000/api/v1/astros",
+                "staging": "https://staging-api.example.com/astros?v=2",
+            }
+            assert space.config.ENVIRONMENT is None
+            assert space.config.API_BASE_URL == "http://api.example.com"
+
+    del sys.modules["space.config"]
+    with patch("dotenv.load_dotenv"):
+        with patch.dict(os.environ, {**base, "SPACE_ENV": "staging"}, clear=True):
+            import space.config
+
+            assert space.config.ENVIRONMENT == "staging"
+            assert space.config.API_BASE_URL == "https://staging-api.example.com"
+            assert space.config.ASTROS_ENDPOINT == "/astros?v=2"
+
+    for env, message in [
+        ({"SPACE_ENV": "prod"}, "unknown environment 'prod'"),
+        ({"SPACE_ENV_DEV_URL": "localhost:8000"}, "SPACE_ENV_DEV_URL must be set"),
+        ({"SPACE_ENVIRONMENTS": "dev,qa-1"}, "'qa-1' may only use"),
+        (
+            {"SPACE_ENVIRONMENTS": "dev,status", "SPACE_ENV_STATUS_URL": "http://s"},
+            "'status' is a reserved name",
+        ),
+    ]:
+        del sys.modules["space.config"]
+        with patch("dotenv.load_dotenv"):
+            with patch.dict(os.environ, {**base, **env}, clear=True):
+                import space.config
+
+                with pytest.raises(ValueError, match=message):
+                    space.config.ENVIRONMENTS
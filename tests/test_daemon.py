@@ -0,0 +1,240 @@
+"""Unit tests for the daemon module."""
+
+import asyncio
+import io
+import os
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import threading
+from typing import Any, Generator, Tuple
+from unittest.mock import Mock, patch
+
+import pytest
+
+from space.daemon import RosterDaemon, _claim_socket, run_daemon
+from space.fastpath import ask_daemon, encode_request
+from space.models import Roster
+from space.output import write_people
+
+PEOPLE = [
+    {"name": "John Doe", "craft": "ISS"},
+    {"name": "Jane Smith", "craft": "ISS"},
+    {"name": "Bob Johnson", "craft": "Tiangong"},
+]
+
+
+unix_sockets = pytest.mark.skipif(
+    sys.platform == "win32", reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def sock_path() -> Generator[str, None, None]:
+    """Give the test a short socket path (Unix sockets cap path length)."""
+    directory = tempfile.mkdtemp(prefix="space-")
+    try:
+        yield os.path.join(directory, "daemon.sock")
+    finally:
+        shutil.rmtree(directory)
+
+
+@pytest.fixture
+def daemon() -> RosterDaemon:
+    """Give the test a daemon holding a three-person roster."""
+    daemon = RosterDaemon(Mock(return_value=Roster(PEOPLE)))
+    daemon.roster = Roster(PEOPLE)
+    return daemon
+
+
+@pytest.fixture
+def running_daemon(
+    sock_path: str,
+) -> Generator[Tuple[RosterDaemon, str, Mock], None, None]:
+    """Run a RosterDaemon on an event loop in a background thread."""
+    fetch = Mock(return_value=Roster(PEOPLE))
+    daemon = RosterDaemon(fetch, refresh_interval=30)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    listener = asyncio.run_coroutine_threadsafe(
+        run_daemon(daemon, sock_path), loop
+    ).result(timeout=5)
+    try:
+        yield daemon, sock_path, fetch
+    finally:
+        loop.call_soon_threadsafe(listener.close)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+class TestAnswer:
+    """Tests for rendering answers from memory."""
+
+    @pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+    def test_streaming_formats_match_direct_output(
+        self, daemon: RosterDaemon, fmt: str
+    ) -> None:
+        """Test the bytes are what `space --format` writes itself."""
+        expected = io.StringIO()
+        write_people(PEOPLE, fmt, expected, ["name", "craft"])
+
+        output = daemon.answer(["--format", fmt], 80, False)
+
+        assert output == expected.getvalue().encode()
+
+    def test_query(self, daemon: RosterDaemon) -> None:
+        """Test filters and grouping are applied to the roster."""
+        output = daemon.answer(["--format", "csv", "--group-by", "craft"], 80, False)
+
+        assert output == b"craft,count\r\nISS,2\r\nTiangong,1\r\n"
+
+    def test_table(self, daemon: RosterDaemon) -> None:
+        """Test the table is rendered at the caller's width, in color if asked."""
+        plain = daemon.answer(["--craft", "ISS"], 60, False)
+        colored = daemon.answer(["--craft", "ISS"], 60, True)
+
+        assert plain is not None and colored is not None
+        text = plain.decode()
+        assert "People currently in space: 2" in text
+        assert "Bob Johnson" not in text
+        assert max(len(line) for line in text.splitlines()) <= 60
+        assert b"\x1b[" not in plain
+        assert b"\x1b[" in colored
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["watch"],
+            ["-v"],
+            ["--no-cache"],
+            ["--cache-ttl", "5"],
+            ["--env", "staging"],
+            ["--pager"],
+            ["--profile"],
+            ["--bogus"],
+            ["--vers"],
+        ],
+    )
+    def test_declines(self, daemon: RosterDaemon, argv: Any, capsys: Any) -> None:
+        """Test commands that need the caller's process are declined quietly."""
+        assert daemon.answer(argv, 80, False) is None
+        assert capsys.readouterr() == ("", "")
+
+    def test_declines_without_roster(self) -> None:
+        """Test nothing is answered before the first successful refresh."""
+        assert RosterDaemon(Mock()).answer([], 80, False) is None
+
+
+class TestHandle:
+    """Tests for replies and their cache."""
+
+    def test_reply(self, daemon: RosterDaemon) -> None:
+        """Test answers are prefixed with the exit status."""
+        reply = daemon.handle(encode_request(["--format", "csv"], 80, False))
+
+        assert reply.startswith(b"OK 0\nname,craft\r\n")
+
+    def test_differently_configured_caller_is_declined(
+        self, daemon: RosterDaemon
+    ) -> None:
+        """Test a caller pointed at another API runs the command itself."""
+        environ = dict(os.environ, SPACE_API_BASE_URL="http://staging.invalid")
+
+        assert daemon.handle(encode_request([], 80, False, environ)) == b""
+
+    def test_dotenv_counts_as_configuration(self) -> None:
+        """Test a variable the daemon got from .env need not be exported."""
+        with patch("dotenv.dotenv_values", return_value={"SPACE_ENV": "prod"}):
+            daemon = RosterDaemon(Mock(), environ={"SPACE_ENV": "prod"})
+        daemon.roster = Roster(PEOPLE)
+
+        assert daemon.handle(encode_request([], 80, False, {})).startswith(b"OK 0")
+        assert daemon.handle(encode_request([], 80, False, {"SPACE_ENV": "dev"})) == (
+            b""
+        )
+
+    def test_bad_request_is_declined(self, daemon: RosterDaemon) -> None:
+        """Test malformed requests get an empty reply."""
+        assert daemon.handle(b"nonsense") == b""
+        assert daemon.handle(b"") == b""
+
+    def test_replies_are_cached_until_refresh(self, daemon: RosterDaemon) -> None:
+        """Test a repeated request is answered from the cache."""
+        request = encode_request(["--format", "json"], 80, False)
+        first = daemon.handle(request)
+        assert daemon.handle(request) is first
+
+        daemon.fetch = Mock(return_value=Roster(PEOPLE[:1]))
+        asyncio.run(daemon.refresh())
+        assert daemon.handle(request) == b'OK 0\n[{"name":"John Doe","craft":"ISS"}]\n'
+
+
+@unix_sockets
+class TestRunDaemon:
+    """Tests for the daemon over a real Unix socket."""
+
+    def test_answers_over_socket(
+        self, running_daemon: Tuple[RosterDaemon, str, Mock]
+    ) -> None:
+        """Test a client gets the output through the socket."""
+        _, path, fetch = running_daemon
+
+        answer = ask_daemon(["--format", "csv", "--craft", "Tiangong"], 80, False, path)
+
+        assert answer == (0, b"name,craft\r\nBob Johnson,Tiangong\r\n")
+        fetch.assert_called_once()
+
+    def test_socket_is_private(
+        self, running_daemon: Tuple[RosterDaemon, str, Mock]
+    ) -> None:
+        """Test only the owner may connect."""
+        _, path, _ = running_daemon
+
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_socket_is_created_private(self, sock_path: str) -> None:
+        """Test the socket is owner-only from the moment it is bound."""
+        modes = []
+        start_unix_server = asyncio.start_unix_server
+
+        async def bind(*args: Any, **kwargs: Any) -> asyncio.AbstractServer:
+            server = await start_unix_server(*args, **kwargs)
+            modes.append(stat.S_IMODE(os.stat(sock_path).st_mode))
+            return server
+
+        daemon = RosterDaemon(Mock(return_value=Roster(PEOPLE)), refresh_interval=30)
+        umask = os.umask(0)
+        try:
+            with patch("space.daemon.asyncio.start_unix_server", bind):
+                listener = asyncio.run(run_daemon(daemon, sock_path))
+            assert os.umask(umask) == 0
+        finally:
+            os.umask(umask)
+        listener.close()
+
+        assert modes == [0o600]
+
+    def test_refuses_second_daemon(
+        self, running_daemon: Tuple[RosterDaemon, str, Mock]
+    ) -> None:
+        """Test a live socket is not taken over."""
+        _, path, _ = running_daemon
+
+        with pytest.raises(RuntimeError, match="already listening"):
+            _claim_socket(path)
+
+
+@unix_sockets
+def test_stale_socket_is_removed(sock_path: str) -> None:
+    """Test a socket left by a dead daemon is cleaned up."""
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(sock_path)
+    stale.close()
+
+    _claim_socket(sock_path)
+
+    assert not os.path.exists(sock_path)
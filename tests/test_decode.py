@@ -0,0 +1,156 @@
+"""Unit tests for the decode module."""
+
+import json
+from typing import Any, Generator
+from unittest.mock import patch
+
+import pytest
+
+import space.decode
+from space.decode import (
+    MissingFieldError,
+    SchemaError,
+    get_decoder,
+    loads,
+    use_decoder,
+    validate_astros,
+    validate_astros_member,
+    validate_person,
+)
+
+
+@pytest.fixture
+def reset_decoder() -> Generator[None, None, None]:
+    """Let the test pick a decoder, then go back to the configured one."""
+    yield
+    space.decode._decoder = None
+
+
+class TestDecoders:
+    """Tests for choosing the JSON backend."""
+
+    def test_auto_prefers_orjson(self) -> None:
+        """Test orjson is used when it is installed."""
+        orjson = pytest.importorskip("orjson")
+
+        assert get_decoder("auto") is orjson.loads
+
+    def test_auto_falls_back_to_json(self) -> None:
+        """Test the standard library is used without orjson."""
+        with patch.dict(space.decode.DECODERS, clear=True):
+            space.decode.DECODERS["json"] = json.loads
+            assert get_decoder("auto") is json.loads
+            with pytest.raises(ValueError, match="'orjson' is not available"):
+                get_decoder("orjson")
+
+    @pytest.mark.parametrize("name", sorted(space.decode.DECODERS))
+    def test_backends_agree(self, name: str, reset_decoder: None) -> None:
+        """Test every backend decodes the same document, bytes or str."""
+        document = {"people": [{"name": "Ľudmila Čaputová 王亚平", "craft": "ISS"}]}
+        body = json.dumps(document, ensure_ascii=False)
+        use_decoder(name)
+
+        assert loads(body.encode()) == document
+        assert loads(body) == document
+        with pytest.raises(ValueError):
+            loads(b"{nope")
+
+    def test_configured_backend(self, reset_decoder: None) -> None:
+        """Test loads() uses SPACE_JSON_DECODER on first use."""
+        space.decode._decoder = None
+        with patch("space.config.JSON_DECODER", "json"):
+            loads(b"{}")
+
+        assert space.decode._decoder is json.loads
+
+
+class TestValidateAstros:
+    """Tests for the /astros.json validator."""
+
+    def test_valid(self, mock_api_response: Any) -> None:
+        """Test a well-formed payload passes."""
+        assert validate_astros(mock_api_response) is None
+
+    def test_optional_members(self) -> None:
+        """Test number and message may be absent."""
+        validate_astros({"people": []})
+
+    @pytest.mark.parametrize(
+        "payload, message",
+        [
+            ([], "document: expected an object, got an array"),
+            ({"number": 1}, "people: missing"),
+            ({"people": {}}, "people: expected an array, got an object"),
+            (
+                {"people": [], "number": "3"},
+                "number: expected an integer, got a string",
+            ),
+            (
+                {"people": [], "number": True},
+                "number: expected an integer, got a boolean",
+            ),
+            ({"people": [], "message": None}, "message: expected a string, got null"),
+            ({"people": ["Jane"]}, "people[0]: expected an object, got a string"),
+            (
+                {"people": [{"name": "A", "craft": "ISS"}, {"name": "B"}]},
+                "people[1].craft: missing",
+            ),
+            (
+                {"people": [{"name": "A", "craft": "ISS"}] * 2 + [{"name": 7}]},
+                "people[2].name: expected a string, got a number",
+            ),
+        ],
+    )
+    def test_reports_field(self, payload: Any, message: str) -> None:
+        """Test the error names the malformed field."""
+        with pytest.raises(SchemaError) as raised:
+            validate_astros(payload)
+
+        assert str(raised.value) == message
+
+    def test_missing_field_is_a_key_error(self) -> None:
+        """Test callers catching KeyError still catch a missing roster."""
+        with pytest.raises(KeyError) as raised:
+            validate_astros({"number": 0})
+
+        assert isinstance(raised.value, MissingFieldError)
+        assert (raised.value.path, raised.value.reason) == ("people", "missing")
+
+
+class TestValidatePerson:
+    """Tests for checking one roster entry."""
+
+    def test_valid(self) -> None:
+        """Test an entry with string name and craft passes."""
+        assert validate_person({"name": "A", "craft": "ISS", "extra": 1}) is None
+
+    @pytest.mark.parametrize(
+        "person, message",
+        [
+            (None, "people[4]: expected an object, got null"),
+            ({"craft": "ISS"}, "people[4].name: missing"),
+            (
+                {"name": "A", "craft": ["ISS"]},
+                "people[4].craft: expected a string, " "got an array",
+            ),
+        ],
+    )
+    def test_reports_field(self, person: Any, message: str) -> None:
+        """Test the error names the entry's location and field."""
+        with pytest.raises(SchemaError) as raised:
+            validate_person(person, "people[4]")
+
+        assert str(raised.value) == message
+
+
+class TestValidateAstrosMember:
+    """Tests for checking top-level members one at a time."""
+
+    def test_unknown_members_are_accepted(self) -> None:
+        """Test members outside the schema are not checked."""
+        validate_astros_member("iss_position", None)
+
+    def test_reports_field(self) -> None:
+        """Test a malformed member is reported under its name."""
+        with pytest.raises(SchemaError, match=r"^number: expected an integer"):
+            validate_astros_member("number", 1.5)
@@ -0,0 +1,170 @@
+"""Unit tests for the fastpath module."""
+
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+from typing import Any, Generator, List
+from unittest.mock import patch
+
+import pytest
+
+from space.fastpath import (
+    PROTOCOL,
+    ask_daemon,
+    decode_request,
+    encode_request,
+    run_fast_path,
+    socket_path,
+)
+
+unix_sockets = pytest.mark.skipif(
+    sys.platform == "win32", reason="needs Unix domain sockets"
+)
+
+
+@pytest.fixture
+def sock_path() -> Generator[str, None, None]:
+    """Give the test a short socket path (Unix sockets cap path length)."""
+    directory = tempfile.mkdtemp(prefix="space-")
+    try:
+        yield os.path.join(directory, "daemon.sock")
+    finally:
+        shutil.rmtree(directory)
+
+
+def fake_daemon(path: str, reply: bytes) -> List[bytes]:
+    """Answer one connection on ``path`` with ``reply``; return the requests."""
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    requests: List[bytes] = []
+
+    def serve() -> None:
+        conn, _ = listener.accept()
+        with conn, listener:
+            data = b""
+            while chunk := conn.recv(4096):
+                data += chunk
+            requests.append(data)
+            conn.sendall(reply)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return requests
+
+
+class TestSocketPath:
+    """Tests for locating the daemon socket."""
+
+    def test_explicit_path(self) -> None:
+        """Test SPACE_DAEMON_SOCKET wins."""
+        with patch.dict(os.environ, {"SPACE_DAEMON_SOCKET": "/run/x.sock"}):
+            assert socket_path() == "/run/x.sock"
+
+    def test_empty_disables(self) -> None:
+        """Test an empty SPACE_DAEMON_SOCKET turns the daemon off."""
+        with patch.dict(os.environ, {"SPACE_DAEMON_SOCKET": ""}):
+            assert socket_path() == ""
+            assert ask_daemon([], 80, False) is None
+
+    def test_runtime_dir(self) -> None:
+        """Test the socket lives in XDG_RUNTIME_DIR when there is one."""
+        env = {"XDG_RUNTIME_DIR": "/run/user/1000"}
+        with patch.dict(os.environ, env, clear=True):
+            assert socket_path() == "/run/user/1000/space.sock"
+
+    def test_cache_dir_fallback(self) -> None:
+        """Test the cache directory is used without XDG_RUNTIME_DIR."""
+        with patch.dict(os.environ, {"SPACE_CACHE_DIR": "/tmp/c"}, clear=True):
+            assert socket_path() == "/tmp/c/daemon.sock"
+
+
+class TestRequest:
+    """Tests for the request encoding."""
+
+    def test_round_trip(self) -> None:
+        """Test a request decodes to what was encoded."""
+        environ = {"SPACE_ENV": "prod", "SPACE_X": "a=b", "HOME": "/root"}
+        data = encode_request(["--craft", "ISS"], 120, True, environ)
+
+        assert data.startswith(PROTOCOL.encode())
+        assert decode_request(data) == (
+            ["--craft", "ISS"],
+            120,
+            True,
+            {"SPACE_ENV": "prod", "SPACE_X": "a=b"},
+        )
+
+    def test_sends_own_configuration(self) -> None:
+        """Test the caller's SPACE_* variables go along, bar the socket."""
+        environ = {"SPACE_API_BASE_URL": "http://x", "SPACE_DAEMON_SOCKET": "/s"}
+        with patch.dict(os.environ, environ, clear=True):
+            data = encode_request([], 80, False)
+
+        assert decode_request(data)[3] == {"SPACE_API_BASE_URL": "http://x"}
+
+    def test_rejects_other_protocols(self) -> None:
+        """Test requests in another protocol version are refused."""
+        with pytest.raises(ValueError, match="protocol"):
+            decode_request(b"space/0\x0080\x000")
+        with pytest.raises(ValueError, match="Malformed"):
+            decode_request(PROTOCOL.encode())
+        with pytest.raises(ValueError, match="Malformed"):
+            decode_request(PROTOCOL.encode() + b"\x0080\x000\x002\x00SPACE_ENV=x")
+
+
+class TestAskDaemon:
+    """Tests for talking to the daemon."""
+
+    def test_no_daemon(self, sock_path: str) -> None:
+        """Test a missing socket means no answer."""
+        assert ask_daemon(["--format", "json"], 80, False, path=sock_path) is None
+
+    @unix_sockets
+    def test_answer(self, sock_path: str) -> None:
+        """Test the exit status and output of an answer are returned."""
+        requests = fake_daemon(sock_path, b"OK 3\n[]\n")
+
+        answer = ask_daemon(["--format", "json"], 80, False, path=sock_path)
+
+        assert answer == (3, b"[]\n")
+        assert decode_request(requests[0])[:3] == (["--format", "json"], 80, False)
+
+    @unix_sockets
+    def test_declined(self, sock_path: str) -> None:
+        """Test a reply without OK means the caller runs the command."""
+        fake_daemon(sock_path, b"")
+
+        assert ask_daemon(["watch"], 80, False, path=sock_path) is None
+
+
+class TestRunFastPath:
+    """Tests for the CLI fast path."""
+
+    @unix_sockets
+    def test_writes_answer(self, sock_path: str, capsys: Any) -> None:
+        """Test the daemon's output is written to stdout as is."""
+        fake_daemon(sock_path, "OK 0\nJohn Doe,ISS\n".encode())
+
+        with patch.dict(os.environ, {"SPACE_DAEMON_SOCKET": sock_path}):
+            assert run_fast_path(["--format", "csv"]) == 0
+
+        assert capsys.readouterr().out == "John Doe,ISS\n"
+
+    @pytest.mark.parametrize("flag", ["--help", "-h", "--version"])
+    def test_local_flags_skip_daemon(self, flag: str) -> None:
+        """Test help and version are never sent to the daemon."""
+        with patch("space.fastpath.ask_daemon") as ask:
+            assert run_fast_path([flag]) is None
+        ask.assert_not_called()
+
+    def test_unsupported_platform_skips_daemon(self) -> None:
+        """Test platforms without Unix domain sockets run every command locally."""
+        with patch("space.fastpath.SUPPORTED", False), patch(
+            "space.fastpath._terminal"
+        ) as terminal:
+            assert run_fast_path(["--format", "csv"]) is None
+            assert ask_daemon([], 80, False, path="/tmp/space.sock") is None
+        terminal.assert_not_called()
@@ -0,0 +1,176 @@
+"""Unit tests for the fetcher module."""
+
+import threading
+import time
+from typing import Any, List
+from unittest.mock import Mock
+
+import pytest
+
+from space.fetcher import FetcherStats, RosterFetcher
+
+PEOPLE = [{"name": "John Doe", "craft": "ISS"}]
+
+
+def _blocking_loader(release: threading.Event, result: Any = PEOPLE) -> Mock:
+    """Build a loader that blocks until ``release`` is set."""
+
+    def load() -> Any:
+        release.wait(timeout=5)
+        return result
+
+    return Mock(side_effect=load)
+
+
+def _start(fetcher: RosterFetcher, count: int, results: List[Any]) -> List[Any]:
+    threads = [
+        threading.Thread(target=lambda: results.append(fetcher.get()))
+        for _ in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def _wait_for(predicate: Any) -> None:
+    deadline = time.monotonic() + 5
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.001)
+
+
+class TestRosterFetcher:
+    """Tests for RosterFetcher."""
+
+    def test_get_calls_loader(self) -> None:
+        """Test a single call loads and returns the roster."""
+        loader = Mock(return_value=PEOPLE)
+        fetcher = RosterFetcher(loader)
+
+        assert fetcher.get() == PEOPLE
+        loader.assert_called_once_with()
+        assert fetcher.stats() == FetcherStats(misses=1)
+
+    def test_sequential_calls_reload_without_max_age(self) -> None:
+        """Test every call loads again when max_age is 0."""
+        loader = Mock(return_value=PEOPLE)
+        fetcher = RosterFetcher(loader)
+
+        fetcher.get()
+        fetcher.get()
+
+        assert loader.call_count == 2
+
+    def test_concurrent_calls_are_coalesced(self) -> None:
+        """Test concurrent callers share one in-flight request."""
+        release = threading.Event()
+        loader = _blocking_loader(release)
+        fetcher = RosterFetcher(loader)
+        results: List[Any] = []
+
+        threads = _start(fetcher, 8, results)
+        _wait_for(lambda: fetcher.stats().coalesced == 7)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == [PEOPLE] * 8
+        loader.assert_called_once()
+        assert fetcher.stats() == FetcherStats(misses=1, coalesced=7)
+
+    def test_error_is_shared_with_waiters(self) -> None:
+        """Test every coalesced caller sees the loader's exception."""
+        release = threading.Event()
+
+        def load() -> Any:
+            release.wait(timeout=5)
+            raise ConnectionError("upstream down")
+
+        fetcher = RosterFetcher(Mock(side_effect=load))
+        errors: List[Exception] = []
+
+        def call() -> None:
+            try:
+                fetcher.get()
+            except ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        _wait_for(lambda: fetcher.stats().coalesced == 2)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 3
+        assert fetcher.stats().errors == 1
+
+    def test_fresh_value_is_a_hit(self) -> None:
+        """Test a value younger than max_age is served without loading."""
+        loader = Mock(return_value=PEOPLE)
+        fetcher = RosterFetcher(loader, max_age=60)
+
+        fetcher.get()
+        assert fetcher.get() == PEOPLE
+
+        loader.assert_called_once()
+        assert fetcher.stats() == FetcherStats(hits=1, misses=1)
+
+    def test_stale_while_revalidate_serves_old_value(self) -> None:
+        """Test a stale value is returned while a refresh runs."""
+        loader = Mock(return_value=PEOPLE)
+        fetcher = RosterFetcher(loader, stale_while_revalidate=True)
+        fetcher.get()
+
+        updated = [{"name": "Jane Smith", "craft": "Tiangong"}]
+        release = threading.Event()
+        loader.side_effect = _blocking_loader(release, updated).side_effect
+
+        assert fetcher.get() == PEOPLE
+        assert fetcher.get() == PEOPLE
+        release.set()
+        _wait_for(lambda: fetcher.get() == updated)
+
+        stats = fetcher.stats()
+        assert stats.stale >= 2
+        assert stats.refreshes >= 1
+        assert loader.call_count >= 2
+
+    def test_failed_background_refresh_keeps_value(self) -> None:
+        """Test the last good value survives a failed refresh."""
+        loader = Mock(return_value=PEOPLE)
+        fetcher = RosterFetcher(loader, stale_while_revalidate=True)
+        fetcher.get()
+        loader.side_effect = ConnectionError("upstream down")
+
+        assert fetcher.get() == PEOPLE
+        _wait_for(lambda: fetcher.stats().errors == 1)
+        assert fetcher.get() == PEOPLE
+
+    def test_invalidate_forces_reload(self) -> None:
+        """Test invalidate discards the stored value."""
+        loader = Mock(return_value=PEOPLE)
+        fetcher = RosterFetcher(loader, max_age=60)
+        fetcher.get()
+
+        fetcher.invalidate()
+        fetcher.get()
+
+        assert loader.call_count == 2
+
+    def test_loader_error_without_stale_value_raises(self) -> None:
+        """Test a failed first load propagates to the caller."""
+        fetcher = RosterFetcher(Mock(side_effect=ValueError("bad json")))
+        with pytest.raises(ValueError):
+            fetcher.get()
+
+    def test_interrupted_load_releases_waiters(self) -> None:
+        """Test a KeyboardInterrupt in the leader does not wedge the fetcher."""
+        loader = Mock(side_effect=[KeyboardInterrupt, [{"name": "A", "craft": "ISS"}]])
+        fetcher = RosterFetcher(loader)
+
+        with pytest.raises(KeyboardInterrupt):
+            fetcher.get()
+
+        assert fetcher.get() == [{"name": "A", "craft": "ISS"}]
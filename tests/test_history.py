@@ -0,0 +1,142 @@
+"""Unit tests for the history module."""
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from space.history import (
+    ARRIVED,
+    DEPARTED,
+    HistoryEvent,
+    HistoryStore,
+    format_time,
+    parse_time,
+)
+
+ALICE = {"name": "Alice", "craft": "ISS"}
+BOB = {"name": "Bob", "craft": "ISS"}
+CHEN = {"name": "Chén Dōng", "craft": "Tiangong"}
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> Any:
+    """Provide an empty history store in a temporary directory."""
+    with HistoryStore(tmp_path / "history" / "history.sqlite3") as history:
+        yield history
+
+
+def _count(store: HistoryStore, table: str) -> int:
+    connection = sqlite3.connect(str(store.path))
+    try:
+        return int(connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+    finally:
+        connection.close()
+
+
+class TestTimes:
+    """Tests for parse_time and format_time."""
+
+    def test_parse_epoch(self) -> None:
+        """Test epoch seconds are accepted as-is."""
+        assert parse_time("1700000000") == 1700000000.0
+
+    def test_parse_iso(self) -> None:
+        """Test ISO timestamps, with naive ones taken as UTC."""
+        assert parse_time("2023-11-14T22:13:20Z") == 1700000000.0
+        assert parse_time("2023-11-14T22:13:20") == 1700000000.0
+        assert parse_time("2023-11-14T23:13:20+01:00") == 1700000000.0
+
+    def test_parse_invalid(self) -> None:
+        """Test garbage is rejected with a ValueError."""
+        with pytest.raises(ValueError, match="Invalid time"):
+            parse_time("last tuesday")
+
+    def test_format(self) -> None:
+        """Test timestamps are formatted as UTC ISO 8601."""
+        assert format_time(1700000000) == "2023-11-14T22:13:20Z"
+
+
+class TestHistoryStore:
+    """Tests for HistoryStore."""
+
+    def test_first_roster_is_baseline(self, store: HistoryStore) -> None:
+        """Test the first roster is stored without events."""
+        assert store.record([ALICE, BOB], at=100) is True
+
+        assert store.events() == []
+        assert store.roster_at(100) == [ALICE, BOB]
+
+    def test_unchanged_rosters_are_not_stored(self, store: HistoryStore) -> None:
+        """Test identical rosters, in any order, are deduplicated."""
+        store.record([ALICE, BOB], at=100)
+
+        assert store.record([BOB, ALICE], at=160) is False
+        assert store.record([ALICE, BOB], at=220) is False
+        assert _count(store, "rosters") == 1
+
+    def test_changes_become_events(self, store: HistoryStore) -> None:
+        """Test arrivals and departures are recorded as events."""
+        store.record([ALICE, BOB], at=100)
+        store.record([ALICE, CHEN], at=200)
+
+        assert store.events() == [
+            HistoryEvent(200, DEPARTED, "Bob", "ISS"),
+            HistoryEvent(200, ARRIVED, "Chén Dōng", "Tiangong"),
+        ]
+
+    def test_roster_at(self, store: HistoryStore) -> None:
+        """Test point-in-time queries return the roster then in effect."""
+        store.record([ALICE], at=100)
+        store.record([ALICE, BOB], at=200)
+        store.record([BOB], at=300)
+
+        assert store.roster_at(50) is None
+        assert store.roster_at(100) == [ALICE]
+        assert store.roster_at(250) == [ALICE, BOB]
+        assert store.roster_at(10_000) == [BOB]
+
+    def test_events_by_time_range(self, store: HistoryStore) -> None:
+        """Test range queries bound the event times."""
+        store.record([ALICE], at=100)
+        store.record([ALICE, BOB], at=200)
+        store.record([BOB], at=300)
+
+        assert [e.recorded_at for e in store.events(since=250)] == [300]
+        assert [e.recorded_at for e in store.events(until=250)] == [200]
+        assert store.events(since=201, until=299) == []
+
+    def test_events_by_name(self, store: HistoryStore) -> None:
+        """Test a person's launches and returns are found by normalized name."""
+        store.record([ALICE], at=100)
+        store.record([ALICE, CHEN], at=200)
+        store.record([ALICE], at=300)
+
+        events = store.events(name="chen  dong")
+
+        assert [(e.recorded_at, e.event) for e in events] == [
+            (200, ARRIVED),
+            (300, DEPARTED),
+        ]
+
+    def test_persists_across_stores(self, tmp_path: Path) -> None:
+        """Test a second store on the same file sees and extends the history."""
+        path = tmp_path / "history.sqlite3"
+        with HistoryStore(path) as first:
+            first.record([ALICE], at=100)
+        with HistoryStore(path) as second:
+            assert second.record([ALICE], at=200) is False
+            second.record([BOB], at=300)
+            assert len(second.events()) == 2
+
+    def test_event_to_dict(self) -> None:
+        """Test events become rows with ISO times."""
+        event = HistoryEvent(1700000000, ARRIVED, "Alice", "ISS")
+
+        assert event.to_dict() == {
+            "time": "2023-11-14T22:13:20Z",
+            "event": "arrived",
+            "name": "Alice",
+            "craft": "ISS",
+        }
@@ -0,0 +1,94 @@
+"""Import-time regression tests for CLI startup (``python -X importtime``)."""
+
+import os
+import subprocess
+import sys
+from typing import Any, Dict
+
+import pytest
+
+# Cumulative microseconds importing space.__main__ may take. The eager
+# imports this guards against cost well over 100 ms.
+STARTUP_BUDGET_US = 50_000
+
+# Modules the --help/--version path must never import
+HEAVY_MODULES = ("rich", "requests", "tenacity", "dotenv", "aiohttp")
+
+
+def _importtime(*args: str, **env_vars: str) -> Dict[str, int]:
+    """
+    Run Python with ``-X importtime`` and collect cumulative import times.
+
+    Args:
+        args: Arguments passed to the interpreter after ``-X importtime``.
+        env_vars: Extra environment variables for the child process.
+
+    Returns:
+        Mapping of module name to cumulative import time in microseconds.
+    """
+    env = {k: v for k, v in os.environ.items() if not k.startswith("SPACE_")}
+    # Time the process itself, never an answer from a running `space daemon`
+    env["SPACE_DAEMON_SOCKET"] = ""
+    env.update(env_vars)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("flag", ["--version", "--help"])
+def test_cli_flags_skip_heavy_imports(flag: str) -> None:
+    """Test --version and --help answer without importing heavy modules."""
+    times = _importtime("-m", "space", flag)
+
+    loaded = {name.split(".")[0] for name in times}
+    assert loaded.isdisjoint(HEAVY_MODULES), loaded & set(HEAVY_MODULES)
+
+
+def test_cli_flags_work_without_configuration() -> None:
+    """Test --version answers even when required settings are missing."""
+    env = {k: v for k, v in os.environ.items() if not k.startswith("SPACE_")}
+    env["SPACE_DAEMON_SOCKET"] = ""
+    env.pop("PYTEST_CURRENT_TEST", None)
+    result = subprocess.run(
+        [sys.executable, "-m", "space", "--version"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_main_module_import_within_budget() -> None:
+    """Test importing the CLI entry point stays within the startup budget."""
+    times = _importtime("-c", "import space.__main__")
+
+    assert times["space.__main__"] < STARTUP_BUDGET_US
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_streaming_formats_skip_rich(fmt: str, astros_server: Dict[str, Any]) -> None:
+    """Test machine-readable output never imports rich."""
+    times = _importtime(
+        "-m",
+        "space",
+        "--format",
+        fmt,
+        SPACE_API_BASE_URL=astros_server["base_url"],
+        SPACE_ASTROS_ENDPOINT="/astros.json",
+    )
+
+    assert "space.output" in times
+    assert not any(name.split(".")[0] == "rich" for name in times)
@@ -0,0 +1,129 @@
+"""Unit tests for the instrument module."""
+
+import logging
+import time
+from typing import Generator
+
+import pytest
+
+from space.instrument import (
+    ERROR,
+    OK,
+    Recorder,
+    Span,
+    format_profile,
+    get_recorder,
+    record_span,
+    span,
+)
+
+
+@pytest.fixture
+def recorder() -> Generator[Recorder, None, None]:
+    """Give the test an empty process-wide recorder."""
+    get_recorder().reset()
+    yield get_recorder()
+    get_recorder().reset()
+
+
+class TestSpan:
+    """Tests for span timing."""
+
+    def test_span_is_recorded(self, recorder: Recorder) -> None:
+        """Test a finished block is recorded with its attributes."""
+        with span("decode", bytes=10) as attributes:
+            attributes["items"] = 2
+
+        (recorded,) = recorder.spans()
+        assert recorded.name == "decode"
+        assert recorded.outcome == OK
+        assert recorded.attributes == {"bytes": 10, "items": 2}
+        assert recorded.duration >= 0
+
+    def test_nested_spans(self, recorder: Recorder) -> None:
+        """Test inner spans are children of the enclosing one."""
+        with span("fetch"):
+            with span("fetch.attempt", attempt=1):
+                record_span("http.headers", time.perf_counter(), 0.01)
+
+        spans = recorder.spans()
+        assert [(s.name, s.depth) for s in spans] == [
+            ("fetch", 0),
+            ("fetch.attempt", 1),
+            ("http.headers", 2),
+        ]
+
+    def test_error_outcome(self, recorder: Recorder) -> None:
+        """Test an exception marks the span as failed and propagates."""
+        with pytest.raises(KeyError):
+            with span("decode"):
+                raise KeyError("people")
+
+        (recorded,) = recorder.spans()
+        assert recorded.outcome == ERROR
+        assert recorded.attributes["error"] == "KeyError"
+
+    def test_span_is_logged(
+        self, recorder: Recorder, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test finished spans are logged with structured fields."""
+        with caplog.at_level(logging.INFO, logger="space.instrument"):
+            record_span("render", 0.0, 0.5, format="csv")
+
+        (log,) = caplog.records
+        assert log.getMessage() == "render took 500.0 ms"
+        assert log.span == {  # type: ignore[attr-defined]
+            "span": "render",
+            "duration_ms": 500.0,
+            "outcome": "ok",
+            "format": "csv",
+        }
+
+
+class TestRecorder:
+    """Tests for span aggregation."""
+
+    def test_keeps_recent_spans(self) -> None:
+        """Test only the most recent spans are kept."""
+        recorder = Recorder(max_spans=2)
+        for start in range(3):
+            recorder.record(Span("fetch", float(start), 0.1))
+
+        assert [s.start for s in recorder.spans()] == [1.0, 2.0]
+
+    def test_render_metrics(self) -> None:
+        """Test counters and a cumulative histogram are rendered."""
+        recorder = Recorder(buckets=(0.1, 1.0))
+        recorder.record(Span("fetch", 0.0, 0.05))
+        recorder.record(Span("fetch", 0.0, 0.5, outcome=ERROR))
+        recorder.record(Span("fetch", 0.0, 3.0))
+
+        lines = recorder.render_metrics()
+
+        assert 'space_span_total{phase="fetch",outcome="ok"} 2' in lines
+        assert 'space_span_total{phase="fetch",outcome="error"} 1' in lines
+        assert 'space_span_seconds_bucket{phase="fetch",le="0.1"} 1' in lines
+        assert 'space_span_seconds_bucket{phase="fetch",le="1.0"} 2' in lines
+        assert 'space_span_seconds_bucket{phase="fetch",le="+Inf"} 3' in lines
+        assert 'space_span_seconds_sum{phase="fetch"} 3.550000' in lines
+        assert 'space_span_seconds_count{phase="fetch"} 3' in lines
+        assert "# TYPE space_span_seconds histogram" in lines
+
+    def test_render_metrics_empty(self) -> None:
+        """Test nothing is rendered before the first span."""
+        assert Recorder().render_metrics() == []
+
+
+def test_format_profile() -> None:
+    """Test spans are printed as an indented tree."""
+    text = format_profile(
+        [
+            Span("run", 0.0, 0.25, attributes={"command": "roster"}),
+            Span("fetch.attempt", 0.1, 0.125, depth=1, outcome=ERROR),
+        ]
+    )
+
+    assert text.splitlines() == [
+        "     250.0 ms  run  command=roster",
+        "     125.0 ms    fetch.attempt [error]",
+    ]
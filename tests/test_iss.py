@@ -0,0 +1,211 @@
+"""Unit tests for the iss module."""
+
+import json
+from datetime import timedelta
+from typing import Any, List
+from unittest.mock import Mock, patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from space.iss import (  # noqa: E402
+    IssPosition,
+    PositionBuffer,
+    TrackingError,
+    fetch_iss_position,
+    haversine_km,
+    parse_position,
+    track,
+)
+
+RESPONSE = {
+    "message": "success",
+    "timestamp": 1700000000,
+    "iss_position": {"latitude": "51.5074", "longitude": "-0.1278"},
+}
+
+
+class FakeClock:
+    """Monotonic clock that only advances when slept on or told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestParsePosition:
+    """Tests for parse_position and fetch_iss_position."""
+
+    def test_parse(self) -> None:
+        """Test string coordinates are converted to floats."""
+        assert parse_position(RESPONSE) == IssPosition(1700000000.0, 51.5074, -0.1278)
+
+    def test_parse_missing_position(self) -> None:
+        """Test a response without a position raises KeyError."""
+        with pytest.raises(KeyError):
+            parse_position({"timestamp": 1})
+
+    @patch("space.client.requests.Session.get")
+    def test_fetch_uses_shared_client(self, mock_get: Any) -> None:
+        """Test the position is fetched from the configured API."""
+        mock_get.return_value = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
+        mock_get.return_value.content = json.dumps(RESPONSE).encode()
+
+        assert fetch_iss_position().latitude == 51.5074
+        assert mock_get.call_args.args[0] == "http://api.open-notify.org/iss-now.json"
+
+
+class TestHaversine:
+    """Tests for haversine_km."""
+
+    def test_known_distance(self) -> None:
+        """Test London to Paris is about 344 km."""
+        distance = haversine_km(51.5074, -0.1278, 48.8566, 2.3522)
+        assert distance == pytest.approx(343.6, abs=0.5)
+
+    def test_vectorized(self) -> None:
+        """Test arrays are processed element-wise, including the antimeridian."""
+        distances = haversine_km(
+            np.array([0.0, 0.0]),
+            np.array([0.0, 179.5]),
+            np.array([0.0, 0.0]),
+            np.array([1.0, -179.5]),
+        )
+        assert distances == pytest.approx([111.19, 111.19], abs=0.01)
+
+
+class TestPositionBuffer:
+    """Tests for PositionBuffer."""
+
+    def test_samples_in_order(self) -> None:
+        """Test samples come back oldest first before the buffer fills."""
+        buffer = PositionBuffer(4)
+        buffer.append(IssPosition(1, 0, 0))
+        buffer.append(IssPosition(2, 0, 1))
+
+        assert len(buffer) == 2
+        assert buffer.samples().tolist() == [[1, 0, 0], [2, 0, 1]]
+        assert buffer.last() == IssPosition(2, 0, 1)
+
+    def test_wraps_around(self) -> None:
+        """Test the oldest samples are overwritten once full."""
+        buffer = PositionBuffer(3)
+        for t in range(1, 6):
+            buffer.append(IssPosition(t, 0, t))
+
+        assert len(buffer) == 3
+        assert buffer.samples()[:, 0].tolist() == [3, 4, 5]
+        assert buffer.last() == IssPosition(5, 0, 5)
+
+    def test_storage_is_preallocated(self) -> None:
+        """Test appends write into the same array."""
+        buffer = PositionBuffer(8)
+        storage = buffer._data
+        for t in range(20):
+            buffer.append(IssPosition(t, 0, 0))
+        assert buffer._data is storage
+
+    def test_empty(self) -> None:
+        """Test an empty buffer has no samples or derived values."""
+        buffer = PositionBuffer(4)
+        assert buffer.last() is None
+        assert buffer.samples().shape == (0, 3)
+        assert buffer.speeds_kmh().shape == (0,)
+
+    def test_rejects_tiny_capacity(self) -> None:
+        """Test derived quantities need room for at least two samples."""
+        with pytest.raises(ValueError):
+            PositionBuffer(1)
+
+    def test_distances_and_speeds(self) -> None:
+        """Test derived quantities cover every consecutive pair."""
+        buffer = PositionBuffer(4)
+        buffer.append(IssPosition(0, 0, 0))
+        buffer.append(IssPosition(60, 0, 1))
+        buffer.append(IssPosition(60, 0, 2))
+
+        assert buffer.distances_km() == pytest.approx([111.19, 111.19], abs=0.01)
+        speeds = buffer.speeds_kmh()
+        assert speeds[0] == pytest.approx(111.19 * 60, abs=1)
+        assert np.isnan(speeds[1])
+
+
+class TestTrack:
+    """Tests for track."""
+
+    def test_fixed_rate_polling(self) -> None:
+        """Test polls stay on the timetable when requests take time."""
+        clock = FakeClock()
+        positions = iter([IssPosition(t, 0, t / 60) for t in (0, 5, 10)])
+
+        def fetch() -> IssPosition:
+            clock.now += 1.5  # each request takes 1.5s
+            return next(positions)
+
+        buffer = PositionBuffer(8)
+        rows = list(track(buffer, 5, fetch, 3, clock, clock.sleep))
+
+        assert clock.sleeps == [3.5, 3.5]
+        assert len(buffer) == 3
+        assert rows[0]["speed_kmh"] is None
+        assert rows[1]["speed_kmh"] == pytest.approx(111.19 / 60 * 3600, rel=0.001)
+
+    def test_overrun_does_not_burst(self) -> None:
+        """Test a slow poll is followed by one immediate poll, not a burst."""
+        clock = FakeClock()
+        durations = iter([12.0, 0.0, 0.0])
+
+        def fetch() -> IssPosition:
+            clock.now += next(durations)
+            return IssPosition(clock.now, 0, 0)
+
+        list(track(PositionBuffer(8), 5, fetch, 3, clock, clock.sleep))
+
+        assert clock.sleeps == [5.0]
+
+    def test_failed_polls_are_skipped(self, caplog: Any) -> None:
+        """Test errors are logged and polling continues."""
+        clock = FakeClock()
+        results = iter([ConnectionError("down"), IssPosition(0, 0, 0)])
+
+        def fetch() -> IssPosition:
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        rows = list(track(PositionBuffer(4), 5, fetch, 1, clock, clock.sleep))
+
+        assert len(rows) == 1
+        assert "ISS position poll failed: down" in caplog.text
+
+    def test_gives_up_after_consecutive_failures(self) -> None:
+        """Test polling stops with an error once max_failures polls fail in a row."""
+        clock = FakeClock()
+        results = iter(
+            [ConnectionError("down"), IssPosition(0, 0, 0)]
+            + [ConnectionError("down")] * 3
+        )
+
+        def fetch() -> IssPosition:
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        rows = []
+        with pytest.raises(TrackingError, match="3 ISS position polls failed"):
+            for row in track(
+                PositionBuffer(4), 5, fetch, None, clock, clock.sleep, max_failures=3
+            ):
+                rows.append(row)
+
+        assert len(rows) == 1
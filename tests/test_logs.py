@@ -0,0 +1,222 @@
+"""Unit tests for the logs module."""
+
+import io
+import json
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+from unittest.mock import patch
+
+import pytest
+
+from space import logs
+from space.core import parse_people
+from space.logs import (
+    PAYLOAD,
+    JsonFormatter,
+    PayloadPreview,
+    PayloadSampler,
+    PayloadSummary,
+    dropped_records,
+    setup_logging,
+    stop_logging,
+)
+
+
+@contextmanager
+def bare_root() -> Iterator[logging.Logger]:
+    """Run with a root logger without handlers, stopping the listener after."""
+    # pytest installs its capture handlers after fixtures run, so this has to
+    # happen inside the test itself
+    root = logging.getLogger()
+    saved, level = root.handlers[:], root.level
+    root.handlers = []
+    try:
+        yield root
+    finally:
+        stop_logging()
+        root.handlers, root.level = saved, level
+
+
+def make_record(msg: str = "message", **extra: Any) -> logging.LogRecord:
+    record = logging.LogRecord("space.test", logging.DEBUG, __file__, 1, msg, (), None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestPayloadSummary:
+    """Tests for payload summaries."""
+
+    def test_counts_and_digest(self, mock_api_response: Dict[str, Any]) -> None:
+        """Test a roster is described by its size and a stable digest."""
+        text = str(PayloadSummary(mock_api_response))
+
+        assert text.startswith("3 people on 2 craft (digest ")
+        assert text == str(PayloadSummary(mock_api_response))
+        assert "John Doe" not in text
+
+    def test_digest_changes_with_roster(
+        self, mock_api_response: Dict[str, Any]
+    ) -> None:
+        """Test a different roster gets a different digest."""
+        changed = dict(mock_api_response, people=mock_api_response["people"][:2])
+
+        assert str(PayloadSummary(changed)) != str(PayloadSummary(mock_api_response))
+
+    def test_without_people(self) -> None:
+        """Test a payload without a roster lists its keys."""
+        assert str(PayloadSummary({"message": "failure"})) == (
+            "payload with keys ['message']"
+        )
+
+    def test_malformed_payload(self) -> None:
+        """Test a payload that is not a roster is described, not raised on."""
+        assert str(PayloadSummary(["people"])) == "list payload"
+        assert str(PayloadSummary({"people": ["A", None]})).startswith(
+            "2 people on 0 craft (digest "
+        )
+
+
+def test_payload_preview_is_bounded() -> None:
+    """Test the excerpt stays short however large the payload is."""
+    data = {"people": [{"name": "x" * 1000, "craft": "ISS"}] * 100_000}
+
+    text = str(PayloadPreview(data))
+
+    assert len(text) < 500
+    assert "..." in text
+
+
+def test_payload_sampler() -> None:
+    """Test only payload records are sampled."""
+    sampler = PayloadSampler(0.5)
+
+    with patch("random.random", return_value=0.7):
+        assert sampler.filter(make_record())
+        assert not sampler.filter(make_record(**PAYLOAD))
+    with patch("random.random", return_value=0.3):
+        assert sampler.filter(make_record(**PAYLOAD))
+    assert PayloadSampler(1.0).filter(make_record(**PAYLOAD))
+
+
+def test_json_formatter() -> None:
+    """Test records become JSON objects with span fields merged in."""
+    record = logging.LogRecord(
+        "space.instrument", logging.INFO, __file__, 1, "decode took 1.0 ms", (), None
+    )
+    record.span = {"span": "decode", "duration_ms": 1.0}
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "space.instrument"
+    assert entry["message"] == "decode took 1.0 ms"
+    assert entry["span"] == "decode"
+    assert entry["duration_ms"] == 1.0
+    assert entry["time"].endswith("Z")
+
+
+class TestSetupLogging:
+    """Tests for the queued logging setup."""
+
+    def test_records_are_written_by_listener(self) -> None:
+        """Test records reach the stream once the listener is flushed."""
+        stream = io.StringIO()
+        with bare_root():
+            setup_logging(logging.INFO, stream=stream)
+            logging.getLogger("space.test").info("hello %s", "world")
+
+        assert "space.test - INFO - hello world" in stream.getvalue()
+
+    def test_json_format(self) -> None:
+        """Test json_format writes one JSON object per record."""
+        stream = io.StringIO()
+        with bare_root():
+            setup_logging(logging.INFO, json_format=True, stream=stream)
+            logging.getLogger("space.test").warning("careful")
+
+        assert json.loads(stream.getvalue())["message"] == "careful"
+
+    def test_exceptions_are_kept_apart(self) -> None:
+        """Test a traceback reaches the formatter separate from the message."""
+        stream = io.StringIO()
+        with bare_root():
+            setup_logging(logging.INFO, json_format=True, stream=stream)
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError:
+                logging.getLogger("space.test").exception("failed %s", "here")
+
+        entry = json.loads(stream.getvalue())
+        assert entry["message"] == "failed here"
+        assert entry["exception"].endswith("RuntimeError: boom")
+
+    def test_text_format_keeps_tracebacks(self) -> None:
+        """Test the text format still ends a record with its traceback."""
+        stream = io.StringIO()
+        with bare_root():
+            setup_logging(logging.INFO, stream=stream)
+            try:
+                raise RuntimeError("boom")
+            except RuntimeError:
+                logging.getLogger("space.test").exception("failed")
+
+        assert "ERROR - failed\nTraceback" in stream.getvalue()
+        assert stream.getvalue().rstrip().endswith("RuntimeError: boom")
+
+    def test_full_queue_drops_records(self) -> None:
+        """Test records are dropped and counted instead of blocking."""
+        with bare_root(), patch.object(logs, "QUEUE_SIZE", 1):
+            setup_logging(logging.INFO, stream=io.StringIO())
+            stop_logging()  # Nothing drains the queue any more
+            logger = logging.getLogger("space.test")
+            for _ in range(3):
+                logger.info("hello")
+
+            assert dropped_records() == 2
+
+    def test_existing_handlers_are_kept(self) -> None:
+        """Test an already configured root logger only gets its level set."""
+        handler = logging.NullHandler()
+        with bare_root() as root:
+            root.addHandler(handler)
+            setup_logging(logging.DEBUG)
+
+            assert root.handlers == [handler]
+            assert root.level == logging.DEBUG
+
+
+class TestParsePeopleLogging:
+    """Tests for how parse_people logs the payload."""
+
+    def test_payload_is_not_formatted_when_disabled(
+        self, mock_api_response: Dict[str, Any]
+    ) -> None:
+        """Test nothing is formatted with INFO logging off."""
+        with patch("space.core.logger.isEnabledFor", return_value=False), patch(
+            "space.logs.PayloadSummary.__str__"
+        ) as summary:
+            parse_people(mock_api_response)
+
+        summary.assert_not_called()
+
+    def test_malformed_payload_is_not_summarized(self, caplog: Any) -> None:
+        """Test the summary is only logged for a payload that validated."""
+        from space.decode import SchemaError
+
+        with caplog.at_level(logging.INFO, logger="space.core"):
+            with pytest.raises(SchemaError):
+                parse_people({"people": ["not a person"]})
+
+        assert "Fetched data" not in caplog.text
+
+    def test_debug_logs_bounded_excerpt(
+        self, mock_api_response: Dict[str, Any], caplog: Any
+    ) -> None:
+        """Test DEBUG adds a payload excerpt marked for sampling."""
+        with caplog.at_level(logging.DEBUG, logger="space.core"):
+            parse_people(mock_api_response)
+
+        (record,) = [r for r in caplog.records if getattr(r, "payload", False)]
+        assert record.getMessage().startswith("Payload: {")
+        assert "3 people on 2 craft" in caplog.text
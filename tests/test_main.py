@@ -1,6 +1,8 @@
 """Unit tests for __main__.py CLI module."""
 
 import logging
+import os
+import sys
 from typing import Any
 from unittest.mock import Mock, patch
 
@@ -86,6 +88,163 @@ class TestParseArgs:
         assert args.verbose is True
         assert args.debug is True
 
+    def test_parse_args_cache_flags(self) -> None:
+        """Test parsing of the cache control flags."""
+        args = parse_args(["--cache-ttl", "30", "--no-cache"])
+        assert args.cache_ttl == 30
+        assert args.no_cache is True
+
+    def test_parse_args_cache_defaults(self) -> None:
+        """Test the cache TTL defaults to the configured value."""
+        args = parse_args([])
+        assert args.cache_ttl is None
+        assert args.no_cache is False
+
+    def test_parse_args_format_and_fields(self) -> None:
+        """Test parsing of --format and --fields."""
+        args = parse_args(["--format", "csv", "--fields", "craft,name"])
+        assert args.format == "csv"
+        assert args.fields == ["craft", "name"]
+
+    def test_parse_args_format_default(self) -> None:
+        """Test the default output is the Rich table."""
+        args = parse_args([])
+        assert args.format == "table"
+        assert args.fields is None
+
+    def test_parse_args_invalid_format(self) -> None:
+        """Test unknown formats are rejected."""
+        with pytest.raises(SystemExit):
+            parse_args(["--format", "xml"])
+
+    def test_parse_args_queries(self) -> None:
+        """Test parsing of --craft, --name and --group-by."""
+        args = parse_args(["--craft", "ISS", "--name", "jane", "--group-by", "craft"])
+        assert args.craft == "ISS"
+        assert args.name == "jane"
+        assert args.group_by == "craft"
+
+    def test_parse_args_invalid_group_by(self) -> None:
+        """Test only craft can be grouped by."""
+        with pytest.raises(SystemExit):
+            parse_args(["--group-by", "name"])
+
+    def test_parse_args_no_command(self) -> None:
+        """Test no subcommand runs the default table."""
+        assert parse_args([]).command is None
+
+    def test_parse_args_watch(self) -> None:
+        """Test parsing of the watch subcommand and its intervals."""
+        args = parse_args(["-v", "watch", "--interval", "5", "--max-interval", "60"])
+        assert args.command == "watch"
+        assert args.verbose is True
+        assert args.interval == 5.0
+        assert args.max_interval == 60.0
+
+    def test_parse_args_watch_interval_bounds(self) -> None:
+        """Test a long --interval raises the default maximum to match."""
+        assert parse_args(["watch"]).max_interval == 300.0
+        assert parse_args(["watch", "--interval", "600"]).max_interval == 600.0
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["watch", "--interval", "0"],
+            ["watch", "--interval", "soon"],
+            ["watch", "--interval", "60", "--max-interval", "30"],
+        ],
+    )
+    def test_parse_args_watch_invalid(self, argv: Any, capsys: Any) -> None:
+        """Test impossible polling intervals are usage errors."""
+        with pytest.raises(SystemExit) as raised:
+            parse_args(argv)
+
+        assert raised.value.code == 2
+        assert "interval" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "argv, option",
+        [
+            (["track", "--interval", "0"], "--interval"),
+            (["track", "--count", "0"], "--count"),
+            (["track", "--capacity", "1"], "--capacity"),
+            (["track", "--capacity", "many"], "--capacity"),
+        ],
+    )
+    def test_parse_args_track_invalid(
+        self, argv: Any, option: str, capsys: Any
+    ) -> None:
+        """Test track settings the buffer cannot work with are usage errors."""
+        with pytest.raises(SystemExit) as raised:
+            parse_args(argv)
+
+        assert raised.value.code == 2
+        assert option in capsys.readouterr().err
+
+    @pytest.mark.parametrize("value", ["-1", "soon"])
+    def test_parse_args_invalid_cache_ttl(self, value: str, capsys: Any) -> None:
+        """Test a negative or non-numeric cache TTL is a usage error."""
+        with pytest.raises(SystemExit) as raised:
+            parse_args(["--cache-ttl", value])
+
+        assert raised.value.code == 2
+        assert "--cache-ttl" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "argv, option",
+        [
+            (["passes", "-", "--interval", "0"], "--interval"),
+            (["passes", "-", "--interval", "never"], "--interval"),
+            (["passes", "-", "--count", "1"], "--count"),
+        ],
+    )
+    def test_parse_args_passes_invalid(
+        self, argv: Any, option: str, capsys: Any
+    ) -> None:
+        """Test polling settings that cannot yield a track are usage errors."""
+        with pytest.raises(SystemExit) as raised:
+            parse_args(argv)
+
+        assert raised.value.code == 2
+        assert option in capsys.readouterr().err
+
+    def test_parse_args_serve(self) -> None:
+        """Test parsing of the serve subcommand."""
+        args = parse_args(["serve", "--port", "9000", "--refresh", "30"])
+        assert args.command == "serve"
+        assert args.host == "127.0.0.1"
+        assert args.port == 9000
+        assert args.refresh == 30.0
+
+    @pytest.mark.parametrize(
+        "argv, option",
+        [
+            (["serve", "--refresh", "0"], "--refresh"),
+            (["serve", "--refresh", "-60"], "--refresh"),
+            (["serve", "--port", "65536"], "--port"),
+            (["serve", "--port", "-1"], "--port"),
+            (["serve", "--port", "http"], "--port"),
+        ],
+    )
+    def test_parse_args_serve_invalid(
+        self, argv: Any, option: str, capsys: Any
+    ) -> None:
+        """Test a refresh loop without a pause, or a bad port, is refused."""
+        with pytest.raises(SystemExit) as raised:
+            parse_args(argv)
+
+        assert raised.value.code == 2
+        assert option in capsys.readouterr().err
+
+    @pytest.mark.parametrize("refresh", ["0", "-5", "often"])
+    def test_parse_args_daemon_invalid_refresh(self, refresh: str, capsys: Any) -> None:
+        """Test the daemon refuses a refresh loop without a pause."""
+        with pytest.raises(SystemExit) as raised:
+            parse_args(["daemon", "--refresh", refresh])
+
+        assert raised.value.code == 2
+        assert "--refresh" in capsys.readouterr().err
+
     def test_parse_args_version(self) -> None:
         """Test --version flag exits."""
         with pytest.raises(SystemExit):
@@ -95,8 +254,8 @@ class TestParseArgs:
 class TestMain:
     """Tests for main function."""
 
-    @patch("space.__main__.fetch_people_in_space")
-    @patch("space.__main__.Console")
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
     def test_main_success(self, mock_console_class: Any, mock_fetch: Any) -> None:
         """Test successful execution of main."""
         # Arrange
@@ -116,8 +275,24 @@ class TestMain:
         mock_fetch.assert_called_once()
         assert mock_console.print.call_count >= 2  # Header and table
 
-    @patch("space.__main__.fetch_people_in_space")
-    @patch("space.__main__.Console")
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
+    def test_main_passes_cache_ttl(
+        self, mock_console_class: Any, mock_fetch: Any
+    ) -> None:
+        """Test --cache-ttl and --no-cache are forwarded to the fetcher."""
+        mock_fetch.return_value = []
+
+        with patch("sys.argv", ["space", "--cache-ttl", "30"]):
+            main()
+        mock_fetch.assert_called_with(cache_ttl=30)
+
+        with patch("sys.argv", ["space", "--cache-ttl", "30", "--no-cache"]):
+            main()
+        mock_fetch.assert_called_with(cache_ttl=0)
+
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
     def test_main_empty_list(self, mock_console_class: Any, mock_fetch: Any) -> None:
         """Test main with no people in space."""
         # Arrange
@@ -133,8 +308,8 @@ class TestMain:
         assert result == 0
         mock_fetch.assert_called_once()
 
-    @patch("space.__main__.fetch_people_in_space")
-    @patch("space.__main__.Console")
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
     def test_main_with_verbose_flag(
         self, mock_console_class: Any, mock_fetch: Any
     ) -> None:
@@ -152,8 +327,8 @@ class TestMain:
         assert result == 0
         mock_fetch.assert_called_once()
 
-    @patch("space.__main__.fetch_people_in_space")
-    @patch("space.__main__.Console")
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
     def test_main_with_debug_flag(
         self, mock_console_class: Any, mock_fetch: Any
     ) -> None:
@@ -171,8 +346,8 @@ class TestMain:
         assert result == 0
         mock_fetch.assert_called_once()
 
-    @patch("space.__main__.fetch_people_in_space")
-    @patch("space.__main__.Console")
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
     def test_main_displays_correct_count(
         self, mock_console_class: Any, mock_fetch: Any
     ) -> None:
@@ -196,8 +371,8 @@ class TestMain:
         call_args_list = mock_console.print.call_args_list
         assert any("3" in str(call) for call in call_args_list)
 
-    @patch("space.__main__.fetch_people_in_space")
-    @patch("space.__main__.Console")
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
     def test_main_logs_startup(
         self, mock_console_class: Any, mock_fetch: Any, caplog: Any
     ) -> None:
@@ -216,3 +391,517 @@ class TestMain:
 
         # Assert
         assert "Space module CLI started" in caplog.text
+
+    @patch("space.space.fetch_people_in_space")
+    @patch("space.watch.watch")
+    def test_main_watch(self, mock_watch: Any, mock_fetch: Any) -> None:
+        """Test the watch subcommand polls through fetch_people_in_space."""
+        mock_fetch.return_value = []
+
+        with patch("sys.argv", ["space", "--no-cache", "watch", "--interval", "5"]):
+            result = main()
+
+        assert result == 0
+        fetch, interval = mock_watch.call_args.args
+        fetch()
+        mock_fetch.assert_called_once_with(cache_ttl=0)
+        assert interval.minimum == 5.0
+
+    @patch("space.watch.watch", side_effect=KeyboardInterrupt)
+    def test_main_watch_interrupted(self, mock_watch: Any) -> None:
+        """Test Ctrl+C leaves watch mode cleanly."""
+        with patch("sys.argv", ["space", "watch"]):
+            assert main() == 0
+
+    @patch("space.space.iter_people_in_space")
+    @patch("rich.console.Console")
+    def test_main_ndjson_skips_rich(
+        self, mock_console_class: Any, mock_iter: Any, capsys: Any
+    ) -> None:
+        """Test machine-readable formats stream to stdout without a Console."""
+        mock_iter.return_value = iter([{"name": "John Doe", "craft": "ISS"}])
+
+        with patch("sys.argv", ["space", "--format", "ndjson", "--fields", "name"]):
+            result = main()
+
+        assert result == 0
+        assert capsys.readouterr().out == '{"name":"John Doe"}\n'
+        mock_console_class.assert_not_called()
+
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
+    def test_main_table_fields(self, mock_console_class: Any, mock_fetch: Any) -> None:
+        """Test --fields selects the table columns."""
+        mock_fetch.return_value = [{"name": "John Doe", "craft": "ISS"}]
+        mock_console = Mock()
+        mock_console_class.return_value = mock_console
+
+        with patch("sys.argv", ["space", "--fields", "craft"]):
+            main()
+
+        table = mock_console.print.call_args_list[1].args[0]
+        assert [column.header for column in table.columns] == ["#", "Spacecraft"]
+
+    @patch("space.space.fetch_people_in_space")
+    @patch("space.serve.serve")
+    def test_main_serve(self, mock_serve: Any, mock_fetch: Any) -> None:
+        """Test the serve subcommand refreshes through fetch_people_in_space."""
+        with patch("sys.argv", ["space", "serve", "--port", "9000"]):
+            assert main() == 0
+
+        kwargs = mock_serve.call_args.kwargs
+        assert kwargs["port"] == 9000
+        assert "/astros.json" in kwargs["paths"]
+        mock_serve.call_args.args[0]()
+        mock_fetch.assert_called_once_with(cache_ttl=None)
+
+    @patch("space.space.iter_people_in_space")
+    @patch("rich.console.Console")
+    def test_main_craft_filter(
+        self, mock_console_class: Any, mock_iter: Any, capsys: Any
+    ) -> None:
+        """Test --craft keeps only people on that craft."""
+        mock_iter.return_value = iter(
+            [
+                {"name": "John Doe", "craft": "ISS"},
+                {"name": "Li Wei", "craft": "Tiangong"},
+            ]
+        )
+
+        with patch("sys.argv", ["space", "--craft", "tiangong", "--format", "ndjson"]):
+            assert main() == 0
+
+        assert capsys.readouterr().out == '{"name":"Li Wei","craft":"Tiangong"}\n'
+
+    @patch("space.space.iter_people_in_space")
+    @patch("rich.console.Console")
+    def test_main_name_filter(
+        self, mock_console_class: Any, mock_iter: Any, capsys: Any
+    ) -> None:
+        """Test --name matches regardless of case and accents."""
+        mock_iter.return_value = iter(
+            [
+                {"name": "Jérôme Le Bris", "craft": "ISS"},
+                {"name": "Li Wei", "craft": "ISS"},
+            ]
+        )
+
+        argv = ["space", "--name", "jerome le bris", "--format", "csv"]
+        with patch("sys.argv", argv):
+            assert main() == 0
+
+        assert capsys.readouterr().out.splitlines() == [
+            "name,craft",
+            "Jérôme Le Bris,ISS",
+        ]
+
+    @patch("space.space.iter_people_in_space")
+    @patch("rich.console.Console")
+    def test_main_group_by_craft_table(
+        self, mock_console_class: Any, mock_iter: Any
+    ) -> None:
+        """Test --group-by craft renders a per-craft summary table."""
+        mock_iter.return_value = iter(
+            [
+                {"name": "A", "craft": "ISS"},
+                {"name": "B", "craft": "Tiangong"},
+                {"name": "C", "craft": "ISS"},
+            ]
+        )
+        mock_console = Mock()
+        mock_console_class.return_value = mock_console
+
+        with patch("sys.argv", ["space", "--group-by", "craft"]):
+            assert main() == 0
+
+        assert "3" in mock_console.print.call_args_list[0].args[0]
+        table = mock_console.print.call_args_list[1].args[0]
+        assert [column.header for column in table.columns] == [
+            "#",
+            "Spacecraft",
+            "People",
+        ]
+        assert list(table.columns[1].cells) == ["ISS", "Tiangong"]
+        assert list(table.columns[2].cells) == ["2", "1"]
+
+    @patch("space.space.iter_people_in_space")
+    def test_main_group_by_craft_json(self, mock_iter: Any, capsys: Any) -> None:
+        """Test --group-by craft rows in a machine-readable format."""
+        mock_iter.return_value = iter([{"name": "A", "craft": "ISS"}])
+
+        with patch("sys.argv", ["space", "--group-by", "craft", "--format", "json"]):
+            assert main() == 0
+
+        assert capsys.readouterr().out == '[{"craft":"ISS","count":1}]\n'
+
+    def test_main_history_events(self, tmp_path: Any, capsys: Any) -> None:
+        """Test `space history` lists recorded changes."""
+        from space.history import HistoryStore
+
+        path = tmp_path / "history.sqlite3"
+        with HistoryStore(path) as store:
+            store.record([{"name": "A", "craft": "ISS"}], at=1700000000)
+            store.record([{"name": "B", "craft": "ISS"}], at=1700000060)
+
+        argv = ["space", "--format", "csv", "history", "--db", str(path)]
+        with patch("sys.argv", argv):
+            assert main() == 0
+
+        assert capsys.readouterr().out.splitlines() == [
+            "time,event,name,craft",
+            "2023-11-14T22:14:20Z,departed,A,ISS",
+            "2023-11-14T22:14:20Z,arrived,B,ISS",
+        ]
+
+    @patch("rich.console.Console")
+    def test_main_history_at(self, mock_console_class: Any, tmp_path: Any) -> None:
+        """Test `space history --at` shows the roster in effect then."""
+        from space.history import HistoryStore
+
+        path = tmp_path / "history.sqlite3"
+        with HistoryStore(path) as store:
+            store.record([{"name": "A", "craft": "ISS"}], at=1700000000)
+            store.record([{"name": "B", "craft": "ISS"}], at=1700000060)
+        mock_console = Mock()
+        mock_console_class.return_value = mock_console
+
+        argv = ["space", "history", "--db", str(path), "--at", "2023-11-14T22:13:30Z"]
+        with patch("sys.argv", argv):
+            assert main() == 0
+
+        heading = mock_console.print.call_args_list[0].args[0]
+        assert "People in space at 2023-11-14T22:13:30Z: 1" in heading
+        table = mock_console.print.call_args_list[1].args[0]
+        assert list(table.columns[1].cells) == ["A"]
+
+    def test_parse_args_history_invalid_time(self) -> None:
+        """Test unparseable times are rejected by the parser."""
+        with pytest.raises(SystemExit):
+            parse_args(["history", "--at", "yesterday-ish"])
+
+    @patch("space.iss.fetch_iss_position")
+    def test_main_track_ndjson(self, mock_fetch: Any, capsys: Any) -> None:
+        """Test `space track` streams one row per sample."""
+        pytest.importorskip("numpy")
+        from space.iss import IssPosition
+
+        mock_fetch.side_effect = [IssPosition(0, 0, 0), IssPosition(60, 0, 1)]
+
+        argv = [
+            "space",
+            "--format",
+            "ndjson",
+            "track",
+            "--count",
+            "2",
+            "--interval",
+            "0.01",
+        ]
+        with patch("sys.argv", argv):
+            assert main() == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        assert len(lines) == 2
+        assert '"speed_kmh":null' in lines[0]
+        assert '"speed_kmh":6671.' in lines[1]
+
+    @patch("space.iss.fetch_iss_position")
+    @patch("rich.console.Console")
+    def test_main_track_table_summary(
+        self, mock_console_class: Any, mock_fetch: Any
+    ) -> None:
+        """Test the table view ends with totals computed over the buffer."""
+        pytest.importorskip("numpy")
+        from space.iss import IssPosition
+
+        mock_fetch.side_effect = [IssPosition(0, 0, 0), IssPosition(60, 0, 1)]
+        mock_console = Mock()
+        mock_console_class.return_value = mock_console
+
+        argv = ["space", "track", "--count", "2", "--interval", "0.01"]
+        with patch("sys.argv", argv):
+            assert main() == 0
+
+        summary = mock_console.print.call_args_list[-1].args[0]
+        assert "2 samples, 111.2 km" in summary
+        assert "mean ground speed 6,672 km/h" in summary
+
+    def test_main_track_without_numpy(self, capsys: Any) -> None:
+        """Test a missing numpy is reported, not raised."""
+        with patch("sys.argv", ["space", "track"]), patch.dict(
+            sys.modules, {"numpy": None}
+        ):
+            assert main() == 1
+
+        assert "space track: needs numpy" in capsys.readouterr().err
+
+    def test_main_passes_from_track_csv(self, tmp_path: Any, capsys: Any) -> None:
+        """Test `space passes` reads observers and a recorded track from CSV."""
+        pytest.importorskip("numpy")
+        observers = tmp_path / "observers.csv"
+        observers.write_text("id,lat,lon\nunder,0,0\nfar,60,150\n")
+        track = tmp_path / "track.csv"
+        track.write_text(
+            "time,latitude,longitude\n"
+            + "".join(f"{t},0,{t - 30}\n" for t in range(61))
+        )
+
+        argv = ["space", "--format", "csv", "passes", str(observers)]
+        with patch("sys.argv", argv + ["--track", str(track)]):
+            assert main() == 0
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "observer,start,end,duration,max_elevation"
+        assert len(lines) == 2
+        assert lines[1].startswith("under,")
+        assert lines[1].endswith(",90.0")
+
+    @patch("space.iss.fetch_iss_position")
+    def test_main_passes_every_poll_fails(
+        self, mock_fetch: Any, tmp_path: Any, capsys: Any
+    ) -> None:
+        """Test `space passes` gives up with an error when upstream is down."""
+        pytest.importorskip("numpy")
+        mock_fetch.side_effect = ConnectionError("down")
+        observers = tmp_path / "observers.csv"
+        observers.write_text("lat,lon\n0,0\n")
+
+        argv = ["space", "passes", str(observers), "--count", "2"]
+        with patch("sys.argv", argv + ["--interval", "0.001"]):
+            assert main() == 1
+
+        assert mock_fetch.call_count == 10
+        err = capsys.readouterr().err
+        assert "space passes: 10 ISS position polls failed in a row: down" in err
+
+    def test_main_passes_bad_csv(self, tmp_path: Any, capsys: Any) -> None:
+        """Test an unreadable observer CSV fails with a message, not a traceback."""
+        pytest.importorskip("numpy")
+        observers = tmp_path / "observers.csv"
+        observers.write_text("x,y\n1,2\n")
+
+        with patch("sys.argv", ["space", "passes", str(observers)]):
+            assert main() == 1
+
+        assert "needs one of the columns" in capsys.readouterr().err
+
+    @patch("space.space.fetch_people_in_space")
+    @patch("rich.console.Console")
+    def test_main_profile(
+        self, mock_console_class: Any, mock_fetch: Any, capsys: Any
+    ) -> None:
+        """Test --profile prints the phase timings to stderr."""
+        mock_fetch.return_value = [{"name": "John Doe", "craft": "ISS"}]
+
+        with patch("sys.argv", ["space", "--profile"]):
+            assert main() == 0
+
+        err = capsys.readouterr().err
+        assert "run  command=roster" in err
+        assert "  render  format=table" in err
+
+    @patch("space.space.fetch_people_in_space")
+    def test_main_metrics_file(self, mock_fetch: Any, tmp_path: Any) -> None:
+        """Test --metrics-file writes Prometheus span metrics."""
+        mock_fetch.return_value = []
+        path = tmp_path / "space.prom"
+
+        argv = ["space", "--format", "json", "--metrics-file", str(path)]
+        with patch("sys.argv", argv), patch(
+            "space.space.iter_people_in_space", return_value=iter([])
+        ):
+            assert main() == 0
+
+        text = path.read_text()
+        assert 'space_span_total{phase="render",outcome="ok"}' in text
+        assert 'space_span_seconds_count{phase="run"}' in text
+
+    @patch("space.space.fetch_people_in_space")
+    def test_main_metrics_file_rate_limiter(
+        self, mock_fetch: Any, tmp_path: Any
+    ) -> None:
+        """Test --metrics-file includes the host-wide rate limiter's counters."""
+        import dataclasses
+
+        from space.ratelimit import RateLimiter
+        from space.resilience import get_policy
+
+        mock_fetch.return_value = []
+        limiter = RateLimiter(tmp_path / "ratelimit", rate=1)
+        policy = dataclasses.replace(get_policy(), limiter=limiter)
+        path = tmp_path / "space.prom"
+
+        argv = ["space", "--format", "csv", "--metrics-file", str(path)]
+        with patch("sys.argv", argv), patch(
+            "space.space.iter_people_in_space", return_value=iter([])
+        ), patch("space.resilience.get_policy", return_value=policy):
+            assert main() == 0
+
+        assert "space_ratelimit_granted_total 0" in path.read_text()
+
+    @patch("space.__main__.parse_args")
+    @patch("space.fastpath.run_fast_path", return_value=0)
+    def test_main_answered_by_daemon(
+        self, mock_fast_path: Any, mock_parse_args: Any
+    ) -> None:
+        """Test a running daemon's answer skips the direct fetch entirely."""
+        with patch("sys.argv", ["space", "--craft", "ISS"]):
+            assert main() == 0
+
+        mock_fast_path.assert_called_once_with(["--craft", "ISS"])
+        mock_parse_args.assert_not_called()
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs Unix domain sockets")
+    @patch("space.daemon.serve_daemon")
+    def test_main_daemon(self, mock_serve: Any) -> None:
+        """Test `space daemon` serves on the requested socket."""
+        argv = ["space", "daemon", "--socket", "/tmp/s.sock", "--refresh", "5"]
+        with patch("sys.argv", argv):
+            assert main() == 0
+
+        _, path = mock_serve.call_args.args
+        assert path == "/tmp/s.sock"
+        assert mock_serve.call_args.kwargs == {"refresh_interval": 5.0}
+
+    @patch("space.daemon.serve_daemon")
+    def test_main_daemon_unsupported_platform(
+        self, mock_serve: Any, capsys: Any
+    ) -> None:
+        """Test `space daemon` explains why it cannot run without Unix sockets."""
+        with patch("sys.argv", ["space", "daemon"]), patch(
+            "space.fastpath.SUPPORTED", False
+        ):
+            assert main() == 1
+
+        assert "needs Unix domain sockets" in capsys.readouterr().err
+        mock_serve.assert_not_called()
+
+    def test_main_replay(self, astros_cassette: Any, capsys: Any) -> None:
+        """Test --replay answers from a cassette without the network."""
+        from space.client import configure_default_client
+
+        argv = ["space", "--format", "csv", "--no-cache", "--replay"]
+        try:
+            with patch("sys.argv", argv + [str(astros_cassette)]), patch(
+                "space.config.API_BASE_URL", "http://unreachable.invalid"
+            ):
+                assert main() == 0
+        finally:
+            configure_default_client()
+
+        assert capsys.readouterr().out.startswith("name,craft\r\nJohn Doe,ISS\r\n")
+
+    def test_main_replay_bad_cassette(self, tmp_path: Any, capsys: Any) -> None:
+        """Test a file that is not a cassette is reported."""
+        path = tmp_path / "roster.json"
+        path.write_text("{}")
+
+        with patch("sys.argv", ["space", "--replay", str(path)]):
+            assert main() == 1
+
+        assert "cannot open cassette" in capsys.readouterr().err
+
+    @patch("space.space.fetch_people_in_space")
+    def test_main_pager(self, mock_fetch: Any, capsys: Any) -> None:
+        """Test --pager streams the roster instead of fetching it whole."""
+        people = [{"name": "John Doe", "craft": "ISS"}]
+        with patch("sys.argv", ["space", "--pager"]), patch(
+            "space.space.iter_people_in_space", return_value=iter(people)
+        ):
+            assert main() == 0
+
+        out = capsys.readouterr().out
+        assert "People currently in space" in out
+        assert "John Doe" in out
+        assert "1 person" in out
+        mock_fetch.assert_not_called()
+
+    @patch("space.pager.page_table", return_value=0)
+    def test_main_pager_reads_to_end_for_history(self, mock_page: Any) -> None:
+        """Test rows not paged through are still read when history is recorded."""
+        people = iter([{"name": "A", "craft": "ISS"}, {"name": "B", "craft": "ISS"}])
+        with patch("sys.argv", ["space", "--pager"]), patch(
+            "space.space.iter_people_in_space", return_value=people
+        ), patch("space.config.RECORD_HISTORY", True):
+            assert main() == 0
+
+        mock_page.assert_called_once()
+        assert next(people, None) is None
+
+    @patch("space.compare.fetch_environments")
+    def test_main_compare(self, mock_fetch: Any, capsys: Any) -> None:
+        """Test `space compare` lists disagreements and exits like diff(1)."""
+        from space.compare import EnvironmentResult
+
+        mock_fetch.return_value = [
+            EnvironmentResult(
+                "dev", "http://dev/astros", [{"name": "A", "craft": "ISS"}]
+            ),
+            EnvironmentResult("prod", "http://prod/astros", []),
+        ]
+        environments = {"dev": "http://dev/astros", "prod": "http://prod/astros"}
+        argv = ["space", "--format", "csv", "compare", "--max-workers", "3"]
+        with patch("sys.argv", argv), patch("space.config.ENVIRONMENTS", environments):
+            assert main() == 1
+
+        assert capsys.readouterr().out.splitlines() == ["name,dev,prod", "A,ISS,"]
+        mock_fetch.assert_called_once_with(environments, 3)
+
+    @patch("space.compare.fetch_environments")
+    def test_main_compare_table(self, mock_fetch: Any, capsys: Any) -> None:
+        """Test agreeing environments exit 0 and a failed one exits 2."""
+        from space.compare import EnvironmentResult
+
+        people = [{"name": "A", "craft": "ISS"}]
+        environments = {"dev": "http://dev", "staging": "http://st", "prod": "http://p"}
+        mock_fetch.return_value = [
+            EnvironmentResult("dev", "http://dev", people),
+            EnvironmentResult("prod", "http://p", people),
+        ]
+        argv = ["space", "compare", "dev", "prod"]
+        with patch("sys.argv", argv), patch("space.config.ENVIRONMENTS", environments):
+            assert main() == 0
+        assert "All environments agree" in capsys.readouterr().out
+        assert list(mock_fetch.call_args[0][0]) == ["dev", "prod"]
+
+        mock_fetch.return_value.append(
+            EnvironmentResult("staging", "http://st", None, "503 Server Error")
+        )
+        with patch("sys.argv", argv + ["staging"]), patch(
+            "space.config.ENVIRONMENTS", environments
+        ):
+            assert main() == 2
+        assert "503 Server Error" in capsys.readouterr().out
+
+    @pytest.mark.parametrize(
+        "argv, message",
+        [
+            (["compare", "dev", "qa"], "unknown environment 'qa'"),
+            (["compare", "dev"], "at least two environments"),
+            (["compare", "--max-workers", "0"], "--max-workers"),
+            (["--replay", "x.cassette", "compare"], "SPACE_REPLAY_CASSETTE"),
+        ],
+    )
+    def test_main_compare_usage(self, argv: Any, message: str, capsys: Any) -> None:
+        """Test bad compare command lines are reported."""
+        environments = {"dev": "http://dev", "prod": "http://prod"}
+        with patch("sys.argv", ["space", *argv]), patch(
+            "space.config.ENVIRONMENTS", environments
+        ):
+            assert main() == 2
+
+        assert message in capsys.readouterr().err
+
+    @patch("space.space.fetch_people_in_space", return_value=[])
+    def test_main_env_selects_environment(self, mock_fetch: Any) -> None:
+        """Test --env is handed to the configuration as SPACE_ENV."""
+        with patch("sys.argv", ["space", "--env", "staging"]), patch.dict(
+            "os.environ", {}
+        ):
+            assert main() == 0
+            assert os.environ["SPACE_ENV"] == "staging"
+
+    def test_parse_args_record_and_replay(self) -> None:
+        """Test recording and replaying at once is refused."""
+        with pytest.raises(SystemExit):
+            parse_args(["--record", "a.bin", "--replay", "b.bin"])
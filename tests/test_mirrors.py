@@ -0,0 +1,228 @@
+"""Unit tests for the mirrors module."""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List
+from unittest.mock import Mock
+
+import pytest
+import requests
+
+from space.client import SpaceClient
+from space.mirrors import (
+    MIN_LATENCY_SAMPLES,
+    UNHEALTHY_AFTER,
+    UNHEALTHY_COOLDOWN,
+    Mirror,
+    MirrorPool,
+    render_mirror_metrics,
+)
+
+
+def make_send(delays: Dict[str, float], failing: tuple = ()) -> Callable[[str], Mock]:
+    """Build a fake ``send`` that answers each mirror after a delay."""
+    calls: List[str] = []
+    lock = threading.Lock()
+
+    def send(url: str) -> Mock:
+        with lock:
+            calls.append(url)
+        base = url.rsplit("/", 1)[0]
+        time.sleep(delays.get(base, 0.0))
+        if base in failing:
+            raise requests.exceptions.ConnectionError(f"{base} is down")
+        return Mock(url=url)
+
+    send.calls = calls  # type: ignore[attr-defined]
+    return send
+
+
+class TestMirror:
+    """Tests for per-mirror estimates."""
+
+    def test_percentiles(self) -> None:
+        """Test latency quantiles come from the recent samples."""
+        mirror = Mirror("http://a/")
+        assert mirror.percentile(0.5) is None
+        for ms in range(1, 101):
+            mirror.record_success(ms / 1000)
+
+        assert mirror.url == "http://a"
+        assert mirror.percentile(0.5) == pytest.approx(0.051)
+        assert mirror.percentile(0.95) == pytest.approx(0.096)
+
+    def test_hedge_delay_needs_enough_samples(self) -> None:
+        """Test the default delay is used until the p95 is meaningful."""
+        mirror = Mirror("http://a")
+        for _ in range(MIN_LATENCY_SAMPLES - 1):
+            mirror.record_success(0.01)
+        assert mirror.hedge_delay(1.0) == 1.0
+
+        mirror.record_success(0.01)
+        assert mirror.hedge_delay(1.0) == pytest.approx(0.01)
+
+    def test_unhealthy_after_failures_until_cooldown(self) -> None:
+        """Test repeated failures mark a mirror unhealthy for a while."""
+        now = [0.0]
+        mirror = Mirror("http://a", clock=lambda: now[0])
+        for _ in range(UNHEALTHY_AFTER):
+            assert mirror.healthy
+            mirror.record_failure()
+        assert not mirror.healthy
+
+        now[0] += UNHEALTHY_COOLDOWN
+        assert mirror.healthy
+
+    def test_success_restores_health(self) -> None:
+        """Test a success resets the consecutive failure count."""
+        mirror = Mirror("http://a", clock=lambda: 0.0)
+        for _ in range(UNHEALTHY_AFTER):
+            mirror.record_failure()
+        mirror.record_success(0.1)
+
+        stats = mirror.stats()
+        assert stats.healthy
+        assert (stats.requests, stats.failures) == (UNHEALTHY_AFTER + 1, 3)
+
+
+class TestMirrorPool:
+    """Tests for failover and hedging."""
+
+    def test_needs_a_mirror(self) -> None:
+        """Test an empty mirror list is rejected."""
+        with pytest.raises(ValueError):
+            MirrorPool([])
+
+    def test_fast_primary_is_not_hedged(self) -> None:
+        """Test a prompt primary answers alone."""
+        pool = MirrorPool(["http://a", "http://b"], hedge_delay=1.0)
+        send = make_send({})
+        try:
+            response = pool.request("/astros.json", send)
+        finally:
+            pool.close()
+
+        assert response.url == "http://a/astros.json"
+        assert send.calls == ["http://a/astros.json"]  # type: ignore[attr-defined]
+        assert [s.hedges for s in pool.stats()] == [0, 0]
+
+    def test_slow_primary_is_hedged(self) -> None:
+        """Test the next mirror is tried once the hedge delay passes."""
+        pool = MirrorPool(["http://a", "http://b"], hedge_delay=0.05)
+        send = make_send({"http://a": 1.0})
+        try:
+            start = time.perf_counter()
+            response = pool.request("/astros.json", send)
+            elapsed = time.perf_counter() - start
+        finally:
+            pool.close()
+
+        assert response.url == "http://b/astros.json"
+        assert elapsed < 0.5
+        a, b = pool.stats()
+        assert (b.hedges, b.wins, a.wins) == (1, 1, 0)
+
+    def test_failed_primary_fails_over(self) -> None:
+        """Test an error moves on to the next mirror without waiting."""
+        pool = MirrorPool(["http://a", "http://b"], hedge_delay=5.0)
+        send = make_send({}, failing=("http://a",))
+        try:
+            response = pool.request("/astros.json", send)
+        finally:
+            pool.close()
+
+        assert response.url == "http://b/astros.json"
+        a, b = pool.stats()
+        assert (a.failures, b.hedges, b.wins) == (1, 0, 1)
+
+    def test_all_mirrors_failing_raises_last_error(self) -> None:
+        """Test the last error is raised once every mirror has failed."""
+        pool = MirrorPool(["http://a", "http://b"], hedge_delay=5.0)
+        send = make_send({}, failing=("http://a", "http://b"))
+        try:
+            with pytest.raises(requests.exceptions.ConnectionError, match="b is"):
+                pool.request("/astros.json", send)
+        finally:
+            pool.close()
+
+    def test_unhealthy_mirror_is_tried_last(self) -> None:
+        """Test a mirror cooling down after failures goes to the back."""
+        pool = MirrorPool(["http://a", "http://b"], hedge_delay=5.0)
+        for _ in range(UNHEALTHY_AFTER):
+            pool.mirrors[0].record_failure()
+        send = make_send({})
+        try:
+            response = pool.request("/astros.json", send)
+        finally:
+            pool.close()
+
+        assert [m.url for m in pool.ordered()] == ["http://b", "http://a"]
+        assert response.url == "http://b/astros.json"
+
+    def test_losing_response_is_closed(self) -> None:
+        """Test the loser's response is released once it arrives."""
+        pool = MirrorPool(["http://a", "http://b"], hedge_delay=0.02)
+        loser = Mock()
+        arrived = threading.Event()
+
+        def send(url: str) -> Any:
+            if url.startswith("http://a"):
+                time.sleep(0.2)
+                arrived.set()
+                return loser
+            return Mock(url=url)
+
+        try:
+            pool.request("/astros.json", send)
+            assert arrived.wait(2)
+            time.sleep(0.05)
+        finally:
+            pool.close()
+
+        loser.close.assert_called_once()
+
+
+class TestClientIntegration:
+    """Tests for SpaceClient routing through mirrors."""
+
+    def test_fails_over_to_live_mirror(self, astros_server: Dict[str, Any]) -> None:
+        """Test a dead mirror is skipped in favour of a working one."""
+        dead = "http://127.0.0.1:9"
+        with SpaceClient(
+            base_url=dead, mirrors=[dead, astros_server["base_url"]]
+        ) as client:
+            people = client.fetch_people()
+            stats = client.mirror_stats()
+
+        assert len(people) == 3
+        assert [s.url for s in stats] == [dead, astros_server["base_url"]]
+        assert stats[0].failures >= 1
+        assert stats[1].wins >= 1
+
+    def test_base_url_is_last_resort(self) -> None:
+        """Test the base URL joins the mirrors when not listed."""
+        with SpaceClient(base_url="http://c", mirrors=["http://a"]) as client:
+            assert [m.url for m in client.mirrors.mirrors] == ["http://a", "http://c"]
+
+    def test_no_mirrors(self) -> None:
+        """Test mirroring is off without configured mirrors."""
+        with SpaceClient(base_url="http://c", mirrors=[]) as client:
+            assert client.mirrors is None
+            assert client.mirror_stats() == []
+
+
+def test_render_mirror_metrics() -> None:
+    """Test mirror stats render as Prometheus metrics."""
+    mirror = Mirror("http://a")
+    mirror.record_success(0.25)
+    mirror.record_win()
+
+    text = "\n".join(render_mirror_metrics([mirror.stats()]))
+
+    assert 'space_mirror_up{mirror="http://a"} 1' in text
+    assert 'space_mirror_wins_total{mirror="http://a"} 1' in text
+    assert (
+        'space_mirror_latency_seconds{mirror="http://a",quantile="0.95"} 0.250000'
+        in text
+    )
+    assert render_mirror_metrics([]) == []
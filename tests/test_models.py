@@ -0,0 +1,217 @@
+"""Unit tests for the models module."""
+
+import pickle
+import tracemalloc
+from typing import Any, Dict, List
+
+import pytest
+
+from space.models import Astronaut, Roster, normalize_name
+
+PEOPLE = [
+    {"name": "John Doe", "craft": "ISS"},
+    {"name": "Jane Smith", "craft": "Tiangong"},
+    {"name": "Bob Johnson", "craft": "ISS"},
+]
+
+
+class TestNormalizeName:
+    """Tests for normalize_name."""
+
+    def test_folds_case_accents_and_whitespace(self) -> None:
+        """Test lookups ignore case, accents and spacing."""
+        assert normalize_name("  Jérôme   LE bris ") == "jerome le bris"
+        assert normalize_name("STRASSE") == normalize_name("straße")
+
+
+class TestAstronaut:
+    """Tests for Astronaut."""
+
+    def test_attribute_and_item_access(self) -> None:
+        """Test fields read the same as attributes and as dict items."""
+        astronaut = Astronaut("John Doe", "ISS")
+
+        assert astronaut.name == astronaut["name"] == "John Doe"
+        assert astronaut.craft == astronaut["craft"] == "ISS"
+        assert astronaut.get("missing") is None
+        with pytest.raises(KeyError):
+            astronaut["missing"]
+
+    def test_equals_api_dict(self) -> None:
+        """Test a record compares equal to the matching API dict."""
+        astronaut = Astronaut.from_dict(PEOPLE[0])
+
+        assert astronaut == PEOPLE[0]
+        assert dict(astronaut) == astronaut.to_dict() == PEOPLE[0]
+        assert astronaut != PEOPLE[1]
+
+    def test_is_immutable(self) -> None:
+        """Test fields cannot be reassigned, deleted or added."""
+        astronaut = Astronaut("John Doe", "ISS")
+
+        with pytest.raises(AttributeError):
+            astronaut.name = "Someone Else"  # type: ignore[misc]
+        with pytest.raises(AttributeError):
+            del astronaut.craft
+        with pytest.raises(AttributeError):
+            astronaut.extra = 1  # type: ignore[attr-defined]
+
+    def test_has_no_instance_dict(self) -> None:
+        """Test records are slotted."""
+        assert not hasattr(Astronaut("John Doe", "ISS"), "__dict__")
+
+    def test_hashable(self) -> None:
+        """Test equal records hash alike and can be used in sets."""
+        records = {Astronaut("A", "ISS"), Astronaut("A", "ISS"), Astronaut("B", "ISS")}
+        assert len(records) == 2
+
+    def test_pickle_round_trip(self) -> None:
+        """Test records survive pickling."""
+        astronaut = Astronaut("John Doe", "ISS")
+        assert pickle.loads(pickle.dumps(astronaut)) == astronaut
+
+    def test_from_dict_interns_strings(self) -> None:
+        """Test names built at runtime share one string object."""
+        first = Astronaut.from_dict({"name": "".join(["John ", "Doe"]), "craft": "ISS"})
+        second = Astronaut.from_dict(
+            {"name": "".join(["John", " Doe"]), "craft": "ISS"}
+        )
+        assert first.name is second.name
+
+
+class TestRoster:
+    """Tests for Roster."""
+
+    def test_sequence_of_astronauts(self) -> None:
+        """Test the roster indexes and iterates as Astronaut records."""
+        roster = Roster(PEOPLE)
+
+        assert len(roster) == 3
+        assert roster[1] == Astronaut("Jane Smith", "Tiangong")
+        assert roster[-1] == PEOPLE[-1]
+        assert list(roster) == PEOPLE
+        assert Astronaut("John Doe", "ISS") in roster
+
+    def test_columnar_storage(self) -> None:
+        """Test each craft name is stored once and referenced by code."""
+        roster = Roster(PEOPLE)
+
+        assert roster.crafts == ("ISS", "Tiangong")
+        assert list(roster.craft_codes) == [0, 1, 0]
+        assert roster.columns() == {
+            "name": ["John Doe", "Jane Smith", "Bob Johnson"],
+            "craft": ["ISS", "Tiangong", "ISS"],
+        }
+
+    def test_slice_returns_roster(self) -> None:
+        """Test slicing keeps the compact representation."""
+        roster = Roster(PEOPLE)[::2]
+
+        assert isinstance(roster, Roster)
+        assert roster == [PEOPLE[0], PEOPLE[2]]
+        assert roster.crafts == ("ISS",)
+
+    def test_equality_and_hash(self) -> None:
+        """Test rosters compare by content, including against lists."""
+        assert Roster(PEOPLE) == Roster(PEOPLE)
+        assert hash(Roster(PEOPLE)) == hash(Roster(PEOPLE))
+        assert Roster(PEOPLE) == PEOPLE
+        assert Roster(PEOPLE) != Roster(PEOPLE[:2])
+        assert Roster(PEOPLE) != "not a roster"
+
+    def test_accepts_astronauts_and_iterators(self) -> None:
+        """Test a roster can be built from records or a lazy stream."""
+        records = [Astronaut.from_dict(person) for person in PEOPLE]
+
+        assert Roster(records) == Roster(iter(PEOPLE))
+
+    def test_to_dicts(self) -> None:
+        """Test conversion back to the API's list of dicts."""
+        assert Roster(PEOPLE).to_dicts() == PEOPLE
+        assert Roster().to_dicts() == []
+
+    def test_pickle_round_trip(self) -> None:
+        """Test rosters survive pickling."""
+        roster = Roster(PEOPLE)
+        assert pickle.loads(pickle.dumps(roster)) == roster
+
+    def test_snapshots_use_less_memory_than_dicts(self) -> None:
+        """Test many snapshots of one roster are much smaller than dicts."""
+
+        def people() -> List[Dict[str, Any]]:
+            # Fresh strings per snapshot, as a new API response would produce
+            return [
+                {"name": f"Person {i}", "craft": "".join(["IS", "S"])}
+                for i in range(200)
+            ]
+
+        def measure(build: Any) -> int:
+            tracemalloc.start()
+            try:
+                kept = [build(people()) for _ in range(50)]
+                size, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert len(kept) == 50
+            return size
+
+        assert measure(Roster) * 3 < measure(list)
+
+
+class TestRosterQueries:
+    """Tests for the indexed Roster queries."""
+
+    def test_on_craft(self) -> None:
+        """Test people on a craft are found case-insensitively."""
+        roster = Roster(PEOPLE)
+
+        assert roster.on_craft("iss") == [PEOPLE[0], PEOPLE[2]]
+        assert roster.on_craft("Tiangong").crafts == ("Tiangong",)
+        assert len(roster.on_craft("Soyuz")) == 0
+
+    def test_on_craft_reuses_index(self) -> None:
+        """Test repeated queries are answered from the same index."""
+        roster = Roster(PEOPLE)
+
+        assert roster.on_craft("ISS") is roster.on_craft("ISS")
+
+    def test_find_and_has_name(self) -> None:
+        """Test name lookups use the normalized name."""
+        roster = Roster(PEOPLE + [{"name": "Jérôme Le Bris", "craft": "ISS"}])
+
+        assert roster.find("jane  SMITH") == [PEOPLE[1]]
+        assert roster.find("Jerome le Bris")[0].name == "Jérôme Le Bris"
+        assert roster.has_name("bob johnson")
+        assert not roster.has_name("Nobody")
+        assert len(roster.find("Nobody")) == 0
+
+    def test_contains_uses_exact_record(self) -> None:
+        """Test membership matches the exact name and craft."""
+        roster = Roster(PEOPLE)
+
+        assert {"name": "Jane Smith", "craft": "Tiangong"} in roster
+        assert {"name": "Jane Smith", "craft": "ISS"} not in roster
+        assert {"name": "jane smith", "craft": "Tiangong"} not in roster
+        assert "Jane Smith" not in roster
+
+    def test_filter(self) -> None:
+        """Test criteria are combined, and no criteria is the whole roster."""
+        roster = Roster(PEOPLE)
+
+        assert roster.filter() is roster
+        assert roster.filter(craft="ISS") == [PEOPLE[0], PEOPLE[2]]
+        assert roster.filter(name="john doe") == [PEOPLE[0]]
+        assert roster.filter(craft="ISS", name="Jane Smith") == []
+        assert roster.filter(craft="tiangong", name="jane smith") == [PEOPLE[1]]
+
+    def test_craft_counts(self) -> None:
+        """Test per-craft counts in order of first appearance."""
+        assert Roster(PEOPLE).craft_counts() == {"ISS": 2, "Tiangong": 1}
+        assert Roster().craft_counts() == {}
+
+    def test_query_results_are_rosters(self) -> None:
+        """Test query results can be queried again."""
+        on_iss = Roster(PEOPLE).on_craft("ISS")
+
+        assert isinstance(on_iss, Roster)
+        assert on_iss.find("Bob Johnson") == [PEOPLE[2]]
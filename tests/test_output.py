@@ -0,0 +1,95 @@
+"""Unit tests for the output module."""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+from space.output import count_people, parse_fields, project, write_people
+
+PEOPLE = [
+    {"name": "John Doe", "craft": "ISS"},
+    {"name": "Jane, Smith", "craft": "Tiangong"},
+]
+
+
+class TestWritePeople:
+    """Tests for write_people."""
+
+    def test_ndjson(self) -> None:
+        """Test one compact JSON object per line."""
+        stream = io.StringIO()
+
+        count = write_people(PEOPLE, "ndjson", stream)
+
+        lines = stream.getvalue().splitlines()
+        assert count == 2
+        assert [json.loads(line) for line in lines] == PEOPLE
+        assert lines[0] == '{"name":"John Doe","craft":"ISS"}'
+
+    def test_json(self) -> None:
+        """Test a single JSON array is produced."""
+        stream = io.StringIO()
+        write_people(PEOPLE, "json", stream)
+        assert json.loads(stream.getvalue()) == PEOPLE
+
+    def test_json_empty(self) -> None:
+        """Test an empty roster is a valid empty array."""
+        stream = io.StringIO()
+        assert write_people([], "json", stream) == 0
+        assert json.loads(stream.getvalue()) == []
+
+    def test_csv_quotes_values(self) -> None:
+        """Test CSV output has a header and quotes embedded commas."""
+        stream = io.StringIO()
+        write_people(PEOPLE, "csv", stream)
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        assert rows == PEOPLE
+
+    def test_fields_projection(self) -> None:
+        """Test only the requested fields are written, in order."""
+        stream = io.StringIO()
+        write_people(PEOPLE, "ndjson", stream, fields=["craft"])
+        assert stream.getvalue().splitlines()[0] == '{"craft":"ISS"}'
+
+    def test_rows_are_written_as_produced(self) -> None:
+        """Test records are consumed lazily and written one by one."""
+        stream = io.StringIO()
+        seen: List[str] = []
+
+        def people() -> Iterator[Dict[str, Any]]:
+            for person in PEOPLE:
+                seen.append(stream.getvalue())
+                yield person
+
+        write_people(people(), "ndjson", stream)
+
+        assert seen[0] == ""
+        assert seen[1].count("\n") == 1
+
+    def test_unsupported_format(self) -> None:
+        """Test table output is not handled here."""
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            write_people(PEOPLE, "table", io.StringIO())
+
+
+def test_project_fills_missing_fields() -> None:
+    """Test missing fields become None."""
+    assert project({"name": "A"}, ["name", "craft"]) == {"name": "A", "craft": None}
+
+
+def test_parse_fields() -> None:
+    """Test comma-separated field lists are split and trimmed."""
+    assert parse_fields(" name , craft") == ["name", "craft"]
+    with pytest.raises(ValueError):
+        parse_fields(" , ")
+
+
+@pytest.mark.parametrize(
+    "count, expected", [(0, "0 people"), (1, "1 person"), (2, "2 people")]
+)
+def test_count_people(count: int, expected: str) -> None:
+    """Test the noun agrees with the count."""
+    assert count_people(count) == expected
@@ -0,0 +1,187 @@
+"""Unit tests for the pager module."""
+
+import io
+from typing import Any, Dict, Iterator, List
+
+import pytest
+from rich.console import Console
+
+from space.pager import (
+    SAMPLE_ROWS,
+    LazyRows,
+    Pager,
+    TableLayout,
+    measure_columns,
+    page_table,
+)
+
+COLUMNS = {"name": ("Name", "cyan"), "craft": ("Spacecraft", "green")}
+FIELDS = ["name", "craft"]
+
+
+class CountingRoster:
+    """A large synthetic roster that counts how many people were read."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.read = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.size):
+            self.read += 1
+            yield {"name": f"Person {i}", "craft": "ISS" if i % 2 else "Tiangong"}
+
+
+def make_console(height: int = 14, width: int = 60) -> Console:
+    return Console(
+        file=io.StringIO(),
+        width=width,
+        height=height,
+        force_terminal=True,
+        color_system=None,
+    )
+
+
+def keys(*pressed: str) -> Any:
+    """Key source pressing ``pressed`` in turn, then q."""
+    remaining = iter([*pressed, "q"])
+    return lambda: next(remaining)
+
+
+class TestLazyRows:
+    """Tests for the on-demand row buffer."""
+
+    def test_reads_only_what_is_asked(self) -> None:
+        """Test rows are read from the iterator as far as needed."""
+        roster = CountingRoster(1000)
+        rows = LazyRows(roster)
+
+        assert [row["name"] for row in rows.window(10, 12)] == [
+            "Person 10",
+            "Person 11",
+        ]
+        assert roster.read == 12
+        assert not rows.exhausted
+        assert rows.fetch_all() == 1000
+        assert rows.exhausted
+
+    def test_find(self) -> None:
+        """Test search ignores case and accents and stops at the match."""
+        roster = [{"name": "Jérôme Le Bris"}, {"name": "Bob"}, {"name": "jerome"}]
+        rows = LazyRows(iter(roster))
+
+        assert rows.find("JEROME", ["name"], 0) == 0
+        assert len(rows) == 1
+        assert rows.find("jerome", ["name"], 1) == 2
+        assert rows.find("alice", ["name"], 0) is None
+
+    def test_drain(self) -> None:
+        """Test one-pass output yields buffered rows then the rest."""
+        rows = LazyRows(range(5))  # type: ignore[arg-type]
+        rows.fetch(2)
+
+        assert list(rows.drain()) == [0, 1, 2, 3, 4]
+        assert len(rows) == 0
+
+
+class TestMeasureColumns:
+    """Tests for column sizing."""
+
+    def test_natural_widths(self) -> None:
+        """Test columns fit the widest sampled cell or title."""
+        sample = [{"name": "Ab", "craft": "Tiangong"}, {"name": "王亚平"}]
+
+        assert measure_columns(sample, FIELDS, ["Name", "Craft"], 80) == [6, 8]
+
+    def test_shrinks_widest_to_fit(self) -> None:
+        """Test columns are narrowed, widest first, to fit the screen."""
+        sample = [{"name": "x" * 40, "craft": "y" * 10}]
+
+        widths = measure_columns(sample, FIELDS, ["Name", "Craft"], 30)
+
+        assert widths == [15, 10]
+        assert sum(widths) + 5 == 30
+
+
+class TestPager:
+    """Tests for the interactive pager."""
+
+    @pytest.fixture
+    def pager(self) -> Pager:
+        rows = LazyRows(CountingRoster(100))
+        layout = TableLayout(FIELDS, COLUMNS, rows.window(0, 20), 60)
+        return Pager(make_console(height=14), rows, layout, "People")
+
+    def test_paging(self, pager: Pager) -> None:
+        """Test paging and scrolling move by screens and lines."""
+        assert pager.page_size == 10
+        pager.handle(" ")
+        assert pager.top == 10
+        pager.handle("j")
+        pager.handle("down")
+        assert pager.top == 12
+        pager.handle("b")
+        assert pager.top == 2
+        pager.handle("pgup")
+        assert pager.top == 0
+        pager.handle("G")
+        assert pager.top == 90
+        pager.handle(" ")
+        assert pager.top == 90
+        pager.handle("g")
+        assert pager.top == 0
+        assert pager.handle("q") is False
+
+    def test_search(self, pager: Pager) -> None:
+        """Test / jumps to the next match and n to the one after."""
+        for key in ["/", "p", "e", "r", "s", "o", "n", " ", "7", "backspace", "5"]:
+            pager.handle(key)
+        assert pager.prompt == "person 5"
+        pager.handle("enter")
+        assert (pager.top, pager.prompt) == (5, None)
+        pager.handle("n")
+        assert pager.top == 50
+        for key in ["/", "z", "enter"]:
+            pager.handle(key)
+        assert pager.message == "Not found: z"
+        assert pager.top == 50
+
+    def test_screen(self, pager: Pager) -> None:
+        """Test a screen shows a page of rows and a status line."""
+        pager.handle(" ")
+        console = make_console(height=14)
+        console.print(pager.render())
+        lines = console.file.getvalue().splitlines()  # type: ignore[attr-defined]
+
+        assert len(lines) == 14
+        assert "People: 20+" in lines[0]
+        assert lines[3].split()[:3] == ["11", "Person", "10"]
+        assert lines[-1].startswith("rows 11–20 of 20+")
+
+
+class TestPageTable:
+    """Tests for the table view entry point."""
+
+    def test_first_screen_reads_a_constant_number_of_rows(self) -> None:
+        """Test a huge roster is only read as far as the sample."""
+        roster = CountingRoster(10**7)
+        console = make_console()
+
+        count = page_table(console, roster, FIELDS, COLUMNS, "People", None, keys())
+
+        assert count == roster.read == SAMPLE_ROWS
+        assert "Person 9" in console.file.getvalue()  # type: ignore[attr-defined]
+
+    def test_non_interactive_streams_pages(self) -> None:
+        """Test without a terminal every row is written, in fixed columns."""
+        roster = CountingRoster(1200)
+        console = Console(file=io.StringIO(), width=60)
+
+        count = page_table(console, roster, FIELDS, COLUMNS, "People", 1200)
+
+        output: List[str] = console.file.getvalue().splitlines()  # type: ignore
+        rows = [line for line in output if "Person" in line]
+        assert count == len(rows) == 1200
+        assert "People: 1200" in output[1]
+        assert sum(line.split()[:2] == ["#", "Name"] for line in output) == 1
+        assert len({line.index("Person") for line in rows}) == 1
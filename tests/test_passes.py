@@ -0,0 +1,152 @@
+"""Unit tests for the passes module."""
+
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from space.passes import (  # noqa: E402
+    PassWindow,
+    elevation_deg,
+    find_passes,
+    load_observers,
+    load_track,
+)
+
+
+def _equator_track(step: float = 1.0) -> "np.ndarray":
+    """Ground track along the equator, one sample per second per degree."""
+    longitudes = np.arange(-60.0, 60.0 + step, step)
+    return np.column_stack([longitudes + 60, np.zeros_like(longitudes), longitudes])
+
+
+class TestElevation:
+    """Tests for elevation_deg."""
+
+    def test_overhead_and_horizon(self) -> None:
+        """Test zenith directly below, and below the horizon far away."""
+        elevation = elevation_deg([[0.0, 0.0]], [[0.0, 0.0], [0.0, 90.0]])
+
+        assert elevation.shape == (1, 2)
+        assert elevation[0, 0] == pytest.approx(90.0)
+        assert elevation[0, 1] < 0
+
+    def test_broadcasts_observers_against_track(self) -> None:
+        """Test every observer is evaluated at every sample."""
+        elevation = elevation_deg(np.zeros((5, 2)), np.zeros((7, 2)))
+        assert elevation.shape == (5, 7)
+
+
+class TestFindPasses:
+    """Tests for find_passes."""
+
+    def test_single_pass(self) -> None:
+        """Test an observer under the track sees one symmetric pass."""
+        (window,) = find_passes([[0.0, 0.0]], _equator_track())
+
+        assert window.observer == 0
+        assert window.max_elevation == pytest.approx(90.0)
+        assert window.start + window.end == pytest.approx(120.0)
+        assert 0 < window.end - window.start < 60
+
+    def test_unreachable_observer(self) -> None:
+        """Test an observer far from the track has no windows."""
+        assert list(find_passes([[60.0, 150.0]], _equator_track())) == []
+
+    def test_window_at_track_edges(self) -> None:
+        """Test windows touching the first or last sample are closed."""
+        windows = list(find_passes([[0.0, -60.0], [0.0, 60.0]], _equator_track()))
+
+        assert [w.observer for w in windows] == [0, 1]
+        assert windows[0].start == 0.0
+        assert windows[1].end == 120.0
+
+    def test_multiple_windows_per_observer(self) -> None:
+        """Test separate passes over one observer are reported separately."""
+        track = np.concatenate([_equator_track(), _equator_track() + [1000, 0, 0]])
+
+        windows = list(find_passes([[0.0, 0.0]], track))
+
+        assert len(windows) == 2
+        assert windows[1].start > windows[0].end
+
+    def test_chunking_does_not_change_results(self) -> None:
+        """Test the result is the same whatever the chunk size."""
+        rng = np.random.default_rng(0)
+        observers = np.column_stack(
+            [rng.uniform(-20, 20, 200), rng.uniform(-80, 80, 200)]
+        )
+        track = _equator_track(0.5)
+
+        whole = list(find_passes(observers, track, chunk_size=1000))
+        chunked = list(find_passes(observers, track, chunk_size=7))
+
+        assert whole == chunked
+        assert len(whole) > 0
+
+    def test_peak_matches_direct_computation(self) -> None:
+        """Test the reduced peak equals the maximum of each window."""
+        observers = np.array([[5.0, -10.0], [-3.0, 20.0]])
+        track = _equator_track()
+        elevation = elevation_deg(observers, track[:, 1:])
+
+        for window in find_passes(observers, track):
+            in_window = (track[:, 0] >= window.start) & (track[:, 0] <= window.end)
+            expected = elevation[window.observer, in_window].max()
+            assert window.max_elevation == pytest.approx(expected)
+
+    def test_rejects_bad_shapes(self) -> None:
+        """Test observers and samples must be 2-D with the right columns."""
+        with pytest.raises(ValueError, match="observers"):
+            list(find_passes([1.0, 2.0], _equator_track()))
+        with pytest.raises(ValueError, match="samples"):
+            list(find_passes([[0.0, 0.0]], [[0.0, 0.0]]))
+
+    def test_empty_inputs(self) -> None:
+        """Test no observers or no samples yield no windows."""
+        assert list(find_passes(np.empty((0, 2)), _equator_track())) == []
+        assert list(find_passes([[0.0, 0.0]], np.empty((0, 3)))) == []
+
+
+class TestLoaders:
+    """Tests for load_observers, load_track and PassWindow rows."""
+
+    def test_load_observers(self) -> None:
+        """Test coordinates and labels are read from named columns."""
+        stream = io.StringIO("name,Lat,Lon\nLondon,51.5,-0.12\nQuito,-0.18,-78.5\n")
+
+        labels, observers = load_observers(stream)
+
+        assert labels == ["London", "Quito"]
+        assert observers.tolist() == [[51.5, -0.12], [-0.18, -78.5]]
+
+    def test_load_observers_without_labels(self) -> None:
+        """Test row numbers label unnamed observers."""
+        labels, _ = load_observers(io.StringIO("latitude,longitude\n1,2\n3,4\n"))
+        assert labels == ["0", "1"]
+
+    def test_load_observers_errors(self) -> None:
+        """Test missing columns and bad values are reported."""
+        with pytest.raises(ValueError, match="latitude"):
+            load_observers(io.StringIO("x,y\n1,2\n"))
+        with pytest.raises(ValueError, match="line 3"):
+            load_observers(io.StringIO("lat,lon\n1,2\nnorth,2\n"))
+
+    def test_load_track(self) -> None:
+        """Test `space track` CSV output is read back sorted by time."""
+        stream = io.StringIO(
+            "time,latitude,longitude,speed_kmh\n20,1,2,27000\n10,3,4,\n"
+        )
+        assert load_track(stream).tolist() == [[10, 3, 4], [20, 1, 2]]
+
+    def test_window_row(self) -> None:
+        """Test windows become rows with a duration."""
+        row = PassWindow(3, 100.0, 160.0, 45.1234).to_dict()
+        assert row == {
+            "observer": 3,
+            "start": 100.0,
+            "end": 160.0,
+            "duration": 60.0,
+            "max_elevation": 45.12,
+        }
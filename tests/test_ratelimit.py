@@ -0,0 +1,200 @@
+"""Unit tests for the ratelimit module."""
+
+import multiprocessing
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, List
+
+import pytest
+
+from space.ratelimit import (
+    CACHE,
+    RateLimitedError,
+    RateLimiter,
+    render_limiter_metrics,
+)
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _take_all(path: str, results: Any) -> None:
+    """Take tokens until refused; report how many were granted."""
+    limiter = RateLimiter(path, rate=0.001, burst=20)
+    granted = 0
+    try:
+        while True:
+            limiter.acquire()
+            granted += 1
+    except RateLimitedError:
+        results.put(granted)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def state_file(tmp_path: Path) -> Path:
+    return tmp_path / "limits" / "ratelimit"
+
+
+class TestRateLimiter:
+    """Tests for the file-backed token bucket."""
+
+    def test_burst_then_throttle(self, state_file: Path, clock: FakeClock) -> None:
+        """Test a full bucket lets a burst through, then refuses."""
+        limiter = RateLimiter(state_file, rate=2, burst=3, clock=clock)
+
+        assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        with pytest.raises(RateLimitedError, match="2 requests/s") as raised:
+            limiter.acquire()
+
+        assert raised.value.retry_in == pytest.approx(0.5)
+        assert state_file.stat().st_mode & 0o777 == 0o600
+
+    def test_refills_over_time(self, state_file: Path, clock: FakeClock) -> None:
+        """Test tokens accrue at the rate, up to the burst."""
+        limiter = RateLimiter(state_file, rate=2, burst=3, clock=clock)
+        for _ in range(3):
+            limiter.acquire()
+
+        clock.now += 0.5
+        assert limiter.acquire() == 0.0
+        clock.now += 3600
+        assert limiter.stats().tokens == 3
+
+    def test_waiters_queue_up(self, state_file: Path, clock: FakeClock) -> None:
+        """Test waiting callers reserve tokens in turn."""
+        limiter = RateLimiter(state_file, rate=4, burst=1, clock=clock)
+
+        delays = [limiter.acquire(max_wait=1.0) for _ in range(5)]
+
+        assert delays == pytest.approx([0, 0.25, 0.5, 0.75, 1.0])
+        with pytest.raises(RateLimitedError):
+            limiter.acquire(max_wait=1.0)
+
+    def test_shared_between_limiters(self, state_file: Path, clock: FakeClock) -> None:
+        """Test two limiters on one file share a bucket and counters."""
+        first = RateLimiter(state_file, rate=1, burst=2, clock=clock)
+        second = RateLimiter(state_file, rate=1, burst=2, clock=clock)
+
+        first.acquire()
+        second.acquire()
+        with pytest.raises(RateLimitedError):
+            first.acquire()
+        assert second.acquire(max_wait=5) == pytest.approx(1.0)
+
+        stats = first.stats()
+        assert (stats.granted, stats.delayed, stats.throttled) == (3, 1, 1)
+        assert stats.wait_seconds == pytest.approx(1.0)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs fcntl.flock")
+    def test_shared_between_processes(self, state_file: Path) -> None:
+        """Test concurrent processes never take more than the bucket holds."""
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        workers = [
+            context.Process(target=_take_all, args=(str(state_file), results))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        granted = [results.get(timeout=30) for _ in workers]
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert sum(granted) == 20
+
+    def test_without_file_locking(self, state_file: Path, monkeypatch: Any) -> None:
+        """Test the thread-only fallback used where fcntl and pread are missing."""
+        import space.ratelimit
+
+        monkeypatch.setattr(space.ratelimit, "fcntl", None)
+        monkeypatch.delattr(os, "pread", raising=False)
+        monkeypatch.delattr(os, "pwrite", raising=False)
+        limiter = RateLimiter(state_file, rate=0.001, burst=40, policy=CACHE)
+        granted: List[int] = []
+
+        def take_all() -> None:
+            try:
+                while True:
+                    limiter.acquire()
+                    granted.append(1)
+            except RateLimitedError:
+                pass
+
+        threads = [threading.Thread(target=take_all) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=30)
+
+        assert len(granted) == 40
+        assert limiter.stats().throttled == 4
+
+    def test_unreadable_state_starts_full(
+        self, state_file: Path, clock: FakeClock
+    ) -> None:
+        """Test a foreign or truncated state file is replaced."""
+        state_file.parent.mkdir()
+        state_file.write_bytes(b"garbage")
+
+        stats = RateLimiter(state_file, rate=1, burst=4, clock=clock).stats()
+
+        assert (stats.tokens, stats.granted) == (4, 0)
+
+    def test_clock_stepping_back(self, state_file: Path, clock: FakeClock) -> None:
+        """Test a wall clock set back does not refill or break the bucket."""
+        limiter = RateLimiter(state_file, rate=1, burst=1, clock=clock)
+        limiter.acquire()
+
+        clock.now -= 3600
+        with pytest.raises(RateLimitedError):
+            limiter.acquire()
+        clock.now += 1
+        assert limiter.acquire() == 0.0
+
+    def test_unusable_state_file_does_not_limit(
+        self, tmp_path: Path, caplog: Any
+    ) -> None:
+        """Test requests go through when the state file cannot be used."""
+        limiter = RateLimiter(tmp_path, rate=1, burst=1)
+
+        assert limiter.acquire() == 0.0
+        assert limiter.acquire() == 0.0
+        assert "Rate limiter unavailable" in caplog.text
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"rate": 0}, {"rate": 1, "burst": 0.5}, {"rate": 1, "policy": "x"}]
+    )
+    def test_invalid_settings(self, state_file: Path, kwargs: Any) -> None:
+        """Test nonsensical limits are refused."""
+        with pytest.raises(ValueError):
+            RateLimiter(state_file, **kwargs)
+
+
+def test_render_limiter_metrics(state_file: Path, clock: FakeClock) -> None:
+    """Test the counters are exported in the Prometheus text format."""
+    limiter = RateLimiter(state_file, rate=1, burst=1, policy=CACHE, clock=clock)
+    limiter.acquire()
+    with pytest.raises(RateLimitedError):
+        limiter.acquire()
+
+    lines = render_limiter_metrics(limiter.stats())
+
+    assert "# TYPE space_ratelimit_throttled_total counter" in lines
+    assert "space_ratelimit_throttled_total 1" in lines
+    assert "space_ratelimit_granted_total 1" in lines
+    assert "space_ratelimit_tokens 0.000000" in lines
+    assert render_limiter_metrics(None) == []
@@ -0,0 +1,382 @@
+"""Unit tests for the resilience module and the shared retry decorator."""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from space.core import attempt_timeout, retry_transient
+from space.ratelimit import FAIL, RateLimitedError, RateLimiter
+from space.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResiliencePolicy,
+    RetryBudget,
+    full_jitter_backoff,
+    get_policy,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _policy(**overrides: Any) -> ResiliencePolicy:
+    settings: dict = {
+        "attempts": 3,
+        "backoff": 0.0,
+        "backoff_max": 0.0,
+        "deadline": 60.0,
+        "breaker": CircuitBreaker(0),
+        "budget": RetryBudget(0.2, 10),
+    }
+    settings.update(overrides)
+    return ResiliencePolicy(**settings)
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker."""
+
+    def test_opens_after_threshold(self) -> None:
+        """Test consecutive failures open the circuit and calls fail fast."""
+        breaker = CircuitBreaker(3, 30, clock=FakeClock())
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state == CLOSED
+        breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError, match="retry in 30s"):
+            breaker.allow()
+
+    def test_success_resets_failure_count(self) -> None:
+        """Test failures must be consecutive to open the circuit."""
+        breaker = CircuitBreaker(2, 30, clock=FakeClock())
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_half_open_allows_one_probe(self) -> None:
+        """Test a single probe is let through after the reset timeout."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 30
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+    def test_probe_success_closes(self) -> None:
+        """Test a successful probe closes the circuit."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.record_failure()
+        clock.now = 31
+        breaker.allow()
+
+        breaker.record_success()
+
+        assert breaker.state == CLOSED
+        breaker.allow()
+
+    def test_probe_failure_reopens(self) -> None:
+        """Test a failed probe re-opens the circuit for another timeout."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.record_failure()
+        clock.now = 31
+        breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        clock.now = 60
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        clock.now = 61
+        breaker.allow()
+
+    def test_release_lets_another_probe_through(self) -> None:
+        """Test a probe without a verdict does not leave the circuit stuck."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.record_failure()
+        clock.now = 31
+        breaker.allow()
+
+        breaker.release()
+
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+
+    def test_zero_threshold_disables(self) -> None:
+        """Test a threshold of 0 never opens the circuit."""
+        breaker = CircuitBreaker(0, 30)
+        for _ in range(100):
+            breaker.record_failure()
+        breaker.allow()
+        assert breaker.state == CLOSED
+
+
+class TestRetryBudget:
+    """Tests for RetryBudget."""
+
+    def test_reserve_then_ratio(self) -> None:
+        """Test the reserve is spent first, then deposits fund retries."""
+        budget = RetryBudget(ratio=0.5, reserve=2)
+
+        assert budget.withdraw() and budget.withdraw()
+        assert not budget.withdraw()
+
+        budget.deposit()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert budget.withdraw()
+
+    def test_balance_is_capped(self) -> None:
+        """Test idle periods cannot bank more than the reserve."""
+        budget = RetryBudget(ratio=1, reserve=3)
+        for _ in range(10):
+            budget.deposit()
+        assert budget.balance == 3
+
+
+class TestFullJitterBackoff:
+    """Tests for full_jitter_backoff."""
+
+    def test_bounds(self) -> None:
+        """Test delays stay within the exponentially growing, capped window."""
+        for attempt, ceiling in ((1, 1), (2, 2), (3, 4), (6, 10)):
+            delays = [full_jitter_backoff(attempt, 1, 10) for _ in range(200)]
+            assert all(0 <= delay <= ceiling for delay in delays)
+            assert max(delays) > ceiling / 2
+
+    def test_jitter_spreads_clients(self) -> None:
+        """Test two clients failing together do not retry at the same time."""
+        assert len({full_jitter_backoff(3, 1, 10) for _ in range(20)}) > 1
+
+
+class TestGetPolicy:
+    """Tests for get_policy."""
+
+    def test_built_from_config(self) -> None:
+        """Test the policy reads its limits from the environment."""
+        env = {"SPACE_RETRY_ATTEMPTS": "5", "SPACE_BREAKER_THRESHOLD": "7"}
+        with patch.dict(os.environ, env), patch("space.config._settings", None):
+            policy = get_policy()
+
+        assert policy.attempts == 5
+        assert policy.breaker.failure_threshold == 7
+        assert policy.limiter is None
+        assert get_policy() is policy
+
+    def test_rate_limiter_from_config(self, tmp_path: Any) -> None:
+        """Test a host-wide limiter is set up when a rate is configured."""
+        env = {
+            "SPACE_RATE_LIMIT": "0.5",
+            "SPACE_RATE_LIMIT_POLICY": "cache",
+            "SPACE_RATE_LIMIT_FILE": str(tmp_path / "ratelimit"),
+        }
+        with patch.dict(os.environ, env), patch("space.config._settings", None):
+            limiter = get_policy().limiter
+
+        assert limiter is not None
+        assert (limiter.rate, limiter.burst, limiter.policy) == (0.5, 5.0, "cache")
+        assert limiter.path == tmp_path / "ratelimit"
+
+
+class TestRetryTransient:
+    """Tests for the retry decorator built on the shared policy."""
+
+    @staticmethod
+    def _failing(calls: List[int], failures: int) -> Any:
+        @retry_transient((ConnectionError,), logger)
+        def call() -> str:
+            calls.append(1)
+            if len(calls) <= failures:
+                raise ConnectionError("refused")
+            return "ok"
+
+        return call
+
+    def test_retries_until_success(self) -> None:
+        """Test transient failures are retried within the attempt limit."""
+        calls: List[int] = []
+        with patch("space.core.get_policy", return_value=_policy()):
+            assert self._failing(calls, 2)() == "ok"
+        assert len(calls) == 3
+
+    def test_stops_at_attempt_limit(self) -> None:
+        """Test the last error is raised once attempts run out."""
+        calls: List[int] = []
+        with patch("space.core.get_policy", return_value=_policy(attempts=2)):
+            with pytest.raises(ConnectionError):
+                self._failing(calls, 5)()
+        assert len(calls) == 2
+
+    def test_budget_limits_retries(self, caplog: Any) -> None:
+        """Test an exhausted process-wide budget stops retrying."""
+        calls: List[int] = []
+        policy = _policy(budget=RetryBudget(ratio=0, reserve=1))
+        with patch("space.core.get_policy", return_value=policy):
+            with pytest.raises(ConnectionError):
+                self._failing(calls, 5)()
+        assert len(calls) == 2
+        assert "Retry budget exhausted" in caplog.text
+
+    def test_deadline_stops_retries(self) -> None:
+        """Test no retry starts after the call deadline."""
+        calls: List[int] = []
+        policy = _policy(attempts=10, backoff=0.05, backoff_max=0.05, deadline=0.0)
+        with patch("space.core.get_policy", return_value=policy):
+            with pytest.raises(ConnectionError):
+                self._failing(calls, 5)()
+        assert len(calls) == 1
+
+    def test_open_circuit_fails_fast(self) -> None:
+        """Test no request is made, and nothing retried, while open."""
+        calls: List[int] = []
+        breaker = CircuitBreaker(2, 60)
+        with patch("space.core.get_policy", return_value=_policy(breaker=breaker)):
+            with pytest.raises(ConnectionError):
+                self._failing(calls, 5)()
+            with pytest.raises(CircuitOpenError):
+                self._failing(calls, 5)()
+        assert len(calls) == 2
+
+    def test_server_errors_count_as_failures(self) -> None:
+        """Test a 5xx response counts against the breaker without a retry."""
+        calls: List[int] = []
+        breaker = CircuitBreaker(2, 60)
+
+        @retry_transient((ConnectionError,), logger)
+        def call() -> None:
+            calls.append(1)
+            response = requests.Response()
+            response.status_code = 503
+            raise requests.exceptions.HTTPError("503", response=response)
+
+        with patch("space.core.get_policy", return_value=_policy(breaker=breaker)):
+            for _ in range(2):
+                with pytest.raises(requests.exceptions.HTTPError):
+                    call()
+
+        assert len(calls) == 2
+        assert breaker.state == OPEN
+
+    @pytest.mark.parametrize("error", [ValueError("bad body"), KeyboardInterrupt()])
+    def test_probe_released_on_other_errors(self, error: BaseException) -> None:
+        """Test a probe ending in a non-transient error frees the next one."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.record_failure()
+        clock.now = 31
+
+        @retry_transient((ConnectionError,), logger)
+        def call() -> None:
+            raise error
+
+        with patch("space.core.get_policy", return_value=_policy(breaker=breaker)):
+            with pytest.raises(type(error)):
+                call()
+
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+
+    def test_rate_limit_checked_before_breaker(self, tmp_path: Any) -> None:
+        """Test an attempt refused a token does not take the half-open probe."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(1, 30, clock=clock)
+        breaker.record_failure()
+        clock.now = 31
+        limiter = RateLimiter(tmp_path / "ratelimit", rate=0.01, burst=1, policy=FAIL)
+        policy = _policy(breaker=breaker, limiter=limiter)
+        with patch("space.core.get_policy", return_value=policy):
+            limiter.acquire(0)
+            with pytest.raises(RateLimitedError):
+                self._failing([], 0)()
+
+        breaker.allow()
+
+    def test_rate_limit_waits_for_a_token(self, tmp_path: Any) -> None:
+        """Test an attempt without a free token waits its turn, then runs."""
+        calls: List[int] = []
+        limiter = RateLimiter(tmp_path / "ratelimit", rate=20, burst=1)
+        with patch("space.core.get_policy", return_value=_policy(limiter=limiter)):
+            start = time.monotonic()
+            for _ in range(3):
+                self._failing(calls, 0)()
+
+        assert len(calls) == 3
+        assert time.monotonic() - start >= 0.09
+        assert limiter.stats().delayed == 2
+
+    def test_rate_limit_counts_retries(self, tmp_path: Any) -> None:
+        """Test retries take tokens too, and fail fast when none are left."""
+        calls: List[int] = []
+        limiter = RateLimiter(tmp_path / "ratelimit", rate=0.01, burst=2, policy=FAIL)
+        with patch("space.core.get_policy", return_value=_policy(limiter=limiter)):
+            with pytest.raises(RateLimitedError):
+                self._failing(calls, 5)()
+
+        assert len(calls) == 2
+        assert limiter.stats().throttled == 1
+
+    def test_rate_limit_wait_respects_deadline(self, tmp_path: Any) -> None:
+        """Test a wait longer than the call deadline is refused at once."""
+        limiter = RateLimiter(tmp_path / "ratelimit", rate=0.1, burst=1)
+        policy = _policy(limiter=limiter, deadline=5.0)
+        with patch("space.core.get_policy", return_value=policy):
+            self._failing([], 0)()
+            with pytest.raises(RateLimitedError, match="next token in 10.0s"):
+                self._failing([], 0)()
+
+    def test_attempt_timeout_follows_deadline(self) -> None:
+        """Test attempts get at most what is left of the deadline."""
+        seen: List[float] = []
+
+        @retry_transient((ConnectionError,), logger)
+        def call() -> None:
+            seen.append(attempt_timeout(10))
+
+        with patch("space.core.get_policy", return_value=_policy(deadline=2.0)):
+            call()
+        assert 1.5 < seen[0] <= 2.0
+
+    def test_coroutines(self) -> None:
+        """Test the decorator guards and retries coroutines too."""
+        calls: List[int] = []
+        breaker = CircuitBreaker(5, 60)
+
+        @retry_transient((ConnectionError,), logger)
+        async def call() -> str:
+            calls.append(1)
+            if len(calls) == 1:
+                raise ConnectionError("refused")
+            return "ok"
+
+        with patch("space.core.get_policy", return_value=_policy(breaker=breaker)):
+            assert asyncio.run(call()) == "ok"
+        assert len(calls) == 2
+        assert breaker.state == CLOSED
@@ -0,0 +1,226 @@
+"""Unit tests for the serve module."""
+
+import asyncio
+import http.client
+import json
+import socket
+import threading
+from typing import Any, Dict, Generator, List, Tuple
+from unittest.mock import Mock
+
+import pytest
+
+from space.mirrors import Mirror
+from space.ratelimit import RateLimiter
+from space.serve import RosterServer, _etag_matches, build_snapshot, run_server
+
+PEOPLE = [{"name": "John Doe", "craft": "ISS"}, {"name": "Jane Smith", "craft": "ISS"}]
+
+
+@pytest.fixture
+def running_server() -> Generator[Tuple[RosterServer, int, Mock], None, None]:
+    """Run a RosterServer on an event loop in a background thread."""
+    fetch = Mock(return_value=PEOPLE)
+    server = RosterServer(fetch, refresh_interval=30)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    listener = asyncio.run_coroutine_threadsafe(
+        run_server(server, "127.0.0.1", 0), loop
+    ).result(timeout=5)
+    port = listener.sockets[0].getsockname()[1]  # type: ignore[attr-defined]
+    try:
+        yield server, port, fetch
+    finally:
+        loop.call_soon_threadsafe(listener.close)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+
+
+def _get(
+    port: int, path: str, headers: Dict[str, str] = {}, method: str = "GET"
+) -> Tuple[int, Dict[str, str], bytes]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request(method, path, headers=headers)
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+class TestBuildSnapshot:
+    """Tests for build_snapshot."""
+
+    def test_body_uses_open_notify_schema(self) -> None:
+        """Test the body mirrors the upstream /astros.json payload."""
+        snapshot = build_snapshot(PEOPLE, max_age=60)
+        assert json.loads(snapshot.body) == {
+            "message": "success",
+            "number": 2,
+            "people": PEOPLE,
+        }
+        assert b"Content-Length: %d\r\n" % len(snapshot.body) in snapshot.head_200
+
+    def test_etag_is_content_based(self) -> None:
+        """Test equal rosters share an ETag and different ones do not."""
+        assert build_snapshot(PEOPLE, 60).etag == build_snapshot(PEOPLE, 60).etag
+        assert build_snapshot(PEOPLE, 60).etag != build_snapshot(PEOPLE[:1], 60).etag
+
+
+def test_etag_matches() -> None:
+    """Test If-None-Match lists, weak validators and wildcards."""
+    assert _etag_matches('"a", W/"b"', '"b"')
+    assert _etag_matches("*", '"b"')
+    assert not _etag_matches('"a"', '"b"')
+
+
+class TestRosterServer:
+    """Tests for RosterServer over real sockets."""
+
+    def test_serves_roster(self, running_server: Any) -> None:
+        """Test the roster is served with an ETag."""
+        server, port, _ = running_server
+
+        status, headers, body = _get(port, "/astros.json")
+
+        assert status == 200
+        assert json.loads(body)["people"] == PEOPLE
+        assert headers["ETag"] == server.snapshot.etag
+        assert headers["Content-Type"] == "application/json"
+
+    def test_conditional_request_gets_304(self, running_server: Any) -> None:
+        """Test a matching If-None-Match is answered with 304 and no body."""
+        server, port, _ = running_server
+
+        status, _, body = _get(
+            port, "/astros.json", {"If-None-Match": server.snapshot.etag}
+        )
+
+        assert status == 304
+        assert body == b""
+
+    def test_requests_are_served_from_memory(self, running_server: Any) -> None:
+        """Test many requests cause no additional upstream fetches."""
+        _, port, fetch = running_server
+
+        for _ in range(5):
+            _get(port, "/astros.json")
+
+        fetch.assert_called_once()
+
+    def test_keep_alive_and_pipelining(self, running_server: Any) -> None:
+        """Test several pipelined requests are answered on one connection."""
+        _, port, _ = running_server
+        request = b"GET /astros.json HTTP/1.1\r\nHost: x\r\n\r\n"
+
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(request * 3)
+            data = b""
+            while data.count(b"HTTP/1.1 200 OK") < 3 or not data.endswith(b"]}"):
+                chunk = sock.recv(65536)
+                assert chunk, "connection closed early"
+                data += chunk
+
+        assert data.count(b"HTTP/1.1 200 OK") == 3
+
+    def test_head_has_no_body(self, running_server: Any) -> None:
+        """Test HEAD returns headers only."""
+        _, port, _ = running_server
+        status, headers, body = _get(port, "/astros.json", method="HEAD")
+        assert status == 200
+        assert int(headers["Content-Length"]) > 0
+        assert body == b""
+
+    def test_unknown_path_is_404(self, running_server: Any) -> None:
+        """Test unknown paths are rejected."""
+        _, port, _ = running_server
+        assert _get(port, "/nope")[0] == 404
+
+    def test_unsupported_method_is_405(self, running_server: Any) -> None:
+        """Test only GET and HEAD are accepted."""
+        _, port, _ = running_server
+        assert _get(port, "/astros.json", method="DELETE")[0] == 405
+
+    def test_metrics(self, running_server: Any) -> None:
+        """Test /metrics reports request counts and roster size."""
+        _, port, _ = running_server
+        _get(port, "/astros.json")
+        _get(port, "/nope")
+
+        status, headers, body = _get(port, "/metrics")
+        text = body.decode()
+
+        assert status == 200
+        assert headers["Content-Type"].startswith("text/plain")
+        assert 'space_serve_requests_total{path="/astros.json",status="200"} 1' in text
+        assert 'space_serve_requests_total{path="other",status="404"} 1' in text
+        assert "space_serve_roster_people 2" in text
+        assert "space_serve_refreshes_total 1" in text
+
+    def test_metrics_include_mirrors(self) -> None:
+        """Test upstream mirror stats are exported when available."""
+        mirror = Mirror("http://cache.local")
+        mirror.record_success(0.1)
+        server = RosterServer(lambda: [], mirror_stats=lambda: [mirror.stats()])
+
+        text = server.render_metrics()
+
+        assert 'space_mirror_requests_total{mirror="http://cache.local"} 1' in text
+        assert "space_mirror_up" not in RosterServer(lambda: []).render_metrics()
+
+    def test_metrics_include_rate_limiter(self, tmp_path: Any) -> None:
+        """Test the host-wide rate limiter's counters are exported when given."""
+        limiter = RateLimiter(tmp_path / "ratelimit", rate=1, burst=2)
+        limiter.acquire()
+        server = RosterServer(lambda: [], limiter_stats=limiter.stats)
+
+        text = server.render_metrics()
+
+        assert "space_ratelimit_granted_total 1" in text
+        assert "space_ratelimit_" not in RosterServer(lambda: []).render_metrics()
+
+    def test_malformed_request_is_400(self, running_server: Any) -> None:
+        """Test garbage request lines get a 400 and a closed connection."""
+        _, port, _ = running_server
+        with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+            sock.sendall(b"nonsense\r\n\r\n")
+            data = sock.recv(65536)
+        assert data.startswith(b"HTTP/1.1 400 Bad Request")
+        assert b"Connection: close" in data
+
+
+class TestRefresh:
+    """Tests for RosterServer.refresh."""
+
+    def test_not_ready_is_503(self) -> None:
+        """Test requests before the first successful refresh get 503."""
+        server = RosterServer(Mock(side_effect=ConnectionError("down")))
+        assert asyncio.run(server.refresh()) is False
+        status, _ = server.respond("GET", "/astros.json", {})
+        assert status == 503
+        assert server.refresh_errors == 1
+
+    def test_failed_refresh_keeps_snapshot(self) -> None:
+        """Test the last good roster keeps being served after a failure."""
+        fetch = Mock(return_value=PEOPLE)
+        server = RosterServer(fetch)
+        asyncio.run(server.refresh())
+        fetch.side_effect = ConnectionError("down")
+
+        assert asyncio.run(server.refresh()) is False
+        status, parts = server.respond("GET", "/astros.json", {})
+        assert status == 200
+        assert json.loads(parts[1])["number"] == 2
+
+    def test_refresh_publishes_new_roster(self) -> None:
+        """Test a refresh swaps in the new snapshot."""
+        rosters: List[Any] = [PEOPLE, PEOPLE[:1]]
+        server = RosterServer(Mock(side_effect=rosters))
+        asyncio.run(server.refresh())
+        first = server.snapshot
+        asyncio.run(server.refresh())
+        assert server.snapshot is not None and first is not None
+        assert server.snapshot.etag != first.etag
+        assert server.snapshot.people == 1
@@ -1,31 +1,44 @@
 """Unit tests for space.py module."""
 
+import dataclasses
+import json
+import time
+from datetime import timedelta
 from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
 import requests
 
-from space.space import fetch_people_in_space
+from space.history import HistoryStore
+from space.models import Roster
+from space.space import (
+    fetch_people_in_space,
+    fetch_roster,
+    get_fetcher,
+    iter_people_in_space,
+)
 
 
 class TestFetchPeopleInSpace:
     """Tests for fetch_people_in_space function."""
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_success(self, mock_get: Any) -> None:
         """Test successful API call returns people list."""
         # Arrange
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "number": 3,
-            "people": [
-                {"name": "John Doe", "craft": "ISS"},
-                {"name": "Jane Smith", "craft": "ISS"},
-                {"name": "Bob Johnson", "craft": "Tiangong"},
-            ],
-            "message": "success",
-        }
+        mock_response = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
+        mock_response.content = json.dumps(
+            {
+                "number": 3,
+                "people": [
+                    {"name": "John Doe", "craft": "ISS"},
+                    {"name": "Jane Smith", "craft": "ISS"},
+                    {"name": "Bob Johnson", "craft": "Tiangong"},
+                ],
+                "message": "success",
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
@@ -39,19 +52,24 @@ class TestFetchPeopleInSpace:
         assert result[1]["name"] == "Jane Smith"
         assert result[2]["craft"] == "Tiangong"
         mock_get.assert_called_once_with(
-            "http://api.open-notify.org/astros.json", timeout=10
+            "http://api.open-notify.org/astros.json",
+            headers=None,
+            timeout=10,
+            stream=False,
         )
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_empty_list(self, mock_get: Any) -> None:
         """Test API call with no people in space."""
         # Arrange
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "number": 0,
-            "people": [],
-            "message": "success",
-        }
+        mock_response = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
+        mock_response.content = json.dumps(
+            {
+                "number": 0,
+                "people": [],
+                "message": "success",
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
@@ -62,7 +80,7 @@ class TestFetchPeopleInSpace:
         assert len(result) == 0
         assert result == []
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_network_error(self, mock_get: Any) -> None:
         """Test network error handling."""
         # Arrange
@@ -72,7 +90,7 @@ class TestFetchPeopleInSpace:
         with pytest.raises(requests.exceptions.RequestException):
             fetch_people_in_space()
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_timeout(self, mock_get: Any) -> None:
         """Test timeout error handling."""
         # Arrange
@@ -82,11 +100,11 @@ class TestFetchPeopleInSpace:
         with pytest.raises(requests.exceptions.RequestException):
             fetch_people_in_space()
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_http_error(self, mock_get: Any) -> None:
         """Test HTTP error handling (4xx, 5xx)."""
         # Arrange
-        mock_response = Mock()
+        mock_response = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
         mock_response.raise_for_status.side_effect = requests.exceptions.HTTPError(
             "404 Not Found"
         )
@@ -96,33 +114,32 @@ class TestFetchPeopleInSpace:
         with pytest.raises(requests.exceptions.RequestException):
             fetch_people_in_space()
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_invalid_json(self, mock_get: Any) -> None:
         """Test handling of invalid JSON response."""
         # Arrange
-        mock_response = Mock()
+        mock_response = Mock(content=b"not json", headers={}, elapsed=timedelta(0))
         mock_response.raise_for_status.return_value = None
-        mock_response.json.side_effect = ValueError("Invalid JSON")
         mock_get.return_value = mock_response
 
         # Act & Assert
         with pytest.raises(ValueError):
             fetch_people_in_space()
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_missing_people_key(self, mock_get: Any) -> None:
         """Test handling when 'people' key is missing from response."""
         # Arrange
-        mock_response = Mock()
+        mock_response = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
         mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {"number": 3, "message": "success"}
+        mock_response.content = json.dumps({"number": 3, "message": "success"}).encode()
         mock_get.return_value = mock_response
 
         # Act & Assert
         with pytest.raises(KeyError):
             fetch_people_in_space()
 
-    @patch("space.space.requests.get")
+    @patch("space.client.requests.Session.get")
     def test_fetch_people_in_space_logs_data(self, mock_get: Any, caplog: Any) -> None:
         """Test that fetched data is logged."""
         # Arrange
@@ -130,12 +147,14 @@ class TestFetchPeopleInSpace:
 
         caplog.set_level(logging.INFO)
 
-        mock_response = Mock()
-        mock_response.json.return_value = {
-            "number": 1,
-            "people": [{"name": "Test Person", "craft": "ISS"}],
-            "message": "success",
-        }
+        mock_response = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
+        mock_response.content = json.dumps(
+            {
+                "number": 1,
+                "people": [{"name": "Test Person", "craft": "ISS"}],
+                "message": "success",
+            }
+        ).encode()
         mock_response.raise_for_status.return_value = None
         mock_get.return_value = mock_response
 
@@ -144,3 +163,461 @@ class TestFetchPeopleInSpace:
 
         # Assert
         assert "Fetched data:" in caplog.text
+
+
+class TestFetchPeopleInSpaceCache:
+    """Tests for the on-disk cache path of fetch_people_in_space."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path: Any) -> Any:
+        """Point the response cache at a temporary directory."""
+        with patch("space.space.CACHE_DIR", tmp_path):
+            yield tmp_path
+
+    @staticmethod
+    def _response(people: Any, status_code: int = 200) -> Mock:
+        response = Mock(content=b"{}", elapsed=timedelta(0))
+        response.status_code = status_code
+        response.headers = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"}
+        response.content = json.dumps(
+            {"number": len(people), "people": people}
+        ).encode()
+        response.raise_for_status.return_value = None
+        return response
+
+    @patch("space.client.requests.Session.get")
+    def test_cache_disabled_by_default(self, mock_get: Any, cache_dir: Any) -> None:
+        """Test the default TTL of 0 never touches the cache directory."""
+        mock_get.return_value = self._response([{"name": "A", "craft": "ISS"}])
+
+        fetch_people_in_space()
+        fetch_people_in_space()
+
+        assert mock_get.call_count == 2
+        assert list(cache_dir.iterdir()) == []
+
+    @patch("space.client.requests.Session.get")
+    def test_fresh_entry_served_from_cache(self, mock_get: Any) -> None:
+        """Test a second call within the TTL does not hit the network."""
+        people = [{"name": "A", "craft": "ISS"}]
+        mock_get.return_value = self._response(people)
+
+        first = fetch_people_in_space(cache_ttl=60)
+        second = fetch_people_in_space(cache_ttl=60)
+
+        assert first == second == people
+        mock_get.assert_called_once_with(
+            "http://api.open-notify.org/astros.json",
+            headers=None,
+            timeout=10,
+            stream=False,
+        )
+
+    @patch("space.client.requests.Session.get")
+    def test_stale_entry_revalidated_with_304(self, mock_get: Any) -> None:
+        """Test a stale entry is revalidated and reused on 304."""
+        people = [{"name": "A", "craft": "ISS"}]
+        mock_get.return_value = self._response(people)
+        fetch_people_in_space(cache_ttl=60)
+
+        not_modified = self._response([], status_code=304)
+        mock_get.return_value = not_modified
+        with patch("space.cache.time.time", return_value=time.time() + 120):
+            result = fetch_people_in_space(cache_ttl=60)
+
+        assert result == people
+        not_modified.json.assert_not_called()
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        }
+
+    @patch("space.client.requests.Session.get")
+    def test_stale_entry_replaced_on_200(self, mock_get: Any) -> None:
+        """Test a stale entry is replaced when the roster has changed."""
+        mock_get.return_value = self._response([{"name": "A", "craft": "ISS"}])
+        fetch_people_in_space(cache_ttl=60)
+
+        updated = [{"name": "B", "craft": "Tiangong"}]
+        mock_get.return_value = self._response(updated)
+        with patch("space.cache.time.time", return_value=time.time() + 120):
+            result = fetch_people_in_space(cache_ttl=60)
+
+        assert result == updated
+        assert fetch_people_in_space(cache_ttl=60) == updated
+        assert mock_get.call_count == 2
+
+    @patch("space.client.requests.Session.get")
+    def test_unwritable_cache_still_returns_data(self, mock_get: Any) -> None:
+        """Test a cache write failure does not fail the fetch."""
+        people = [{"name": "A", "craft": "ISS"}]
+        mock_get.return_value = self._response(people)
+
+        with patch("space.space.ResponseCache.store", side_effect=OSError("ro")):
+            assert fetch_people_in_space(cache_ttl=60) == people
+
+
+class TestFetchPeopleInSpaceHistory:
+    """Tests for recording fetched rosters into the history store."""
+
+    @patch("space.client.requests.Session.get")
+    def test_history_off_by_default(self, mock_get: Any, tmp_path: Any) -> None:
+        """Test nothing is recorded unless SPACE_RECORD_HISTORY is set."""
+        mock_get.return_value = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
+        mock_get.return_value.content = json.dumps({"people": []}).encode()
+
+        with patch("space.space.HISTORY_DB", tmp_path / "history.sqlite3"):
+            fetch_people_in_space(cache_ttl=0)
+
+        assert list(tmp_path.iterdir()) == []
+
+    @patch("space.client.requests.Session.get")
+    def test_fetches_are_recorded(self, mock_get: Any, tmp_path: Any) -> None:
+        """Test each fetched roster is appended to the history store."""
+        mock_get.side_effect = [
+            Mock(
+                content=json.dumps(
+                    {"people": [{"name": name, "craft": "ISS"}]}
+                ).encode(),
+                headers={},
+                elapsed=timedelta(0),
+            )
+            for name in "AB"
+        ]
+        path = tmp_path / "history.sqlite3"
+
+        with patch("space.space.RECORD_HISTORY", True), patch(
+            "space.space.HISTORY_DB", path
+        ):
+            fetch_people_in_space(cache_ttl=0)
+            fetch_people_in_space(cache_ttl=0)
+
+        with HistoryStore(path) as store:
+            assert [(e.event, e.name) for e in store.events()] == [
+                ("departed", "A"),
+                ("arrived", "B"),
+            ]
+
+    @patch("space.client.requests.Session.get")
+    def test_history_failure_is_logged(
+        self, mock_get: Any, tmp_path: Any, caplog: Any
+    ) -> None:
+        """Test an unusable history database does not fail the fetch."""
+        mock_get.return_value = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
+        mock_get.return_value.content = json.dumps({"people": []}).encode()
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        with patch("space.space.RECORD_HISTORY", True), patch(
+            "space.space.HISTORY_DB", blocker / "history.sqlite3"
+        ):
+            assert fetch_people_in_space(cache_ttl=0) == []
+
+        assert "Could not record roster history" in caplog.text
+
+
+class TestRateLimitFallback:
+    """Tests for what fetch_people_in_space does at the host-wide rate limit."""
+
+    @pytest.fixture
+    def exhausted_limiter(self, tmp_path: Any) -> Any:
+        """Install a rate limiter with no token left."""
+        from space.ratelimit import RateLimiter
+        from space.resilience import get_policy
+
+        limiter = RateLimiter(tmp_path / "ratelimit", rate=0.001, burst=1)
+        limiter.acquire()
+        policy = dataclasses.replace(get_policy(), limiter=limiter)
+        with patch("space.core.get_policy", return_value=policy):
+            yield limiter
+
+    @patch("space.client.requests.Session.get")
+    def test_cache_policy_serves_last_known_roster(
+        self, mock_get: Any, exhausted_limiter: Any
+    ) -> None:
+        """Test the cache policy answers from the last roster, sending nothing."""
+        people = [{"name": "A", "craft": "ISS"}]
+        with patch("space.space._last_people", people), patch(
+            "space.space.RATE_LIMIT_POLICY", "cache"
+        ):
+            assert fetch_people_in_space(cache_ttl=0) == people
+
+        mock_get.assert_not_called()
+        assert exhausted_limiter.stats().throttled == 1
+
+    @patch("space.client.requests.Session.get")
+    def test_fail_policy_raises(self, mock_get: Any, exhausted_limiter: Any) -> None:
+        """Test the fail policy raises even when a roster is known."""
+        from space.ratelimit import RateLimitedError
+
+        people = [{"name": "A", "craft": "ISS"}]
+        with patch("space.space._last_people", people), patch(
+            "space.space.RATE_LIMIT_POLICY", "fail"
+        ):
+            with pytest.raises(RateLimitedError):
+                fetch_people_in_space(cache_ttl=0)
+        mock_get.assert_not_called()
+
+    @patch("space.client.requests.Session.get")
+    def test_stream_cache_policy_serves_last_known_roster(
+        self, mock_get: Any, exhausted_limiter: Any
+    ) -> None:
+        """Test the streaming path honours the cache policy too."""
+        people = [{"name": "A", "craft": "ISS"}]
+        with patch("space.space._last_people", people), patch(
+            "space.space.RATE_LIMIT_POLICY", "cache"
+        ):
+            assert list(iter_people_in_space(cache_ttl=0)) == people
+
+        mock_get.assert_not_called()
+
+    @patch("space.client.requests.Session.get")
+    def test_stream_fail_policy_raises(
+        self, mock_get: Any, exhausted_limiter: Any
+    ) -> None:
+        """Test the streaming path raises under the fail policy."""
+        from space.ratelimit import RateLimitedError
+
+        with patch("space.space._last_people", [{"name": "A", "craft": "ISS"}]):
+            with pytest.raises(RateLimitedError):
+                list(iter_people_in_space(cache_ttl=0))
+        mock_get.assert_not_called()
+
+
+class TestCircuitBreakerFallback:
+    """Tests for serving the last known roster while the circuit is open."""
+
+    @pytest.fixture
+    def open_circuit(self) -> Any:
+        """Open the process-wide circuit breaker."""
+        from space.resilience import get_policy
+
+        breaker = get_policy().breaker
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        return breaker
+
+    @patch("space.client.requests.Session.get")
+    def test_serves_last_known_roster(
+        self, mock_get: Any, open_circuit: Any, caplog: Any
+    ) -> None:
+        """Test the last roster loaded is returned without a request."""
+        with patch("space.space._last_people", [{"name": "A", "craft": "ISS"}]):
+            assert fetch_people_in_space(cache_ttl=0) == [{"name": "A", "craft": "ISS"}]
+
+        mock_get.assert_not_called()
+        assert "serving the last known roster" in caplog.text
+
+    @patch("space.client.requests.Session.get")
+    def test_falls_back_to_disk_cache(
+        self, mock_get: Any, open_circuit: Any, tmp_path: Any
+    ) -> None:
+        """Test a cached roster from an earlier run is used if nothing is in memory."""
+        from space.cache import CacheEntry, ResponseCache
+
+        people = [{"name": "B", "craft": "ISS"}]
+        ResponseCache(tmp_path).store(
+            "http://api.open-notify.org/astros.json", CacheEntry(people)
+        )
+
+        with patch("space.space._last_people", None), patch(
+            "space.space.CACHE_DIR", tmp_path
+        ):
+            assert fetch_people_in_space(cache_ttl=0) == people
+        mock_get.assert_not_called()
+
+    @patch("space.client.requests.Session.get")
+    def test_fails_fast_without_fallback(
+        self, mock_get: Any, open_circuit: Any, tmp_path: Any
+    ) -> None:
+        """Test CircuitOpenError is raised when no roster was ever seen."""
+        from space.resilience import CircuitOpenError
+
+        with patch("space.space._last_people", None), patch(
+            "space.space.CACHE_DIR", tmp_path
+        ):
+            with pytest.raises(CircuitOpenError):
+                fetch_people_in_space(cache_ttl=0)
+        mock_get.assert_not_called()
+
+    @patch("space.client.requests.Session.get")
+    def test_stream_serves_last_known_roster(
+        self, mock_get: Any, open_circuit: Any
+    ) -> None:
+        """Test the streaming and Roster paths fall back like the table does."""
+        people = [{"name": "A", "craft": "ISS"}]
+        with patch("space.space._last_people", people):
+            assert list(iter_people_in_space(cache_ttl=0)) == people
+            assert fetch_roster(cache_ttl=0) == people
+
+        mock_get.assert_not_called()
+
+    @patch("space.client.requests.Session.get")
+    def test_stream_fails_fast_without_fallback(
+        self, mock_get: Any, open_circuit: Any, tmp_path: Any
+    ) -> None:
+        """Test the stream raises CircuitOpenError when no roster was seen."""
+        from space.resilience import CircuitOpenError
+
+        with patch("space.space._last_people", None), patch(
+            "space.space.CACHE_DIR", tmp_path
+        ):
+            with pytest.raises(CircuitOpenError):
+                list(iter_people_in_space(cache_ttl=0))
+        mock_get.assert_not_called()
+
+
+class TestGetFetcher:
+    """Tests for the shared fetcher behind fetch_people_in_space."""
+
+    def test_get_fetcher_is_shared_per_ttl(self) -> None:
+        """Test the same fetcher is reused for the same TTL."""
+        assert get_fetcher(0) is get_fetcher(0)
+        assert get_fetcher(0) is not get_fetcher(30)
+
+    @patch("space.client.requests.Session.get")
+    def test_concurrent_fetches_share_one_request(self, mock_get: Any) -> None:
+        """Test concurrent callers trigger a single HTTP request."""
+        import threading
+
+        release = threading.Event()
+        mock_response = Mock(content=b"{}", headers={}, elapsed=timedelta(0))
+        mock_response.content = json.dumps(
+            {"people": [{"name": "A", "craft": "ISS"}]}
+        ).encode()
+
+        def slow_get(*args: Any, **kwargs: Any) -> Mock:
+            release.wait(timeout=5)
+            return mock_response
+
+        mock_get.side_effect = slow_get
+        coalesced = get_fetcher(0).stats().coalesced + 4
+        results: list = []
+        threads = [
+            threading.Thread(target=lambda: results.append(fetch_people_in_space()))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while (
+            get_fetcher(0).stats().coalesced < coalesced and time.monotonic() < deadline
+        ):
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(results) == 5
+        mock_get.assert_called_once()
+
+    @pytest.fixture
+    def roster_reuse(self) -> Any:
+        """Build fresh fetchers with a 60s max age and stale-while-revalidate."""
+        get_fetcher.cache_clear()
+        with patch("space.space.ROSTER_MAX_AGE", 60.0), patch(
+            "space.space.STALE_WHILE_REVALIDATE", True
+        ):
+            yield
+        get_fetcher.cache_clear()
+
+    @staticmethod
+    def _response(name: str) -> Mock:
+        body = json.dumps({"people": [{"name": name, "craft": "ISS"}]}).encode()
+        return Mock(content=body, headers={}, elapsed=timedelta(0))
+
+    @patch("space.client.requests.Session.get")
+    def test_roster_reused_within_max_age(
+        self, mock_get: Any, roster_reuse: None
+    ) -> None:
+        """Test a roster younger than SPACE_ROSTER_MAX_AGE is not fetched again."""
+        mock_get.return_value = self._response("A")
+
+        assert fetch_people_in_space(cache_ttl=0) == [{"name": "A", "craft": "ISS"}]
+        assert fetch_people_in_space(cache_ttl=0) == [{"name": "A", "craft": "ISS"}]
+        mock_get.assert_called_once()
+        assert get_fetcher(0).stats().hits == 1
+
+    @patch("space.client.requests.Session.get")
+    def test_stale_roster_served_while_revalidating(
+        self, mock_get: Any, roster_reuse: None
+    ) -> None:
+        """Test an expired roster is returned at once and refreshed behind it."""
+        mock_get.side_effect = [self._response("A"), self._response("B")]
+        fetch_people_in_space(cache_ttl=0)
+
+        with patch("space.fetcher.time.monotonic", return_value=time.monotonic() + 61):
+            stale = fetch_people_in_space(cache_ttl=0)
+        deadline = time.monotonic() + 5
+        while mock_get.call_count < 2 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        assert stale == [{"name": "A", "craft": "ISS"}]
+        assert get_fetcher(0).stats().stale == 1
+        assert mock_get.call_count == 2
+
+
+class TestIterPeopleInSpace:
+    """Tests for iter_people_in_space."""
+
+    @patch("space.space.get_default_client")
+    def test_streams_without_cache(self, mock_client: Any) -> None:
+        """Test the roster is streamed from the client when caching is off."""
+        mock_client.return_value.iter_people.return_value = iter(
+            [{"name": "A", "craft": "ISS"}]
+        )
+
+        assert list(iter_people_in_space(cache_ttl=0)) == [
+            {"name": "A", "craft": "ISS"}
+        ]
+        mock_client.return_value.iter_people.assert_called_once_with()
+
+    @patch("space.space.fetch_people_in_space")
+    def test_uses_cache_when_enabled(self, mock_fetch: Any) -> None:
+        """Test a positive TTL goes through the cached fetch."""
+        mock_fetch.return_value = [{"name": "A", "craft": "ISS"}]
+
+        assert list(iter_people_in_space(cache_ttl=60)) == mock_fetch.return_value
+        mock_fetch.assert_called_once_with(cache_ttl=60)
+
+    @patch("space.space.get_default_client")
+    def test_streamed_roster_is_recorded(self, mock_client: Any, tmp_path: Any) -> None:
+        """Test a stream read to the end is recorded, a partial one is not."""
+        mock_client.return_value.iter_people.side_effect = lambda: iter(
+            [{"name": "A", "craft": "ISS"}, {"name": "B", "craft": "ISS"}]
+        )
+        path = tmp_path / "history.sqlite3"
+
+        with patch("space.space.RECORD_HISTORY", True), patch(
+            "space.space.HISTORY_DB", path
+        ):
+            next(iter_people_in_space(cache_ttl=0))
+            assert not path.exists()
+            assert len(fetch_roster(cache_ttl=0)) == 2
+
+        with HistoryStore(path) as store:
+            assert store.roster_at(time.time()) == [
+                {"name": "A", "craft": "ISS"},
+                {"name": "B", "craft": "ISS"},
+            ]
+
+    @patch("space.space.get_default_client")
+    def test_is_lazy(self, mock_client: Any) -> None:
+        """Test nothing is requested until the generator is consumed."""
+        iter_people_in_space(cache_ttl=0)
+        mock_client.assert_not_called()
+
+
+class TestFetchRoster:
+    """Tests for fetch_roster."""
+
+    @patch("space.space.iter_people_in_space")
+    def test_builds_roster_from_stream(self, mock_iter: Any) -> None:
+        """Test the streamed roster is packed into a Roster."""
+        mock_iter.return_value = iter([{"name": "A", "craft": "ISS"}])
+
+        roster = fetch_roster(cache_ttl=0)
+
+        assert isinstance(roster, Roster)
+        assert roster == [{"name": "A", "craft": "ISS"}]
+        mock_iter.assert_called_once_with(cache_ttl=0)
@@ -0,0 +1,124 @@
+"""Unit tests for the stream module."""
+
+import json
+from typing import Any, Iterator, List
+
+import pytest
+
+from space.stream import _Reader, iter_array_items
+
+
+def _chunks(data: bytes, size: int) -> List[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class TestIterArrayItems:
+    """Tests for iter_array_items."""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 1024])
+    def test_any_chunking(self, size: int, mock_api_response: Any) -> None:
+        """Test elements decode identically however the bytes are split."""
+        data = json.dumps(mock_api_response, indent=2).encode("utf-8")
+
+        people = list(iter_array_items(_chunks(data, size), "people"))
+
+        assert people == mock_api_response["people"]
+
+    def test_members_after_the_array(self) -> None:
+        """Test other members may come before or after the array."""
+        data = b'{"people": [{"name": "A"}], "number": 12345, "nested": {"x": [1]}}'
+        assert list(iter_array_items(_chunks(data, 4), "people")) == [{"name": "A"}]
+
+    def test_other_members_are_handed_over(self) -> None:
+        """Test members besides the array reach on_member as they are decoded."""
+        data = b'{"number": 1, "people": [{"name": "A"}], "message": "ok"}'
+        seen: List[Any] = []
+
+        items = iter_array_items(
+            _chunks(data, 4), "people", lambda *member: seen.append(member)
+        )
+
+        assert next(items) == {"name": "A"}
+        assert seen == [("number", 1)]
+        assert list(items) == []
+        assert seen == [("number", 1), ("message", "ok")]
+
+    def test_multibyte_characters_split_across_chunks(self) -> None:
+        """Test UTF-8 sequences split between chunks are reassembled."""
+        data = json.dumps(
+            {"people": [{"name": "Ľudmila Čaputová 王亚平"}]}, ensure_ascii=False
+        ).encode("utf-8")
+        people = list(iter_array_items(_chunks(data, 1), "people"))
+        assert people[0]["name"] == "Ľudmila Čaputová 王亚平"
+
+    def test_numbers_split_across_chunks(self) -> None:
+        """Test a number split between chunks is not truncated."""
+        data = b'{"people": [12, 345]}'
+        assert list(
+            iter_array_items([b'{"people": [1', b"2, 34", b"5]}"], "people")
+        ) == [
+            12,
+            345,
+        ]
+        assert list(iter_array_items([data], "people")) == [12, 345]
+
+    def test_empty_array(self) -> None:
+        """Test an empty array yields nothing."""
+        assert list(iter_array_items([b'{"people": []}'], "people")) == []
+
+    def test_missing_key(self) -> None:
+        """Test a document without the key raises KeyError."""
+        with pytest.raises(KeyError):
+            list(iter_array_items([b'{"number": 3}'], "people"))
+
+    def test_empty_object(self) -> None:
+        """Test an empty object raises KeyError."""
+        with pytest.raises(KeyError):
+            list(iter_array_items([b"{}"], "people"))
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"not json", b'{"people": {"a": 1}}', b'{"people": [1, 2', b"[1, 2]"],
+    )
+    def test_malformed_documents(self, data: bytes) -> None:
+        """Test malformed or truncated documents raise ValueError."""
+        with pytest.raises(ValueError):
+            list(iter_array_items([data], "people"))
+
+    def test_yields_before_document_is_complete(self) -> None:
+        """Test elements are produced while later chunks are still unread."""
+        consumed: List[int] = []
+
+        def chunks() -> Iterator[bytes]:
+            for i, chunk in enumerate([b'{"people": [{"a": 1},', b' {"a": 2}]}']):
+                consumed.append(i)
+                yield chunk
+
+        items = iter_array_items(chunks(), "people")
+        assert next(items) == {"a": 1}
+        assert consumed == [0]
+
+    def test_memory_stays_bounded(self, monkeypatch: Any) -> None:
+        """Test the parse buffer does not grow with the roster size."""
+        person = b'{"name": "Astronaut Number 000000", "craft": "ISS"}'
+        count = 20_000
+
+        def chunks() -> Iterator[bytes]:
+            yield b'{"people": ['
+            for i in range(count):
+                yield person + (b"," if i < count - 1 else b"")
+            yield b"]}"
+
+        reader_sizes: List[int] = []
+        original_fill = _Reader._fill
+
+        def tracking_fill(self: _Reader) -> bool:
+            reader_sizes.append(len(self.buffer))
+            return original_fill(self)
+
+        monkeypatch.setattr(_Reader, "_fill", tracking_fill)
+        total = sum(1 for _ in iter_array_items(chunks(), "people"))
+
+        assert total == count
+        assert max(reader_sizes) < 2 * 64 * 1024
+        assert count * len(person) > 10 * max(reader_sizes)
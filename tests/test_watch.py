@@ -0,0 +1,171 @@
+"""Unit tests for the watch module."""
+
+import io
+from typing import Any, List
+from unittest.mock import Mock
+
+import pytest
+from rich.console import Console
+
+from space.watch import (
+    ARRIVED_STYLE,
+    DEPARTED_STYLE,
+    AdaptiveInterval,
+    RosterDiff,
+    WatchView,
+    diff_rosters,
+    roster_keys,
+    watch,
+)
+
+ISS_CREW = [
+    {"name": "John Doe", "craft": "ISS"},
+    {"name": "Jane Smith", "craft": "ISS"},
+]
+
+
+class TestDiffRosters:
+    """Tests for diff_rosters."""
+
+    def test_no_change(self) -> None:
+        """Test identical rosters produce an empty diff."""
+        keys = roster_keys(ISS_CREW)
+        assert not diff_rosters(keys, list(reversed(keys)))
+
+    def test_arrivals_and_departures(self) -> None:
+        """Test arrivals and departures are detected by name and craft."""
+        old = [("A", "ISS"), ("B", "ISS")]
+        new = [("B", "ISS"), ("C", "Tiangong")]
+
+        assert diff_rosters(old, new) == RosterDiff(
+            arrived=[("C", "Tiangong")], departed=[("A", "ISS")]
+        )
+
+    def test_craft_change_is_departure_and_arrival(self) -> None:
+        """Test moving between craft shows up on both sides."""
+        diff = diff_rosters([("A", "Soyuz")], [("A", "ISS")])
+        assert diff.arrived == [("A", "ISS")]
+        assert diff.departed == [("A", "Soyuz")]
+
+
+class TestAdaptiveInterval:
+    """Tests for AdaptiveInterval."""
+
+    def test_backs_off_until_maximum(self) -> None:
+        """Test unchanged polls grow the interval up to the maximum."""
+        interval = AdaptiveInterval(10, 35)
+        assert [interval.update(False) for _ in range(3)] == [20, 35, 35]
+
+    def test_change_resets_to_minimum(self) -> None:
+        """Test a change brings the interval back to the minimum."""
+        interval = AdaptiveInterval(10, 300)
+        interval.update(False)
+        interval.update(False)
+        assert interval.update(True) == 10
+
+    def test_invalid_bounds(self) -> None:
+        """Test inconsistent bounds are rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveInterval(10, 5)
+
+
+class TestWatchView:
+    """Tests for WatchView."""
+
+    def test_load_is_not_highlighted(self) -> None:
+        """Test the initial roster is shown without highlights."""
+        view = WatchView()
+        view.load([("A", "ISS")])
+        assert view.rows == {("A", "ISS"): ""}
+
+    def test_apply_touches_only_changed_rows(self) -> None:
+        """Test arrivals and departures are highlighted, others untouched."""
+        view = WatchView()
+        view.load([("A", "ISS"), ("B", "ISS")])
+
+        view.apply(RosterDiff(arrived=[("C", "ISS")], departed=[("A", "ISS")]))
+
+        assert view.rows == {
+            ("A", "ISS"): DEPARTED_STYLE,
+            ("B", "ISS"): "",
+            ("C", "ISS"): ARRIVED_STYLE,
+        }
+        assert view.count == 2
+
+    def test_next_change_settles_highlights(self) -> None:
+        """Test departed rows are dropped and arrivals settle on the next change."""
+        view = WatchView()
+        view.load([("A", "ISS")])
+        view.apply(RosterDiff(arrived=[("B", "ISS")], departed=[("A", "ISS")]))
+
+        view.apply(RosterDiff(arrived=[("C", "ISS")]))
+
+        assert view.rows == {("B", "ISS"): "", ("C", "ISS"): ARRIVED_STYLE}
+
+    def test_empty_diff_keeps_highlights(self) -> None:
+        """Test an unchanged poll leaves the current highlights alone."""
+        view = WatchView()
+        view.load([("A", "ISS")])
+        view.apply(RosterDiff(arrived=[("B", "ISS")]))
+
+        view.apply(RosterDiff())
+
+        assert view.rows[("B", "ISS")] == ARRIVED_STYLE
+
+    def test_render_contains_rows(self) -> None:
+        """Test the rendered table lists every row and the count."""
+        view = WatchView()
+        view.load(roster_keys(ISS_CREW))
+        console = Console(file=io.StringIO(), width=80)
+
+        console.print(view.render())
+
+        output = console.file.getvalue()  # type: ignore[attr-defined]
+        assert "John Doe" in output
+        assert "People currently in space: 2" in output
+
+
+class TestWatch:
+    """Tests for the watch loop."""
+
+    @staticmethod
+    def _run(fetch: Mock, polls: int) -> List[float]:
+        sleep = Mock()
+        watch(
+            fetch,
+            AdaptiveInterval(10, 40),
+            console=Console(file=io.StringIO(), width=80),
+            sleep=sleep,
+            max_polls=polls,
+        )
+        return [call.args[0] for call in sleep.call_args_list]
+
+    def test_polling_backs_off_and_resets(self) -> None:
+        """Test the delay grows while unchanged and resets after a change."""
+        changed = ISS_CREW + [{"name": "Bob Johnson", "craft": "Tiangong"}]
+        fetch = Mock(side_effect=[ISS_CREW, ISS_CREW, ISS_CREW, changed, changed])
+
+        delays = self._run(fetch, polls=5)
+
+        assert delays == [10, 20, 40, 10]
+        assert fetch.call_count == 5
+
+    def test_poll_errors_are_survived(self) -> None:
+        """Test a failing poll backs off and the loop keeps going."""
+        fetch = Mock(side_effect=[ISS_CREW, ConnectionError("down"), ISS_CREW])
+
+        delays = self._run(fetch, polls=3)
+
+        assert delays == [10, 20]
+        assert fetch.call_count == 3
+
+    def test_single_poll_does_not_sleep(self) -> None:
+        """Test the loop does not sleep after its final poll."""
+        assert self._run(Mock(return_value=ISS_CREW), polls=1) == []
+
+
+def test_watch_view_handles_real_roster(mock_api_response: Any) -> None:
+    """Test API payloads map straight onto view rows."""
+    view = WatchView()
+    view.load(roster_keys(mock_api_response["people"]))
+    assert view.count == 3